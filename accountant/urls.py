@@ -7,14 +7,22 @@ from . import views
 urlpatterns = [
     # finance urls
     path('accountant/finance/', views.accountant_finance_home, name='accountant_finance_home'),
+    path('accountant/offerings/forecast/', views.accountant_offerings_forecast, name='accountant_offerings_forecast'),
     path('accountant/offerings/create/', views.AccountantOfferingsCreateView.as_view(), name='accountant_offerings_create'),
     path('accountant/offerings/list/', views.AccountantOfferingsListView.as_view(), name='accountant_offerings_list'),
+    path('accountant/offerings/import/', views.accountant_offerings_import, name='accountant_offerings_import'),
+    path('accountant/offerings/grid/', views.accountant_offerings_grid, name='accountant_offerings_grid'),
     path('accountant/offerings/update/<int:pk>/', views.AccountantOfferingsUpdateView.as_view(), name='accountant_offerings_update'),
     path('accountant/offerings/delete/<int:pk>/', views.AccountantOfferingsDeleteView.as_view(), name='accountant_offerings_delete'),
     path('accountant/tithes/create/', views.accountant_create_multiple_tithes, name='accountant_create_tithe'),
     path('accountant/tithes/update/<int:tithe_id>/', views.accountant_create_or_update_tithe, name='accountant_update_tithe'),
     path('accountant/tithes/', views.accountant_tithe_list, name='accountant_tithe_list'),
+    path('accountant/tithes/export/', views.accountant_tithe_export, name='accountant_tithe_export'),
     path('accountant/tithes/delete/<int:tithe_id>/', views.accountant_delete_tithe, name='accountant_delete_tithe'),
+    path('accountant/tithes/quick-entry/', views.accountant_tithes_quick_entry, name='accountant_tithes_quick_entry'),
+    path('accountant/tithes/lookup/', views.accountant_tithe_member_lookup, name='accountant_tithe_member_lookup'),
+    path('accountant/tithes/bulk/', views.accountant_tithes_bulk, name='accountant_tithes_bulk'),
+    path('accountant/tithes/import/', views.accountant_tithes_import, name='accountant_tithes_import'),
     path('accountant-facility-renting/create/', views.accountant_facility_renting_create, name='accountant_facility_renting_create'),
     path('accountant-facility-renting/<int:pk>/update/', views.accountant_facility_renting_update, name='accountant_facility_renting_update'),
     path('accountant/facility-renting/list/', views.accountant_facility_renting_list, name='accountant_facility_renting_list'),
@@ -8,8 +8,10 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from finance.utils import (
     get_offerings_data,
     get_special_contributions_data,  # <-- NEW
-    get_asset_finance_data
+    get_asset_finance_data,
+    get_offering_trends_data
 )
+from analysis.cache import cached_analysis
 
 @login_required
 @parish_treasurer_required
@@ -21,6 +23,9 @@ def accountant_finance_home(request):
     # Offerings Data (Chart.js)
     offerings_data = get_offerings_data()
 
+    # Multi-year offering trends (cached, see finance/trends.py)
+    offering_trends_data = cached_analysis("offering_trends", get_offering_trends_data)
+
     # Tithes Data (Chart.js)
 
     # Special Contributions Data (Chart.js)
@@ -31,11 +36,33 @@ def accountant_finance_home(request):
 
     context = {
         'offerings_data': offerings_data,
+        'offering_trends_data': offering_trends_data,
         'special_contributions_data': special_contributions_data,  # Pass to template
         'asset_finance_data': asset_finance_data,
     }
     return render(request, 'accountant/finance/finance_home.html', context)
 
+
+from django.http import JsonResponse
+
+@login_required
+@parish_treasurer_required
+def accountant_offerings_forecast(request):
+    """
+    JSON: expected offerings next Sunday and next month, per outstation/service.
+    Served from the offline-trained artefact (manage.py train_offerings_forecast);
+    nothing is fitted on the request path.
+    """
+    from finance.forecast import forecast_offerings
+
+    forecast = forecast_offerings()
+    if forecast is None:
+        return JsonResponse({
+            "available": False,
+            "message": "No up-to-date offerings forecast has been trained yet.",
+        })
+    return JsonResponse({"available": True, **forecast})
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
@@ -73,24 +100,60 @@ class AccountantOfferingsCreateView(LoginRequiredMixin, ParishTreasurerRequiredM
         messages.error(self.request, "❌ Error: Please check the form fields.")
         return super().form_invalid(form)
 
-from django.utils.timezone import now
-from django.utils.timesince import timesince
+from finance.forms import OfferingsImportForm
+from finance.importer import ImportFileError, import_offerings
+
+@login_required
+@parish_treasurer_required
+def accountant_offerings_import(request):
+    """
+    📥 Import many offerings at once from a CSV/XLSX file (e.g. weeks of paper records).
+    Bad rows are listed with their row number; the valid rows are saved.
+    """
+    result = None
+    if request.method == 'POST':
+        form = OfferingsImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                result = import_offerings(form.cleaned_data['file'], form.cleaned_data['default_category'])
+            except ImportFileError as error:
+                form.add_error('file', str(error))
+            else:
+                messages.success(request, f"✅ {result.created} offerings imported.")
+                if result.error_count:
+                    messages.warning(request, f"⚠️ {result.error_count} rows were skipped.")
+    else:
+        form = OfferingsImportForm()
+
+    return render(request, 'accountant/finance/offerings_import.html', {'form': form, 'result': result})
+
+from finance.grid import offerings_grid_context
+from settings.models import OutStation
+
+@login_required
+@parish_treasurer_required
+def accountant_offerings_grid(request):
+    """
+    🗓️ Sunday grid: every service × category × outstation of one date on one
+    screen, validated together and saved in one transaction.
+    """
+    context = offerings_grid_context(request, OutStation.objects.all())
+    return render(request, 'accountant/finance/offerings_grid.html', context)
+
 from django.views.generic import ListView
-from django.db.models import Sum
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from finance.models import Offerings
-from settings.models import Year
-from members.models import ChurchMember
+from finance.ledger import offerings_ledger_context
 
 class AccountantOfferingsListView(LoginRequiredMixin, ParishTreasurerRequiredMixin, ListView):
     """
-    View to list all offerings from all years.
-    Only accessible by Admins and Superusers.
+    View to list offerings (newest first), filtered and paginated in the
+    database by the offerings ledger (finance/ledger.py).
+    Only accessible by Parish Treasurers.
     """
     model = Offerings
     template_name = "accountant/finance/offerings_list.html"
     context_object_name = "offerings"
-    ordering = ['-date_given']  # Display newest offerings first
 
     def get_context_data(self, **kwargs):
         """
@@ -98,26 +161,8 @@ class AccountantOfferingsListView(LoginRequiredMixin, ParishTreasurerRequiredMix
         """
         context = super().get_context_data(**kwargs)
 
-        # Retrieve all offerings
-        offerings_qs = Offerings.objects.all().order_by('-date_given')
-        context["offerings"] = offerings_qs
-
-        # Retrieve all years
-        context["years"] = Year.objects.all()
-
-        # Retrieve all active church members for collected_by filter
-        context["collected_by_members"] = ChurchMember.objects.filter(status="Active")
-
-        # Retrieve all active church leaders for recorded_by filter
-        context["recorded_by_leaders"] = ChurchMember.objects.filter(leader__isnull=False, status="Active")
-
-        # Calculate total amount
-        context["total_offerings"] = offerings_qs.aggregate(Sum('amount'))['amount__sum'] or 0
-
-        # Annotate offerings with time since created and updated
-        for offering in context["offerings"]:
-            offering.time_since_created = timesince(offering.date_created, now())
-            offering.time_since_updated = timesince(offering.date_updated, now())
+        # One page of offerings, the filtered totals and the filter choices
+        context.update(offerings_ledger_context(self.request.GET))
 
         return context
 
@@ -181,6 +226,8 @@ class AccountantOfferingsDeleteView(LoginRequiredMixin,ParishTreasurerRequiredMi
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
+from finance.forms import TitheForm, TitheFormSet
+from finance.models import Tithe
 
 
 @login_required
@@ -188,29 +235,16 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 def accountant_create_multiple_tithes(request):
     """
     View to create multiple tithes at once using formsets.
-    Only accessible to Admins and Superusers.
+    Only accessible to Parish Treasurers.
     """
-    print("🚀 Entered create_multiple_tithes view")
-
     if request.method == 'POST':
-        print("📥 Handling POST request...")
         formset = TitheFormSet(request.POST)
-        print("✅ Formset initialized with POST data")
-
         if formset.is_valid():
-            print("🎯 Formset is valid. Saving data...")
             formset.save()
             messages.success(request, "✅ Tithes successfully created!")
-            print("💾 Tithes saved successfully!")
             return redirect('accountant_tithe_list')  # Redirect after saving
-        else:
-            print("❌ Formset validation failed")
-            print("📝 Formset errors:", formset.errors)
-
     else:
-        print("📄 Handling GET request...")
         formset = TitheFormSet(queryset=Tithe.objects.none())
-        print("✅ Empty formset initialized for new entries")
 
     return render(request, 'accountant/finance/create_multiple_tithes.html', {'formset': formset})
 
@@ -272,6 +306,51 @@ def accountant_tithe_list(request):
         'years': years,
     })
 
+
+from django.utils.dateparse import parse_date
+from finance.exports import EXPORT_CHUNK_SIZE, export_filename, export_response
+
+def _tithe_filter_date(value):
+    """date of a YYYY-MM-DD filter value; None if empty, malformed or impossible (2025-02-30)."""
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+# 📤 CSV/XLSX download of the tithe list
+@login_required
+@parish_treasurer_required
+def accountant_tithe_export(request):
+    """
+    📤 CSV/XLSX download of the tithes shown by the tithe list filters:
+    ?year=, ?member= (part of the name), ?from_date= / ?to_date= (YYYY-MM-DD).
+    """
+    tithes = Tithe.objects.all()
+    year_filter = request.GET.get('year', '')
+    member_filter = request.GET.get('member', '').strip()
+    from_date = _tithe_filter_date(request.GET.get('from_date', ''))
+    to_date = _tithe_filter_date(request.GET.get('to_date', ''))
+
+    if year_filter.isdecimal():
+        tithes = tithes.filter(year__year=year_filter)
+    if member_filter:
+        tithes = tithes.filter(member__full_name__icontains=member_filter)
+    if from_date:
+        tithes = tithes.filter(date_given__gte=from_date)
+    if to_date:
+        tithes = tithes.filter(date_given__lte=to_date)
+
+    rows = (
+        tithes.order_by('-date_given', '-pk')
+        .values_list(
+            'date_given', 'year__year', 'member__member_id', 'member__full_name',
+            'amount', 'payment_method', 'receipt_number', 'purpose',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    header = ['Date Given', 'Year', 'Member ID', 'Member', 'Amount (TZS)', 'Payment Method', 'Receipt Number', 'Purpose']
+    return export_response(request, export_filename('tithes', year_filter, from_date, to_date), header, rows)
+
 # ❌ View to Delete a Specific Tithe
 @login_required
 @parish_treasurer_required
@@ -291,6 +370,98 @@ def accountant_delete_tithe(request, tithe_id):
     return render(request, 'accountant/finance/delete_tithe.html', {'tithe': tithe})
 
 
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+from finance.tithes import MAX_BULK_TITHES, PAYMENT_METHODS, create_tithes, resolve_members
+
+# ⌨️ Keyboard-driven tithe entry page
+@login_required
+@parish_treasurer_required
+def accountant_tithes_quick_entry(request):
+    """
+    Type an envelope number, phone or member ID, then the amount, press Enter
+    and go on; the whole batch is saved at once through accountant_tithes_bulk.
+    """
+    return render(request, 'accountant/finance/tithe_quick_entry.html', {
+        'payment_methods': PAYMENT_METHODS.values(),
+        'max_rows': MAX_BULK_TITHES,
+    })
+
+# 🔍 Resolve members by envelope number / phone / member ID (JSON)
+@login_required
+@parish_treasurer_required
+@require_GET
+def accountant_tithe_member_lookup(request):
+    """
+    GET ?q=<identifier>&q=<identifier>... ->
+    {"results": {identifier: {"id", "name", "member_id", "status", "via"} or null}}
+    """
+    identifiers = request.GET.getlist('q')[:MAX_BULK_TITHES]
+    return JsonResponse({"results": resolve_members(identifiers)})
+
+# 📦 Save many tithes in one request (JSON)
+@login_required
+@parish_treasurer_required
+@require_POST
+def accountant_tithes_bulk(request):
+    """
+    POST {"defaults": {"date_given", "payment_method", "purpose"},
+          "rows": [{"member", "amount", ...}, ...]}
+
+    All rows are saved in one transaction, or none if any row is invalid.
+    Responds with {"ok", "created", "results": [per-row outcome]}; 400 when
+    nothing was saved.
+    """
+    try:
+        payload = json.loads(request.body)
+        rows = payload["rows"]
+        defaults = payload.get("defaults") or {}
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows) or not isinstance(defaults, dict):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"ok": False, "error": 'Send JSON like {"rows": [{"member": ..., "amount": ...}]}.'}, status=400)
+
+    if not rows:
+        return JsonResponse({"ok": False, "error": "No tithes to save."}, status=400)
+    try:
+        result = create_tithes(rows, defaults)
+    except ValueError as error:
+        return JsonResponse({"ok": False, "error": str(error)}, status=400)
+
+    return JsonResponse(result, status=200 if result["ok"] else 400)
+
+
+from finance.forms import TithesImportForm
+from finance.tithes import import_tithes
+
+# 📥 Import tithes from a CSV/XLSX file
+@login_required
+@parish_treasurer_required
+def accountant_tithes_import(request):
+    """
+    📥 Import many tithes at once from a CSV/XLSX file (e.g. envelope records).
+    Bad rows are listed with their row number; the valid rows are saved.
+    """
+    result = None
+    if request.method == 'POST':
+        form = TithesImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                result = import_tithes(form.cleaned_data['file'])
+            except ImportFileError as error:
+                form.add_error('file', str(error))
+            else:
+                messages.success(request, f"✅ {result.created} tithes imported.")
+                if result.error_count:
+                    messages.warning(request, f"⚠️ {result.error_count} rows were skipped.")
+    else:
+        form = TithesImportForm()
+
+    return render(request, 'accountant/finance/tithes_import.html', {'form': form, 'result': result})
+
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -169,6 +169,10 @@ class AdminUpdateForm(UserChangeForm):
 from django import forms
 from .models import CustomUser
 from members.models import ChurchMember
+from settings.ids import is_typed_id_acceptable
+
+# Shown when a typed member ID fails its check character
+TYPED_MEMBER_ID_ERROR = "⚠️ This member ID has a typing mistake. Please check it and try again."
 
 class AccountRequestForm(forms.ModelForm):
     """
@@ -222,6 +226,8 @@ class AccountRequestForm(forms.ModelForm):
         Validate if the entered member ID exists in the ChurchMember model.
         """
         member_id = self.cleaned_data['member_id']
+        if not is_typed_id_acceptable("member", member_id):
+            raise forms.ValidationError(TYPED_MEMBER_ID_ERROR)
         try:
             member = ChurchMember.objects.get(member_id=member_id)
             return member
@@ -289,6 +295,8 @@ class ForgotPasswordForm(forms.ModelForm):
         Validate if the entered member ID exists in the ChurchMember model.
         """
         member_id = self.cleaned_data['member_id']
+        if not is_typed_id_acceptable("member", member_id):
+            raise forms.ValidationError(TYPED_MEMBER_ID_ERROR)
         try:
             member = ChurchMember.objects.get(member_id=member_id)
             return member
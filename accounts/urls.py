@@ -39,6 +39,7 @@ urlpatterns = [
     path("members_upload_profile_picture/", member_upload_profile_picture, name="member_upload_profile_picture"),
     path("accountant_upload_profile_picture/", views.accountant_upload_profile_picture, name="accountant_upload_profile_picture"),
     path("secretary_upload_profile_picture/", views.secretary_upload_profile_picture, name="secretary_upload_profile_picture"),
+    path("pastor_upload_profile_picture/", views.pastor_upload_profile_picture, name="pastor_upload_profile_picture"),
     path("remove_profile_picture/", remove_profile_picture, name="remove_profile_picture"),
     path("member_remove_profile_picture/", member_remove_profile_picture, name="member_remove_profile_picture"),
 
@@ -39,20 +39,26 @@ def get_client_ip(request):
 
 import json
 from django.utils.timezone import now
-from django.db.models import Sum
-from finance.models import Offerings, FacilityRenting, DonationItemFund
+from django.db.models import Sum, Q
+from finance.models import FinanceDailyRollup
 
 def get_general_finance_analysis():
     """
     Fetches total amounts from Offerings, Facility Renting, and Special Contributions
     for the current year and returns JSON data for visualization.
+    All three totals come from FinanceDailyRollup in a single query.
     """
     current_year = now().year
 
     # Fetch total amount from each financial component
-    total_offerings = Offerings.objects.filter(date_given__year=current_year).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_facility_renting = FacilityRenting.objects.filter(date_rented__year=current_year).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_special_contributions = DonationItemFund.objects.filter(year__year=current_year).aggregate(Sum('amount'))['amount__sum'] or 0
+    totals = FinanceDailyRollup.objects.aggregate(
+        offerings=Sum('total', filter=Q(kind=FinanceDailyRollup.OFFERING, date__year=current_year)),
+        facility_renting=Sum('total', filter=Q(kind=FinanceDailyRollup.RENTING, date__year=current_year)),
+        special_contributions=Sum('total', filter=Q(kind=FinanceDailyRollup.DONATION, year__year=current_year)),
+    )
+    total_offerings = totals['offerings'] or 0
+    total_facility_renting = totals['facility_renting'] or 0
+    total_special_contributions = totals['special_contributions'] or 0
 
     # Convert Decimal values to float for JSON serialization
     total_offerings = float(total_offerings)
@@ -81,28 +87,31 @@ def get_general_finance_analysis():
 import json
 from django.utils.timezone import now
 from members.models import ChurchMember
+from members.utils import get_membership_stats
 
 def get_general_sacraments_analysis():
     """
     Fetches the count of baptized, confirmed, and marital status categories
     and returns JSON data for visualization.
     """
+    stats = get_membership_stats("parish")
+
     # Get the total count of members
-    total_members = ChurchMember.objects.count()
+    total_members = stats["total"]
 
     # Baptism statistics
-    baptized = ChurchMember.objects.filter(is_baptised=True).count()
-    unbaptized = ChurchMember.objects.filter(is_baptised=False).count()
+    baptized = stats["baptised"]
+    unbaptized = stats["unbaptised"]
 
     # Confirmation statistics (using date_confirmed as a proxy since is_confirmed is removed)
-    confirmed = ChurchMember.objects.filter(date_confirmed__isnull=False).count()
-    unconfirmed = ChurchMember.objects.filter(date_confirmed__isnull=True).count()
+    confirmed = stats["confirmed"]
+    unconfirmed = stats["unconfirmed"]
 
     # Marital status statistics
-    married_males = ChurchMember.objects.filter(marital_status='Married', gender='Male').count()
-    married_females = ChurchMember.objects.filter(marital_status='Married', gender='Female').count()
-    unmarried_males = ChurchMember.objects.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Male').count()
-    unmarried_females = ChurchMember.objects.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Female').count()
+    married_males = stats["married_male"]
+    married_females = stats["married_female"]
+    unmarried_males = stats["unmarried_male"]
+    unmarried_females = stats["unmarried_female"]
 
     # Data Labels and Values
     labels = [
@@ -301,34 +310,29 @@ def get_members_distribution_analysis():
     total members per outstation, and total active and inactive members.
     Returns JSON data for visualization.
     """
+    # Totals, per-cell and per-outstation counts from the membership stats cube
+    parish = get_membership_stats("parish")
+    cell_stats = get_membership_stats("cell")
+    outstation_stats = get_membership_stats("outstation")
+
     # Get total number of members
-    total_members = ChurchMember.objects.count()
+    total_members = parish["total"]
 
     # Get total male and female members
-    total_male_members = ChurchMember.objects.filter(gender="Male").count()
-    total_female_members = ChurchMember.objects.filter(gender="Female").count()
+    total_male_members = parish["male"]
+    total_female_members = parish["female"]
 
     # Get total active and inactive members
-    total_active_members = ChurchMember.objects.filter(status="Active").count()
-    total_inactive_members = ChurchMember.objects.filter(status="Inactive").count()
-
-    # Get members count by cell
-    members_by_cell = (
-        ChurchMember.objects.values("cell__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
+    total_active_members = parish["active"]
+    total_inactive_members = parish["inactive"]
 
-    # Get members count by outstation (replaced zone)
-    members_by_outstation = (
-        ChurchMember.objects.values("cell__outstation__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")
+    # Get members count by cell, largest first; filter out members with no cell
+    members_by_cell = sorted(
+        (row for row in cell_stats.values() if row["label"]),
+        key=lambda row: (-row["total"], row["label"]),
     )
-
-    # Filter out cells with no members
-    cell_labels = [entry["cell__name"] for entry in members_by_cell if entry["cell__name"]]
-    cell_counts = [entry["count"] for entry in members_by_cell if entry["cell__name"]]
+    cell_labels = [row["label"] for row in members_by_cell]
+    cell_counts = [row["total"] for row in members_by_cell]
 
     # Calculate percentage per cell
     cell_percentages = [
@@ -350,7 +354,7 @@ def get_members_distribution_analysis():
         "total_members": total_members,
         "total_male_members": total_male_members,
         "total_female_members": total_female_members,
-        "total_outstations": members_by_outstation.count(),  # Changed from total_zones
+        "total_outstations": len(outstation_stats),  # Changed from total_zones
         "total_active_members": total_active_members,
         "total_inactive_members": total_inactive_members,
         "analysis": analysis
@@ -8,14 +8,16 @@ from django.utils.timezone import now
 from datetime import datetime, timezone
 
 from .forms import (
-    LoginForm, AdminUpdateForm, AccountRequestForm, ForgotPasswordForm
+    LoginForm, AdminUpdateForm, AccountRequestForm, ForgotPasswordForm, TYPED_MEMBER_ID_ERROR
 )
 from .models import LoginHistory, CustomUser
 from .utils import authenticate_with_username_or_email, get_client_ip
 from accounts.decorators import church_member_required  # custom decorator
 from leaders.models import Leader
 from members.models import ChurchMember
+from settings.ids import is_typed_id_acceptable
 from settings.models import Year
+from analysis.cache import cached_analysis
 
 # -------------------------------------------------
 # Helpers
@@ -198,13 +200,13 @@ def admin_dashboard(request):
     )
 
     context = {
-        "general_finance_data": get_general_finance_analysis(),
-        "general_sacraments_data": get_general_sacraments_analysis(),
-        "general_properties_data": get_general_properties_analysis(),
+        "general_finance_data": cached_analysis("general_finance", get_general_finance_analysis),
+        "general_sacraments_data": cached_analysis("general_sacraments", get_general_sacraments_analysis),
+        "general_properties_data": cached_analysis("general_properties", get_general_properties_analysis),
         "account_completion_data": get_account_completion_analysis(request.user),
-        "leaders_distribution_data": get_leaders_distribution_analysis(),
-        "members_distribution_data": get_members_distribution_analysis(),
-        "general_data_analysis": get_general_data_analysis(),
+        "leaders_distribution_data": cached_analysis("leaders_distribution", get_leaders_distribution_analysis),
+        "members_distribution_data": cached_analysis("members_distribution", get_members_distribution_analysis),
+        "general_data_analysis": cached_analysis("general_data", get_general_data_analysis),
     }
     return render(request, "accounts/admin_dashboard.html", context)
 
@@ -230,10 +232,10 @@ def secretary_dashboard(request):
     )
 
     context = {
-        "general_sacraments_data": get_general_sacraments_analysis(),
-        "general_properties_data": get_general_properties_analysis(),
-        "leaders_distribution_data": get_leaders_distribution_analysis(),
-        "members_distribution_data": get_members_distribution_analysis(),
+        "general_sacraments_data": cached_analysis("general_sacraments", get_general_sacraments_analysis),
+        "general_properties_data": cached_analysis("general_properties", get_general_properties_analysis),
+        "leaders_distribution_data": cached_analysis("leaders_distribution", get_leaders_distribution_analysis),
+        "members_distribution_data": cached_analysis("members_distribution", get_members_distribution_analysis),
     }
     return render(request, "accounts/secretary_dashboard.html", context)
 
@@ -262,13 +264,13 @@ def accountant_dashboard(request):
     )
 
     context = {
-        "general_finance_data": get_general_finance_analysis(),
-        "general_sacraments_data": get_general_sacraments_analysis(),
-        "general_properties_data": get_general_properties_analysis(),
+        "general_finance_data": cached_analysis("general_finance", get_general_finance_analysis),
+        "general_sacraments_data": cached_analysis("general_sacraments", get_general_sacraments_analysis),
+        "general_properties_data": cached_analysis("general_properties", get_general_properties_analysis),
         "account_completion_data": get_account_completion_analysis(request.user),
-        "leaders_distribution_data": get_leaders_distribution_analysis(),
-        "members_distribution_data": get_members_distribution_analysis(),
-        "general_data_analysis": get_general_data_analysis(),
+        "leaders_distribution_data": cached_analysis("leaders_distribution", get_leaders_distribution_analysis),
+        "members_distribution_data": cached_analysis("members_distribution", get_members_distribution_analysis),
+        "general_data_analysis": cached_analysis("general_data", get_general_data_analysis),
     }
     return render(request, "accounts/accountant_dashboard.html", context)
 
@@ -297,13 +299,13 @@ def pastor_dashboard(request):
     )
 
     context = {
-        "general_finance_data": get_general_finance_analysis(),
-        "general_sacraments_data": get_general_sacraments_analysis(),
-        "general_properties_data": get_general_properties_analysis(),
+        "general_finance_data": cached_analysis("general_finance", get_general_finance_analysis),
+        "general_sacraments_data": cached_analysis("general_sacraments", get_general_sacraments_analysis),
+        "general_properties_data": cached_analysis("general_properties", get_general_properties_analysis),
         "account_completion_data": get_account_completion_analysis(request.user),
-        "leaders_distribution_data": get_leaders_distribution_analysis(),
-        "members_distribution_data": get_members_distribution_analysis(),
-        "general_data_analysis": get_general_data_analysis(),
+        "leaders_distribution_data": cached_analysis("leaders_distribution", get_leaders_distribution_analysis),
+        "members_distribution_data": cached_analysis("members_distribution", get_members_distribution_analysis),
+        "general_data_analysis": cached_analysis("general_data", get_general_data_analysis),
     }
     return render(request, "accounts/pastor_dashboard.html", context)
 
@@ -332,13 +334,13 @@ def evangelist_dashboard(request):
     )
 
     context = {
-        "general_finance_data": get_general_finance_analysis(),
-        "general_sacraments_data": get_general_sacraments_analysis(),
-        "general_properties_data": get_general_properties_analysis(),
+        "general_finance_data": cached_analysis("general_finance", get_general_finance_analysis),
+        "general_sacraments_data": cached_analysis("general_sacraments", get_general_sacraments_analysis),
+        "general_properties_data": cached_analysis("general_properties", get_general_properties_analysis),
         "account_completion_data": get_account_completion_analysis(request.user),
-        "leaders_distribution_data": get_leaders_distribution_analysis(),
-        "members_distribution_data": get_members_distribution_analysis(),
-        "general_data_analysis": get_general_data_analysis(),
+        "leaders_distribution_data": cached_analysis("leaders_distribution", get_leaders_distribution_analysis),
+        "members_distribution_data": cached_analysis("members_distribution", get_members_distribution_analysis),
+        "general_data_analysis": cached_analysis("general_data", get_general_data_analysis),
     }
     return render(request, "accounts/evangelist_dashboard.html", context)
 
@@ -508,6 +510,9 @@ def request_account(request):
     if request.method == "POST":
         if "validate_id" in request.POST:
             member_id = request.POST.get("member_id", "").strip()
+            if not is_typed_id_acceptable("member", member_id):
+                messages.error(request, TYPED_MEMBER_ID_ERROR)
+                return render(request, "accounts/request_account.html", {"form": form})
             try:
                 church_member = ChurchMember.objects.get(member_id=member_id)
                 leader = Leader.objects.filter(church_member=church_member).first()
@@ -567,6 +572,9 @@ def forgot_password(request):
     if request.method == "POST":
         if "validate_id" in request.POST:
             member_id = request.POST.get("member_id", "").strip()
+            if not is_typed_id_acceptable("member", member_id):
+                messages.error(request, TYPED_MEMBER_ID_ERROR)
+                return render(request, "accounts/forgot_password.html", {"form": form})
             try:
                 church_member = ChurchMember.objects.get(member_id=member_id)
                 user = CustomUser.objects.filter(church_member=church_member).first()
@@ -1,3 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
+
+from .models import RequestSample
+
+
+@admin.register(RequestSample)
+class RequestSampleAdmin(admin.ModelAdmin):
+    list_display = ("view_name", "method", "status_code", "duration_ms", "query_count", "db_time_ms", "over_budget", "created_at")
+    list_filter = ("over_budget", "method")
+    search_fields = ("view_name", "path")
+    readonly_fields = [field.name for field in RequestSample._meta.fields]
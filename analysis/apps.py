@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analysis'
+
+    def ready(self):
+        # Bump analytics data versions whenever tracked models change
+        from .signals import connect_analytics_signals
+        connect_analytics_signals()
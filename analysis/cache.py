@@ -0,0 +1,174 @@
+# analysis/cache.py
+"""
+Versioned cache for dashboard/analysis JSON payloads.
+
+Every tracked model has a data-version counter in the cache. The counter is
+bumped from post_save/post_delete (see analysis/signals.py). A widget's cache
+key embeds the versions of the models it reads, so a cached payload is served
+until one of those models actually changes, or until the widget's TTL expires.
+
+Bulk operations (bulk_create/update/delete) do not send signals: call
+bump_data_version() for the affected model after running them.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import localdate
+
+VERSION_KEY_PREFIX = "analytics:version:"
+WIDGET_KEY_PREFIX = "analytics:widget:"
+
+# Models whose changes invalidate cached analytics (app_label.ModelName).
+TRACKED_MODELS = (
+    "members.ChurchMember",
+    "leaders.Leader",
+    "finance.Offerings",
+    "finance.DonationItemFund",
+    "finance.FacilityRenting",
+    "finance.Expenditure",
+    "properties.ChurchAsset",
+    # Structural tables used for labels and totals
+    "finance.SpecialContribution",
+    "settings.Year",
+    "settings.OutStation",
+    "settings.Cell",
+    "accounts.CustomUser",
+    "news.News",
+    "notifications.Notification",
+)
+
+# Widget name -> models it reads + TTL in seconds.
+# TTLs can be overridden per widget with settings.ANALYTICS_CACHE_TTLS.
+ANALYTICS_WIDGETS = {
+    # accounts.utils (dashboards)
+    "general_finance": {
+        "models": ("finance.Offerings", "finance.FacilityRenting", "finance.DonationItemFund", "settings.Year"),
+        "ttl": 10 * 60,
+    },
+    "general_sacraments": {
+        "models": ("members.ChurchMember",),
+        "ttl": 30 * 60,
+    },
+    "general_properties": {
+        "models": ("properties.ChurchAsset",),
+        "ttl": 60 * 60,
+    },
+    "leaders_distribution": {
+        "models": ("leaders.Leader", "members.ChurchMember", "settings.Cell", "settings.OutStation"),
+        "ttl": 30 * 60,
+    },
+    "members_distribution": {
+        "models": ("members.ChurchMember", "settings.Cell", "settings.OutStation"),
+        "ttl": 30 * 60,
+    },
+    "general_data": {
+        "models": (
+            "settings.Year", "settings.OutStation", "settings.Cell", "accounts.CustomUser",
+            "news.News", "notifications.Notification", "members.ChurchMember",
+            "leaders.Leader", "properties.ChurchAsset",
+        ),
+        "ttl": 15 * 60,
+    },
+    # analysis.utils (analysis pages)
+    "outstations": {
+        "models": ("members.ChurchMember", "settings.Cell", "settings.OutStation"),
+        "ttl": 30 * 60,
+    },
+    "cells": {
+        "models": ("members.ChurchMember", "settings.Cell", "settings.OutStation"),
+        "ttl": 30 * 60,
+    },
+    "active_inactive": {
+        "models": ("members.ChurchMember",),
+        "ttl": 30 * 60,
+    },
+    "leaders_active_inactive": {
+        "models": ("leaders.Leader", "members.ChurchMember"),
+        "ttl": 30 * 60,
+    },
+    "offerings": {
+        "models": ("finance.Offerings",),
+        "ttl": 5 * 60,
+    },
+    "facility_renting": {
+        "models": ("finance.FacilityRenting", "properties.ChurchAsset", "settings.Year"),
+        "ttl": 10 * 60,
+    },
+    # finance.utils (finance dashboards)
+    "offering_trends": {
+        "models": ("finance.Offerings", "settings.OutStation"),
+        "ttl": 30 * 60,
+    },
+    "special_contribution_funds": {
+        "models": ("finance.DonationItemFund", "finance.SpecialContribution", "settings.Year"),
+        "ttl": 10 * 60,
+    },
+}
+
+
+def _model_label(model):
+    """Accepts a model class/instance or an 'app_label.ModelName' string."""
+    if isinstance(model, str):
+        return model
+    return model._meta.label
+
+
+def _new_version():
+    # Time-based seed: a counter lost from the cache never reuses an old version.
+    return time.time_ns() // 1000
+
+
+def bump_data_version(model):
+    """
+    Marks the data of `model` as changed, invalidating every widget that reads it.
+    """
+    key = VERSION_KEY_PREFIX + _model_label(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def get_data_versions(models):
+    """
+    Returns the current version of each model label, seeding missing counters.
+    """
+    keys = [VERSION_KEY_PREFIX + _model_label(m) for m in models]
+    versions = cache.get_many(keys)
+
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        for key, value in missing.items():
+            cache.add(key, value, None)
+        versions.update(cache.get_many(list(missing)))
+
+    return [versions.get(key, 0) for key in keys]
+
+
+def get_widget_ttl(name):
+    overrides = getattr(settings, "ANALYTICS_CACHE_TTLS", {}) or {}
+    return overrides.get(name, ANALYTICS_WIDGETS[name]["ttl"])
+
+
+def get_widget_cache_key(name):
+    """
+    Cache key for a widget: its name, today's date (the payloads report on the
+    current year/month/week) and the versions of every model it reads.
+    """
+    versions = get_data_versions(ANALYTICS_WIDGETS[name]["models"])
+    version_part = ".".join(str(v) for v in versions)
+    return f"{WIDGET_KEY_PREFIX}{name}:{localdate().isoformat()}:{version_part}"
+
+
+def cached_analysis(name, compute, *args, **kwargs):
+    """
+    Returns the cached JSON payload for widget `name`, computing it with
+    compute(*args, **kwargs) only when the underlying data changed or the TTL expired.
+    """
+    key = get_widget_cache_key(name)
+    payload = cache.get(key)
+    if payload is None:
+        payload = compute(*args, **kwargs)
+        cache.set(key, payload, get_widget_ttl(name))
+    return payload
@@ -0,0 +1,191 @@
+# analysis/management/commands/benchmark_analytics.py
+"""
+Benchmarks every analytics function and the heavy report/dashboard views.
+
+For each target it records wall time (min / median / max over --repeat runs)
+and the number of SQL queries, and writes everything to a JSON file so two
+commits can be compared:
+
+    python manage.py benchmark_analytics --output before.json
+    git checkout other-branch
+    python manage.py benchmark_analytics --output after.json
+
+The analytics cache is cleared before every run unless --warm is given.
+"""
+import importlib
+import inspect
+import json
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from finance.models import Offerings, DonationItemFund, Expenditure
+from leaders.models import Leader
+from members.models import ChurchMember
+
+# Modules whose zero-argument get_* functions are benchmarked
+BENCHMARK_MODULES = ("analysis.utils", "accounts.utils", "finance.utils")
+
+# (url name, which user requests it)
+BENCHMARK_VIEWS = (
+    ("admin_dashboard", "admin"),
+    ("secretary_dashboard", "admin"),
+    ("accountant_dashboard", "admin"),
+    ("general_analysis", "admin"),
+    ("analysis_widgets_bundle", "admin"),  # queries run on the widget pool threads are not counted
+    ("finance_general_report", "admin"),
+    ("church_members_report", "admin"),
+    ("pastor_dashboard", "pastor"),
+    ("pastor_report", "pastor"),
+)
+
+
+def discover_functions(module_names=BENCHMARK_MODULES):
+    """Yields (label, function) for every get_* function callable without arguments."""
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ != module_name or not name.startswith("get_"):
+                continue
+            params = inspect.signature(func).parameters.values()
+            if any(p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+                continue
+            yield f"{module_name}.{name}", func
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark analytics functions and report views (wall time + SQL query count) into a JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="benchmark-results.json", help="JSON file to write.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per target.")
+        parser.add_argument("--warm", action="store_true", help="Keep the cache between runs (measures cache hits).")
+        parser.add_argument("--only", default="", help="Comma-separated substrings; benchmark matching targets only.")
+        parser.add_argument("--no-views", action="store_true", help="Skip the view benchmarks.")
+        parser.add_argument("--admin-user", help="Username for admin views (default: first superuser).")
+        parser.add_argument("--pastor-user", help="Username for pastor views (default: a Senior Pastor's account).")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        self.repeat = options["repeat"]
+        self.warm = options["warm"]
+        only = [s for s in options["only"].split(",") if s]
+
+        def wanted(label):
+            return not only or any(s in label for s in only)
+
+        results = []
+        for label, func in discover_functions():
+            if wanted(label):
+                results.append(self.measure(label, "function", func))
+
+        if not options["no_views"]:
+            users = {
+                "admin": self.get_admin_user(options["admin_user"]),
+                "pastor": self.get_pastor_user(options["pastor_user"]),
+            }
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for url_name, role in BENCHMARK_VIEWS:
+                    label = f"view:{url_name}"
+                    if not wanted(label):
+                        continue
+                    if users[role] is None:
+                        results.append({"target": label, "kind": "view", "status": f"skipped: no {role} user"})
+                        continue
+                    client = Client()
+                    client.force_login(users[role])
+                    url = reverse(url_name)
+                    results.append(self.measure(label, "view", lambda: self.get_view(client, url)))
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "git_commit": _git_commit(),
+            "database": connection.vendor,
+            "cache": "warm" if self.warm else "cold",
+            "repeat": self.repeat,
+            "dataset": {
+                "members": ChurchMember.objects.count(),
+                "leaders": Leader.objects.count(),
+                "offerings": Offerings.objects.count(),
+                "donation_item_funds": DonationItemFund.objects.count(),
+                "expenditures": Expenditure.objects.count(),
+            },
+            "results": results,
+        }
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+        for row in results:
+            if "median_ms" in row:
+                self.stdout.write(f"{row['target']:<70} {row['median_ms']:>9.1f} ms {row['queries']:>6} queries")
+            else:
+                self.stdout.write(f"{row['target']:<70} {row['status']}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+
+    # ------------------------------------------------------------------
+    def get_view(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response
+
+    def measure(self, label, kind, func):
+        timings = []
+        queries = None
+        for _ in range(self.repeat):
+            if not self.warm:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                try:
+                    func()
+                except Exception as exc:  # keep benchmarking the other targets
+                    return {"target": label, "kind": kind, "status": f"error: {exc!r}"}
+                timings.append((time.perf_counter() - started) * 1000)
+            if queries is None:
+                queries = len(captured)
+        return {
+            "target": label,
+            "kind": kind,
+            "status": "ok",
+            "min_ms": round(min(timings), 2),
+            "median_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "queries": queries,
+        }
+
+    def get_admin_user(self, username):
+        if username:
+            return CustomUser.objects.filter(username=username).first()
+        return CustomUser.objects.filter(is_superuser=True).order_by("pk").first()
+
+    def get_pastor_user(self, username):
+        if username:
+            return CustomUser.objects.filter(username=username).first()
+        return (
+            CustomUser.objects
+            .filter(church_member__leader__occupation="Senior Pastor")
+            .order_by("pk")
+            .first()
+        )
@@ -0,0 +1,413 @@
+# analysis/management/commands/generate_sample_data.py
+"""
+Generates a realistic synthetic parish so dashboards, analytics and reports can
+be measured at scale (see benchmark_analytics).
+
+    python manage.py generate_sample_data --members 5000 --years 5
+
+Everything is inserted with bulk_create (no per-row signals, no SMS), then the
+finance rollup and the pledge summaries are rebuilt, the journal is synced and
+the analytics cache versions are bumped.
+Never run this against a production database.
+"""
+import datetime
+import random
+import string
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from analysis.cache import TRACKED_MODELS, bump_data_version
+from finance.models import (
+    OfferingCategory, Offerings, SpecialContribution, DonationItemFund,
+    Pledge, Tithe, Category, Expenditure, FacilityRenting
+)
+from finance.journal import sync_journal
+from finance.pledges import rebuild_pledge_summaries
+from finance.rollup import rebuild_rollup
+from leaders.models import Leader
+from members.models import ChurchMember
+from news.models import News, Comment, Like
+from properties.models import ChurchAsset
+from settings.ids import assign_ids, reserve_ids
+from settings.models import Year, OutStation, Cell
+from sms.models import SentSMS
+
+MASS_NAMES = ["Ibada ya Kwanza", "Ibada ya Pili", "Ibada ya Tatu"]
+FIRST_NAMES = [
+    "John", "Mary", "Joseph", "Grace", "Peter", "Neema", "Paul", "Rehema",
+    "James", "Upendo", "Daniel", "Esther", "Emmanuel", "Agnes", "Samuel", "Faraja",
+]
+LAST_NAMES = [
+    "Mushi", "Massawe", "Kimaro", "Lyimo", "Swai", "Mollel", "Urio", "Shirima",
+    "Minja", "Temba", "Mbwambo", "Kweka", "Lema", "Mrema", "Ngowi", "Tarimo",
+]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+]
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic parish dataset (outstations, members, finance, SMS, news) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--outstations", type=int, default=6)
+        parser.add_argument("--cells-per-outstation", type=int, default=8)
+        parser.add_argument("--members", type=int, default=3000)
+        parser.add_argument("--leaders", type=int, default=120)
+        parser.add_argument("--years", type=int, default=5, help="Years of finance history, ending this year.")
+        parser.add_argument("--pledge-ratio", type=float, default=0.3, help="Share of members with a pledge each year.")
+        parser.add_argument("--tithe-ratio", type=float, default=0.4, help="Share of members paying tithes each year.")
+        parser.add_argument("--sms", type=int, default=5000, help="Number of SMS log rows.")
+        parser.add_argument("--news", type=int, default=40)
+        parser.add_argument("--likes-per-news", type=int, default=25)
+        parser.add_argument("--comments-per-news", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible dataset.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        # Unique tag so the command can be run several times on the same database
+        self.tag = "".join(self.rng.choices(string.ascii_uppercase, k=4))
+        today = timezone.localdate()
+
+        with transaction.atomic():
+            years = self.create_years(today, options["years"])
+            outstations, cells = self.create_structure(options["outstations"], options["cells_per_outstation"])
+            members = self.create_members(options["members"], cells)
+            leaders = self.create_leaders(options["leaders"], members, outstations)
+            self.create_users(leaders)
+            offerings = self.create_offerings(years, outstations, members, today)
+            donations = self.create_donations(years, today)
+            expenditures = self.create_expenditures(years, today)
+            rentings = self.create_rentings(years, today)
+            pledges = self.create_pledges(years, members, options["pledge_ratio"], today)
+            tithes = self.create_tithes(years, members, options["tithe_ratio"], today)
+            sms = self.create_sms(members, options["sms"], today)
+            news = self.create_news(options["news"], options["likes_per_news"], options["comments_per_news"], today)
+
+            rollup_rows = rebuild_rollup()
+            rebuild_pledge_summaries()
+            journal_entries, _ = sync_journal()
+
+        for label in TRACKED_MODELS:
+            bump_data_version(label)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sample data [{self.tag}]: {len(outstations)} outstations, {len(cells)} cells, "
+            f"{len(members)} members, {len(leaders)} leaders, {offerings} offerings, "
+            f"{donations} donation item funds, {expenditures} expenditures, {rentings} rentings, "
+            f"{pledges} pledges, {tithes} tithes, {sms} SMS, {news} news; {rollup_rows} finance rollup rows, {journal_entries} journal entries."
+        ))
+
+    # ------------------------------------------------------------------
+    # Structure & people
+    # ------------------------------------------------------------------
+    def create_years(self, today, count):
+        wanted = range(today.year - count + 1, today.year + 1)
+        existing = set(Year.objects.filter(year__in=wanted).values_list("year", flat=True))
+        Year.objects.bulk_create([Year(year=y) for y in wanted if y not in existing])
+        if not Year.objects.filter(is_current=True).exists():
+            Year.objects.filter(year=today.year).update(is_current=True)
+        return {y.year: y for y in Year.objects.filter(year__in=wanted)}
+
+    def create_structure(self, outstation_count, cells_per_outstation):
+        ids = reserve_ids("outstation", outstation_count)
+        outstations = OutStation.objects.bulk_create([
+            OutStation(name=f"{self.tag} Outstation {i + 1}", location=f"Area {i + 1}", outstation_id=ids[i])
+            for i in range(outstation_count)
+        ])
+        cell_count = outstation_count * cells_per_outstation
+        ids = reserve_ids("cell", cell_count)
+        cells = Cell.objects.bulk_create([
+            Cell(
+                name=f"{self.tag} Cell {i + 1}",
+                outstation=outstations[i % outstation_count],
+                location=f"Street {i + 1}",
+                cell_id=ids[i],
+            )
+            for i in range(cell_count)
+        ])
+        return outstations, cells
+
+    def create_members(self, count, cells):
+        rng = self.rng
+        taken_phones = set(ChurchMember.objects.values_list("phone_number", flat=True))
+        phones = set()
+        while len(phones) < count:
+            phone = f"255{rng.choice('67')}{rng.randint(10000000, 99999999)}"
+            if phone not in taken_phones:
+                phones.add(phone)
+
+        members = []
+        for phone in phones:
+            baptised = rng.random() < 0.7
+            married = rng.random() < 0.45
+            members.append(ChurchMember(
+                status=rng.choices(["Active", "Inactive", "Pending"], weights=[75, 15, 10])[0],
+                full_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                date_of_birth=datetime.date(rng.randint(1945, 2015), rng.randint(1, 12), rng.randint(1, 28)),
+                gender=rng.choice(["Male", "Female"]),
+                phone_number=phone,
+                address="P.O. Box 1, Moshi",
+                cell=rng.choice(cells) if rng.random() < 0.95 else None,
+                is_baptised=baptised,
+                date_of_baptism=datetime.date(rng.randint(1950, 2020), 1, 1) if baptised else None,
+                is_confirmed=baptised and rng.random() < 0.6,
+                date_confirmed=datetime.date(rng.randint(1960, 2022), 1, 1) if baptised and rng.random() < 0.6 else None,
+                marital_status="Married" if married else rng.choice(["Single", "Single", "Divorced", "Widowed"]),
+                date_of_marriage=datetime.date(rng.randint(1970, 2023), 1, 1) if married else None,
+                emergency_contact_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                emergency_contact_phone=f"2557{rng.randint(10000000, 99999999)}",
+            ))
+        assign_ids("member", members)
+        return ChurchMember.objects.bulk_create(members, batch_size=BATCH_SIZE)
+
+    def create_leaders(self, count, members, outstations):
+        rng = self.rng
+        occupations = [value for value, _ in Leader.OCCUPATION_CHOICES if value != "Senior Pastor"]
+        chosen = rng.sample(members, min(count, len(members)))
+        leaders = [
+            Leader(
+                church_member=member,
+                # The first leader of every run is a Senior Pastor (pastor views need one)
+                occupation="Senior Pastor" if i == 0 else rng.choice(occupations),
+                start_date=datetime.date(rng.randint(2005, 2024), rng.randint(1, 12), 1),
+                responsibilities="Serving the congregation.",
+                outstation=rng.choice(outstations),
+            )
+            for i, member in enumerate(chosen)
+        ]
+        assign_ids("leader", leaders)
+        ChurchMember.objects.filter(pk__in=[m.pk for m in chosen]).update(is_this_church_member_a_leader=True)
+        if chosen:
+            # pastor views refuse a Senior Pastor whose member record is not Active
+            chosen[0].status = "Active"
+            ChurchMember.objects.filter(pk=chosen[0].pk).update(status="Active")
+        return Leader.objects.bulk_create(leaders, batch_size=BATCH_SIZE)
+
+    def create_users(self, leaders):
+        """An admin and a Senior Pastor login for benchmark_analytics (unusable passwords)."""
+        admin = CustomUser(
+            username=f"sample_admin_{self.tag.lower()}",
+            user_type="ADMIN",
+            is_superuser=True,
+            phone_number=f"+2550{self.rng.randint(10000000, 99999999)}",  # members never use a 0 prefix
+        )
+        admin.set_unusable_password()
+        admin.save()
+        if leaders:
+            pastor = CustomUser(
+                username=f"sample_pastor_{self.tag.lower()}",
+                user_type="CHURCH_MEMBER",
+                church_member=leaders[0].church_member,
+                phone_number=f"+{leaders[0].church_member.phone_number}",
+            )
+            pastor.set_unusable_password()
+            pastor.save()
+
+    # ------------------------------------------------------------------
+    # Finance
+    # ------------------------------------------------------------------
+    def _sundays(self, years, today):
+        first = datetime.date(min(years), 1, 1)
+        day = first + datetime.timedelta(days=(6 - first.weekday()) % 7)
+        while day <= today:
+            yield day
+            day += datetime.timedelta(days=7)
+
+    def create_offerings(self, years, outstations, members, today):
+        rng = self.rng
+        categories = list(OfferingCategory.objects.all()) or OfferingCategory.objects.bulk_create([
+            OfferingCategory(name=name) for name in ["Sadaka ya Kawaida", "Shukrani", "Majengo", "Watoto"]
+        ])
+        collectors = rng.sample(members, min(20, len(members)))
+
+        rows = []
+        total = 0
+        for sunday in self._sundays(years, today):
+            for outstation in outstations:
+                for mass in MASS_NAMES:
+                    rows.append(Offerings(
+                        year=years[sunday.year],
+                        date_given=sunday,
+                        service_time="Morning" if mass != MASS_NAMES[-1] else "Evening",
+                        amount=Decimal(rng.randint(50, 900) * 1000),
+                        mass_name=mass,
+                        offering_category=rng.choice(categories),
+                        outstation=outstation,
+                        collected_by=rng.choice(collectors),
+                        recorded_by=rng.choice(collectors),
+                    ))
+            if len(rows) >= BATCH_SIZE:
+                Offerings.objects.bulk_create(rows)
+                total += len(rows)
+                rows = []
+        Offerings.objects.bulk_create(rows)
+        return total + len(rows)
+
+    def create_donations(self, years, today):
+        rng = self.rng
+        contributions = list(SpecialContribution.objects.all()) or SpecialContribution.objects.bulk_create([
+            SpecialContribution(name=name, contribution_type=kind)
+            for name, kind in [
+                ("Dayosisi", "DIOCESAN"), ("Jimbo", "JIMBO"),
+                ("Ushirika", "FELLOWSHIP"), ("Maendeleo ya Jimbo", "JIMBO"),
+            ]
+        ])
+        donations = []
+        for sunday in self._sundays(years, today):
+            if sunday.day > 7:
+                continue  # first Sunday of the month
+            for contribution in contributions:
+                donation = DonationItemFund(
+                    contribution_type=contribution,
+                    year=years[sunday.year],
+                    period=sunday.strftime("%B %Y"),
+                    mass_name=rng.choice(MASS_NAMES),
+                    amount=Decimal(rng.randint(20, 400) * 1000),
+                )
+                donation.sample_date = sunday
+                donations.append(donation)
+        DonationItemFund.objects.bulk_create(donations, batch_size=BATCH_SIZE)
+
+        # date_created is auto_now_add: spread it over the history afterwards
+        for donation in donations:
+            donation.date_created = timezone.make_aware(
+                datetime.datetime.combine(donation.sample_date, datetime.time(11))
+            )
+        DonationItemFund.objects.bulk_update(donations, ["date_created"], batch_size=BATCH_SIZE)
+        return len(donations)
+
+    def create_expenditures(self, years, today):
+        rng = self.rng
+        categories = list(Category.objects.all()) or Category.objects.bulk_create([
+            Category(name=name) for name in ["Mishahara", "Umeme na Maji", "Matengenezo", "Huduma za Jamii"]
+        ])
+        expenditures = []
+        for year in years:
+            for month in range(1, 13):
+                for category in categories:
+                    for _ in range(rng.randint(1, 4)):
+                        taken = datetime.date(year, month, rng.randint(1, 28))
+                        if taken > today:
+                            continue
+                        expenditures.append(Expenditure(
+                            year=years[year],
+                            month=MONTHS[month - 1],
+                            date_taken=timezone.make_aware(datetime.datetime.combine(taken, datetime.time(10))),
+                            expenditure_amount=Decimal(rng.randint(10, 800) * 1000),
+                            expenditure_purpose="Sample expenditure",
+                            category=category,
+                        ))
+        Expenditure.objects.bulk_create(expenditures, batch_size=BATCH_SIZE)
+        return len(expenditures)
+
+    def create_rentings(self, years, today):
+        rng = self.rng
+        assets = list(ChurchAsset.objects.all()[:5]) or ChurchAsset.objects.bulk_create([
+            ChurchAsset(name=name, asset_type="Building", status="Good", quantity=1, value=Decimal(50000000))
+            for name in ["Ukumbi Mkuu", "Uwanja", "Nyumba ya Wageni"]
+        ])
+        rentings = []
+        for i in range(len(years) * 40):
+            rented = datetime.date(rng.choice(list(years)), rng.randint(1, 12), rng.randint(1, 28))
+            if rented > today:
+                continue
+            rentings.append(FacilityRenting(
+                year=years[rented.year],
+                property_rented=rng.choice(assets),
+                rentor_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                amount=Decimal(rng.randint(50, 500) * 1000),
+                date_rented=rented,
+                end_date=rented + datetime.timedelta(days=1),
+                purpose="Sherehe",
+            ))
+        assign_ids("renting_receipt", rentings)
+        FacilityRenting.objects.bulk_create(rentings, batch_size=BATCH_SIZE)
+        return len(rentings)
+
+    def create_pledges(self, years, members, ratio, today):
+        rng = self.rng
+        pledges = []
+        for year in years:
+            for member in rng.sample(members, int(len(members) * ratio)):
+                given = min(datetime.date(year, rng.randint(1, 12), rng.randint(1, 28)), today)
+                pledges.append(Pledge(
+                    member=member,
+                    envelope_number=f"E{member.pk:06d}",
+                    pledge_amount=Decimal(rng.randint(10, 500) * 1000),
+                    pledge_for_construction=Decimal(rng.randint(0, 200) * 1000),
+                    year=years[year],
+                    month=MONTHS[given.month - 1],
+                    date_given=given,
+                ))
+        Pledge.objects.bulk_create(pledges, batch_size=BATCH_SIZE)
+        return len(pledges)
+
+    def create_tithes(self, years, members, ratio, today):
+        rng = self.rng
+        methods = [value for value, _ in Tithe.PAYMENT_METHOD_CHOICES]
+        tithes = []
+        for year in years:
+            for member in rng.sample(members, int(len(members) * ratio)):
+                for _ in range(rng.randint(1, 12)):
+                    tithes.append(Tithe(
+                        year=years[year],
+                        member=member,
+                        amount=Decimal(rng.randint(1, 100) * 1000),
+                        payment_method=rng.choice(methods),
+                        date_given=min(datetime.date(year, rng.randint(1, 12), rng.randint(1, 28)), today),
+                    ))
+        assign_ids("tithe_receipt", tithes)
+        Tithe.objects.bulk_create(tithes, batch_size=BATCH_SIZE)
+        return len(tithes)
+
+    # ------------------------------------------------------------------
+    # SMS & news
+    # ------------------------------------------------------------------
+    def create_sms(self, members, count, today):
+        rng = self.rng
+        now = timezone.now()
+        rows = [
+            SentSMS(
+                recipient=member,
+                phone_number=member.phone_number,
+                message="Bwana asifiwe! Karibu ibadani Jumapili hii.",
+                request_id=f"{self.tag}{i:08d}",
+                status=rng.choices(["DELIVERED", "PENDING", "FAILED"], weights=[85, 10, 5])[0],
+                sent_at=now - datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+            )
+            for i, member in enumerate(rng.choices(members, k=count))
+        ] if members else []
+        SentSMS.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
+
+    def create_news(self, count, likes_per_news, comments_per_news, today):
+        rng = self.rng
+        now = timezone.now()
+        news = News.objects.bulk_create([
+            News(
+                title=f"Habari {self.tag} #{i + 1}",
+                content="Taarifa kwa washarika wote.",
+                created_at=now - datetime.timedelta(days=rng.randint(0, 365)),
+            )
+            for i in range(count)
+        ])
+        likes, comments = [], []
+        for item in news:
+            likes.extend(
+                Like(news=item, session_id=f"{self.tag}-{item.pk}-{n}")
+                for n in range(rng.randint(0, likes_per_news))
+            )
+            comments.extend(
+                Comment(news=item, name=rng.choice(FIRST_NAMES), comment_text="Amina!")
+                for _ in range(rng.randint(0, comments_per_news))
+            )
+        Like.objects.bulk_create(likes, batch_size=BATCH_SIZE)
+        Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+        return len(news)
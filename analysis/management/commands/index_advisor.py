@@ -0,0 +1,149 @@
+# analysis/management/commands/index_advisor.py
+"""
+Replays the main read paths and asks the database how it runs each query.
+
+Every zero-argument get_* function in analysis.utils and the finance / member
+list and report views (requested as an admin through the test Client) are run
+once while their SQL is recorded. Each distinct statement is then passed to
+EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (PostgreSQL), and statements that still
+scan a whole table of at least --min-rows rows are reported:
+
+    python manage.py index_advisor
+    python manage.py index_advisor --min-rows 0 --fail   # CI: exit 1 on any full scan
+"""
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from analysis.management.commands.benchmark_analytics import discover_functions
+from analysis.middleware import fingerprint_sql
+
+ADVISOR_MODULES = ("analysis.utils",)
+
+# (url name, kwargs) requested as an admin
+ADVISOR_VIEWS = (
+    ("finance_home", {}),
+    ("offerings_list", {}),
+    ("finance_general_report", {}),
+    ("expenditure_list_all", {}),
+    ("all_donation_item_funds", {}),
+    ("facility_renting_list", {}),
+    ("pledge_list", {}),
+    ("church_member_list", {}),
+    ("inactive_church_member_list", {}),
+    ("church_members_report", {}),
+)
+
+# "SCAN finance_offerings" but not "SCAN finance_offerings USING INDEX ..."
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+_POSTGRES_SCAN_RE = re.compile(r"Seq Scan on (\w+)")
+# Django aliases repeated joins: ... JOIN "settings_year" T4 ON ...
+_ALIAS_RE = re.compile(r'"(\w+)" (T\d+)\b')
+
+
+class _StatementRecorder:
+    """connection.execute_wrapper() hook keeping the first (sql, params) per fingerprint."""
+
+    def __init__(self):
+        self.target = None
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            entry = self.statements.setdefault(fingerprint_sql(sql), {"sql": sql, "params": params, "targets": []})
+            if self.target not in entry["targets"]:
+                entry["targets"].append(self.target)
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Run the main analytics/finance/member queries through EXPLAIN and report full table scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-rows", type=int, default=1000,
+                            help="Ignore scans of tables with fewer rows than this (default 1000).")
+        parser.add_argument("--admin-user", help="Username for the views (default: first superuser/admin).")
+        parser.add_argument("--no-views", action="store_true", help="Only replay the analysis functions.")
+        parser.add_argument("--fail", action="store_true", help="Exit with an error if any full scan is reported.")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError(f"EXPLAIN parsing is not implemented for {connection.vendor}.")
+
+        recorder = _StatementRecorder()
+        with connection.execute_wrapper(recorder):
+            for label, func in discover_functions(ADVISOR_MODULES):
+                recorder.target = label
+                func()
+            if not options["no_views"]:
+                self.replay_views(recorder, options["admin_user"])
+
+        table_rows = {}
+        findings = []
+        for entry in recorder.statements.values():
+            for table in self.full_scans(entry["sql"], entry["params"]):
+                if table not in table_rows:
+                    table_rows[table] = self.count_rows(table)
+                if table_rows[table] is not None and table_rows[table] >= options["min_rows"]:
+                    findings.append((table, entry))
+
+        self.stdout.write(f"Explained {len(recorder.statements)} distinct queries.")
+        if not findings:
+            self.stdout.write(self.style.SUCCESS("No full table scans over the row threshold."))
+            return
+
+        for table, entry in sorted(findings, key=lambda finding: -table_rows[finding[0]]):
+            self.stdout.write(self.style.WARNING(f"\nFULL SCAN of {table} ({table_rows[table]} rows)"))
+            self.stdout.write(f"  from: {', '.join(str(target) for target in entry['targets'])}")
+            self.stdout.write(f"  sql:  {entry['sql'][:500]}")
+
+        message = f"{len(findings)} queries scan a whole table."
+        if options["fail"]:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(f"\n{message}"))
+
+    def replay_views(self, recorder, username):
+        users = CustomUser.objects.filter(Q(is_superuser=True) | Q(user_type="ADMIN")).order_by("-is_superuser", "pk")
+        if username:
+            users = CustomUser.objects.filter(username=username)
+        user = users.first()
+        if user is None:
+            self.stderr.write("No admin user found; skipping views.")
+            return
+
+        client = Client()
+        client.force_login(user)
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for url_name, kwargs in ADVISOR_VIEWS:
+                recorder.target = f"view:{url_name}"
+                response = client.get(reverse(url_name, kwargs=kwargs))
+                if response.status_code != 200:
+                    self.stderr.write(f"view:{url_name} returned {response.status_code}")
+
+    def full_scans(self, sql, params):
+        """Tables the plan reads in full."""
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                details = [row[-1] for row in cursor.fetchall()]
+                matches = [_SQLITE_SCAN_RE.match(detail) for detail in details]
+            else:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                matches = [_POSTGRES_SCAN_RE.search(row[0]) for row in cursor.fetchall()]
+        aliases = {alias: table for table, alias in _ALIAS_RE.findall(sql)}
+        return {aliases.get(match.group(1), match.group(1)) for match in matches if match}
+
+    def count_rows(self, table):
+        """Row count of `table`, or None for aliases/subqueries that are not real tables."""
+        if table not in connection.introspection.table_names():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
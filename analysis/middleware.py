@@ -0,0 +1,142 @@
+# analysis/middleware.py
+"""
+Per-request SQL budget instrumentation.
+
+QueryBudgetMiddleware counts the SQL queries and DB time of a random sample of
+requests (settings.QUERY_BUDGET["SAMPLE_RATE"]) and stores one RequestSample
+per sampled request. Requests over the query/DB-time budget also keep the
+fingerprints of the queries they ran more than once (N+1 patterns).
+
+Unsampled requests only pay for one random() call. Disabled entirely unless
+settings.QUERY_BUDGET["ENABLED"] is true. See the admin-only slow views page
+(analysis.views.slow_views_report).
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGET = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.05,      # share of requests measured (0..1)
+    "MAX_QUERIES": 50,        # a request over either limit is "over budget"
+    "MAX_DB_MS": 300,
+    "RETENTION_DAYS": 14,     # samples older than this are pruned
+    "IGNORE_PREFIXES": ("/static/", "/media/"),
+}
+
+# Literals -> '?', so the same query with different parameters shares a fingerprint
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def get_query_budget():
+    config = dict(DEFAULT_QUERY_BUDGET)
+    config.update(getattr(settings, "QUERY_BUDGET", {}) or {})
+    return config
+
+
+def fingerprint_sql(sql):
+    """Normalises a SQL statement for duplicate detection."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper() hook: counts, times and fingerprints queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[sql] += 1
+
+    def duplicates(self, limit=10):
+        # Fingerprint only now (and only for over-budget requests), not per query
+        grouped = Counter()
+        for sql, count in self.fingerprints.items():
+            grouped[fingerprint_sql(sql)] += count
+        return [
+            {"sql": sql[:1000], "count": count}
+            for sql, count in grouped.most_common(limit)
+            if count > 1
+        ]
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.config = get_query_budget()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed("QUERY_BUDGET is disabled.")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = self.config
+        if random.random() >= config["SAMPLE_RATE"] or request.path.startswith(tuple(config["IGNORE_PREFIXES"])):
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            self.record(request, response, recorder, duration_ms)
+        except Exception:
+            # Never break a response because of instrumentation
+            logger.exception("Could not record request sample for %s", request.path)
+        return response
+
+    def record(self, request, response, recorder, duration_ms):
+        from analysis.models import RequestSample
+
+        config = self.config
+        db_time_ms = recorder.db_time * 1000
+        over_budget = recorder.count > config["MAX_QUERIES"] or db_time_ms > config["MAX_DB_MS"]
+
+        match = getattr(request, "resolver_match", None)
+        view_name = (match.view_name or match._func_path) if match else "(unresolved)"
+
+        RequestSample.objects.create(
+            view_name=view_name[:255],
+            path=request.path[:500],
+            method=request.method[:10],
+            status_code=getattr(response, "status_code", 0),
+            duration_ms=round(duration_ms, 2),
+            query_count=recorder.count,
+            db_time_ms=round(db_time_ms, 2),
+            over_budget=over_budget,
+            duplicate_queries=recorder.duplicates() if over_budget else [],
+        )
+        if over_budget:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d queries (%.0f ms DB) in %.0f ms",
+                request.method, request.path, recorder.count, db_time_ms, duration_ms,
+            )
+
+        # Occasional pruning keeps the table bounded without a cron job
+        if random.random() < 0.01:
+            cutoff = now() - timedelta(days=config["RETENTION_DAYS"])
+            RequestSample.objects.filter(created_at__lt=cutoff).delete()
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(db_index=True, help_text='Resolved URL name or view path.', max_length=255)),
+                ('path', models.CharField(help_text='Request path (no query string).', max_length=500)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField(help_text='Total time spent in the view stack (ms).')),
+                ('query_count', models.PositiveIntegerField(help_text='Number of SQL queries executed.')),
+                ('db_time_ms', models.FloatField(help_text='Time spent executing SQL (ms).')),
+                ('over_budget', models.BooleanField(db_index=True, default=False)),
+                ('duplicate_queries', models.JSONField(blank=True, default=list, help_text="[{'sql': fingerprint, 'count': n}, ...] for queries run more than once (over-budget requests only).")),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Request Sample',
+                'verbose_name_plural': 'Request Samples',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
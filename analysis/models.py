@@ -1,3 +1,36 @@
 from django.db import models
+from django.utils.timezone import now
 
-# Create your models here.
+
+class RequestSample(models.Model):
+    """
+    One sampled request recorded by analysis.middleware.QueryBudgetMiddleware:
+    wall time, SQL query count and DB time. Requests over the configured
+    budget also keep their duplicated-query fingerprints.
+    """
+
+    view_name = models.CharField(max_length=255, db_index=True, help_text="Resolved URL name or view path.")
+    path = models.CharField(max_length=500, help_text="Request path (no query string).")
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+
+    duration_ms = models.FloatField(help_text="Total time spent in the view stack (ms).")
+    query_count = models.PositiveIntegerField(help_text="Number of SQL queries executed.")
+    db_time_ms = models.FloatField(help_text="Time spent executing SQL (ms).")
+
+    over_budget = models.BooleanField(default=False, db_index=True)
+    duplicate_queries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="[{'sql': fingerprint, 'count': n}, ...] for queries run more than once (over-budget requests only).",
+    )
+
+    created_at = models.DateTimeField(default=now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Request Sample"
+        verbose_name_plural = "Request Samples"
+
+    def __str__(self):
+        return f"{self.view_name} - {self.duration_ms:.0f} ms / {self.query_count} queries"
@@ -0,0 +1,17 @@
+# analysis/signals.py
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .cache import TRACKED_MODELS, bump_data_version
+
+
+def bump_version_on_change(sender, **kwargs):
+    """Any save/delete on a tracked model invalidates the analytics that read it."""
+    bump_data_version(sender)
+
+
+def connect_analytics_signals():
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(bump_version_on_change, sender=model, dispatch_uid=f"analytics-save-{label}")
+        post_delete.connect(bump_version_on_change, sender=model, dispatch_uid=f"analytics-delete-{label}")
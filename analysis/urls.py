@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import general_analysis_view, secretary_general_analysis_view, accountant_general_analysis_view  # Import the new view
+from .views import (
+    general_analysis_view, secretary_general_analysis_view, accountant_general_analysis_view,
+    analysis_widget_view, analysis_widgets_bundle_view, slow_views_report,
+)
 
 urlpatterns = [
     path('general-analysis/', general_analysis_view, name='general_analysis'),
     path('secretary-general-analysis/', secretary_general_analysis_view, name='secretary_general_analysis'),
     path('accountant-general-analysis/', accountant_general_analysis_view, name='accountant_general_analysis'),
+
+    # 📊 Per-chart JSON endpoints (fetched in parallel by the analysis pages)
+    path('widgets/', analysis_widgets_bundle_view, name='analysis_widgets_bundle'),
+    path('widgets/<str:name>/', analysis_widget_view, name='analysis_widget'),
+
+    # 🐢 Slow views / SQL budget report (admin only, fed by QueryBudgetMiddleware)
+    path('slow-views/', slow_views_report, name='slow_views_report'),
 ]
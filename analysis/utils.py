@@ -2,6 +2,7 @@ import json
 from django.db.models import Count
 from settings.models import OutStation, Cell
 from members.models import ChurchMember
+from members.utils import get_membership_stats, empty_membership_stats
 
 def get_outstations_analysis():
     """
@@ -84,7 +85,7 @@ def get_cells_analysis():
         married males/unmarried males, married females/unmarried females, etc.
       - Returns JSON for Chart.js plus a text summary of all categories.
     """
-    cells = Cell.objects.order_by("name")
+    cells = list(Cell.objects.order_by("name"))
 
     labels = []
     data = []  # total members per cell for the bar chart
@@ -97,30 +98,33 @@ def get_cells_analysis():
     largest_cell_count = 0
     smallest_cell_count = 0
 
-    if cells.exists():
+    if cells:
         smallest_cell_count = None  # so we can set it initially
 
+    # One grouped query for every cell instead of 7 counts per cell
+    cell_stats = get_membership_stats("cell")
+
     for cell in cells:
-        members_qs = cell.members.all()
+        stats = cell_stats.get(cell.pk) or empty_membership_stats(cell.name)
 
         # Basic totals
-        total_count = members_qs.count()
+        total_count = stats["total"]
 
         # Baptism
-        baptized_count = members_qs.filter(is_baptised=True).count()
+        baptized_count = stats["baptised"]
         unbaptized_count = total_count - baptized_count
 
         # Confirmation (using date_confirmed as proxy for confirmed status)
-        confirmed_count = members_qs.filter(date_confirmed__isnull=False).count()
+        confirmed_count = stats["confirmed"]
         unconfirmed_count = total_count - confirmed_count
 
         # Married Males / Unmarried Males
-        married_males = members_qs.filter(marital_status='Married', gender="Male").count()
-        unmarried_males = members_qs.exclude(marital_status='Married').filter(gender="Male").count()
+        married_males = stats["married_male"]
+        unmarried_males = stats["male"] - married_males
 
         # Married Females / Unmarried Females
-        married_females = members_qs.filter(marital_status='Married', gender="Female").count()
-        unmarried_females = members_qs.exclude(marital_status='Married').filter(gender="Female").count()
+        married_females = stats["married_female"]
+        unmarried_females = stats["female"] - married_females
 
         # Append to the bar chart data
         labels.append(cell.name)
@@ -150,7 +154,7 @@ def get_cells_analysis():
         })
 
     # Summaries
-    total_cells = cells.count()
+    total_cells = len(cells)
     grand_total_members = sum(data)
 
     # Build a descriptive text
@@ -253,10 +257,9 @@ def get_leaders_active_inactive_analysis():
 
 import json
 from datetime import date, timedelta
-from django.db.models import Sum
+from django.db.models import Max, Q, Sum
 from django.utils.timezone import now
-from django.db.models.functions import ExtractWeek, ExtractMonth, ExtractYear
-from finance.models import Offerings
+from finance.models import FinanceDailyRollup, Offerings
 
 def get_offerings_analysis():
     """
@@ -267,23 +270,47 @@ def get_offerings_analysis():
       - Overall total offerings (all years),
       - This year's total,
       - This month's total,
-      - This week's total,
+      - This week's total (ISO week),
       - Last day total,
       - The highest & lowest mass info,
       - Advice/explanations.
 
+    Everything is summed in SQL over the daily finance rollup: one series of the
+    current year's totals per mass (Offerings.objects.series), one aggregate for
+    the all-time / year / month / ISO-week totals and the last recorded day, and
+    one sum for that day. No per-day rows are loaded.
+
     Returns JSON for Chart.js (line chart) and the single descriptive text.
     """
 
-    current_year = now().year
-
-    # 1) Group offerings by mass_name for the current year
-    current_year_offerings = (
-        Offerings.objects.filter(date_given__year=current_year)
-        .values("mass_name")
-        .annotate(total=Sum("amount"))
-        .order_by("mass_name")
+    today = now().date()
+    current_year = today.year
+    year_start = date(current_year, 1, 1)
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    week_start = date.fromisocalendar(*today.isocalendar()[:2], 1)  # Monday of this ISO week
+
+    # 1) The current year's total per mass (one row per mass)
+    per_mass_current_year = {
+        row["group"]: row["total"]
+        for row in Offerings.objects.series(
+            "year", start=year_start, end=date(current_year, 12, 31), group_by="mass_name"
+        )
+    }
+
+    # 2) Headline totals in one aggregate
+    offerings_rollup = FinanceDailyRollup.objects.filter(kind=FinanceDailyRollup.OFFERING)
+    totals = offerings_rollup.aggregate(
+        overall=Sum("total"),
+        year=Sum("total", filter=Q(date__gte=year_start, date__lte=date(current_year, 12, 31))),
+        month=Sum("total", filter=Q(date__gte=month_start, date__lt=next_month_start)),
+        week=Sum("total", filter=Q(date__gte=week_start, date__lte=week_start + timedelta(days=6))),
+        last_day=Max("date"),
     )
+    overall_total = totals["overall"] or 0
+    total_current_year = totals["year"] or 0
+    total_current_month = totals["month"] or 0
+    total_current_week = totals["week"] or 0
 
     labels = []
     data = []
@@ -292,12 +319,11 @@ def get_offerings_analysis():
     highest_amount = 0
     lowest_mass_name = ""
     lowest_amount = 0
-    if current_year_offerings.exists():
+    if per_mass_current_year:
         lowest_amount = None
 
-    for entry in current_year_offerings:
-        mass = entry["mass_name"]
-        amt = entry["total"] or 0
+    for mass in sorted(per_mass_current_year):
+        amt = per_mass_current_year[mass] or 0
         labels.append(mass)
         data.append(float(amt))
 
@@ -309,57 +335,20 @@ def get_offerings_analysis():
             lowest_amount = amt
             lowest_mass_name = mass
 
-    # 2) Summaries
-    # A) Overall total (all years)
-    overall_total = Offerings.objects.aggregate(sum=Sum("amount"))["sum"] or 0
-
-    # B) total offerings in the current year
-    total_current_year = (
-        Offerings.objects.filter(date_given__year=current_year)
-        .aggregate(sum=Sum("amount"))["sum"]
-        or 0
-    )
-
-    # C) total offerings in the current month
-    this_month = now().month
-    total_current_month = (
-        Offerings.objects.filter(date_given__year=current_year, date_given__month=this_month)
-        .aggregate(sum=Sum("amount"))["sum"]
-        or 0
-    )
-
-    # D) total offerings in the current week
-    this_week_num = now().isocalendar()[1]  # 1–52
-    total_current_week = (
-        Offerings.objects.annotate(
-            week=ExtractWeek("date_given"),
-            annotated_year=ExtractYear("date_given"),
-        )
-        .filter(week=this_week_num, annotated_year=current_year)
-        .aggregate(sum=Sum("amount"))["sum"]
-        or 0
-    )
-
-    # E) total offerings of the last day (the most recent date in the DB)
-    last_day_qs = Offerings.objects.order_by("-date_given").values("date_given").first()
-    if last_day_qs:
-        last_day_date = last_day_qs["date_given"]
-        total_last_day = (
-            Offerings.objects.filter(date_given=last_day_date)
-            .aggregate(sum=Sum("amount"))["sum"]
-            or 0
-        )
+    # 3) Last day total (the most recent date in the DB)
+    last_day_date = totals["last_day"]
+    if last_day_date:
+        total_last_day = offerings_rollup.filter(date=last_day_date).aggregate(total=Sum("total"))["total"] or 0
     else:
-        last_day_date = None
         total_last_day = 0
 
-    # 3) Advice / Explanation
+    # 4) Advice / Explanation
     advice_text = (
         "Offerings remain a vital source of church funding. "
         "Monitoring these patterns can help in financial planning."
     )
 
-    # 4) Chart analysis text
+    # 5) Chart analysis text
     if not labels:
         line_analysis = "No offering data available for the current year."
         highest_info = "N/A"
@@ -373,7 +362,7 @@ def get_offerings_analysis():
         highest_info = f"{highest_mass_name} ({highest_amount} TZS)"
         lowest_info = f"{lowest_mass_name} ({lowest_amount} TZS)"
 
-    # 5) Create a SINGLE descriptive text combining all summary info
+    # 6) Create a SINGLE descriptive text combining all summary info
     last_day_str = str(last_day_date) if last_day_date else "N/A"
     long_description = (
         f"Overall, the total offerings across all recorded years amount to {overall_total} TZS. "
@@ -386,7 +375,7 @@ def get_offerings_analysis():
         f"with {lowest_amount} TZS. {advice_text}"
     )
 
-    # 6) Return everything as JSON for Chart.js and partial
+    # 7) Return everything as JSON for Chart.js and partial
     return json.dumps({
         # Data for the line chart
         "labels": labels,
@@ -400,7 +389,7 @@ def get_offerings_analysis():
 import json
 from django.db.models import Sum
 from django.utils.timezone import now
-from finance.models import FacilityRenting
+from finance.models import FinanceDailyRollup
 
 def get_facility_renting_analysis():
     """
@@ -416,11 +405,12 @@ def get_facility_renting_analysis():
 
     # 2) Filter facility renting by property where the facility's 'year__year' matches current_year
     #    i.e. the 'year' field is the current "Year" object whose year == current_year
+    renting_rollup = FinanceDailyRollup.objects.filter(kind=FinanceDailyRollup.RENTING)
     current_year_renting_qs = (
-        FacilityRenting.objects
+        renting_rollup
         .filter(year__year=current_year)
         .values("property_rented__name")
-        .annotate(total=Sum("amount"))
+        .annotate(total=Sum("total"))
         .order_by("-total")  # Sort by highest amount first
     )
 
@@ -454,7 +444,7 @@ def get_facility_renting_analysis():
         renting_details.append(f"{prop_name}: {total_amt:,.2f} TZS")
 
     # 3) Compute overall total renting across ALL years
-    overall_total = FacilityRenting.objects.aggregate(s=Sum("amount"))["s"] or 0
+    overall_total = renting_rollup.aggregate(s=Sum("total"))["s"] or 0
 
     # 4) Build a **detailed description**
     if not labels:
@@ -482,7 +472,7 @@ def get_facility_renting_analysis():
 import json
 from django.db.models import Sum
 from django.utils.timezone import now
-from finance.models import DonationItemFund
+from finance.models import FinanceDailyRollup
 
 def get_special_contribution_funds_analysis():
     """
@@ -498,11 +488,11 @@ def get_special_contribution_funds_analysis():
 
     # 1) Filter DonationItemFund by 'year__year == current_year'
     qs = (
-        DonationItemFund.objects
-        .filter(year__year=current_year)
-        .values("contribution_type__name")
-        .annotate(total=Sum("amount"))
-        .order_by("contribution_type__name")
+        FinanceDailyRollup.objects
+        .filter(kind=FinanceDailyRollup.DONATION, year__year=current_year)
+        .values("contribution__name")
+        .annotate(total=Sum("total"))
+        .order_by("contribution__name")
     )
 
     labels = []
@@ -512,7 +502,7 @@ def get_special_contribution_funds_analysis():
 
     # 2) Build lists for Radar chart + track sums
     for entry in qs:
-        contrib_name = entry["contribution_type__name"]
+        contrib_name = entry["contribution__name"]
         amt = entry["total"] or 0
 
         labels.append(contrib_name)
@@ -1,17 +1,7 @@
 # analysis/views.py or wherever your main analysis view resides
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
-
-# Import your existing analysis functions with corrected names, removing get_movements_analysis
-from analysis.utils import (
-    get_outstations_analysis,  # Updated from get_zones_analysis
-    get_cells_analysis,       # Updated from get_communities_analysis
-    get_active_inactive_analysis,
-    get_leaders_active_inactive_analysis,
-    get_offerings_analysis,
-    get_facility_renting_analysis,
-    get_special_contribution_funds_analysis
-)
+from django.urls import reverse
 
 def is_admin_or_superuser(user):
     """
@@ -19,12 +9,30 @@ def is_admin_or_superuser(user):
     """
     return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
 
+# Template variable prefix (partials use <prefix>_data / <prefix>_url) -> widget name
+ANALYSIS_TEMPLATE_WIDGETS = {
+    'zones': 'outstations',
+    'communities': 'cells',
+    'active_inactive': 'active_inactive',
+    'leaders_active_inactive': 'leaders_active_inactive',
+    'offerings': 'offerings',
+    'facility': 'facility_renting',
+    'donation_fund': 'special_contribution_funds',
+}
+
+def get_widget_urls_context():
+    """Context with one '<prefix>_url' per chart partial."""
+    return {
+        f'{prefix}_url': reverse('analysis_widget', args=[name])
+        for prefix, name in ANALYSIS_TEMPLATE_WIDGETS.items()
+    }
+
 @login_required(login_url='login')
 @user_passes_test(is_admin_or_superuser, login_url='login')
 def general_analysis_view(request):
     """
-    This view collects all analysis data and renders them on 'analysis/general_analysis.html'.
-    The data includes:
+    This view renders the analysis page shell on 'analysis/general_analysis.html'.
+    Each chart loads its data from its own JSON endpoint:
       1. Zones Analysis (Line Chart)
       2. Communities Analysis (Bar Chart)
       3. Movements Analysis (Combined)
@@ -36,62 +44,23 @@ def general_analysis_view(request):
       9. Special Contribution Funds Analysis (Radar chart for current year)
     """
 
-    # 1. Zones Analysis (Line)
-    zones_data_json = get_outstations_analysis()
-
-    # 2. Communities Analysis (Bar)
-    communities_data_json = get_cells_analysis()
-
-    # 4. Active vs Inactive Members (Pie)
-    active_inactive_data_json = get_active_inactive_analysis()
-
-    # 5. Leaders Active vs Inactive (Doughnut)
-    leaders_active_inactive_data_json = get_leaders_active_inactive_analysis()
-
-    # 6. Offerings (Line chart + Summaries for current year)
-    offerings_data_json = get_offerings_analysis()
-
-
-    # 8. Facility Renting Analysis (Bar chart for current year)
-    facility_data_json = get_facility_renting_analysis()
-
-    # 9. Special Contribution Funds Analysis (Radar chart for current year)
-    donation_fund_data_json = get_special_contribution_funds_analysis()
-
+    # Each chart fetches its own JSON from analysis_widget_view, so the page
+    # shell renders immediately instead of waiting for the slowest chart.
     return render(
         request,
         'analysis/general_analysis.html',
-        {
-            'zones_data': zones_data_json,
-            'communities_data': communities_data_json,
-            'active_inactive_data': active_inactive_data_json,
-            'leaders_active_inactive_data': leaders_active_inactive_data_json,
-            'offerings_data': offerings_data_json,
-            'facility_data': facility_data_json,
-            'donation_fund_data': donation_fund_data_json,  # <-- pass radar chart data to template
-        }
+        get_widget_urls_context()
     )
 
 # analysis/views.py or wherever your main analysis view resides
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
 
-# Import your existing analysis functions with corrected names, removing get_movements_analysis
-from analysis.utils import (
-    get_outstations_analysis,  # Updated from get_zones_analysis
-    get_cells_analysis,       # Updated from get_communities_analysis
-    get_active_inactive_analysis,
-    get_leaders_active_inactive_analysis,
-    get_offerings_analysis,
-    get_facility_renting_analysis,
-    get_special_contribution_funds_analysis
-)
-
 @login_required(login_url='login')
 def secretary_general_analysis_view(request):
     """
-    This view collects all analysis data and renders them on 'analysis/general_analysis.html'.
-    The data includes:
+    This view renders the analysis page shell on 'analysis/general_analysis.html'.
+    Each chart loads its data from its own JSON endpoint:
       1. Zones Analysis (Line Chart)
       2. Communities Analysis (Bar Chart)
       3. Movements Analysis (Combined)
@@ -103,61 +72,23 @@ def secretary_general_analysis_view(request):
       9. Special Contribution Funds Analysis (Radar chart for current year)
     """
 
-    # 1. Zones Analysis (Line)
-    zones_data_json = get_outstations_analysis()
-
-    # 2. Communities Analysis (Bar)
-    communities_data_json = get_cells_analysis()
-
-    # 4. Active vs Inactive Members (Pie)
-    active_inactive_data_json = get_active_inactive_analysis()
-
-    # 5. Leaders Active vs Inactive (Doughnut)
-    leaders_active_inactive_data_json = get_leaders_active_inactive_analysis()
-
-    # 6. Offerings (Line chart + Summaries for current year)
-    offerings_data_json = get_offerings_analysis()
-
-    # 8. Facility Renting Analysis (Bar chart for current year)
-    facility_data_json = get_facility_renting_analysis()
-
-    # 9. Special Contribution Funds Analysis (Radar chart for current year)
-    donation_fund_data_json = get_special_contribution_funds_analysis()
-
+    # Each chart fetches its own JSON from analysis_widget_view, so the page
+    # shell renders immediately instead of waiting for the slowest chart.
     return render(
         request,
         'analysis/secretary_general_analysis.html',
-        {
-            'zones_data': zones_data_json,
-            'communities_data': communities_data_json,
-            'active_inactive_data': active_inactive_data_json,
-            'leaders_active_inactive_data': leaders_active_inactive_data_json,
-            'offerings_data': offerings_data_json,
-            'facility_data': facility_data_json,
-            'donation_fund_data': donation_fund_data_json,  # <-- pass radar chart data to template
-        }
+        get_widget_urls_context()
     )
 
 # analysis/views.py or wherever your main analysis view resides
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
 
-# Import your existing analysis functions with corrected names, removing get_movements_analysis
-from analysis.utils import (
-    get_outstations_analysis,  # Updated from get_zones_analysis
-    get_cells_analysis,       # Updated from get_communities_analysis
-    get_active_inactive_analysis,
-    get_leaders_active_inactive_analysis,
-    get_offerings_analysis,
-    get_facility_renting_analysis,
-    get_special_contribution_funds_analysis
-)
-
 @login_required(login_url='login')
 def accountant_general_analysis_view(request):
     """
-    This view collects all analysis data and renders them on 'analysis/general_analysis.html'.
-    The data includes:
+    This view renders the analysis page shell on 'analysis/general_analysis.html'.
+    Each chart loads its data from its own JSON endpoint:
       1. Zones Analysis (Line Chart)
       2. Communities Analysis (Bar Chart)
       3. Movements Analysis (Combined)
@@ -169,37 +100,112 @@ def accountant_general_analysis_view(request):
       9. Special Contribution Funds Analysis (Radar chart for current year)
     """
 
-    # 1. Zones Analysis (Line)
-    zones_data_json = get_outstations_analysis()
+    # Each chart fetches its own JSON from analysis_widget_view, so the page
+    # shell renders immediately instead of waiting for the slowest chart.
+    return render(
+        request,
+        'analysis/accountant_general_analysis.html',
+        get_widget_urls_context()
+    )
 
-    # 2. Communities Analysis (Bar)
-    communities_data_json = get_cells_analysis()
+# analysis/views.py
+from django.http import JsonResponse, HttpResponse, Http404
+from django.contrib.auth.decorators import login_required
 
-    # 4. Active vs Inactive Members (Pie)
-    active_inactive_data_json = get_active_inactive_analysis()
+from analysis.widgets import ANALYSIS_PAGE_WIDGETS, get_widget_payload, compute_widget_bundle
 
-    # 5. Leaders Active vs Inactive (Doughnut)
-    leaders_active_inactive_data_json = get_leaders_active_inactive_analysis()
+@login_required(login_url='login')
+def analysis_widget_view(request, name):
+    """
+    Returns the JSON payload of a single analysis chart (cached, see analysis/cache.py).
+    The analysis pages fetch every chart from here in parallel.
+    """
+    if name not in ANALYSIS_PAGE_WIDGETS:
+        raise Http404("Unknown analysis widget.")
+    return HttpResponse(get_widget_payload(name), content_type='application/json')
 
-    # 6. Offerings (Line chart + Summaries for current year)
-    offerings_data_json = get_offerings_analysis()
+@login_required(login_url='login')
+def analysis_widgets_bundle_view(request):
+    """
+    Returns several charts in one response: ?names=offerings,cells (default: all).
+    The charts are computed in parallel on a bounded thread pool.
+    """
+    names = [n for n in request.GET.get('names', '').split(',') if n] or list(ANALYSIS_PAGE_WIDGETS)
+    unknown = [n for n in names if n not in ANALYSIS_PAGE_WIDGETS]
+    if unknown:
+        return JsonResponse({'error': f"Unknown analysis widget(s): {', '.join(unknown)}"}, status=400)
+    return JsonResponse(compute_widget_bundle(names))
+
+# analysis/views.py
+import math
+from datetime import timedelta
+from django.utils.timezone import now
+from django.contrib.auth.decorators import login_required, user_passes_test
 
-    # 8. Facility Renting Analysis (Bar chart for current year)
-    facility_data_json = get_facility_renting_analysis()
+from analysis.middleware import get_query_budget
+from analysis.models import RequestSample
 
-    # 9. Special Contribution Funds Analysis (Radar chart for current year)
-    donation_fund_data_json = get_special_contribution_funds_analysis()
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
 
-    return render(
-        request,
-        'analysis/accountant_general_analysis.html',
-        {
-            'zones_data': zones_data_json,
-            'communities_data': communities_data_json,
-            'active_inactive_data': active_inactive_data_json,
-            'leaders_active_inactive_data': leaders_active_inactive_data_json,
-            'offerings_data': offerings_data_json,
-            'facility_data': facility_data_json,
-            'donation_fund_data': donation_fund_data_json,  # <-- pass radar chart data to template
-        }
-    )
\ No newline at end of file
+@login_required(login_url='login')
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def slow_views_report(request):
+    """
+    Admin-only report of the sampled requests recorded by QueryBudgetMiddleware:
+      - Worst views by p95 latency (or ?sort=queries for p95 query count)
+      - Recent over-budget requests with their duplicated-query fingerprints
+    ?days=N limits the window (default 7, at most 3650).
+    """
+    try:
+        days = min(3650, max(1, int(request.GET.get('days', 7))))
+    except ValueError:
+        days = 7
+    sort = request.GET.get('sort', 'latency')
+    since = now() - timedelta(days=days)
+
+    samples = (
+        RequestSample.objects
+        .filter(created_at__gte=since)
+        .order_by('-created_at')
+        .values_list('view_name', 'duration_ms', 'query_count', 'db_time_ms', 'over_budget')[:50000]
+    )
+
+    per_view = {}
+    for view_name, duration_ms, query_count, db_time_ms, over_budget in samples:
+        entry = per_view.setdefault(view_name, {'durations': [], 'queries': [], 'db_time': 0.0, 'over_budget': 0})
+        entry['durations'].append(duration_ms)
+        entry['queries'].append(query_count)
+        entry['db_time'] += db_time_ms
+        entry['over_budget'] += int(over_budget)
+
+    rows = []
+    for view_name, entry in per_view.items():
+        durations = sorted(entry['durations'])
+        queries = sorted(entry['queries'])
+        rows.append({
+            'view_name': view_name,
+            'samples': len(durations),
+            'p50_ms': _percentile(durations, 50),
+            'p95_ms': _percentile(durations, 95),
+            'p95_queries': _percentile(queries, 95),
+            'max_queries': queries[-1],
+            'avg_db_ms': entry['db_time'] / len(durations),
+            'over_budget': entry['over_budget'],
+        })
+    sort_key = 'p95_queries' if sort == 'queries' else 'p95_ms'
+    rows.sort(key=lambda row: (row[sort_key], row['samples']), reverse=True)
+
+    recent_over_budget = RequestSample.objects.filter(created_at__gte=since, over_budget=True)[:20]
+
+    return render(request, 'analysis/slow_views_report.html', {
+        'rows': rows[:100],
+        'recent_over_budget': recent_over_budget,
+        'days': days,
+        'sort': sort,
+        'budget': get_query_budget(),
+    })
@@ -0,0 +1,79 @@
+# analysis/widgets.py
+"""
+Registry of the analysis-page widgets and their (cached) JSON payloads.
+
+- get_widget_payload(name)      -> one widget's JSON string (served by analysis_widget_view).
+- compute_widget_bundle(names)  -> several widgets at once, computed in parallel on a
+                                   bounded, process-wide thread pool (ANALYTICS_BUNDLE_WORKERS).
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from analysis.cache import cached_analysis
+from analysis.utils import (
+    get_outstations_analysis,
+    get_cells_analysis,
+    get_active_inactive_analysis,
+    get_leaders_active_inactive_analysis,
+    get_offerings_analysis,
+    get_facility_renting_analysis,
+    get_special_contribution_funds_analysis
+)
+
+# Widget name (see analysis/cache.py ANALYTICS_WIDGETS) -> compute function
+ANALYSIS_PAGE_WIDGETS = {
+    "outstations": get_outstations_analysis,
+    "cells": get_cells_analysis,
+    "active_inactive": get_active_inactive_analysis,
+    "leaders_active_inactive": get_leaders_active_inactive_analysis,
+    "offerings": get_offerings_analysis,
+    "facility_renting": get_facility_renting_analysis,
+    "special_contribution_funds": get_special_contribution_funds_analysis,
+}
+
+DEFAULT_BUNDLE_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """One shared pool per process, so concurrent bundle requests cannot multiply threads."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = getattr(settings, "ANALYTICS_BUNDLE_WORKERS", DEFAULT_BUNDLE_WORKERS)
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="analysis-widget")
+    return _executor
+
+
+def get_widget_payload(name):
+    """Returns the JSON string of widget `name` (KeyError for unknown widgets)."""
+    return cached_analysis(name, ANALYSIS_PAGE_WIDGETS[name])
+
+
+def _compute_in_worker(name):
+    # Pool threads keep their own DB connection between tasks; drop it if stale/broken.
+    close_old_connections()
+    try:
+        return get_widget_payload(name)
+    finally:
+        close_old_connections()
+
+
+def compute_widget_bundle(names=None):
+    """
+    Computes several widgets in parallel.
+    Returns {name: decoded payload} in the order requested.
+    """
+    names = list(names or ANALYSIS_PAGE_WIDGETS)
+    unknown = [name for name in names if name not in ANALYSIS_PAGE_WIDGETS]
+    if unknown:
+        raise KeyError(", ".join(unknown))
+
+    futures = {name: _get_executor().submit(_compute_in_worker, name) for name in names}
+    return {name: json.loads(future.result()) for name, future in futures.items()}
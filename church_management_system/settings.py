@@ -80,8 +80,21 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "accounts.middleware.LastPathMiddleware",
+    # Per-request SQL budget sampling (no-op unless QUERY_BUDGET["ENABLED"])
+    "analysis.middleware.QueryBudgetMiddleware",
 ]
 
+# --------------------------
+# SQL BUDGET INSTRUMENTATION (analysis/middleware.py)
+# --------------------------
+QUERY_BUDGET = {
+    "ENABLED": os.environ.get("QUERY_BUDGET_ENABLED", "false").lower() == "true",
+    "SAMPLE_RATE": float(os.environ.get("QUERY_BUDGET_SAMPLE_RATE", "0.05")),
+    "MAX_QUERIES": int(os.environ.get("QUERY_BUDGET_MAX_QUERIES", "50")),
+    "MAX_DB_MS": int(os.environ.get("QUERY_BUDGET_MAX_DB_MS", "300")),
+    "RETENTION_DAYS": 14,
+}
+
 # --------------------------
 # URLS / WSGI
 # --------------------------
@@ -129,6 +142,27 @@ DATABASES = {
 #     }
 # }
 
+# --------------------------
+# CACHE (dashboard analytics)
+# --------------------------
+# File-based so every gunicorn worker sees the same data versions.
+# Swap for Redis/Memcached via env when deploying at scale.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", str(BASE_DIR / ".django_cache")),
+    }
+}
+
+# Optional per-widget TTL overrides (seconds) for analysis/cache.py, e.g. {"offerings": 60}
+ANALYTICS_CACHE_TTLS = {}
+
+# Max threads computing analysis widgets for bundle requests (analysis/widgets.py)
+ANALYTICS_BUNDLE_WORKERS = int(os.environ.get("ANALYTICS_BUNDLE_WORKERS", "4"))
+
+# Trained offerings forecast (manage.py train_offerings_forecast writes it, finance/forecast.py reads it)
+OFFERINGS_FORECAST_PATH = os.environ.get("OFFERINGS_FORECAST_PATH", str(BASE_DIR / "forecasts" / "offerings_forecast.joblib"))
+
 # --------------------------
 # PASSWORD VALIDATION
 # --------------------------
@@ -173,6 +207,9 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_AGE = 3600
 SESSION_SAVE_EVERY_REQUEST = True
 
+# Notification broadcasts post one "recipients" value per member
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
+
 # --------------------------
 # AUTH MODEL
 # --------------------------
@@ -187,6 +224,24 @@ NEXTSMS_PASSWORD = os.environ.get("NEXTSMS_PASSWORD", "")
 NEXTSMS_SENDER_ID = os.environ.get("NEXTSMS_SENDER_ID", "KIZITA SOFT")
 NEXTSMS_BASE_URL = os.environ.get("NEXTSMS_BASE_URL", "https://messaging-service.co.tz")
 NEXTSMS_VERIFY_SSL = os.environ.get("NEXTSMS_VERIFY_SSL", "true").lower() != "false"
+NEXTSMS_BATCH_LIMIT = int(os.environ.get("NEXTSMS_BATCH_LIMIT", "100"))  # destinations per request
+# Pooled keep-alive HTTP client (sms/client.py)
+NEXTSMS_POOL_SIZE = int(os.environ.get("NEXTSMS_POOL_SIZE", "20"))
+NEXTSMS_CONNECT_TIMEOUT = float(os.environ.get("NEXTSMS_CONNECT_TIMEOUT", "5"))
+NEXTSMS_READ_TIMEOUT = float(os.environ.get("NEXTSMS_READ_TIMEOUT", "30"))
+
+# SMS outbox worker (python manage.py send_sms_outbox)
+SMS_OUTBOX_CONCURRENCY = int(os.environ.get("SMS_OUTBOX_CONCURRENCY", "8"))
+SMS_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("SMS_OUTBOX_MAX_ATTEMPTS", "5"))
+
+# Cached balance (sms/balance.py): re-read from NextSMS in the background once older than this
+SMS_BALANCE_TTL = int(os.environ.get("SMS_BALANCE_TTL", "300"))
+
+# Delivery reports: NextSMS callback URL is /sms/delivery-report/?token=<NEXTSMS_WEBHOOK_TOKEN>
+NEXTSMS_WEBHOOK_TOKEN = os.environ.get("NEXTSMS_WEBHOOK_TOKEN", "")
+# Status reconciler (python manage.py reconcile_sms_status)
+SMS_STATUS_BATCH_SIZE = int(os.environ.get("SMS_STATUS_BATCH_SIZE", "200"))
+SMS_STATUS_MAX_AGE_DAYS = int(os.environ.get("SMS_STATUS_MAX_AGE_DAYS", "3"))
 
 # --- Beem (DEPRECATED here; kept for reference) ---
 # BEEM_SENDER_NAME = os.environ.get("BEEM_SENDER_NAME", "KIZITA SOFT")
@@ -253,6 +253,7 @@ def member_notifications_view(request):
 
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
+from finance.models import Tithe
 
 # ✅ Helper function to allow only church members
 def is_church_member(user):
@@ -608,7 +609,7 @@ def member_pledge_create_view(request):
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from finance.models import Pledge
+from finance.models import Pledge, PledgeSummary
 from settings.models import Year
 from accounts.models import CustomUser
 
@@ -643,9 +644,17 @@ def member_pledge_list_view(request):
     current_year_obj = Year.objects.filter(is_current=True).first()
     current_year_val = str(current_year_obj.year) if current_year_obj else ""
 
+    # Pledged / paid / outstanding per year (kept up to date by finance/pledges.py)
+    pledge_summaries = (
+        PledgeSummary.objects.filter(member=church_member, pledge_count__gt=0)
+        .select_related("year")
+        .order_by("-year__year")
+    )
+
     context = {
         "church_member": church_member,
         "pledges": pledges,
+        "pledge_summaries": pledge_summaries,
         "all_years": all_years,
         "months_list": months_list,
         "current_year_val": current_year_val,  # for pre-selecting the year filter
@@ -39,6 +39,8 @@ urlpatterns = [
         name="evangelist_offering_category_list",
     ),
 
+    path('evangelist/offerings/grid/', views.evangelist_offerings_grid, name='evangelist_offerings_grid'),
+
     path(
         "evangelist-report/create/",
         evangelist_report_create,
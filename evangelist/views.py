@@ -1547,3 +1547,44 @@ def evangelist_report_create(request):
         "evangelist/evangelist_report_form.html",
         {"report_form": report_form, "formset": formset},
     )
+
+
+# evangelist/views.py
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+
+from finance.grid import offerings_grid_context
+from settings.models import OutStation
+
+
+@login_required
+def evangelist_offerings_grid(request):
+    """
+    🗓️ Sunday grid for the Evangelist's own outstation: every service × category
+    of one date on one screen, validated together and saved in one transaction.
+    """
+    user = request.user
+
+    # 1) Must be CHURCH_MEMBER
+    if user.user_type != 'CHURCH_MEMBER':
+        raise PermissionDenied("Access denied: user type must be CHURCH_MEMBER.")
+
+    # 2) Must have an Active ChurchMember
+    church_member = getattr(user, 'church_member', None)
+    if not church_member or church_member.status != 'Active':
+        raise PermissionDenied("Access denied: ChurchMember must be active.")
+
+    # 3) Must be a Leader
+    leader = getattr(church_member, 'leader', None)
+    if not leader:
+        raise PermissionDenied("Access denied: ChurchMember is not a Leader.")
+
+    # 4) Must be an Evangelist with an outstation
+    if leader.occupation != 'Evangelist':
+        raise PermissionDenied("Access denied: Only Evangelists can access this page.")
+    if not leader.outstation_id:
+        raise PermissionDenied("Access denied: You are not assigned to an outstation.")
+
+    context = offerings_grid_context(request, OutStation.objects.filter(pk=leader.outstation_id))
+    return render(request, 'evangelist/offerings_grid.html', context)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'finance'
+
+    def ready(self):
+        # Keep FinanceDailyRollup in step with the income/expense tables
+        from .signals import connect_journal_signals, connect_pledge_summary_signals, connect_rollup_signals
+        connect_rollup_signals()
+        # ...and post every income/expense record to the double-entry journal
+        connect_journal_signals()
+        # ...and keep the per-member pledge fulfilment summary in step with pledges and tithes
+        connect_pledge_summary_signals()
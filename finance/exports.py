@@ -0,0 +1,116 @@
+# finance/exports.py
+"""
+Streaming CSV / XLSX downloads of the finance lists.
+
+    return export_response(request, "expenditures_2025", EXPENDITURE_COLUMNS, rows)
+
+`rows` is any iterable of tuples, normally `queryset.values_list(...).iterator(chunk_size=...)`,
+so only one chunk of rows is in memory at a time:
+
+- CSV (?format=csv, the default) is written line by line into a StreamingHttpResponse.
+- XLSX (?format=xlsx) uses openpyxl's write-only workbook, which spools rows to a
+  temporary file; that file is then streamed back in blocks.
+
+Text starting with =, +, -, @ (or a tab / carriage return) is written with a
+leading ' so spreadsheet programs never run notes or names typed by users as
+formulas.
+"""
+import csv
+import re
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+_XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# First characters that make Excel / LibreOffice read a cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer (see the Django docs)."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.localtime(value).replace(tzinfo=None)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return "" if value is None else value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield "\ufeff"  # BOM so Excel opens UTF-8 (Swahili names) correctly
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def _file_blocks(handle, block_size=64 * 1024):
+    try:
+        handle.seek(0)
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            yield block
+    finally:
+        handle.close()
+
+
+def _xlsx_file(header, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append([
+            float(value) if isinstance(value, Decimal) else _cell(value)
+            for value in row
+        ])
+    handle = tempfile.TemporaryFile()
+    workbook.save(handle)
+    return handle
+
+
+def export_response(request, filename, header, rows):
+    """
+    A download of `rows` under `header` in the format asked for by ?format=
+    (csv or xlsx). `filename` is given without extension.
+    """
+    export_format = request.GET.get("format", "csv").lower()
+
+    if export_format == "xlsx":
+        try:
+            handle = _xlsx_file(header, rows)
+        except ImportError:
+            return HttpResponse(
+                "XLSX export needs the openpyxl package; use ?format=csv instead.",
+                status=501,
+                content_type="text/plain",
+            )
+        response = StreamingHttpResponse(_file_blocks(handle), content_type=_XLSX_CONTENT_TYPE)
+        response["Content-Length"] = handle.seek(0, 2)
+        extension = "xlsx"
+    else:
+        response = StreamingHttpResponse(_csv_lines(header, rows), content_type="text/csv; charset=utf-8")
+        extension = "csv"
+
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+
+def export_filename(*parts):
+    """'expenditures', 2025, None, 'Sadaka ya Kawaida' -> 'expenditures_2025_Sadaka-ya-Kawaida' (ASCII only)."""
+    cleaned = (re.sub(r"[^A-Za-z0-9_-]+", "-", str(part)).strip("-") for part in parts if part not in (None, ""))
+    return "_".join(part for part in cleaned if part) or "export"
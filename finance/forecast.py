@@ -0,0 +1,232 @@
+# finance/forecast.py
+"""
+Offerings forecast per outstation and service (mass_name).
+
+Training is offline (`python manage.py train_offerings_forecast`):
+- train_offerings_forecast() builds one weekly series (weeks ending Sunday) per
+  (outstation, mass_name) from FinanceDailyRollup, fits a small scikit-learn
+  Ridge regression on lagged weeks + season, and save_forecast_artefact()
+  writes everything to settings.OFFERINGS_FORECAST_PATH with joblib.
+
+Serving never fits anything:
+- load_forecast_artefact() reads the file once per process (and again only
+  when the file on disk is replaced by a new training run).
+- forecast_offerings() rolls the fitted models forward to next Sunday and to
+  the Sundays of next month.
+"""
+import datetime
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.utils.timezone import localdate, now
+from sklearn.linear_model import Ridge
+
+ARTEFACT_VERSION = 1
+LAGS = 4                 # previous weeks used as features
+WINDOW = 12              # weeks in the rolling-mean feature
+MIN_TRAINING_WEEKS = 26  # shorter series fall back to the mean of their last LAGS weeks
+HOLDOUT_WEEKS = 8        # weeks held back to report the error of each model
+
+_artefact_lock = threading.Lock()
+_artefact_cache = {"path": None, "mtime": None, "artefact": None}
+
+
+def get_forecast_path():
+    return str(getattr(settings, "OFFERINGS_FORECAST_PATH", os.path.join(settings.BASE_DIR, "forecasts", "offerings_forecast.joblib")))
+
+
+def _features(history, week_end):
+    """Feature row for the week ending `week_end`, given the weeks before it."""
+    lags = history[-LAGS:][::-1]
+    angle = 2 * np.pi * week_end.isocalendar()[1] / 52.18
+    return [*lags, float(np.mean(history[-WINDOW:])), np.sin(angle), np.cos(angle)]
+
+
+def _training_matrix(values, week_ends):
+    rows, targets = [], []
+    for i in range(WINDOW, len(values)):
+        rows.append(_features(values[:i], week_ends[i]))
+        targets.append(values[i])
+    return np.array(rows), np.array(targets)
+
+
+def load_weekly_series(through):
+    """
+    Weekly offering totals per (outstation_id, mass_name), weeks ending Sunday,
+    up to the week ending `through` (ONE query). Returns (frame, outstation names).
+    """
+    from finance.models import FinanceDailyRollup
+
+    rows = (
+        FinanceDailyRollup.objects
+        .filter(kind=FinanceDailyRollup.OFFERING, date__lte=through)
+        .order_by()
+        .values_list("date", "outstation_id", "outstation__name", "mass_name", "total")
+    )
+    frame = pd.DataFrame.from_records(list(rows), columns=["date", "outstation_id", "outstation", "mass_name", "total"])
+    if frame.empty:
+        return pd.DataFrame(), {}
+
+    names = dict(zip(frame["outstation_id"], frame["outstation"]))
+    frame["date"] = pd.to_datetime(frame["date"])
+    frame["total"] = frame["total"].astype(float)
+    weekly = (
+        frame.groupby(["outstation_id", "mass_name", pd.Grouper(key="date", freq="W-SUN")])["total"]
+        .sum()
+        .unstack(["outstation_id", "mass_name"], fill_value=0.0)
+    )
+    weekly = weekly.reindex(pd.date_range(weekly.index.min(), pd.Timestamp(through), freq="W-SUN"), fill_value=0.0)
+    return weekly.fillna(0.0), names
+
+
+def train_offerings_forecast(through=None, alpha=1.0):
+    """
+    Fits one model per (outstation, mass_name). `through` is the last week-end
+    (Sunday) used; defaults to the last Sunday on or before today.
+    Returns the artefact dict (see save_forecast_artefact).
+    """
+    if through is None:
+        today = localdate()
+        through = today - datetime.timedelta(days=(today.weekday() + 1) % 7)
+
+    weekly, names = load_weekly_series(through)
+    series = {}
+    for outstation_id, mass_name in weekly.columns:
+        column = weekly[(outstation_id, mass_name)]
+        values = column.iloc[int(np.argmax(column.values > 0)):]  # from the series' first offering
+        week_ends = [week.date() for week in values.index]
+        values = [float(value) for value in values.values]
+
+        entry = {
+            "outstation_id": int(outstation_id),
+            "outstation": names.get(outstation_id),
+            "mass_name": mass_name,
+            "weeks": len(values),
+            "history": values[-WINDOW:],
+            "model": None,
+            "holdout_mae": None,
+            "naive_mae": None,
+        }
+        if len(values) >= MIN_TRAINING_WEEKS:
+            features, targets = _training_matrix(values, week_ends)
+
+            # Error on the last HOLDOUT_WEEKS weeks, from a model that did not see them
+            holdout = Ridge(alpha=alpha).fit(features[:-HOLDOUT_WEEKS], targets[:-HOLDOUT_WEEKS])
+            predicted = holdout.predict(features[-HOLDOUT_WEEKS:])
+            entry["holdout_mae"] = float(np.mean(np.abs(predicted - targets[-HOLDOUT_WEEKS:])))
+            # Baseline: "same as the average of the previous LAGS weeks"
+            naive = features[-HOLDOUT_WEEKS:, :LAGS].mean(axis=1)
+            entry["naive_mae"] = float(np.mean(np.abs(naive - targets[-HOLDOUT_WEEKS:])))
+
+            entry["model"] = Ridge(alpha=alpha).fit(features, targets)
+        series[(int(outstation_id), mass_name)] = entry
+
+    return {
+        "version": ARTEFACT_VERSION,
+        "trained_at": now().isoformat(),
+        "trained_through": through,
+        "series": series,
+    }
+
+
+def save_forecast_artefact(artefact, path=None):
+    """Writes the artefact atomically (serving processes never see a half-written file)."""
+    path = path or get_forecast_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    joblib.dump(artefact, temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_forecast_artefact():
+    """
+    The trained artefact, loaded once per process; reloaded only if the file
+    was replaced since. Returns None when nothing has been trained yet.
+    """
+    path = get_forecast_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+    with _artefact_lock:
+        if _artefact_cache["path"] != path or _artefact_cache["mtime"] != mtime:
+            artefact = joblib.load(path)
+            if artefact.get("version") != ARTEFACT_VERSION:
+                return None
+            _artefact_cache.update(path=path, mtime=mtime, artefact=artefact)
+        return _artefact_cache["artefact"]
+
+
+def _roll_forward(entry, week_ends):
+    """Predicted totals for consecutive `week_ends` following the training history."""
+    history = list(entry["history"])
+    predictions = []
+    for week_end in week_ends:
+        if entry["model"] is None or len(history) < LAGS:
+            value = float(np.mean(history[-LAGS:])) if history else 0.0
+        else:
+            # Ridge is linear: a dot product avoids sklearn's per-call input validation
+            model = entry["model"]
+            value = float(np.dot(model.coef_, _features(history, week_end)) + model.intercept_)
+        value = max(value, 0.0)
+        predictions.append(value)
+        history.append(value)
+    return predictions
+
+
+def forecast_offerings(today=None):
+    """
+    Expected offerings next Sunday (the first Sunday after `today`) and next
+    month (sum of its Sundays), per outstation and service and in total.
+    Returns None without a trained artefact, or when the artefact was trained
+    through next Sunday or later (nothing left to forecast from it).
+    """
+    artefact = load_forecast_artefact()
+    if artefact is None:
+        return None
+
+    today = today or localdate()
+    next_sunday = today + datetime.timedelta(days=(6 - today.weekday()) % 7 or 7)
+    month_start = (today.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+    month_end = (month_start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+
+    # Every Sunday from the end of the training data up to the end of next month
+    trained_through = artefact["trained_through"]
+    week_ends = []
+    week_end = trained_through + datetime.timedelta(days=7)
+    while week_end <= month_end:
+        week_ends.append(week_end)
+        week_end += datetime.timedelta(days=7)
+    if next_sunday not in week_ends:
+        return None
+    in_next_month = np.array([month_start <= day <= month_end for day in week_ends], dtype=bool)
+    next_sunday_index = week_ends.index(next_sunday)
+
+    rows = []
+    for entry in artefact["series"].values():
+        predictions = np.array(_roll_forward(entry, week_ends))
+        rows.append({
+            "outstation_id": entry["outstation_id"],
+            "outstation": entry["outstation"],
+            "mass_name": entry["mass_name"],
+            "next_sunday": round(float(predictions[next_sunday_index]), 2),
+            "next_month": round(float(predictions[in_next_month].sum()), 2),
+            "holdout_mae": entry["holdout_mae"],
+        })
+    rows.sort(key=lambda row: (row["outstation"] or "", row["mass_name"]))
+
+    return {
+        "trained_at": artefact["trained_at"],
+        "trained_through": trained_through.isoformat(),
+        "next_sunday": next_sunday.isoformat(),
+        "next_month": month_start.strftime("%Y-%m"),
+        "total_next_sunday": round(sum(row["next_sunday"] for row in rows), 2),
+        "total_next_month": round(sum(row["next_month"] for row in rows), 2),
+        "series": rows,
+    }
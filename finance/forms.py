@@ -531,3 +531,87 @@ class OfferingCategoryForm(forms.ModelForm):
             }),
         }
 
+
+
+from django import forms
+from .models import OfferingCategory
+
+class OfferingsImportForm(forms.Form):
+    """
+    Upload of a CSV/XLSX file of offerings (see finance/importer.py for the columns).
+    """
+    base_style = (
+        'padding: 14px; '
+        'border-radius: 15px; '
+        'border: 1px solid #ccc; '
+        'font-size: 16px; '
+        'width: 100%; '
+        'box-sizing: border-box; '
+        'outline: none;'
+    )
+
+    file = forms.FileField(
+        label="Offerings file (.csv or .xlsx)",
+        widget=forms.ClearableFileInput(attrs={'style': base_style, 'accept': '.csv,.xlsx'}),
+    )
+    default_category = forms.ModelChoiceField(
+        queryset=OfferingCategory.objects.all(),
+        required=False,
+        label="Category for rows without one",
+        empty_label="— Every row has a category column —",
+        widget=forms.Select(attrs={'style': base_style}),
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError("Upload a .csv or .xlsx file.")
+        return upload
+
+
+# finance/forms.py
+from django import forms
+from django.forms import modelformset_factory
+from .models import Tithe
+from members.models import ChurchMember
+
+
+class TitheForm(forms.ModelForm):
+    """
+    Form for recording one tithe.
+    """
+
+    member = forms.ModelChoiceField(
+        queryset=ChurchMember.objects.filter(status='Active').order_by('full_name'),
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        help_text="Select the church member giving the tithe."
+    )
+
+    class Meta:
+        model = Tithe
+        fields = ['member', 'amount', 'payment_method', 'date_given', 'purpose']
+        widgets = {
+            'amount': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': '💰 Enter Amount'}),
+            'payment_method': forms.Select(attrs={'class': 'form-control'}),
+            'date_given': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'purpose': forms.Textarea(attrs={'class': 'form-control', 'rows': 2, 'placeholder': '🗒️ Purpose (optional)'}),
+        }
+
+
+TitheFormSet = modelformset_factory(Tithe, form=TitheForm, extra=1)
+
+
+class TithesImportForm(forms.Form):
+    """
+    Upload of a CSV/XLSX file of tithes (see finance/tithes.py for the columns).
+    """
+    file = forms.FileField(
+        label="Tithes file (.csv or .xlsx)",
+        widget=forms.ClearableFileInput(attrs={'style': OfferingsImportForm.base_style, 'accept': '.csv,.xlsx'}),
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError("Upload a .csv or .xlsx file.")
+        return upload
@@ -0,0 +1,278 @@
+# finance/grid.py
+"""
+Sunday grid entry: all the offerings of one date on one screen.
+
+Rows are outstation × service time, columns are offering categories, and
+every cell holds the amount of one offering:
+
+    grid = OfferingsGrid(day, outstations)
+    if grid.bind(request.POST):       # validates every cell together
+        grid.save(recorded_by=member) # one transaction
+    grid.rows                         # for the template
+    grid.changed                      # cells written by save()
+
+Views use offerings_grid_context(request, outstations), which reads ?date=
+(default today; a POST without a valid date is refused), binds and saves a
+POST and returns the template context for
+finance/_offerings_grid.html. Posting the same grid twice writes nothing the
+second time, so the page is re-rendered after saving instead of redirecting,
+with the written cells highlighted.
+
+The grid re-opens pre-filled with the offerings already saved for that date.
+On save only the cells that differ from the database are written: new cells
+are bulk_created (see importer.save_offerings), edited cells are saved and
+cleared cells deleted one by one so the model signals keep the rollup and the
+journal in step. A cell holding several offerings (entered one by one on the
+normal form) is shown as a read-only total.
+"""
+from collections import defaultdict
+
+from django.contrib import messages
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from analysis.cache import bump_data_version
+from finance.importer import parse_amount, save_offerings
+from finance.models import OfferingCategory, Offerings
+from settings.models import Year
+
+SERVICE_TIMES = [value for value, _ in Offerings.SERVICE_TIME_CHOICES]
+
+
+def cell_name(outstation_id, service_time, category_id):
+    return f"cell-{outstation_id}-{service_time}-{category_id}"
+
+
+def mass_name_field(outstation_id, service_time):
+    return f"mass-{outstation_id}-{service_time}"
+
+
+class OfferingsGrid:
+    def __init__(self, day, outstations):
+        self.day = day
+        self.outstations = list(outstations)
+        self.categories = list(OfferingCategory.objects.order_by("name"))
+
+        # (outstation id, service time, category id) -> [Offerings]
+        self.existing = defaultdict(list)
+        offerings = Offerings.objects.filter(
+            date_given=day, outstation__in=self.outstations
+        ).order_by("pk")
+        for offering in offerings:
+            key = (offering.outstation_id, offering.service_time, offering.offering_category_id)
+            self.existing[key].append(offering)
+
+        # The mass name shown for each row: that of its first single-offering cell
+        self.initial_mass_names = {}
+        for key in sorted(self.existing, key=lambda key: self.existing[key][0].pk):
+            if len(self.existing[key]) == 1:
+                self.initial_mass_names.setdefault(key[:2], self.existing[key][0].mass_name)
+
+        self.values = {}       # cell key -> posted text
+        self.mass_names = {}   # (outstation id, service time) -> posted text
+        self.errors = {}       # cell key or row key -> message
+        self.amounts = {}      # cell key -> Decimal or None, once bound
+        self.changed = set()
+        self.default_mass_name = ""
+
+    # ------------------------------------------------------------------
+    # Posted data
+    # ------------------------------------------------------------------
+
+    def _cell_keys(self):
+        for outstation in self.outstations:
+            for service_time in SERVICE_TIMES:
+                for category in self.categories:
+                    yield outstation.pk, service_time, category.pk
+
+    def _is_locked(self, key):
+        return len(self.existing.get(key, ())) > 1
+
+    def bind(self, data):
+        """Reads and validates every cell of a POST; True when all of them are valid."""
+        self.default_mass_name = data.get("default_mass_name", "").strip()
+        rows_in_use = set()
+
+        for key in self._cell_keys():
+            # Locked cells, and cells missing from the POST, are left as they are
+            if self._is_locked(key) or cell_name(*key) not in data:
+                continue
+            text = data[cell_name(*key)].strip()
+            self.values[key] = text
+            if not text:
+                self.amounts[key] = None
+                continue
+            amount = parse_amount(text)
+            if amount is None:
+                self.errors[key] = "Enter a positive amount."
+            self.amounts[key] = amount
+            rows_in_use.add(key[:2])
+
+        for outstation in self.outstations:
+            for service_time in SERVICE_TIMES:
+                row = (outstation.pk, service_time)
+                mass_name = data.get(mass_name_field(*row), self.initial_mass_names.get(row, "")).strip()
+                self.mass_names[row] = mass_name
+                mass_name = mass_name or self.default_mass_name
+                if row in rows_in_use and not mass_name:
+                    self.errors[row] = "Mass name is required for a row with amounts."
+                elif len(mass_name) > 255:
+                    self.errors[row] = "Mass name must be at most 255 characters."
+
+        return not self.errors
+
+    def _mass_name(self, row):
+        return self.mass_names.get(row) or self.default_mass_name
+
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
+
+    def save(self, recorded_by=None):
+        """
+        Writes the cells that differ from the database in one transaction and
+        returns (created, updated, deleted) counts. Call after a successful bind().
+        """
+        year = (
+            Year.objects.filter(year=self.day.year).first()
+            or Year.objects.filter(is_current=True).first()
+        )
+        new, updated, deleted = [], [], []
+
+        for key, amount in self.amounts.items():
+            current = self.existing[key][0] if self.existing.get(key) else None
+            mass_name = self._mass_name(key[:2])
+            # An untouched row name keeps each offering's own mass name
+            if current is not None and mass_name == self.initial_mass_names.get(key[:2]):
+                mass_name = current.mass_name
+            if current is None:
+                if amount is not None:
+                    new.append((key, Offerings(
+                        year=year,
+                        date_given=self.day,
+                        service_time=key[1],
+                        amount=amount,
+                        recorded_by=recorded_by,
+                        mass_name=mass_name,
+                        offering_category_id=key[2],
+                        outstation_id=key[0],
+                    )))
+            elif amount is None:
+                deleted.append((key, current))
+            elif current.amount != amount or current.mass_name != mass_name:
+                current.amount = amount
+                current.mass_name = mass_name
+                updated.append((key, current))
+
+        with transaction.atomic():
+            if new:
+                save_offerings([offering for _, offering in new])
+            for _, offering in updated:
+                offering.save()
+            for _, offering in deleted:
+                offering.delete()
+
+        if new or updated or deleted:
+            bump_data_version("finance.Offerings")
+
+        for key, offering in new + updated:
+            self.existing[key] = [offering]
+        for key, _ in deleted:
+            self.existing.pop(key, None)
+        self.changed = {key for key, _ in new + updated + deleted}
+        return len(new), len(updated), len(deleted)
+
+    # ------------------------------------------------------------------
+    # Display
+    # ------------------------------------------------------------------
+
+    @property
+    def rows(self):
+        """One dict per outstation × service time, with its cells in category order."""
+        rows = []
+        for outstation in self.outstations:
+            for service_time in SERVICE_TIMES:
+                row_key = (outstation.pk, service_time)
+                cells = []
+                if row_key in self.mass_names:
+                    mass_name = self.mass_names[row_key]
+                else:
+                    mass_name = self.initial_mass_names.get(row_key, "")
+                for category in self.categories:
+                    key = (*row_key, category.pk)
+                    offerings = self.existing.get(key, [])
+                    if key in self.values:
+                        value = self.values[key]
+                    else:
+                        value = f"{offerings[0].amount:.2f}" if len(offerings) == 1 else ""
+                    cells.append({
+                        "name": cell_name(*key),
+                        "value": value,
+                        "locked": len(offerings) > 1,
+                        "total": sum(offering.amount for offering in offerings),
+                        "error": self.errors.get(key),
+                        "changed": key in self.changed,
+                    })
+                rows.append({
+                    "outstation": outstation,
+                    "service_time": service_time,
+                    "mass_name_field": mass_name_field(*row_key),
+                    "mass_name": mass_name,
+                    "error": self.errors.get(row_key),
+                    "cells": cells,
+                })
+        return rows
+
+
+def grid_day(value, strict=False):
+    """
+    The date of a ?date=YYYY-MM-DD parameter, today if missing or invalid
+    (None with strict=True: posted cells must never land on a guessed date).
+    """
+    try:
+        day = parse_date(value or "")
+    except ValueError:
+        day = None
+    return day if day or strict else timezone.localdate()
+
+
+def offerings_grid_context(request, outstations):
+    """
+    Template context of the grid page for an OutStation queryset (narrowed by
+    ?outstation=<pk>); saves the grid when the request is a POST.
+    """
+    params = request.POST if request.method == "POST" else request.GET
+    day = grid_day(params.get("date"), strict=request.method == "POST")
+    posted_without_day = day is None
+    day = day or timezone.localdate()
+    choices = list(outstations.order_by("name"))
+    selected = params.get("outstation", "")
+    shown = [outstation for outstation in choices if str(outstation.pk) == selected] or choices
+    grid = OfferingsGrid(day, shown)
+
+    if request.method == "POST" and posted_without_day:
+        messages.error(request, "❌ Nothing was saved: the date of the offerings is missing or invalid.")
+    elif request.method == "POST":
+        if grid.bind(request.POST):
+            created, updated, deleted = grid.save(
+                recorded_by=getattr(request.user, "church_member", None)
+            )
+            if created or updated or deleted:
+                messages.success(
+                    request,
+                    f"✅ Offerings of {day:%d %B %Y} saved: {created} added, {updated} changed, {deleted} removed.",
+                )
+            else:
+                messages.info(request, "ℹ️ Nothing changed.")
+        else:
+            messages.error(request, "❌ Nothing was saved. Please correct the highlighted cells.")
+
+    return {
+        "grid": grid,
+        "grid_rows": grid.rows,
+        "categories": grid.categories,
+        "day": day,
+        "outstation_choices": choices if len(choices) > 1 else [],
+        "selected_outstation": selected if len(shown) == 1 and len(choices) > 1 else "",
+    }
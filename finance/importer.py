@@ -0,0 +1,392 @@
+# finance/importer.py
+"""
+Streaming import of offerings from a CSV or XLSX file.
+
+    result = import_offerings(upload, default_category=category)
+    result.created        # number of offerings saved
+    result.errors         # [(row number, message), ...] of the skipped rows
+
+Rows are read one at a time (csv module / openpyxl read-only mode) and handled
+in chunks of IMPORT_CHUNK_SIZE. Year, OutStation and OfferingCategory are
+looked up from dictionaries loaded once; members (collected_by / recorded_by,
+given as member ID or phone number) with one query per chunk. Each chunk's
+valid rows are bulk_created in one transaction; an invalid row is reported and
+skipped without aborting the file. The whole file is checked before the first
+chunk (CSV: decodes as UTF-8 or Windows-1252; XLSX: every zip part intact), so
+an unreadable file raises ImportFileError with nothing imported.
+
+Columns (header row, any order, case-insensitive):
+    date_given*, amount*, service_time*, mass_name*, outstation*,
+    category (name or id; required unless a default category is given),
+    collected_by, recorded_by, notes,
+    year (defaults to the Year of date_given, then the current Year)
+
+bulk_create skips Offerings.save() and the model signals, so every chunk
+updates FinanceDailyRollup and the journal itself, and the analytics cache
+is invalidated once at the end.
+"""
+import codecs
+import csv
+import datetime
+import io
+import zipfile
+import zlib
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from analysis.cache import bump_data_version
+from finance.journal import post_new_records
+from finance.models import OfferingCategory, Offerings
+from finance.rollup import apply_rollup_deltas, freeze_key, rollup_entry
+from members.models import ChurchMember
+from settings.ids import is_typed_id_acceptable
+from settings.models import OutStation, Year
+
+IMPORT_CHUNK_SIZE = 1000
+
+# CSV files are read as UTF-8 (with or without BOM), else as Excel's Windows default
+CSV_ENCODINGS = ("utf-8-sig", "cp1252")
+READ_BLOCK_SIZE = 64 * 1024
+
+# Only the first errors are kept for display; all are counted
+MAX_REPORTED_ERRORS = 500
+
+# Other spellings accepted in the header row
+COLUMN_ALIASES = {
+    "date": "date_given",
+    "offering_category": "category",
+    "service": "service_time",
+    "mass": "mass_name",
+}
+
+REQUIRED_COLUMNS = ("date_given", "amount", "service_time", "mass_name", "outstation")
+
+MAX_AMOUNT = Decimal("100000000")  # Offerings.amount has max_digits=10, decimal_places=2
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be imported (wrong type, missing columns...)."""
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.rows = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, message))
+
+
+# ------------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------------
+
+def _column_name(header):
+    name = str(header or "").strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _check_columns(columns, default_category):
+    required = REQUIRED_COLUMNS if default_category else REQUIRED_COLUMNS + ("category",)
+    missing = [column for column in required if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}.")
+
+
+def _csv_encoding(binary):
+    """
+    The first of CSV_ENCODINGS the whole file decodes with, checked in blocks
+    before any row is read so a bad byte cannot stop an import half-way.
+    """
+    for encoding in CSV_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        binary.seek(0)
+        try:
+            for block in iter(lambda: binary.read(READ_BLOCK_SIZE), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    raise ImportFileError("The file is not UTF-8 or Windows-1252 text; save it as \"CSV UTF-8\" and try again.")
+
+
+def _csv_rows(upload):
+    binary = getattr(upload, "file", upload)
+    encoding = _csv_encoding(binary)
+    binary.seek(0)
+    text = io.TextIOWrapper(binary, encoding=encoding, newline="")
+    try:
+        reader = csv.reader(text)
+        columns = [_column_name(header) for header in next(reader, [])]
+        yield columns
+        for values in reader:
+            if any(value.strip() for value in values):
+                yield reader.line_num, dict(zip(columns, values))
+    finally:
+        text.detach()
+
+
+def _xlsx_rows(upload):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Reading .xlsx files needs the openpyxl package; upload a .csv file instead.")
+
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    binary = getattr(upload, "file", upload)
+    try:
+        # testzip() reads every part and checks its CRC, so a damaged file is
+        # rejected before any row is imported
+        binary.seek(0)
+        with zipfile.ZipFile(binary) as archive:
+            damaged = archive.testzip()
+        binary.seek(0)
+        workbook = None if damaged else load_workbook(binary, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, zlib.error, EOFError, InvalidFileException, KeyError, ValueError) as error:
+        raise ImportFileError(f"The file is not a readable .xlsx workbook ({error}).")
+    if workbook is None:
+        raise ImportFileError(f"The .xlsx file is damaged ({damaged}); save it again and retry.")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = [_column_name(header) for header in next(rows, ())]
+        yield columns
+        for row_number, values in enumerate(rows, start=2):
+            if any(value not in (None, "") for value in values):
+                yield row_number, dict(zip(columns, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(upload):
+    """Yields the column names once, then (row number, {column: value}) per row."""
+    name = (getattr(upload, "name", "") or "").lower()
+    if name.endswith(".csv"):
+        return _csv_rows(upload)
+    if name.endswith(".xlsx"):
+        return _xlsx_rows(upload)
+    raise ImportFileError("Upload a .csv or .xlsx file.")
+
+
+# ------------------------------------------------------------------
+# Validation
+# ------------------------------------------------------------------
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # spreadsheet numbers (ids, phone numbers) come back as floats
+    return str(value).strip()
+
+
+def normalise_phone(value):
+    digits = "".join(char for char in value if char.isdecimal())
+    if len(digits) == 10 and digits.startswith("0"):
+        return "255" + digits[1:]
+    if len(digits) == 9:
+        return "255" + digits
+    return digits
+
+
+def parse_any_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = _text(value)
+    try:
+        day = parse_date(text)
+    except ValueError:
+        day = None
+    if day is None:
+        for day_format in ("%d/%m/%Y", "%d-%m-%Y"):
+            try:
+                return datetime.datetime.strptime(text, day_format).date()
+            except ValueError:
+                continue
+    return day
+
+
+def parse_amount(value):
+    try:
+        amount = Decimal(_text(value).replace(",", ""))
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or amount <= 0 or amount >= MAX_AMOUNT:
+        return None
+    return amount.quantize(Decimal("0.01"))
+
+
+class OfferingsImporter:
+    """Validates rows into unsaved Offerings using cached lookups; see import_offerings()."""
+
+    def __init__(self, default_category=None):
+        self.default_category = default_category
+
+        years = list(Year.objects.all())
+        self.years = {year.year: year for year in years}
+        self.current_year = next((year for year in years if year.is_current), None)
+
+        self.outstations = {}
+        for outstation in OutStation.objects.all():
+            self.outstations[outstation.name.strip().lower()] = outstation
+            if outstation.outstation_id:
+                self.outstations[str(outstation.outstation_id)] = outstation
+
+        self.categories = {}
+        for category in OfferingCategory.objects.all():
+            self.categories[category.name.strip().lower()] = category
+            self.categories[str(category.pk)] = category
+
+        self.service_times = {value.lower(): value for value, _ in Offerings.SERVICE_TIME_CHOICES}
+        self.members = {}  # member ID / normalised phone -> member pk (None if unknown)
+
+    def load_members(self, rows):
+        """Looks up, in one query, the members of a chunk that are not cached yet."""
+        wanted = set()
+        for _, row in rows:
+            for column in ("collected_by", "recorded_by"):
+                identifier = _text(row.get(column))
+                if identifier:
+                    wanted.update({identifier, normalise_phone(identifier)})
+        wanted -= self.members.keys()
+        wanted.discard("")
+        if not wanted:
+            return
+
+        self.members.update(dict.fromkeys(wanted))
+        # Member IDs with a wrong check character are typing mistakes: not looked up
+        member_ids = [value for value in wanted if is_typed_id_acceptable("member", value)]
+        found = ChurchMember.objects.filter(Q(member_id__in=member_ids) | Q(phone_number__in=wanted))
+        for pk, member_id, phone_number in found.values_list("pk", "member_id", "phone_number"):
+            self.members[member_id] = pk
+            self.members[phone_number] = pk
+
+    def _member(self, row, column, errors):
+        identifier = _text(row.get(column))
+        if not identifier:
+            return None
+        pk = self.members.get(identifier) or self.members.get(normalise_phone(identifier))
+        if pk is None:
+            errors.append(f"{column}: no member with ID or phone '{identifier}'")
+        return pk
+
+    def build(self, row):
+        """Returns (Offerings, None) for a valid row, or (None, error message)."""
+        errors = []
+
+        date_given = parse_any_date(row.get("date_given"))
+        if date_given is None:
+            errors.append("date_given: expected a date like 2025-01-31")
+
+        amount = parse_amount(row.get("amount"))
+        if amount is None:
+            errors.append("amount: expected a positive number below 100,000,000")
+
+        service_time = self.service_times.get(_text(row.get("service_time")).lower())
+        if service_time is None:
+            errors.append(f"service_time: one of {', '.join(self.service_times.values())}")
+
+        mass_name = _text(row.get("mass_name"))
+        if not mass_name or len(mass_name) > 255:
+            errors.append("mass_name: required, at most 255 characters")
+
+        outstation = self.outstations.get(_text(row.get("outstation")).lower())
+        if outstation is None:
+            errors.append(f"outstation: unknown '{_text(row.get('outstation'))}'")
+
+        category_name = _text(row.get("category"))
+        category = self.categories.get(category_name.lower()) if category_name else self.default_category
+        if category is None:
+            errors.append(f"category: unknown '{category_name}'" if category_name else "category: required")
+
+        year_value = _text(row.get("year"))
+        if year_value:
+            # isdecimal(), not isdigit(): '²' is a digit that int() rejects
+            year = self.years.get(int(year_value)) if year_value.isdecimal() else None
+            if year is None:
+                errors.append(f"year: {year_value} is not set up")
+        else:
+            year = (self.years.get(date_given.year) if date_given else None) or self.current_year
+
+        collected_by = self._member(row, "collected_by", errors)
+        recorded_by = self._member(row, "recorded_by", errors)
+
+        if errors:
+            return None, "; ".join(errors)
+        return Offerings(
+            year=year,
+            date_given=date_given,
+            service_time=service_time,
+            amount=amount,
+            collected_by_id=collected_by,
+            recorded_by_id=recorded_by,
+            mass_name=mass_name,
+            notes=_text(row.get("notes")) or None,
+            offering_category=category,
+            outstation=outstation,
+        ), None
+
+
+def save_offerings(offerings):
+    """
+    bulk_creates unsaved Offerings and brings the rollup and journal up to date,
+    atomically. Used for import chunks and the Sunday grid (finance/grid.py).
+    """
+    with transaction.atomic():
+        created = Offerings.objects.bulk_create(offerings)
+
+        deltas = defaultdict(lambda: [Decimal("0"), 0])
+        for offering in created:
+            key, amount = rollup_entry(offering, "OFFERING")
+            delta = deltas[freeze_key(key)]
+            delta[0] += amount
+            delta[1] += 1
+        apply_rollup_deltas(deltas)
+
+        post_new_records("OFFERING", created)
+    return len(created)
+
+
+def import_offerings(upload, default_category=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Imports the offerings of a CSV/XLSX upload (or any binary file object with a
+    .name). Raises ImportFileError if the file cannot be read at all; row problems
+    are collected in the returned ImportResult.
+    """
+    rows = read_rows(upload)
+    _check_columns(next(rows, []), default_category)
+
+    importer = OfferingsImporter(default_category)
+    result = ImportResult()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        importer.load_members(chunk)
+
+        offerings = []
+        for row_number, row in chunk:
+            result.rows += 1
+            offering, error = importer.build(row)
+            if error:
+                result.add_error(row_number, error)
+            else:
+                offerings.append(offering)
+        if offerings:
+            result.created += save_offerings(offerings)
+
+    if result.created:
+        bump_data_version("finance.Offerings")
+    return result
@@ -0,0 +1,607 @@
+# finance/journal.py
+"""
+Double-entry journal over the income/expense tables.
+
+Every Offerings, DonationItemFund, FacilityRenting, Tithe and Expenditure
+record has one active JournalEntry:
+
+    income (offering, donation, renting):  Dr Cash at hand          / Cr <category> income
+    income (tithe):                        Dr Cash at hand          / Cr Tithes
+    expense (expenditure):                 Dr <category> expense    / Cr Cash at hand
+
+AccountPeriodBalance holds a running balance per account and month, updated as
+entries are posted, so these read one row per account however long the history:
+
+- trial_balance(period)       -> opening / debit / credit / closing of every account for a month.
+- account_balances(period)    -> {account_id: closing balance}, the balances carried forward.
+- close_period(period, user)  -> lock a month once its trial balance balances.
+
+Entries are kept in step by finance/signals.py. Bulk operations on the source
+tables do not send signals: run post_new_records() or sync_journal() after
+bulk_create() (sync_journal() also reverses entries whose record is gone), and
+rebuild_journal() / `python manage.py rebuild_journal` after queryset.update().
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Exists, F, IntegerField, Max, OuterRef, Subquery, Sum, Value
+from django.utils import timezone
+
+from finance.rollup import ROLLUP_SOURCES, _as_local_date, kind_for_model, source_models
+
+CASH_ACCOUNT_CODE = "1000"
+
+# kind -> the income/expense account a record is booked against
+# (one account per category; tithes have no category and share one account)
+JOURNAL_ACCOUNTS = {
+    "OFFERING": {
+        "code": "4100", "type": "INCOME", "label": "Offerings",
+        "account_field": "offering_category", "source_field": "offering_category",
+    },
+    "DONATION": {
+        "code": "4200", "type": "INCOME", "label": "Special contributions",
+        "account_field": "contribution", "source_field": "contribution_type",
+    },
+    "RENTING": {
+        "code": "4300", "type": "INCOME", "label": "Facility renting",
+        "account_field": "property_rented", "source_field": "property_rented",
+    },
+    "TITHE": {
+        "code": "4400", "type": "INCOME", "label": "Tithes",
+        "account_field": None, "source_field": None,
+    },
+    "EXPENDITURE": {
+        "code": "5100", "type": "EXPENSE", "label": "Expenditure",
+        "account_field": "expenditure_category", "source_field": "category",
+    },
+}
+
+ZERO = Decimal("0")
+
+
+def _model(name, apps=None):
+    return (apps or global_apps).get_model("finance", name)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(period):
+    return (period.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+
+
+def last_closed_period(apps=None):
+    """First day of the latest closed month, or None."""
+    return _model("ClosedPeriod", apps).objects.aggregate(last=Max("period"))["last"]
+
+
+def posting_period(day, last_closed=None):
+    """The month an entry dated `day` is booked in: its own, or the first open one."""
+    period = month_start(day)
+    if last_closed is not None and period <= last_closed:
+        period = next_month(last_closed)
+    return period
+
+
+# ------------------------------------------------------------------
+# Accounts
+# ------------------------------------------------------------------
+
+def cash_account(apps=None):
+    account, _ = _model("LedgerAccount", apps).objects.get_or_create(
+        code=CASH_ACCOUNT_CODE,
+        defaults={"name": "Cash at hand", "account_type": "ASSET"},
+    )
+    return account
+
+
+def account_for(kind, dimension_id, apps=None):
+    """The income/expense account of one category (or of the kind), created on first use."""
+    spec = JOURNAL_ACCOUNTS[kind]
+    account_model = _model("LedgerAccount", apps)
+    if spec["account_field"] is None:
+        account, _ = account_model.objects.get_or_create(
+            code=spec["code"], defaults={"name": spec["label"], "account_type": spec["type"]},
+        )
+        return account
+
+    lookup = {f"{spec['account_field']}_id": dimension_id}
+
+    account = account_model.objects.filter(**lookup).first()
+    if account is None:
+        target = account_model._meta.get_field(spec["account_field"]).related_model
+        name = target.objects.filter(pk=dimension_id).values_list("name", flat=True).first()
+        account = account_model.objects.create(
+            code=f"{spec['code']}-{dimension_id}",
+            name=f"{spec['label']}: {name or dimension_id}",
+            account_type=spec["type"],
+            **lookup,
+        )
+    return account
+
+
+# ------------------------------------------------------------------
+# Posting
+# ------------------------------------------------------------------
+
+def _entry_lines(kind, amount, cash_id, account_id):
+    """[(account_id, debit, credit), ...] of a balanced entry for `amount`."""
+    if JOURNAL_ACCOUNTS[kind]["type"] == "INCOME":
+        return [(cash_id, amount, ZERO), (account_id, ZERO, amount)]
+    return [(account_id, amount, ZERO), (cash_id, ZERO, amount)]
+
+
+def _dimension_id(record, kind):
+    """The category a record is booked against (None for kinds with a single account)."""
+    field = JOURNAL_ACCOUNTS[kind]["source_field"]
+    return getattr(record, f"{field}_id") if field else None
+
+
+def _memo(kind, source_id):
+    return f"{JOURNAL_ACCOUNTS[kind]['label']} #{source_id}"
+
+
+def journal_lines(instance, kind=None):
+    """
+    (date, lines) the record should be posted as, or None when its amount is zero.
+    Creates the accounts it needs.
+    """
+    kind = kind or kind_for_model(type(instance))
+    source = ROLLUP_SOURCES[kind]
+    amount = Decimal(str(getattr(instance, source["amount"]) or 0))
+    if not amount:
+        return None
+
+    day = _as_local_date(getattr(instance, source["date"]))
+    dimension_id = _dimension_id(instance, kind)
+    lines = _entry_lines(kind, amount, cash_account().pk, account_for(kind, dimension_id).pk)
+    return day, lines
+
+
+def apply_balance_delta(account_id, period, debit, credit):
+    """
+    Adds a debit/credit to an account's month, creating the month's row from the
+    previous closing balance if needed, and moves the opening balance of every
+    later month of the account by the same net amount.
+    """
+    from finance.models import AccountPeriodBalance
+
+    with transaction.atomic():
+        rows = AccountPeriodBalance.objects.filter(account_id=account_id)
+        pk = rows.filter(period=period).select_for_update().values_list("pk", flat=True).first()
+
+        if pk is None:
+            previous = rows.filter(period__lt=period).order_by("-period").first()
+            AccountPeriodBalance.objects.create(
+                account_id=account_id,
+                period=period,
+                opening=previous.closing if previous else ZERO,
+                debit=debit,
+                credit=credit,
+            )
+        else:
+            AccountPeriodBalance.objects.filter(pk=pk).update(debit=F("debit") + debit, credit=F("credit") + credit)
+
+        if debit != credit:
+            rows.filter(period__gt=period).update(opening=F("opening") + (debit - credit))
+
+
+def apply_balance_deltas(movements):
+    """
+    Bulk version of apply_balance_delta(): `movements` maps (account_id, period)
+    -> [debit, credit]. The balance rows of the accounts involved are read once,
+    moved in memory (including the openings of later months) and the changed
+    rows replaced with one bulk_create.
+    """
+    from finance.models import AccountPeriodBalance
+
+    if not movements:
+        return
+    account_ids = {account_id for account_id, _ in movements}
+
+    with transaction.atomic():
+        rows = defaultdict(dict)  # account_id -> {period: row}
+        for row in AccountPeriodBalance.objects.select_for_update().filter(account_id__in=account_ids):
+            rows[row.account_id][row.period] = row
+
+        replaced, changed = [], []
+        for account_id in account_ids:
+            periods = rows[account_id]
+            for (movement_account, period), (debit, credit) in movements.items():
+                if movement_account == account_id and period not in periods:
+                    periods[period] = AccountPeriodBalance(account_id=account_id, period=period)
+            running = ZERO
+            for period in sorted(periods):
+                row = periods[period]
+                debit, credit = movements.get((account_id, period), (ZERO, ZERO))
+                if row.pk is None or debit or credit or row.opening != running:
+                    if row.pk is not None:
+                        replaced.append(row.pk)
+                    changed.append(AccountPeriodBalance(
+                        account_id=account_id, period=period, opening=running,
+                        debit=row.debit + debit, credit=row.credit + credit,
+                    ))
+                running = running + row.debit + debit - row.credit - credit
+
+        for start in range(0, len(replaced), 500):
+            AccountPeriodBalance.objects.filter(pk__in=replaced[start:start + 500]).delete()
+        AccountPeriodBalance.objects.bulk_create(changed, batch_size=500)
+
+
+def _post(kind, source_id, day, lines, memo, reversal_of=None):
+    from finance.models import JournalEntry, JournalLine
+
+    period = posting_period(day, last_closed_period())
+    entry = JournalEntry.objects.create(
+        source_kind=kind, source_id=source_id, date=day, period=period,
+        memo=memo[:255], reversal_of=reversal_of,
+    )
+    JournalLine.objects.bulk_create(
+        JournalLine(entry=entry, account_id=account_id, debit=debit, credit=credit)
+        for account_id, debit, credit in lines
+    )
+    for account_id, debit, credit in lines:
+        apply_balance_delta(account_id, period, debit, credit)
+    return entry
+
+
+def _reverse(entry):
+    """Undo an entry with a mirror-image entry (booked in the first open month if its own is closed)."""
+    lines = [(line.account_id, line.credit, line.debit) for line in entry.lines.all()]
+    return _post(entry.source_kind, entry.source_id, entry.date, lines, f"Reversal: {entry.memo}", reversal_of=entry)
+
+
+def active_entry(kind, source_id):
+    """The record's entry that has not been reversed, or None."""
+    from finance.models import JournalEntry
+
+    return (
+        JournalEntry.objects
+        .filter(source_kind=kind, source_id=source_id, reversal_of__isnull=True, reversal__isnull=True)
+        .prefetch_related("lines")
+        .first()
+    )
+
+
+def _matches(entry, day, lines):
+    stored = sorted((line.account_id, line.debit, line.credit) for line in entry.lines.all())
+    return entry.date == day and stored == sorted(lines)
+
+
+def post_entry_for_record(instance):
+    """
+    Makes the record's active entry match its current amount, date and category:
+    nothing happens if it already does, otherwise the old entry is reversed and a
+    new one posted.
+    """
+    kind = kind_for_model(type(instance))
+    with transaction.atomic():
+        wanted = journal_lines(instance, kind)
+        current = active_entry(kind, instance.pk)
+        if current is not None and wanted is not None and _matches(current, *wanted):
+            return current
+        if current is not None:
+            _reverse(current)
+        if wanted is not None:
+            return _post(kind, instance.pk, *wanted, memo=_memo(kind, instance.pk))
+    return None
+
+
+def reverse_entry_for_record(instance):
+    """Reverses the active entry of a deleted record."""
+    kind = kind_for_model(type(instance))
+    with transaction.atomic():
+        current = active_entry(kind, instance.pk)
+        if current is not None:
+            _reverse(current)
+
+
+# ------------------------------------------------------------------
+# Reading balances
+# ------------------------------------------------------------------
+
+def trial_balance(period=None):
+    """
+    Balances of every account for the month containing `period` (default: this month):
+        {"period", "rows": [{"account", "opening", "debit", "credit", "closing",
+                             "debit_balance", "credit_balance"}],
+         "total_debit", "total_credit", "balanced"}
+    Each account's figures come from its latest AccountPeriodBalance row up to
+    the month (one indexed lookup per account).
+    """
+    from finance.models import AccountPeriodBalance, LedgerAccount
+
+    period = month_start(period or timezone.localdate())
+    latest = AccountPeriodBalance.objects.filter(account=OuterRef("pk"), period__lte=period).order_by("-period")
+    accounts = LedgerAccount.objects.annotate(
+        balance_period=Subquery(latest.values("period")[:1]),
+        balance_opening=Subquery(latest.values("opening")[:1]),
+        balance_debit=Subquery(latest.values("debit")[:1]),
+        balance_credit=Subquery(latest.values("credit")[:1]),
+    ).order_by("code")
+
+    rows = []
+    for account in accounts:
+        if account.balance_period is None:
+            continue  # no activity up to this month
+        if account.balance_period == period:
+            opening, debit, credit = account.balance_opening, account.balance_debit, account.balance_credit
+        else:
+            # Nothing posted this month: the last closing balance carries over
+            opening = account.balance_opening + account.balance_debit - account.balance_credit
+            debit = credit = ZERO
+        closing = opening + debit - credit
+        rows.append({
+            "account": account,
+            "opening": opening,
+            "debit": debit,
+            "credit": credit,
+            "closing": closing,
+            "debit_balance": closing if closing > 0 else ZERO,
+            "credit_balance": -closing if closing < 0 else ZERO,
+        })
+
+    total_debit = sum((row["debit_balance"] for row in rows), ZERO)
+    total_credit = sum((row["credit_balance"] for row in rows), ZERO)
+    return {
+        "period": period,
+        "rows": rows,
+        "total_debit": total_debit,
+        "total_credit": total_credit,
+        "balanced": total_debit == total_credit,
+    }
+
+
+def account_balances(period=None):
+    """{account_id: closing balance} at the end of the month, i.e. the balances carried forward."""
+    return {row["account"].pk: row["closing"] for row in trial_balance(period)["rows"]}
+
+
+def cash_balance(period=None, kinds=None):
+    """
+    Cash at hand at the end of the month (all income less all expenditure so far).
+    With `kinds` (e.g. ("OFFERING", "EXPENDITURE")), only the cash brought in
+    and paid out by those kinds' records, read from their accounts.
+    """
+    if kinds is None:
+        cash = cash_account()
+        return account_balances(period).get(cash.pk, ZERO)
+
+    codes = {JOURNAL_ACCOUNTS[kind]["code"] for kind in kinds}
+    # Income accounts carry credit (negative) balances, expense accounts debit ones
+    return -sum(
+        (row["closing"] for row in trial_balance(period)["rows"]
+         if row["account"].code.split("-")[0] in codes),
+        ZERO,
+    )
+
+
+def close_period(period, user=None):
+    """
+    Closes the month containing `period` (and, implicitly, every earlier month):
+    later entries dated in it are booked in the first open month.
+    Raises ValueError if the month has not ended, is already closed or does not balance.
+    """
+    from finance.models import ClosedPeriod
+
+    period = month_start(period)
+    if period >= month_start(timezone.localdate()):
+        raise ValueError(f"{period:%B %Y} has not ended yet.")
+
+    with transaction.atomic():
+        last_closed = last_closed_period()
+        if last_closed is not None and period <= last_closed:
+            raise ValueError(f"{period:%B %Y} is already closed (closed up to {last_closed:%B %Y}).")
+
+        report = trial_balance(period)
+        if not report["balanced"]:
+            raise ValueError(
+                f"{period:%B %Y} does not balance: debits {report['total_debit']} / credits {report['total_credit']}."
+            )
+        ClosedPeriod.objects.create(
+            period=period,
+            total_debit=report["total_debit"],
+            total_credit=report["total_credit"],
+            closed_by=user,
+        )
+    return report
+
+
+# ------------------------------------------------------------------
+# Bulk maintenance
+# ------------------------------------------------------------------
+
+def sync_journal():
+    """
+    Catches the journal up after bulk operations: posts the records that have no
+    active entry and reverses active entries whose record no longer exists.
+    Returns (posted, reversed).
+    """
+    from finance.models import JournalEntry
+
+    posted = reversed_count = 0
+    for kind, source in ROLLUP_SOURCES.items():
+        model = _model(source["model"])
+        active = JournalEntry.objects.filter(source_kind=kind, reversal_of__isnull=True, reversal__isnull=True)
+
+        missing = model.objects.exclude(**{source["amount"]: 0}).filter(
+            ~Exists(active.filter(source_id=OuterRef("pk")))
+        )
+        posted += post_new_records(kind, list(missing))
+
+        orphans = active.filter(~Exists(model.objects.filter(pk=OuterRef("source_id"))))
+        for entry in orphans.prefetch_related("lines"):
+            with transaction.atomic():
+                _reverse(entry)
+            reversed_count += 1
+    return posted, reversed_count
+
+
+def post_new_records(kind, records, batch_size=1000):
+    """
+    Posts many records of one kind that have no entry yet (e.g. right after a
+    bulk_create) with bulk inserts, then applies the balance movements once per
+    (account, month) with apply_balance_deltas(). Returns the number of entries written.
+    """
+    from finance.models import JournalEntry, JournalLine
+
+    source = ROLLUP_SOURCES[kind]
+    movements = defaultdict(lambda: [ZERO, ZERO])  # (account_id, period) -> [debit, credit]
+    written = 0
+
+    with transaction.atomic():
+        cash_id = cash_account().pk
+        last_closed = last_closed_period()
+        accounts = {}
+        batch = []
+        for record in records:
+            amount = Decimal(str(getattr(record, source["amount"]) or 0))
+            if not amount:
+                continue
+            dimension_id = _dimension_id(record, kind)
+            if dimension_id not in accounts:
+                accounts[dimension_id] = account_for(kind, dimension_id).pk
+            day = _as_local_date(getattr(record, source["date"]))
+            batch.append((JournalEntry(
+                source_kind=kind, source_id=record.pk, date=day, period=posting_period(day, last_closed),
+                memo=_memo(kind, record.pk),
+            ), _entry_lines(kind, amount, cash_id, accounts[dimension_id])))
+            if len(batch) >= batch_size:
+                written += _write_entries(JournalEntry, JournalLine, batch, movements)
+                batch = []
+        written += _write_entries(JournalEntry, JournalLine, batch, movements)
+
+        apply_balance_deltas(movements)
+    return written
+
+
+def rebuild_journal(apps=None, batch_size=1000):
+    """
+    Recreates every entry and balance from the source tables, each record in its
+    own month (closings are kept but not applied). Accounts are reused.
+    Returns the number of entries written. `apps` allows use from migrations.
+    """
+    apps = apps or global_apps
+    entry_model = _model("JournalEntry", apps)
+    line_model = _model("JournalLine", apps)
+    balance_model = _model("AccountPeriodBalance", apps)
+    account_model = _model("LedgerAccount", apps)
+
+    with transaction.atomic():
+        line_model.objects.all().delete()
+        entry_model.objects.all().delete()
+        balance_model.objects.all().delete()
+
+        cash_id = cash_account(apps).pk
+        movements = defaultdict(lambda: [ZERO, ZERO])  # (account_id, period) -> [debit, credit]
+        written = 0
+
+        for kind, source, model in source_models(apps):
+            spec = JOURNAL_ACCOUNTS[kind]
+            if spec["account_field"]:
+                accounts = dict(
+                    account_model.objects.filter(**{f"{spec['account_field']}__isnull": False})
+                    .values_list(f"{spec['account_field']}_id", "pk")
+                )
+                dimension = F(f"{spec['source_field']}_id")
+            else:
+                accounts, dimension = {}, Value(None, output_field=IntegerField())
+            records = (
+                model.objects.order_by("pk")
+                .exclude(**{source["amount"]: 0})
+                .annotate(dimension_id=dimension)
+                .values_list("pk", source["date"], source["amount"], "dimension_id")
+            )
+
+            batch = []
+            for source_id, day, amount, dimension_id in records.iterator(chunk_size=batch_size):
+                if dimension_id not in accounts:
+                    accounts[dimension_id] = account_for(kind, dimension_id, apps).pk
+                day = _as_local_date(day)
+                lines = _entry_lines(kind, Decimal(str(amount)), cash_id, accounts[dimension_id])
+                batch.append((entry_model(
+                    source_kind=kind, source_id=source_id, date=day, period=month_start(day),
+                    memo=_memo(kind, source_id),
+                ), lines))
+                if len(batch) >= batch_size:
+                    written += _write_entries(entry_model, line_model, batch, movements)
+                    batch = []
+            written += _write_entries(entry_model, line_model, batch, movements)
+
+        balances = []
+        running = defaultdict(lambda: ZERO)
+        for (account_id, period), (debit, credit) in sorted(movements.items()):
+            balances.append(balance_model(
+                account_id=account_id, period=period, opening=running[account_id], debit=debit, credit=credit,
+            ))
+            running[account_id] += debit - credit
+        balance_model.objects.bulk_create(balances, batch_size=batch_size)
+    return written
+
+
+def _write_entries(entry_model, line_model, batch, movements):
+    if not batch:
+        return 0
+    entries = entry_model.objects.bulk_create([entry for entry, _ in batch])
+    line_objects = []
+    for entry, lines in zip(entries, (lines for _, lines in batch)):
+        for account_id, debit, credit in lines:
+            line_objects.append(line_model(entry_id=entry.pk, account_id=account_id, debit=debit, credit=credit))
+            movement = movements[(account_id, entry.period)]
+            movement[0] += debit
+            movement[1] += credit
+    line_model.objects.bulk_create(line_objects)
+    return len(entries)
+
+
+def verify_journal():
+    """
+    Checks the journal against itself and the source tables. Returns a list of
+    problems (empty when everything agrees):
+    - entries whose debits and credits differ;
+    - AccountPeriodBalance rows that disagree with the posted lines or with the
+      previous month's closing balance;
+    - kinds whose active entries do not add up to the source table total.
+    """
+    from finance.models import AccountPeriodBalance, JournalLine
+
+    problems = []
+
+    unbalanced = (
+        JournalLine.objects.order_by().values("entry")
+        .annotate(debits=Sum("debit"), credits=Sum("credit"))
+        .exclude(debits=F("credits"))
+    )
+    for row in unbalanced[:50]:
+        problems.append(f"Entry {row['entry']} is unbalanced: Dr {row['debits']} / Cr {row['credits']}.")
+
+    posted = {
+        (row["account"], row["entry__period"]): (row["debits"], row["credits"])
+        for row in JournalLine.objects.order_by().values("account", "entry__period")
+        .annotate(debits=Sum("debit"), credits=Sum("credit"))
+    }
+    running = {}
+    for balance in AccountPeriodBalance.objects.order_by("account", "period"):
+        key = (balance.account_id, balance.period)
+        debits, credits = posted.pop(key, (ZERO, ZERO))
+        if balance.debit != debits or balance.credit != credits:
+            problems.append(f"{balance}: stored Dr {balance.debit} / Cr {balance.credit}, posted Dr {debits} / Cr {credits}.")
+        expected_opening = running.get(balance.account_id, ZERO)
+        if balance.opening != expected_opening:
+            problems.append(f"{balance}: opening {balance.opening}, previous closing {expected_opening}.")
+        running[balance.account_id] = balance.closing
+    for (account_id, period), (debits, credits) in posted.items():
+        problems.append(f"Account {account_id} {period:%Y-%m}: Dr {debits} / Cr {credits} posted but no balance row.")
+
+    for kind, source in ROLLUP_SOURCES.items():
+        expected = _model(source["model"]).objects.aggregate(total=Sum(source["amount"]))["total"] or ZERO
+        booked = JournalLine.objects.filter(
+            entry__source_kind=kind, entry__reversal_of__isnull=True, entry__reversal__isnull=True,
+        ).aggregate(total=Sum("debit"))["total"] or ZERO
+        if Decimal(expected).quantize(Decimal("0.01")) != Decimal(booked).quantize(Decimal("0.01")):
+            problems.append(f"{source['model']}: source total {expected}, journal total {booked}.")
+    return problems
@@ -0,0 +1,178 @@
+# finance/ledger.py
+"""
+Offerings ledger: server-side filters, keyset pagination and totals.
+
+    ledger = OfferingsLedger(request.GET)
+    page = ledger.page()          # rows of the requested page (+1 row to detect more)
+    totals = ledger.totals()      # {"total": Decimal, "count": int} for ALL filtered rows
+
+Rows are ordered newest first by (date_given, id). Pages are addressed by a
+cursor (?after=<date>.<id> / ?before=<date>.<id>) instead of an OFFSET, so
+every page is a short indexed range scan however deep the user pages.
+
+Backs finance.views.OfferingsListView, finance.views.offerings_by_category_list
+and accountant.views.AccountantOfferingsListView.
+"""
+from urllib.parse import urlencode
+
+from django.db.models import Count, Q, Sum
+from django.utils.dateparse import parse_date
+
+from finance.models import OfferingCategory, Offerings
+from members.models import ChurchMember
+from settings.models import Year
+
+LEDGER_PAGE_SIZE = 50
+
+# GET parameters the ledger understands (everything else is ignored)
+LEDGER_FILTER_PARAMS = ("year", "mass_name", "collected_by", "recorded_by", "category", "from_date", "to_date")
+
+
+def _parse_day(value):
+    """date of a YYYY-MM-DD string, or None if empty, malformed or impossible (2025-02-30)."""
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_cursor(value):
+    """'2025-01-12.345' -> (date(2025, 1, 12), 345), or None if malformed."""
+    day, _, pk = (value or "").partition(".")
+    day = _parse_day(day)
+    if day is None or not pk.isdecimal():
+        return None
+    return day, int(pk)
+
+
+def _format_cursor(offering):
+    return f"{offering.date_given.isoformat()}.{offering.pk}"
+
+
+class LedgerPage:
+    """One page of ledger rows plus the query strings of its neighbours."""
+
+    def __init__(self, rows, filters, has_next, has_previous):
+        self.rows = rows
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_query = self._query(filters, after=_format_cursor(rows[-1])) if has_next else ""
+        self.previous_query = self._query(filters, before=_format_cursor(rows[0])) if has_previous else ""
+
+    @staticmethod
+    def _query(filters, **cursor):
+        params = {key: value for key, value in filters.items() if value is not None}
+        params.update(cursor)
+        return urlencode(params)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class OfferingsLedger:
+    """
+    Filtered view over Offerings. `params` is request.GET (or any dict);
+    `queryset` narrows the base set (e.g. one category's offerings).
+    Without a ?year= parameter the current year is shown, like the old pages.
+    """
+
+    def __init__(self, params, queryset=None, page_size=LEDGER_PAGE_SIZE):
+        self.params = params
+        self.page_size = page_size
+        self.base_queryset = queryset if queryset is not None else Offerings.objects.all()
+        self.filters = self._clean_filters(params)
+        self.queryset = self._apply_filters(self.base_queryset, self.filters)
+
+    @staticmethod
+    def _clean_filters(params):
+        filters = {key: (params.get(key) or "").strip() for key in LEDGER_FILTER_PARAMS}
+        if "year" not in params:
+            current_year = Year.objects.filter(is_current=True).values_list("year", flat=True).first()
+            filters["year"] = str(current_year) if current_year else ""
+        return filters
+
+    @staticmethod
+    def _apply_filters(queryset, filters):
+        conditions = Q()
+        if filters["year"].isdecimal():
+            conditions &= Q(year__year=int(filters["year"]))
+        if filters["mass_name"]:
+            conditions &= Q(mass_name__icontains=filters["mass_name"])
+        if filters["collected_by"].isdecimal():
+            conditions &= Q(collected_by_id=int(filters["collected_by"]))
+        if filters["recorded_by"].isdecimal():
+            conditions &= Q(recorded_by_id=int(filters["recorded_by"]))
+        if filters["category"].isdecimal():
+            conditions &= Q(offering_category_id=int(filters["category"]))
+        from_date = _parse_day(filters["from_date"])
+        if from_date:
+            conditions &= Q(date_given__gte=from_date)
+        to_date = _parse_day(filters["to_date"])
+        if to_date:
+            conditions &= Q(date_given__lte=to_date)
+        return queryset.filter(conditions)
+
+    def totals(self):
+        """Sum and number of ALL rows matching the filters (one aggregate query)."""
+        totals = self.queryset.order_by().aggregate(total=Sum("amount"), count=Count("id"))
+        return {"total": totals["total"] or 0, "count": totals["count"]}
+
+    def page(self):
+        """
+        The rows after ?after= (older) or before ?before= (newer) the cursor,
+        newest first. Fetches page_size + 1 rows to know whether more exist.
+        """
+        rows = self.queryset.select_related("collected_by", "recorded_by", "offering_category", "outstation")
+        after = _parse_cursor(self.params.get("after"))
+        before = _parse_cursor(self.params.get("before")) if not after else None
+
+        if before:
+            day, pk = before
+            rows = rows.filter(Q(date_given__gt=day) | Q(date_given=day, pk__gt=pk)).order_by("date_given", "pk")
+            rows = list(rows[:self.page_size + 1])
+            has_previous = len(rows) > self.page_size
+            rows = rows[:self.page_size][::-1]
+            return LedgerPage(rows, self.filters, has_next=bool(rows), has_previous=has_previous)
+
+        if after:
+            day, pk = after
+            rows = rows.filter(Q(date_given__lt=day) | Q(date_given=day, pk__lt=pk))
+        rows = list(rows.order_by("-date_given", "-pk")[:self.page_size + 1])
+        has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        return LedgerPage(rows, self.filters, has_next=has_next, has_previous=bool(after) and bool(rows))
+
+
+def ledger_filter_choices():
+    """
+    Dropdown choices for the ledger filters: years, categories, and the active
+    members (collectors) / active leaders (recorders) from ONE member query.
+    """
+    members = list(
+        ChurchMember.objects.filter(status="Active")
+        .order_by("full_name")
+        .values("id", "full_name", "leader__id")
+    )
+    return {
+        "years": Year.objects.order_by("year"),
+        "all_offering_categories": OfferingCategory.objects.order_by("name"),
+        "collected_by_members": members,
+        "recorded_by_leaders": [member for member in members if member["leader__id"] is not None],
+    }
+
+
+def offerings_ledger_context(params, queryset=None):
+    """Template context shared by the offerings list pages."""
+    ledger = OfferingsLedger(params, queryset=queryset)
+    totals = ledger.totals()
+    context = {
+        "offerings": ledger.page(),
+        "total_offerings": totals["total"],
+        "offerings_count": totals["count"],
+        "filters": ledger.filters,
+    }
+    context.update(ledger_filter_choices())
+    return context
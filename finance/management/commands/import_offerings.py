@@ -0,0 +1,41 @@
+# finance/management/commands/import_offerings.py
+"""
+Imports offerings from a CSV/XLSX file (columns: see finance/importer.py):
+
+    python manage.py import_offerings offerings_2025.csv --category "Sadaka ya Kawaida"
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.importer import ImportFileError, import_offerings
+from finance.models import OfferingCategory
+
+
+class Command(BaseCommand):
+    help = "Import offerings from a .csv or .xlsx file; invalid rows are reported and skipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The .csv or .xlsx file.")
+        parser.add_argument("--category", help="Offering category (name or id) for rows without one.")
+
+    def handle(self, *args, **options):
+        category = None
+        if options["category"]:
+            value = options["category"]
+            lookup = {"pk": int(value)} if value.isdecimal() else {"name__iexact": value}
+            category = OfferingCategory.objects.filter(**lookup).first()
+            if category is None:
+                raise CommandError(f"No offering category '{value}'.")
+
+        try:
+            with open(options["path"], "rb") as upload:
+                result = import_offerings(upload, default_category=category)
+        except (OSError, ImportFileError) as error:
+            raise CommandError(str(error))
+
+        for row_number, message in result.errors:
+            self.stderr.write(f"Row {row_number}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} of {result.rows} rows ({result.error_count} skipped)."
+        ))
@@ -0,0 +1,32 @@
+# finance/management/commands/import_tithes.py
+"""
+Imports tithes from a CSV/XLSX file (columns: see finance/tithes.py):
+
+    python manage.py import_tithes tithes_2025.csv
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.importer import ImportFileError
+from finance.tithes import import_tithes
+
+
+class Command(BaseCommand):
+    help = "Import tithes from a .csv or .xlsx file; invalid rows are reported and skipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The .csv or .xlsx file.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as upload:
+                result = import_tithes(upload)
+        except (OSError, ImportFileError) as error:
+            raise CommandError(str(error))
+
+        for row_number, message in result.errors:
+            self.stderr.write(f"Row {row_number}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} of {result.rows} rows ({result.error_count} skipped)."
+        ))
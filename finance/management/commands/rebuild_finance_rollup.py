@@ -0,0 +1,31 @@
+# finance/management/commands/rebuild_finance_rollup.py
+from django.core.management.base import BaseCommand, CommandError
+
+from analysis.cache import bump_data_version
+from finance.rollup import ROLLUP_SOURCES, rebuild_rollup, verify_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild FinanceDailyRollup from the income/expense tables, or verify it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only compare the rollup with the source tables; exit with an error on mismatch.",
+        )
+
+    def handle(self, *args, **options):
+        if options["verify"]:
+            mismatches = verify_rollup()
+            if mismatches:
+                for key, expected, actual in mismatches[:20]:
+                    self.stderr.write(f"{key}: expected {expected}, found {actual}")
+                raise CommandError(f"FinanceDailyRollup is out of date ({len(mismatches)} mismatched rows).")
+            self.stdout.write(self.style.SUCCESS("FinanceDailyRollup matches the source tables."))
+            return
+
+        written = rebuild_rollup()
+        for source in ROLLUP_SOURCES.values():
+            bump_data_version(f"finance.{source['model']}")
+        self.stdout.write(self.style.SUCCESS(f"FinanceDailyRollup rebuilt: {written} rows."))
@@ -0,0 +1,38 @@
+# finance/management/commands/rebuild_journal.py
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.journal import rebuild_journal, sync_journal, verify_journal
+
+
+class Command(BaseCommand):
+    help = "Rebuild the double-entry journal from the income/expense tables, or check it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only check the journal and its balances; exit with an error on any problem.",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Only post records without an entry and reverse entries of deleted records.",
+        )
+
+    def handle(self, *args, **options):
+        if options["verify"]:
+            problems = verify_journal()
+            if problems:
+                for problem in problems[:20]:
+                    self.stderr.write(problem)
+                raise CommandError(f"The journal does not match the source tables ({len(problems)} problems).")
+            self.stdout.write(self.style.SUCCESS("The journal balances and matches the source tables."))
+            return
+
+        if options["sync"]:
+            posted, reversed_count = sync_journal()
+            self.stdout.write(self.style.SUCCESS(f"Journal synced: {posted} entries posted, {reversed_count} reversed."))
+            return
+
+        written = rebuild_journal()
+        self.stdout.write(self.style.SUCCESS(f"Journal rebuilt: {written} entries."))
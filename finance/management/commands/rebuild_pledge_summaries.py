@@ -0,0 +1,28 @@
+# finance/management/commands/rebuild_pledge_summaries.py
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.pledges import rebuild_pledge_summaries, verify_pledge_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-member pledge fulfilment summary from pledges and tithes, or check it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only compare the summary with the source tables; exit with an error on any difference.",
+        )
+
+    def handle(self, *args, **options):
+        if options["verify"]:
+            differences = verify_pledge_summaries()
+            if differences:
+                for member_id, year_id, stored, expected in differences[:20]:
+                    self.stderr.write(f"member {member_id}, year {year_id}: stored {stored}, expected {expected}")
+                raise CommandError(f"PledgeSummary differs from the source tables ({len(differences)} rows).")
+            self.stdout.write(self.style.SUCCESS("PledgeSummary matches the source tables."))
+            return
+
+        rows = rebuild_pledge_summaries()
+        self.stdout.write(self.style.SUCCESS(f"PledgeSummary rebuilt: {rows} rows."))
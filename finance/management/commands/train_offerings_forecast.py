@@ -0,0 +1,51 @@
+# finance/management/commands/train_offerings_forecast.py
+"""
+Offline training of the offerings forecast. Run it after the Sunday
+collections are recorded, e.g. (crontab, Monday night):
+
+    30 23 * * 1  cd /srv/kkkt && python manage.py train_offerings_forecast
+
+Web processes pick up the new artefact file on their next forecast request.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from django.utils.timezone import localdate
+
+from finance.forecast import get_forecast_path, save_forecast_artefact, train_offerings_forecast
+
+
+class Command(BaseCommand):
+    help = "Train the per-outstation/per-service offerings forecast and save it to OFFERINGS_FORECAST_PATH."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--through", help="Last Sunday (YYYY-MM-DD) to train on. Defaults to the last Sunday.")
+        parser.add_argument("--alpha", type=float, default=1.0, help="Ridge regularisation strength.")
+        parser.add_argument("--output", help=f"Artefact path. Defaults to {get_forecast_path()}.")
+
+    def handle(self, *args, **options):
+        through = None
+        if options["through"]:
+            try:
+                through = parse_date(options["through"])
+            except ValueError:
+                through = None
+            if through is None or through.weekday() != 6:
+                raise CommandError("--through must be a Sunday (YYYY-MM-DD).")
+            if through > localdate():
+                raise CommandError("--through cannot be later than today.")
+
+        artefact = train_offerings_forecast(through=through, alpha=options["alpha"])
+        if not artefact["series"]:
+            raise CommandError("No offerings to train on.")
+
+        for entry in artefact["series"].values():
+            if entry["model"] is None:
+                detail = f"{entry['weeks']} weeks of history, using the recent average"
+            else:
+                detail = f"holdout MAE {entry['holdout_mae']:,.0f} (recent-average baseline {entry['naive_mae']:,.0f})"
+            self.stdout.write(f"{entry['outstation']} / {entry['mass_name']}: {detail}")
+
+        path = save_forecast_artefact(artefact, options["output"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Trained {len(artefact['series'])} series through {artefact['trained_through']}; saved to {path}."
+        ))
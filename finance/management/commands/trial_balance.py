@@ -0,0 +1,46 @@
+# finance/management/commands/trial_balance.py
+"""
+Prints the trial balance of a month from the journal's running balances, and
+optionally closes the month:
+
+    python manage.py trial_balance                      # this month
+    python manage.py trial_balance --period 2025-03 --close
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from finance.journal import close_period, trial_balance
+
+
+class Command(BaseCommand):
+    help = "Print the trial balance of a month (default: this month); --close locks the month."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", help="Month as YYYY-MM.")
+        parser.add_argument("--close", action="store_true", help="Close the month once it balances.")
+
+    def handle(self, *args, **options):
+        period = None
+        if options["period"]:
+            period = parse_date(f"{options['period']}-01")
+            if period is None:
+                raise CommandError("--period must be YYYY-MM.")
+
+        report = trial_balance(period)
+        self.stdout.write(f"Trial balance for {report['period']:%B %Y}")
+        self.stdout.write(f"{'Account':<45}{'Opening':>18}{'Debit':>18}{'Credit':>18}{'Closing':>18}")
+        for row in report["rows"]:
+            self.stdout.write(
+                f"{str(row['account'])[:44]:<45}{row['opening']:>18,.2f}{row['debit']:>18,.2f}"
+                f"{row['credit']:>18,.2f}{row['closing']:>18,.2f}"
+            )
+        self.stdout.write(f"Debit balances {report['total_debit']:,.2f} / credit balances {report['total_credit']:,.2f}")
+
+        if options["close"]:
+            if period is None:
+                raise CommandError("--close needs --period.")
+            try:
+                close_period(period)
+            except ValueError as error:
+                raise CommandError(str(error))
+            self.stdout.write(self.style.SUCCESS(f"{report['period']:%B %Y} closed."))
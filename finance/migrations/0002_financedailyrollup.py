@@ -0,0 +1,94 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:19
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+# The source tables as they are at this migration (frozen: finance/rollup.py may change later).
+# kind -> (model, date field, amount field, {rollup field: source field}, has mass_name)
+ROLLUP_SOURCES = {
+    "OFFERING": ("Offerings", "date_given", "amount",
+                 {"year": "year", "outstation": "outstation", "offering_category": "offering_category"}, True),
+    "DONATION": ("DonationItemFund", "date_created", "amount",
+                 {"year": "year", "contribution": "contribution_type"}, True),
+    "RENTING": ("FacilityRenting", "date_rented", "amount",
+                {"year": "year", "property_rented": "property_rented"}, False),
+    "EXPENDITURE": ("Expenditure", "date_taken", "expenditure_amount",
+                    {"year": "year", "expenditure_category": "category"}, False),
+}
+
+
+def populate_rollup(apps, schema_editor):
+    """Fills FinanceDailyRollup with one grouped query per source table."""
+    FinanceDailyRollup = apps.get_model("finance", "FinanceDailyRollup")
+
+    rows = []
+    for kind, (model_name, date_field, amount_field, dimensions, has_mass_name) in ROLLUP_SOURCES.items():
+        model = apps.get_model("finance", model_name)
+        if model._meta.get_field(date_field).get_internal_type() == "DateTimeField":
+            rollup_date = TruncDate(date_field)
+        else:
+            rollup_date = F(date_field)
+
+        group_fields = {"rollup_date": rollup_date}
+        for dimension, field in dimensions.items():
+            group_fields[f"rollup_{dimension}"] = F(f"{field}_id")
+        if has_mass_name:
+            group_fields["rollup_mass_name"] = F("mass_name")
+
+        grouped = (
+            model.objects.order_by()
+            .annotate(**group_fields)
+            .values(*group_fields)
+            .annotate(rollup_total=Sum(amount_field), rollup_count=Count("id"))
+        )
+        for row in grouped:
+            rows.append(FinanceDailyRollup(
+                kind=kind,
+                date=row["rollup_date"],
+                mass_name=(row["rollup_mass_name"] or "") if has_mass_name else "",
+                total=row["rollup_total"] or Decimal("0"),
+                count=row["rollup_count"],
+                **{f"{dimension}_id": row[f"rollup_{dimension}"] for dimension in dimensions},
+            ))
+    FinanceDailyRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+        ('properties', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinanceDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('OFFERING', 'Offerings'), ('DONATION', 'Donation Item Funds'), ('RENTING', 'Facility Renting'), ('EXPENDITURE', 'Expenditures')], help_text='Which source table this row summarises.', max_length=12)),
+                ('date', models.DateField(help_text='Day the source records fall on.')),
+                ('mass_name', models.CharField(blank=True, default='', help_text='Mass name (offerings and donation item funds).', max_length=255)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('contribution', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.specialcontribution')),
+                ('expenditure_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.category')),
+                ('offering_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.offeringcategory')),
+                ('outstation', models.ForeignKey(blank=True, help_text='Outstation (offerings only).', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='finance_rollups', to='settings.outstation')),
+                ('property_rented', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='finance_rollups', to='properties.churchasset')),
+                ('year', models.ForeignKey(blank=True, help_text='The Year the source records are assigned to.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='finance_rollups', to='settings.year')),
+            ],
+            options={
+                'verbose_name': 'Finance Daily Rollup',
+                'verbose_name_plural': 'Finance Daily Rollups',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['kind', 'date'], name='finance_rollup_kind_date'), models.Index(fields=['kind', 'year'], name='finance_rollup_kind_year')],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
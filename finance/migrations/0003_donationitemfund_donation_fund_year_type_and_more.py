@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_financedailyrollup'),
+        ('members', '0002_membershipsnapshot'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donationitemfund',
+            index=models.Index(fields=['year', 'contribution_type'], name='donation_fund_year_type'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['year', 'month', 'category'], name='expenditure_year_month_cat'),
+        ),
+        migrations.AddIndex(
+            model_name='offerings',
+            index=models.Index(fields=['date_given', 'offering_category'], name='offering_date_category'),
+        ),
+        migrations.AddIndex(
+            model_name='offerings',
+            index=models.Index(fields=['year', 'date_given'], name='offering_year_date'),
+        ),
+    ]
@@ -0,0 +1,217 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:41
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+ZERO = Decimal("0")
+BATCH_SIZE = 1000
+
+# The source tables and accounts as they are at this migration (frozen:
+# finance/journal.py may change later).
+# kind -> (model, date field, amount field, category field, account code, account type, label)
+JOURNAL_SOURCES = {
+    "OFFERING": ("Offerings", "date_given", "amount", "offering_category", "4100", "INCOME", "Offerings"),
+    "DONATION": ("DonationItemFund", "date_created", "amount", "contribution_type", "4200", "INCOME",
+                 "Special contributions"),
+    "RENTING": ("FacilityRenting", "date_rented", "amount", "property_rented", "4300", "INCOME", "Facility renting"),
+    "EXPENDITURE": ("Expenditure", "date_taken", "expenditure_amount", "category", "5100", "EXPENSE", "Expenditure"),
+}
+# kind -> LedgerAccount field of its category
+ACCOUNT_FIELDS = {
+    "OFFERING": "offering_category",
+    "DONATION": "contribution",
+    "RENTING": "property_rented",
+    "EXPENDITURE": "expenditure_category",
+}
+
+
+def _local_date(value):
+    if isinstance(value, datetime.datetime):
+        if settings.USE_TZ and timezone.is_aware(value):
+            value = timezone.make_naive(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def populate_journal(apps, schema_editor):
+    """
+    Posts one balanced entry per existing record, in the record's own month
+    (income: Dr cash / Cr category; expenditure: Dr category / Cr cash), then
+    writes the running balance of every account and month.
+    """
+    LedgerAccount = apps.get_model("finance", "LedgerAccount")
+    JournalEntry = apps.get_model("finance", "JournalEntry")
+    JournalLine = apps.get_model("finance", "JournalLine")
+    AccountPeriodBalance = apps.get_model("finance", "AccountPeriodBalance")
+
+    cash_id = LedgerAccount.objects.create(code="1000", name="Cash at hand", account_type="ASSET").pk
+    movements = defaultdict(lambda: [ZERO, ZERO])  # (account_id, period) -> [debit, credit]
+
+    def write(batch):
+        entries = JournalEntry.objects.bulk_create([entry for entry, _ in batch])
+        lines = []
+        for entry, (_, entry_lines) in zip(entries, batch):
+            for account_id, debit, credit in entry_lines:
+                lines.append(JournalLine(entry_id=entry.pk, account_id=account_id, debit=debit, credit=credit))
+                movement = movements[(account_id, entry.period)]
+                movement[0] += debit
+                movement[1] += credit
+        JournalLine.objects.bulk_create(lines, batch_size=BATCH_SIZE)
+
+    for kind, (model_name, date_field, amount_field, source_field, code, account_type, label) in JOURNAL_SOURCES.items():
+        model = apps.get_model("finance", model_name)
+        account_field = ACCOUNT_FIELDS[kind]
+        names = dict(model._meta.get_field(source_field).related_model.objects.values_list("pk", "name"))
+        accounts = {}
+
+        records = (
+            model.objects.order_by("pk")
+            .exclude(**{amount_field: 0})
+            .values_list("pk", date_field, amount_field, f"{source_field}_id")
+        )
+        batch = []
+        for source_id, day, amount, category_id in records.iterator(chunk_size=BATCH_SIZE):
+            if category_id not in accounts:
+                accounts[category_id] = LedgerAccount.objects.create(
+                    code=f"{code}-{category_id}",
+                    name=f"{label}: {names.get(category_id) or category_id}",
+                    account_type=account_type,
+                    **{f"{account_field}_id": category_id},
+                ).pk
+            day = _local_date(day)
+            amount = Decimal(str(amount))
+            if account_type == "INCOME":
+                lines = [(cash_id, amount, ZERO), (accounts[category_id], ZERO, amount)]
+            else:
+                lines = [(accounts[category_id], amount, ZERO), (cash_id, ZERO, amount)]
+            batch.append((JournalEntry(
+                source_kind=kind, source_id=source_id, date=day, period=day.replace(day=1),
+                memo=f"{label} #{source_id}",
+            ), lines))
+            if len(batch) >= BATCH_SIZE:
+                write(batch)
+                batch = []
+        if batch:
+            write(batch)
+
+    balances = []
+    running = defaultdict(lambda: ZERO)
+    for (account_id, period), (debit, credit) in sorted(movements.items()):
+        balances.append(AccountPeriodBalance(
+            account_id=account_id, period=period, opening=running[account_id], debit=debit, credit=credit,
+        ))
+        running[account_id] += debit - credit
+    AccountPeriodBalance.objects.bulk_create(balances, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_donationitemfund_donation_fund_year_type_and_more'),
+        ('properties', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClosedPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month.', unique=True)),
+                ('total_debit', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('total_credit', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('closed_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_periods', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Closed Period',
+                'verbose_name_plural': 'Closed Periods',
+                'ordering': ['period'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_kind', models.CharField(choices=[('OFFERING', 'Offerings'), ('DONATION', 'Donation Item Funds'), ('RENTING', 'Facility Renting'), ('EXPENDITURE', 'Expenditures')], max_length=12)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('date', models.DateField()),
+                ('period', models.DateField()),
+                ('memo', models.CharField(blank=True, default='', max_length=255)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('reversal_of', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reversal', to='finance.journalentry')),
+            ],
+            options={
+                'verbose_name': 'Journal Entry',
+                'verbose_name_plural': 'Journal Entries',
+                'ordering': ['date', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('account_type', models.CharField(choices=[('ASSET', 'Asset'), ('INCOME', 'Income'), ('EXPENSE', 'Expense')], max_length=10)),
+                ('contribution', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_account', to='finance.specialcontribution')),
+                ('expenditure_category', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_account', to='finance.category')),
+                ('offering_category', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_account', to='finance.offeringcategory')),
+                ('property_rented', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_account', to='properties.churchasset')),
+            ],
+            options={
+                'verbose_name': 'Ledger Account',
+                'verbose_name_plural': 'Ledger Accounts',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='finance.journalentry')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='finance.ledgeraccount')),
+            ],
+            options={
+                'verbose_name': 'Journal Line',
+                'verbose_name_plural': 'Journal Lines',
+            },
+        ),
+        migrations.CreateModel(
+            name='AccountPeriodBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month.')),
+                ('opening', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_balances', to='finance.ledgeraccount')),
+            ],
+            options={
+                'verbose_name': 'Account Period Balance',
+                'verbose_name_plural': 'Account Period Balances',
+                'ordering': ['account', 'period'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['source_kind', 'source_id'], name='journal_entry_source'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['period'], name='journal_entry_period'),
+        ),
+        migrations.AddConstraint(
+            model_name='accountperiodbalance',
+            constraint=models.UniqueConstraint(fields=('account', 'period'), name='account_period_balance_unique'),
+        ),
+        migrations.RunPython(populate_journal, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_journal'),
+        ('members', '0003_churchmember_member_status_gender_cell'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tithe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Amount of the tithe.', max_digits=10)),
+                ('payment_method', models.CharField(choices=[('Cash', 'Cash'), ('Mobile Money', 'Mobile Money'), ('Bank Transfer', 'Bank Transfer'), ('Cheque', 'Cheque')], default='Cash', help_text='How the tithe was paid.', max_length=20)),
+                ('date_given', models.DateField(default=django.utils.timezone.now, help_text='The date the tithe was given.')),
+                ('purpose', models.TextField(blank=True, help_text='Optional note about the tithe.', null=True)),
+                ('receipt_number', models.CharField(editable=False, help_text='Unique receipt number, generated when the tithe is saved.', max_length=20, unique=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tithe',
+                'verbose_name_plural': 'Tithes',
+                'ordering': ['-date_given', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pledge',
+            index=models.Index(fields=['envelope_number'], name='pledge_envelope_number'),
+        ),
+        migrations.AddField(
+            model_name='tithe',
+            name='member',
+            field=models.ForeignKey(help_text='The church member who gave the tithe.', on_delete=django.db.models.deletion.CASCADE, related_name='tithes', to='members.churchmember'),
+        ),
+        migrations.AddField(
+            model_name='tithe',
+            name='year',
+            field=models.ForeignKey(blank=True, help_text='The year in which this tithe was recorded.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tithes', to='settings.year'),
+        ),
+        migrations.AddIndex(
+            model_name='tithe',
+            index=models.Index(fields=['member', 'date_given'], name='tithe_member_date'),
+        ),
+        migrations.AddIndex(
+            model_name='tithe',
+            index=models.Index(fields=['date_given'], name='tithe_date_given'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:03
+
+from collections import defaultdict
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+ZERO = Decimal("0")
+
+
+def populate_pledge_summaries(apps, schema_editor):
+    """
+    One PledgeSummary per member and Year from two grouped queries (pledges,
+    tithes). Frozen here rather than calling finance/pledges.py, which may change.
+    """
+    Pledge = apps.get_model("finance", "Pledge")
+    Tithe = apps.get_model("finance", "Tithe")
+    PledgeSummary = apps.get_model("finance", "PledgeSummary")
+
+    totals = defaultdict(lambda: [ZERO, ZERO, 0])  # (member_id, year_id) -> [pledged, paid, pledges]
+    pledges = Pledge.objects.order_by().values("member_id", "year_id").annotate(
+        pledged=Sum(F("pledge_amount") + F("pledge_for_construction")),
+        number=Count("id"),
+    )
+    for row in pledges:
+        total = totals[(row["member_id"], row["year_id"])]
+        total[0] += Decimal(row["pledged"] or ZERO)
+        total[2] += row["number"]
+
+    tithes = (
+        Tithe.objects.order_by().filter(year__isnull=False)
+        .values("member_id", "year_id").annotate(paid=Sum("amount"))
+    )
+    for row in tithes:
+        totals[(row["member_id"], row["year_id"])][1] += Decimal(row["paid"] or ZERO)
+
+    PledgeSummary.objects.bulk_create(
+        [
+            PledgeSummary(
+                member_id=member_id, year_id=year_id, pledged=pledged, paid=paid,
+                pledge_count=number, outstanding=max(pledged - paid, ZERO),
+            )
+            for (member_id, year_id), (pledged, paid, number) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_tithe'),
+        ('members', '0003_churchmember_member_status_gender_cell'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PledgeSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pledged', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, help_text='max(pledged - paid, 0); stored so the largest balances can be read from an index.', max_digits=14)),
+                ('pledge_count', models.PositiveIntegerField(default=0)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pledge_summaries', to='members.churchmember')),
+                ('year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pledge_summaries', to='settings.year')),
+            ],
+            options={
+                'verbose_name': 'Pledge Summary',
+                'verbose_name_plural': 'Pledge Summaries',
+                'indexes': [models.Index(fields=['year', '-outstanding'], name='pledge_summary_outstanding')],
+                'constraints': [models.UniqueConstraint(fields=('member', 'year'), name='pledge_summary_member_year')],
+            },
+        ),
+        migrations.RunPython(populate_pledge_summaries, migrations.RunPython.noop),
+    ]
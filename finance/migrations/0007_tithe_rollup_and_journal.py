@@ -0,0 +1,137 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:35
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, Max, OuterRef, Sum
+
+ZERO = Decimal("0")
+BATCH_SIZE = 1000
+
+
+def _posting_period(day, last_closed):
+    """The month an entry dated `day` is booked in: its own, or the first open one."""
+    period = day.replace(day=1)
+    if last_closed is not None and period <= last_closed:
+        period = (last_closed + datetime.timedelta(days=32)).replace(day=1)
+    return period
+
+
+def populate_tithes(apps, schema_editor):
+    """
+    Adds the existing tithes to FinanceDailyRollup (one grouped query) and posts
+    a journal entry (Dr cash / Cr Tithes) for every tithe without one, then
+    recomputes the account balances from the journal lines. Frozen here rather
+    than calling finance/rollup.py and finance/journal.py, which may change.
+    """
+    Tithe = apps.get_model("finance", "Tithe")
+    FinanceDailyRollup = apps.get_model("finance", "FinanceDailyRollup")
+    LedgerAccount = apps.get_model("finance", "LedgerAccount")
+    JournalEntry = apps.get_model("finance", "JournalEntry")
+    JournalLine = apps.get_model("finance", "JournalLine")
+    AccountPeriodBalance = apps.get_model("finance", "AccountPeriodBalance")
+    ClosedPeriod = apps.get_model("finance", "ClosedPeriod")
+
+    # Rollup: one row per day and Year
+    FinanceDailyRollup.objects.filter(kind="TITHE").delete()
+    grouped = (
+        Tithe.objects.order_by()
+        .values("date_given", "year_id")
+        .annotate(rollup_total=Sum("amount"), rollup_count=Count("id"))
+    )
+    FinanceDailyRollup.objects.bulk_create(
+        [
+            FinanceDailyRollup(
+                kind="TITHE", date=row["date_given"], year_id=row["year_id"], mass_name="",
+                total=row["rollup_total"] or ZERO, count=row["rollup_count"],
+            )
+            for row in grouped
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    # Journal: entries for the tithes that have none yet
+    active = JournalEntry.objects.filter(
+        source_kind="TITHE", source_id=OuterRef("pk"), reversal_of__isnull=True, reversal__isnull=True,
+    )
+    records = (
+        Tithe.objects.order_by("pk")
+        .exclude(amount=0)
+        .filter(~Exists(active))
+        .values_list("pk", "date_given", "amount")
+    )
+    if not records.exists():
+        return
+
+    cash_id = LedgerAccount.objects.get_or_create(
+        code="1000", defaults={"name": "Cash at hand", "account_type": "ASSET"},
+    )[0].pk
+    tithes_id = LedgerAccount.objects.get_or_create(
+        code="4400", defaults={"name": "Tithes", "account_type": "INCOME"},
+    )[0].pk
+    last_closed = ClosedPeriod.objects.aggregate(last=Max("period"))["last"]
+
+    def write(batch):
+        entries = JournalEntry.objects.bulk_create([entry for entry, _ in batch])
+        JournalLine.objects.bulk_create(
+            [
+                JournalLine(entry_id=entry.pk, account_id=account_id, debit=debit, credit=credit)
+                for entry, (_, amount) in zip(entries, batch)
+                for account_id, debit, credit in ((cash_id, amount, ZERO), (tithes_id, ZERO, amount))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    batch = []
+    for source_id, day, amount in records.iterator(chunk_size=BATCH_SIZE):
+        batch.append((JournalEntry(
+            source_kind="TITHE", source_id=source_id, date=day, period=_posting_period(day, last_closed),
+            memo=f"Tithes #{source_id}",
+        ), Decimal(str(amount))))
+        if len(batch) >= BATCH_SIZE:
+            write(batch)
+            batch = []
+    if batch:
+        write(batch)
+
+    # Balances: running totals per account and month, from the lines
+    movements = (
+        JournalLine.objects.order_by()
+        .values("account_id", "entry__period")
+        .annotate(total_debit=Sum("debit"), total_credit=Sum("credit"))
+    )
+    balances = []
+    running = defaultdict(lambda: ZERO)
+    for row in sorted(movements, key=lambda row: (row["account_id"], row["entry__period"])):
+        account_id = row["account_id"]
+        debit, credit = row["total_debit"] or ZERO, row["total_credit"] or ZERO
+        balances.append(AccountPeriodBalance(
+            account_id=account_id, period=row["entry__period"], opening=running[account_id],
+            debit=debit, credit=credit,
+        ))
+        running[account_id] += debit - credit
+    AccountPeriodBalance.objects.all().delete()
+    AccountPeriodBalance.objects.bulk_create(balances, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_pledgesummary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='financedailyrollup',
+            name='kind',
+            field=models.CharField(choices=[('OFFERING', 'Offerings'), ('DONATION', 'Donation Item Funds'), ('RENTING', 'Facility Renting'), ('TITHE', 'Tithes'), ('EXPENDITURE', 'Expenditures')], help_text='Which source table this row summarises.', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='journalentry',
+            name='source_kind',
+            field=models.CharField(choices=[('OFFERING', 'Offerings'), ('DONATION', 'Donation Item Funds'), ('RENTING', 'Facility Renting'), ('TITHE', 'Tithes'), ('EXPENDITURE', 'Expenditures')], max_length=12),
+        ),
+        migrations.RunPython(populate_tithes, migrations.RunPython.noop),
+    ]
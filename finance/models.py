@@ -2,6 +2,7 @@
 
 from django.db import models
 from django.utils.timezone import now
+from finance.series import FinanceSeriesManager
 
 class OfferingCategory(models.Model):
     """
@@ -147,6 +148,9 @@ class Offerings(models.Model):
         help_text="The date and time when this offering was last updated."
     )
 
+    # 📈 Time-bucketed totals: .objects.series("month", group_by=...)
+    objects = FinanceSeriesManager()
+
     def save(self, *args, **kwargs):
         """
         Ensure that the offering is assigned to the current year automatically if not provided.
@@ -166,13 +170,19 @@ class Offerings(models.Model):
             f"{self.outstation.name}"
         )
 
-import random
-import string
+    class Meta:
+        indexes = [
+            # Date-range reports per category and the offerings ledger (finance/ledger.py)
+            models.Index(fields=["date_given", "offering_category"], name="offering_date_category"),
+            models.Index(fields=["year", "date_given"], name="offering_year_date"),
+        ]
+
 from datetime import timedelta
 from django.db import models
 from django.utils.timezone import now
 from django.core.validators import MinValueValidator
 from properties.models import ChurchAsset
+from settings.ids import new_id
 from settings.models import Year
 
 
@@ -256,20 +266,10 @@ class FacilityRenting(models.Model):
 
     def generate_receipt_id(self):
         """
-        Generates a unique 10-character receipt ID:
-        - 5 random digits (1-9)
-        - 5 random uppercase letters (A-Z)
-        - Shuffled to ensure randomness
+        Generates a unique 10-character receipt ID of digits (1-9) and
+        uppercase letters (A-Z), see settings/ids.py.
         """
-        while True:
-            digits = ''.join(random.choices('123456789', k=5))
-            letters = ''.join(random.choices(string.ascii_uppercase, k=5))
-            combined = list(digits + letters)
-            random.shuffle(combined)
-            receipt_id = ''.join(combined)
-
-            if not FacilityRenting.objects.filter(receipt_id=receipt_id).exists():
-                return receipt_id
+        return new_id("renting_receipt")
 
     def rental_duration(self):
         """
@@ -443,6 +443,9 @@ class DonationItemFund(models.Model):
         help_text="Timestamp when the donation item fund was last updated."
     )
 
+    # 📈 Time-bucketed totals: .objects.series("month", group_by=...)
+    objects = FinanceSeriesManager()
+
     def save(self, *args, **kwargs):
         """
         Automatically assign the current year if not provided.
@@ -462,6 +465,9 @@ class DonationItemFund(models.Model):
         ordering = ['-date_created']
         verbose_name = "Donation Item Fund"
         verbose_name_plural = "Donation Item Funds"
+        indexes = [
+            models.Index(fields=["year", "contribution_type"], name="donation_fund_year_type"),
+        ]
 
 from django.db import models
 from django.utils.timezone import now
@@ -529,6 +535,12 @@ class Pledge(models.Model):
     def __str__(self):
         return f"{self.member.full_name} - {self.pledge_amount} ({self.year.year}, {self.month})"
 
+    class Meta:
+        indexes = [
+            # Envelope lookups during tithe entry (finance/tithes.py)
+            models.Index(fields=["envelope_number"], name="pledge_envelope_number"),
+        ]
+
 
 from django.db import models
 
@@ -667,6 +679,9 @@ class Expenditure(models.Model):
         help_text="The category under which this expenditure falls."
     )
 
+    # 📈 Time-bucketed totals: .objects.series("month", group_by=...)
+    objects = FinanceSeriesManager()
+
     def __str__(self):
         """
         Show a brief summary including the category name, month/year, and amount.
@@ -678,3 +693,398 @@ class Expenditure(models.Model):
         ordering = ['-date_created']
         verbose_name = "Expenditure"
         verbose_name_plural = "Expenditures"
+        indexes = [
+            # Monthly finance report: expenditures per year, month and category
+            models.Index(fields=["year", "month", "category"], name="expenditure_year_month_cat"),
+        ]
+
+
+from django.db import models
+from settings.models import Year, OutStation
+from properties.models import ChurchAsset
+from finance.models import OfferingCategory, SpecialContribution, Category
+
+class FinanceDailyRollup(models.Model):
+    """
+    Pre-aggregated daily totals of every income/expense table.
+    One row per (kind, date, year, outstation, category/contribution, mass name)
+    holding the sum and count of the source records.
+    Maintained incrementally by finance/signals.py; rebuilt or verified with
+    `python manage.py rebuild_finance_rollup`.
+    """
+
+    OFFERING = "OFFERING"
+    DONATION = "DONATION"
+    RENTING = "RENTING"
+    TITHE = "TITHE"
+    EXPENDITURE = "EXPENDITURE"
+
+    KIND_CHOICES = [
+        (OFFERING, "Offerings"),
+        (DONATION, "Donation Item Funds"),
+        (RENTING, "Facility Renting"),
+        (TITHE, "Tithes"),
+        (EXPENDITURE, "Expenditures"),
+    ]
+
+    kind = models.CharField(
+        max_length=12,
+        choices=KIND_CHOICES,
+        help_text="Which source table this row summarises."
+    )
+    # 📅 date_given / date_created / date_rented / date_taken (local date)
+    date = models.DateField(help_text="Day the source records fall on.")
+    year = models.ForeignKey(
+        Year,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="finance_rollups",
+        help_text="The Year the source records are assigned to."
+    )
+    outstation = models.ForeignKey(
+        OutStation,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="finance_rollups",
+        help_text="Outstation (offerings only)."
+    )
+
+    # 🏷 One of these is set, depending on kind (none for tithes)
+    offering_category = models.ForeignKey(
+        OfferingCategory, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups"
+    )
+    contribution = models.ForeignKey(
+        SpecialContribution, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups"
+    )
+    property_rented = models.ForeignKey(
+        ChurchAsset, on_delete=models.CASCADE, null=True, blank=True, related_name="finance_rollups"
+    )
+    expenditure_category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups"
+    )
+
+    mass_name = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Mass name (offerings and donation item funds)."
+    )
+
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.date}: {self.total} ({self.count})"
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name = "Finance Daily Rollup"
+        verbose_name_plural = "Finance Daily Rollups"
+        indexes = [
+            models.Index(fields=["kind", "date"], name="finance_rollup_kind_date"),
+            models.Index(fields=["kind", "year"], name="finance_rollup_kind_year"),
+        ]
+
+
+from django.conf import settings
+from django.db import models
+from properties.models import ChurchAsset
+from finance.models import OfferingCategory, SpecialContribution, Category
+
+class LedgerAccount(models.Model):
+    """
+    An account of the double-entry journal (finance/journal.py).
+    Cash at hand is one asset account; every offering category, special
+    contribution, rented property and expenditure category gets its own
+    income/expense account the first time a record is posted to it, and all
+    tithes share one "Tithes" income account.
+    """
+
+    ASSET = "ASSET"
+    INCOME = "INCOME"
+    EXPENSE = "EXPENSE"
+
+    ACCOUNT_TYPE_CHOICES = [
+        (ASSET, "Asset"),
+        (INCOME, "Income"),
+        (EXPENSE, "Expense"),
+    ]
+
+    # 🔢 Chart-of-accounts code, e.g. "1000" or "4100-3"
+    code = models.CharField(max_length=20, unique=True)
+    name = models.CharField(max_length=255)
+    account_type = models.CharField(max_length=10, choices=ACCOUNT_TYPE_CHOICES)
+
+    # 🏷 The category this account books (none for cash). SET_NULL keeps the
+    #    account and its history if the category is deleted.
+    offering_category = models.OneToOneField(
+        OfferingCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_account"
+    )
+    contribution = models.OneToOneField(
+        SpecialContribution, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_account"
+    )
+    property_rented = models.OneToOneField(
+        ChurchAsset, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_account"
+    )
+    expenditure_category = models.OneToOneField(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_account"
+    )
+
+    def __str__(self):
+        return f"{self.code} {self.name}"
+
+    class Meta:
+        ordering = ["code"]
+        verbose_name = "Ledger Account"
+        verbose_name_plural = "Ledger Accounts"
+
+
+class JournalEntry(models.Model):
+    """
+    One balanced posting for one income/expense record (Offerings,
+    DonationItemFund, FacilityRenting, Tithe or Expenditure). Entries are never
+    edited: a changed or deleted record is undone by a reversing entry.
+    """
+
+    # 🔗 Source record: FinanceDailyRollup kind + primary key
+    source_kind = models.CharField(max_length=12, choices=FinanceDailyRollup.KIND_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+
+    # 📅 Day of the source record, and the (first day of the) month it is booked in.
+    #    The period is later than the date when the record's own month was already closed.
+    date = models.DateField()
+    period = models.DateField()
+
+    memo = models.CharField(max_length=255, blank=True, default="")
+    reversal_of = models.OneToOneField(
+        "self", on_delete=models.CASCADE, null=True, blank=True, related_name="reversal"
+    )
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_source_kind_display()} #{self.source_id} ({self.date})"
+
+    class Meta:
+        ordering = ["date", "id"]
+        verbose_name = "Journal Entry"
+        verbose_name_plural = "Journal Entries"
+        indexes = [
+            models.Index(fields=["source_kind", "source_id"], name="journal_entry_source"),
+            models.Index(fields=["period"], name="journal_entry_period"),
+        ]
+
+
+class JournalLine(models.Model):
+    """A debit or credit of one account inside a JournalEntry."""
+
+    entry = models.ForeignKey(JournalEntry, on_delete=models.CASCADE, related_name="lines")
+    account = models.ForeignKey(LedgerAccount, on_delete=models.PROTECT, related_name="lines")
+    debit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.account.code}: Dr {self.debit} / Cr {self.credit}"
+
+    class Meta:
+        verbose_name = "Journal Line"
+        verbose_name_plural = "Journal Lines"
+
+
+class AccountPeriodBalance(models.Model):
+    """
+    Running balance of one account for one month, maintained as entries are posted:
+    closing = opening + debit - credit, and `opening` is the closing balance of the
+    account's previous row. A trial balance is one read per account.
+    """
+
+    account = models.ForeignKey(LedgerAccount, on_delete=models.CASCADE, related_name="period_balances")
+    period = models.DateField(help_text="First day of the month.")
+    opening = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    debit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    @property
+    def closing(self):
+        return self.opening + self.debit - self.credit
+
+    def __str__(self):
+        return f"{self.account.code} {self.period:%Y-%m}: {self.closing}"
+
+    class Meta:
+        ordering = ["account", "period"]
+        verbose_name = "Account Period Balance"
+        verbose_name_plural = "Account Period Balances"
+        constraints = [
+            models.UniqueConstraint(fields=["account", "period"], name="account_period_balance_unique"),
+        ]
+
+
+class ClosedPeriod(models.Model):
+    """
+    A month closed with `python manage.py trial_balance --close YYYY-MM`.
+    Its balances no longer change: entries dated in it or any earlier month
+    are booked in the first open month instead.
+    """
+
+    period = models.DateField(unique=True, help_text="First day of the month.")
+    total_debit = models.DecimalField(max_digits=16, decimal_places=2)
+    total_credit = models.DecimalField(max_digits=16, decimal_places=2)
+    closed_at = models.DateTimeField(auto_now_add=True)
+    closed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="closed_periods"
+    )
+
+    def __str__(self):
+        return f"{self.period:%B %Y} (closed {self.closed_at:%Y-%m-%d})"
+
+    class Meta:
+        ordering = ["period"]
+        verbose_name = "Closed Period"
+        verbose_name_plural = "Closed Periods"
+
+
+# finance/models.py
+from django.db import models
+from django.utils.timesince import timesince
+from django.utils.timezone import now
+from settings.ids import new_id
+from settings.models import Year
+from members.models import ChurchMember
+
+
+class Tithe(models.Model):
+    """
+    A tithe (zaka) given by a church member.
+    """
+
+    PAYMENT_METHOD_CHOICES = [
+        ('Cash', 'Cash'),
+        ('Mobile Money', 'Mobile Money'),
+        ('Bank Transfer', 'Bank Transfer'),
+        ('Cheque', 'Cheque'),
+    ]
+
+    # 📅 Year (Automatically Set to the Current Year)
+    year = models.ForeignKey(
+        Year,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="tithes",
+        help_text="The year in which this tithe was recorded."
+    )
+
+    # 👤 Member
+    member = models.ForeignKey(
+        ChurchMember,
+        on_delete=models.CASCADE,
+        related_name="tithes",
+        help_text="The church member who gave the tithe."
+    )
+
+    # 💰 Amount
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text="Amount of the tithe."
+    )
+
+    # 💳 Payment Method
+    payment_method = models.CharField(
+        max_length=20,
+        choices=PAYMENT_METHOD_CHOICES,
+        default='Cash',
+        help_text="How the tithe was paid."
+    )
+
+    # 📅 Date Given (Default: Today)
+    date_given = models.DateField(
+        default=now,
+        help_text="The date the tithe was given."
+    )
+
+    # 🗒️ Purpose
+    purpose = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Optional note about the tithe."
+    )
+
+    # 🧾 Receipt Number (generated)
+    receipt_number = models.CharField(
+        max_length=20,
+        unique=True,
+        editable=False,
+        help_text="Unique receipt number, generated when the tithe is saved."
+    )
+
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        """
+        Assign the current year and a unique receipt number if not provided.
+        """
+        if not self.year:
+            current_year = Year.objects.filter(is_current=True).first()
+            if current_year:
+                self.year = current_year
+        if not self.receipt_number:
+            self.receipt_number = new_id("tithe_receipt")
+        super().save(*args, **kwargs)
+
+    @property
+    def time_since_given(self):
+        return f"{timesince(self.date_given)} ago"
+
+    def __str__(self):
+        return f"{self.member.full_name} - {self.amount} TZS ({self.date_given})"
+
+    class Meta:
+        ordering = ['-date_given', '-id']
+        verbose_name = "Tithe"
+        verbose_name_plural = "Tithes"
+        indexes = [
+            models.Index(fields=["member", "date_given"], name="tithe_member_date"),
+            models.Index(fields=["date_given"], name="tithe_date_given"),
+        ]
+
+
+class PledgeSummary(models.Model):
+    """
+    Pledged / paid / outstanding totals of one member for one year, maintained
+    incrementally from Pledge and Tithe (finance/pledges.py).
+    """
+
+    member = models.ForeignKey(ChurchMember, on_delete=models.CASCADE, related_name="pledge_summaries")
+    year = models.ForeignKey(Year, on_delete=models.CASCADE, related_name="pledge_summaries")
+    pledged = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    outstanding = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0,
+        help_text="max(pledged - paid, 0); stored so the largest balances can be read from an index."
+    )
+    pledge_count = models.PositiveIntegerField(default=0)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    @property
+    def percent_paid(self):
+        if not self.pledged:
+            return None
+        return min(self.paid / self.pledged * 100, 100)
+
+    def __str__(self):
+        return f"{self.member.full_name} {self.year.year}: {self.paid} of {self.pledged}"
+
+    class Meta:
+        verbose_name = "Pledge Summary"
+        verbose_name_plural = "Pledge Summaries"
+        constraints = [
+            models.UniqueConstraint(fields=["member", "year"], name="pledge_summary_member_year"),
+        ]
+        indexes = [
+            # Largest outstanding balances of a year first
+            models.Index(fields=["year", "-outstanding"], name="pledge_summary_outstanding"),
+        ]
@@ -0,0 +1,212 @@
+# finance/pledges.py
+"""
+Pledge fulfilment: how much of what each member pledged for a year has been paid.
+
+PledgeSummary holds one row per (member, year):
+
+    pledged      pledge_amount + pledge_for_construction of the member's pledges of that year
+    paid         the member's tithes of that year (the only payments recorded per member)
+    outstanding  max(pledged - paid, 0), stored so "largest balances first" is an index scan
+
+The rows are kept up to date incrementally, like FinanceDailyRollup:
+
+- Pledge / Tithe save and delete signals (finance/signals.py) move a record's
+  amounts from its previous (member, year) row to its current one.
+- Code that bulk_creates pledges or tithes calls apply_summary_deltas().
+- rebuild_pledge_summaries() recomputes everything from the source tables and
+  verify_pledge_summaries() lists differences (`manage.py rebuild_pledge_summaries`).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Greatest
+
+ZERO = Decimal("0")
+
+# Models whose records count towards the summary rows (see summary_entry)
+SUMMARY_SOURCES = ("Pledge", "Tithe")
+
+
+def summary_entry(instance):
+    """((member_id, year_id), pledged, paid, pledge count) for a Pledge or Tithe, or None."""
+    if instance.member_id is None or instance.year_id is None:
+        return None
+    key = (instance.member_id, instance.year_id)
+    if type(instance).__name__ == "Pledge":
+        pledged = (instance.pledge_amount or ZERO) + (instance.pledge_for_construction or ZERO)
+        return key, Decimal(pledged), ZERO, 1
+    return key, ZERO, Decimal(instance.amount or ZERO), 0
+
+
+def apply_summary_delta(key, pledged=ZERO, paid=ZERO, pledges=0):
+    """Adds the given amounts (negative to remove) to the (member, year) row."""
+    from finance.models import PledgeSummary
+
+    member_id, year_id = key
+    with transaction.atomic():
+        rows = PledgeSummary.objects.filter(member_id=member_id, year_id=year_id)
+        updated = rows.update(
+            pledged=F("pledged") + pledged,
+            paid=F("paid") + paid,
+            pledge_count=F("pledge_count") + pledges,
+            outstanding=Greatest(F("pledged") + pledged - F("paid") - paid, Value(ZERO)),
+        )
+        if not updated:
+            if pledges > 0 or paid > 0:
+                PledgeSummary.objects.create(
+                    member_id=member_id,
+                    year_id=year_id,
+                    pledged=pledged,
+                    paid=paid,
+                    pledge_count=pledges,
+                    outstanding=max(pledged - paid, ZERO),
+                )
+            return
+        rows.filter(pledge_count__lte=0, paid__lte=0).delete()
+
+
+def summary_deltas(records):
+    """{(member_id, year_id): [pledged, paid, pledges]} for unsaved-or-new records."""
+    deltas = defaultdict(lambda: [ZERO, ZERO, 0])
+    for record in records:
+        entry = summary_entry(record)
+        if entry is None:
+            continue
+        key, pledged, paid, pledges = entry
+        delta = deltas[key]
+        delta[0] += pledged
+        delta[1] += paid
+        delta[2] += pledges
+    return deltas
+
+
+def apply_summary_deltas(deltas):
+    """
+    Bulk version of apply_summary_delta() for newly added records: the existing
+    rows of the touched members are read in one query, then updated with one
+    bulk_update and the missing ones added with one bulk_create.
+    """
+    from finance.models import PledgeSummary
+
+    if not deltas:
+        return
+    with transaction.atomic():
+        member_ids = {member_id for member_id, _ in deltas}
+        year_ids = {year_id for _, year_id in deltas}
+        existing = {
+            (row.member_id, row.year_id): row
+            for row in PledgeSummary.objects.select_for_update().filter(
+                member_id__in=member_ids, year_id__in=year_ids
+            )
+        }
+
+        changed, new = [], []
+        for key, (pledged, paid, pledges) in deltas.items():
+            row = existing.get(key)
+            if row is None:
+                row = PledgeSummary(member_id=key[0], year_id=key[1], pledged=ZERO, paid=ZERO, pledge_count=0)
+                new.append(row)
+            else:
+                changed.append(row)
+            row.pledged += pledged
+            row.paid += paid
+            row.pledge_count += pledges
+            row.outstanding = max(row.pledged - row.paid, ZERO)
+
+        PledgeSummary.objects.bulk_update(changed, ["pledged", "paid", "pledge_count", "outstanding"], batch_size=1000)
+        PledgeSummary.objects.bulk_create(new, batch_size=1000)
+
+
+# ------------------------------------------------------------------
+# Rebuilding and checking
+# ------------------------------------------------------------------
+
+def _source_totals(apps):
+    """{(member_id, year_id): [pledged, paid, pledges]} computed from Pledge and Tithe."""
+    Pledge = apps.get_model("finance", "Pledge")
+    Tithe = apps.get_model("finance", "Tithe")
+
+    totals = defaultdict(lambda: [ZERO, ZERO, 0])
+    pledges = Pledge.objects.values("member_id", "year_id").annotate(
+        pledged=Sum(F("pledge_amount") + F("pledge_for_construction")),
+        number=Count("id"),
+    )
+    for row in pledges:
+        total = totals[(row["member_id"], row["year_id"])]
+        total[0] += Decimal(row["pledged"] or ZERO)
+        total[2] += row["number"]
+
+    tithes = Tithe.objects.filter(year__isnull=False).values("member_id", "year_id").annotate(paid=Sum("amount"))
+    for row in tithes:
+        totals[(row["member_id"], row["year_id"])][1] += Decimal(row["paid"] or ZERO)
+    return totals
+
+
+def rebuild_pledge_summaries(apps=global_apps):
+    """Recomputes every PledgeSummary row from the source tables; returns the row count."""
+    PledgeSummary = apps.get_model("finance", "PledgeSummary")
+
+    totals = _source_totals(apps)
+    with transaction.atomic():
+        PledgeSummary.objects.all().delete()
+        PledgeSummary.objects.bulk_create(
+            [
+                PledgeSummary(
+                    member_id=member_id,
+                    year_id=year_id,
+                    pledged=pledged,
+                    paid=paid,
+                    pledge_count=pledges,
+                    outstanding=max(pledged - paid, ZERO),
+                )
+                for (member_id, year_id), (pledged, paid, pledges) in totals.items()
+            ],
+            batch_size=1000,
+        )
+    return len(totals)
+
+
+def verify_pledge_summaries():
+    """[(member_id, year_id, stored row values, expected values)] for every row that differs."""
+    from finance.models import PledgeSummary
+
+    expected = {
+        key: (pledged, paid, pledges, max(pledged - paid, ZERO))
+        for key, (pledged, paid, pledges) in _source_totals(global_apps).items()
+    }
+    stored = {
+        (row["member_id"], row["year_id"]): (row["pledged"], row["paid"], row["pledge_count"], row["outstanding"])
+        for row in PledgeSummary.objects.values("member_id", "year_id", "pledged", "paid", "pledge_count", "outstanding")
+    }
+    return [
+        (*key, stored.get(key), expected.get(key))
+        for key in sorted(expected.keys() | stored.keys())
+        if stored.get(key) != expected.get(key)
+    ]
+
+
+# ------------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------------
+
+FULFILMENT_ORDERINGS = {
+    "outstanding": ("-outstanding", "id"),
+    "pledged": ("-pledged", "id"),
+    "paid": ("-paid", "id"),
+    "name": ("member__full_name", "id"),
+}
+
+
+def fulfilment_queryset(year=None, search="", order="outstanding"):
+    """PledgeSummary rows of one year (all years if None), filtered by member name / ID and sorted."""
+    from finance.models import PledgeSummary
+
+    rows = PledgeSummary.objects.select_related("member", "year").filter(pledge_count__gt=0)
+    if year is not None:
+        rows = rows.filter(year=year)
+    if search:
+        rows = rows.filter(Q(member__full_name__icontains=search) | Q(member__member_id__iexact=search))
+    return rows.order_by(*FULFILMENT_ORDERINGS.get(order, FULFILMENT_ORDERINGS["outstanding"]))
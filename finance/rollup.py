@@ -0,0 +1,271 @@
+# finance/rollup.py
+"""
+Maintenance of FinanceDailyRollup.
+
+- rollup_entry()        -> the rollup key + amount a single source record contributes.
+- apply_rollup_delta()  -> add/subtract one record's contribution (used by finance/signals.py).
+- apply_rollup_deltas() -> add many new records' contributions at once (bulk imports).
+- rebuild_rollup()      -> recompute the whole table from the source tables.
+- verify_rollup()       -> compare the table against the source tables.
+
+Bulk operations on the source tables do not send signals. Code that
+bulk_creates source records sums their rollup_entry() per freeze_key() and
+passes the totals to apply_rollup_deltas() (see finance.importer.save_offerings);
+after bulk updates or deletes, run rebuild_rollup() (or the management command).
+"""
+import datetime
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# kind -> how to read a source model into the rollup dimensions
+ROLLUP_SOURCES = {
+    "OFFERING": {
+        "model": "Offerings",
+        "date": "date_given",
+        "amount": "amount",
+        "dimensions": {"year": "year", "outstation": "outstation", "offering_category": "offering_category"},
+        "mass_name": True,
+    },
+    "DONATION": {
+        "model": "DonationItemFund",
+        "date": "date_created",
+        "amount": "amount",
+        "dimensions": {"year": "year", "contribution": "contribution_type"},
+        "mass_name": True,
+    },
+    "RENTING": {
+        "model": "FacilityRenting",
+        "date": "date_rented",
+        "amount": "amount",
+        "dimensions": {"year": "year", "property_rented": "property_rented"},
+        "mass_name": False,
+    },
+    "TITHE": {
+        "model": "Tithe",
+        "date": "date_given",
+        "amount": "amount",
+        "dimensions": {"year": "year"},
+        "mass_name": False,
+    },
+    "EXPENDITURE": {
+        "model": "Expenditure",
+        "date": "date_taken",
+        "amount": "expenditure_amount",
+        "dimensions": {"year": "year", "expenditure_category": "category"},
+        "mass_name": False,
+    },
+}
+
+# Every key column of FinanceDailyRollup
+ROLLUP_KEY_FIELDS = (
+    "kind", "date", "year_id", "outstation_id", "offering_category_id",
+    "contribution_id", "property_rented_id", "expenditure_category_id", "mass_name",
+)
+
+
+def source_models(apps=None):
+    """
+    Yields (kind, source, model) for every ROLLUP_SOURCES entry. In a migration
+    (`apps` given), sources whose table does not exist yet at that point are skipped.
+    """
+    apps = apps or global_apps
+    for kind, source in ROLLUP_SOURCES.items():
+        try:
+            model = apps.get_model("finance", source["model"])
+        except LookupError:
+            continue
+        yield kind, source, model
+
+
+def kind_for_model(model):
+    """Returns the rollup kind for a source model class, or None."""
+    for kind, source in ROLLUP_SOURCES.items():
+        if model.__name__ == source["model"] and model._meta.app_label == "finance":
+            return kind
+    return None
+
+
+def _as_local_date(value):
+    """Dates as the database stores them: aware datetimes in the default timezone."""
+    if isinstance(value, datetime.datetime):
+        if settings.USE_TZ and timezone.is_aware(value):
+            value = timezone.make_naive(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def _empty_key(kind):
+    key = dict.fromkeys(ROLLUP_KEY_FIELDS)
+    key["kind"] = kind
+    key["mass_name"] = ""
+    return key
+
+
+def rollup_entry(instance, kind=None):
+    """
+    Returns (key, amount) for one source record: the rollup row it belongs to
+    and the amount it contributes.
+    """
+    kind = kind or kind_for_model(type(instance))
+    source = ROLLUP_SOURCES[kind]
+
+    key = _empty_key(kind)
+    key["date"] = _as_local_date(getattr(instance, source["date"]))
+    for dimension, field in source["dimensions"].items():
+        key[f"{dimension}_id"] = getattr(instance, f"{field}_id")
+    if source["mass_name"]:
+        key["mass_name"] = getattr(instance, "mass_name") or ""
+
+    amount = Decimal(str(getattr(instance, source["amount"]) or 0))
+    return key, amount
+
+
+def apply_rollup_delta(key, amount, count):
+    """
+    Adds (count > 0) or removes (count < 0) `count` records totalling `amount`
+    to/from the rollup row identified by `key`.
+    Removing never creates rows; rows that drop to zero records are deleted.
+    """
+    from finance.models import FinanceDailyRollup
+
+    with transaction.atomic():
+        rows = FinanceDailyRollup.objects.filter(**key)
+        pk = rows.select_for_update().values_list("pk", flat=True).first()
+
+        if pk is None:
+            if count > 0:
+                FinanceDailyRollup.objects.create(**key, total=amount, count=count)
+            return
+
+        FinanceDailyRollup.objects.filter(pk=pk).update(
+            total=F("total") + amount,
+            count=F("count") + count,
+        )
+        if count < 0:
+            FinanceDailyRollup.objects.filter(pk=pk, count__lte=0).delete()
+
+
+def freeze_key(key):
+    """A rollup key dict as a hashable tuple (in ROLLUP_KEY_FIELDS order)."""
+    return tuple(key[field] for field in ROLLUP_KEY_FIELDS)
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Bulk version of apply_rollup_delta() for newly added records (e.g. after a
+    bulk_create): `deltas` maps freeze_key(key) -> (amount, count). The existing
+    rows of those days are read (and locked) in one query; the touched ones are
+    replaced, together with the new ones, by one bulk_create.
+    """
+    from finance.models import FinanceDailyRollup
+
+    if not deltas:
+        return
+    kinds = {frozen[0] for frozen in deltas}
+    dates = {frozen[1] for frozen in deltas}
+
+    with transaction.atomic():
+        existing = {}
+        stored = (
+            FinanceDailyRollup.objects.select_for_update().filter(kind__in=kinds, date__in=dates)
+            .values_list(*ROLLUP_KEY_FIELDS, "pk", "total", "count")
+        )
+        for *frozen, pk, total, count in stored:
+            existing.setdefault(tuple(frozen), (pk, total, count))
+
+        replaced, rows = [], []
+        for frozen, (amount, count) in deltas.items():
+            if frozen in existing:
+                pk, stored_total, stored_count = existing[frozen]
+                replaced.append(pk)
+                amount, count = stored_total + amount, stored_count + count
+            rows.append(FinanceDailyRollup(**dict(zip(ROLLUP_KEY_FIELDS, frozen)), total=amount, count=count))
+        for start in range(0, len(replaced), 500):
+            FinanceDailyRollup.objects.filter(pk__in=replaced[start:start + 500]).delete()
+        FinanceDailyRollup.objects.bulk_create(rows, batch_size=500)
+
+
+def source_rollup_rows(apps=None):
+    """
+    Aggregates the source tables into rollup rows (one grouped query per table).
+    Yields (key, total, count). `apps` allows use from migrations.
+    """
+    for kind, source, model in source_models(apps):
+        date_field = model._meta.get_field(source["date"])
+        if date_field.get_internal_type() == "DateTimeField":
+            rollup_date = TruncDate(source["date"])
+        else:
+            rollup_date = F(source["date"])
+
+        group_fields = {"rollup_date": rollup_date}
+        for dimension, field in source["dimensions"].items():
+            group_fields[f"rollup_{dimension}"] = F(f"{field}_id")
+        if source["mass_name"]:
+            group_fields["rollup_mass_name"] = F("mass_name")
+
+        rows = (
+            model.objects.order_by()
+            .annotate(**group_fields)
+            .values(*group_fields)
+            .annotate(rollup_total=Sum(source["amount"]), rollup_count=Count("id"))
+        )
+        for row in rows:
+            key = _empty_key(kind)
+            key["date"] = row["rollup_date"]
+            for dimension in source["dimensions"]:
+                key[f"{dimension}_id"] = row[f"rollup_{dimension}"]
+            if source["mass_name"]:
+                key["mass_name"] = row["rollup_mass_name"] or ""
+            yield key, row["rollup_total"] or Decimal("0"), row["rollup_count"]
+
+
+def rebuild_rollup(apps=None, batch_size=1000):
+    """
+    Recomputes FinanceDailyRollup from scratch. Returns the number of rows written.
+    """
+    apps = apps or global_apps
+    rollup_model = apps.get_model("finance", "FinanceDailyRollup")
+
+    with transaction.atomic():
+        rollup_model.objects.all().delete()
+        rows = [
+            rollup_model(**key, total=total, count=count)
+            for key, total, count in source_rollup_rows(apps)
+        ]
+        rollup_model.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def verify_rollup():
+    """
+    Compares FinanceDailyRollup with the source tables.
+    Returns a list of (key, expected (total, count), actual (total, count)) mismatches.
+    """
+    from finance.models import FinanceDailyRollup
+
+    expected = {}
+    for key, total, count in source_rollup_rows():
+        expected[freeze_key(key)] = (Decimal(total), count)
+
+    actual = {}
+    stored = (
+        FinanceDailyRollup.objects.order_by()
+        .values(*ROLLUP_KEY_FIELDS)
+        .annotate(sum_total=Sum("total"), sum_count=Sum("count"))
+    )
+    for row in stored:
+        actual[freeze_key(row)] = (Decimal(row["sum_total"]), row["sum_count"])
+
+    mismatches = []
+    for frozen in sorted(set(expected) | set(actual), key=str):
+        want = expected.get(frozen, (Decimal("0"), 0))
+        got = actual.get(frozen, (Decimal("0"), 0))
+        if want[0].quantize(Decimal("0.01")) != got[0].quantize(Decimal("0.01")) or want[1] != got[1]:
+            mismatches.append((dict(zip(ROLLUP_KEY_FIELDS, frozen)), want, got))
+    return mismatches
@@ -0,0 +1,132 @@
+# finance/series.py
+"""
+Time-bucketed totals for Offerings, DonationItemFund and Expenditure.
+
+    Offerings.objects.series("month", start=date(2025, 1, 1), group_by="mass_name")
+
+runs ONE grouped query over FinanceDailyRollup (truncating its daily rows to
+the bucket) and returns a list of dicts:
+
+    {"period": date, "group": <value or None>, "total": Decimal, "count": int}
+
+ordered by period, then group. `period` is the first day of the bucket
+(ISO weeks start on Monday).
+
+Through a related manager the series covers that object's records only:
+
+    category.offerings.series("month")      # one offering category
+"""
+from django.db import models
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+
+SERIES_BUCKETS = {
+    "day": TruncDay,
+    "week": TruncWeek,   # ISO week (Monday)
+    "month": TruncMonth,
+    "year": TruncYear,
+}
+
+# Source field -> FinanceDailyRollup field, per rollup kind
+SERIES_GROUPINGS = {
+    "OFFERING": {
+        "mass_name": "mass_name",
+        "outstation": "outstation",
+        "offering_category": "offering_category",
+        "category": "offering_category",
+        "year": "year",
+    },
+    "DONATION": {
+        "mass_name": "mass_name",
+        "contribution_type": "contribution",
+        "year": "year",
+    },
+    "EXPENDITURE": {
+        "category": "expenditure_category",
+        "year": "year",
+    },
+}
+
+
+def _rollup_group_field(kind, group_by):
+    """
+    Maps a source-model lookup ("outstation", "outstation__name", ...) to the rollup.
+    """
+    head, _, rest = group_by.partition("__")
+    try:
+        field = SERIES_GROUPINGS[kind][head]
+    except KeyError:
+        allowed = ", ".join(sorted(SERIES_GROUPINGS[kind]))
+        raise ValueError(f"Cannot group this series by '{group_by}'. Choose one of: {allowed}.")
+    return f"{field}__{rest}" if rest else field
+
+
+def _rollup_filters(kind, filters):
+    """Maps {source field: value} (a related manager's filter) to rollup fields."""
+    mapped = {}
+    for field, value in (filters or {}).items():
+        try:
+            mapped[SERIES_GROUPINGS[kind][field]] = value
+        except KeyError:
+            raise ValueError(f"The rollup cannot narrow this series by '{field}'; query the table instead.")
+    return mapped
+
+
+def bucket_series(kind, bucket="day", start=None, end=None, group_by=None, filters=None):
+    """
+    Sums of rollup `kind` per `bucket` ("day", "week", "month", "year") between
+    `start` and `end` (inclusive dates, both optional), optionally grouped by a
+    field and narrowed by `filters` ({source field: value}, e.g. {"category": category}).
+    """
+    from finance.models import FinanceDailyRollup
+
+    try:
+        trunc = SERIES_BUCKETS[bucket]
+    except KeyError:
+        raise ValueError(f"Unknown bucket '{bucket}'. Choose one of: {', '.join(SERIES_BUCKETS)}.")
+
+    qs = FinanceDailyRollup.objects.filter(kind=kind, **_rollup_filters(kind, filters))
+    if start:
+        qs = qs.filter(date__gte=start)
+    if end:
+        qs = qs.filter(date__lte=end)
+
+    group_fields = {"period": trunc("date", output_field=models.DateField())}
+    if group_by:
+        group_fields["group"] = F(_rollup_group_field(kind, group_by))
+
+    rows = (
+        qs.order_by()
+        .annotate(**group_fields)
+        .values(*group_fields)
+        .annotate(sum_total=Sum("total"), sum_count=Sum("count"))
+        .order_by(*group_fields)
+    )
+    return [
+        {
+            "period": row["period"],
+            "group": row.get("group"),
+            "total": row["sum_total"] or 0,
+            "count": row["sum_count"] or 0,
+        }
+        for row in rows
+    ]
+
+
+class FinanceSeriesManager(models.Manager):
+    """
+    Default manager for the income/expense models: adds .series(...) on top of
+    the usual queryset API. The rollup kind is looked up from the model, so the
+    manager takes no arguments and Django can also use it as the base of
+    related managers (category.offerings, ...). A related manager narrows the
+    series to its object; one the rollup has no column for (member.offerings_collected)
+    raises ValueError rather than returning the whole table.
+    """
+
+    def series(self, bucket="day", start=None, end=None, group_by=None):
+        from finance.rollup import kind_for_model
+
+        return bucket_series(
+            kind_for_model(self.model), bucket=bucket, start=start, end=end, group_by=group_by,
+            filters=getattr(self, "core_filters", None),
+        )
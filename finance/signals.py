@@ -0,0 +1,109 @@
+# finance/signals.py
+from django.apps import apps
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .journal import post_entry_for_record, reverse_entry_for_record
+from .pledges import SUMMARY_SOURCES, apply_summary_delta, summary_entry
+from .rollup import ROLLUP_SOURCES, apply_rollup_delta, kind_for_model, rollup_entry
+
+
+def remember_previous_rollup_entry(sender, instance, raw=False, **kwargs):
+    """Before an update, keep the rollup entry of the stored row so it can be subtracted."""
+    instance._rollup_previous = None
+    if raw or instance.pk is None:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._rollup_previous = rollup_entry(previous, kind_for_model(sender))
+
+
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    """Move the record's amount from its old rollup row (if any) to its current one."""
+    if raw:
+        return
+    kind = kind_for_model(sender)
+    previous = getattr(instance, "_rollup_previous", None)
+    current = rollup_entry(instance, kind)
+
+    if previous == current:
+        return
+    if previous is not None:
+        apply_rollup_delta(previous[0], -previous[1], -1)
+    apply_rollup_delta(current[0], current[1], 1)
+    instance._rollup_previous = current
+
+
+def update_rollup_on_delete(sender, instance, **kwargs):
+    key, amount = rollup_entry(instance, kind_for_model(sender))
+    apply_rollup_delta(key, -amount, -1)
+
+
+def connect_rollup_signals():
+    for source in ROLLUP_SOURCES.values():
+        model = apps.get_model("finance", source["model"])
+        label = model._meta.label
+        pre_save.connect(remember_previous_rollup_entry, sender=model, dispatch_uid=f"rollup-pre-save-{label}")
+        post_save.connect(update_rollup_on_save, sender=model, dispatch_uid=f"rollup-save-{label}")
+        post_delete.connect(update_rollup_on_delete, sender=model, dispatch_uid=f"rollup-delete-{label}")
+
+
+def post_journal_entry_on_save(sender, instance, raw=False, **kwargs):
+    """Post the record to the journal, reversing its previous entry if it changed."""
+    if raw:
+        return
+    post_entry_for_record(instance)
+
+
+def reverse_journal_entry_on_delete(sender, instance, **kwargs):
+    reverse_entry_for_record(instance)
+
+
+def connect_journal_signals():
+    for source in ROLLUP_SOURCES.values():
+        model = apps.get_model("finance", source["model"])
+        label = model._meta.label
+        post_save.connect(post_journal_entry_on_save, sender=model, dispatch_uid=f"journal-save-{label}")
+        post_delete.connect(reverse_journal_entry_on_delete, sender=model, dispatch_uid=f"journal-delete-{label}")
+
+
+def remember_previous_summary_entry(sender, instance, raw=False, **kwargs):
+    """Before an update, keep the pledge summary entry of the stored row so it can be subtracted."""
+    instance._summary_previous = None
+    if raw or instance.pk is None:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._summary_previous = summary_entry(previous)
+
+
+def update_pledge_summary_on_save(sender, instance, raw=False, **kwargs):
+    """Move the pledge / tithe amount from its old (member, year) summary row to its current one."""
+    if raw:
+        return
+    previous = getattr(instance, "_summary_previous", None)
+    current = summary_entry(instance)
+
+    if previous == current:
+        return
+    if previous is not None:
+        key, pledged, paid, pledges = previous
+        apply_summary_delta(key, -pledged, -paid, -pledges)
+    if current is not None:
+        apply_summary_delta(*current)
+    instance._summary_previous = current
+
+
+def update_pledge_summary_on_delete(sender, instance, **kwargs):
+    entry = summary_entry(instance)
+    if entry is not None:
+        key, pledged, paid, pledges = entry
+        apply_summary_delta(key, -pledged, -paid, -pledges)
+
+
+def connect_pledge_summary_signals():
+    for model_name in SUMMARY_SOURCES:
+        model = apps.get_model("finance", model_name)
+        label = model._meta.label
+        pre_save.connect(remember_previous_summary_entry, sender=model, dispatch_uid=f"pledge-summary-pre-save-{label}")
+        post_save.connect(update_pledge_summary_on_save, sender=model, dispatch_uid=f"pledge-summary-save-{label}")
+        post_delete.connect(update_pledge_summary_on_delete, sender=model, dispatch_uid=f"pledge-summary-delete-{label}")
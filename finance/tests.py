@@ -1,3 +1,80 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from finance.models import (
+    Category, DonationItemFund, Expenditure, FacilityRenting,
+    OfferingCategory, Offerings, SpecialContribution,
+)
+from properties.models import ChurchAsset
+from settings.models import OutStation, Year
+
+
+class GeneralReportCarryForwardTests(TestCase):
+    """Table I: each month opens with the balance the month before closed with."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        this_month = today.replace(day=1)
+        last_month = (this_month - timedelta(days=1)).replace(day=1)
+        month_before = (last_month - timedelta(days=1)).replace(day=1)
+        cls.months = [month_before, last_month, this_month]
+
+        years = {}
+        for month in cls.months:
+            if month.year not in years:
+                years[month.year] = Year.objects.create(year=month.year, is_current=month.year == today.year)
+        outstation = OutStation.objects.create(name="Main", location="Town")
+        offering_category = OfferingCategory.objects.create(name="Sunday")
+        expenditure_category = Category.objects.create(name="Utilities")
+        contribution = SpecialContribution.objects.create(contribution_type="JIMBO", name="Building")
+        asset = ChurchAsset.objects.create(
+            name="Hall", asset_type="Building", quantity_name="Pieces", status="Good", value=Decimal("1000"),
+        )
+
+        for index, month in enumerate(cls.months):
+            day = month + timedelta(days=1)
+            Offerings.objects.create(
+                year=years[month.year], date_given=day, service_time="Morning", amount=Decimal(1000 * (index + 1)),
+                mass_name="First Mass", offering_category=offering_category, outstation=outstation,
+            )
+            Expenditure.objects.create(
+                year=years[month.year], month=month.strftime("%B"),
+                date_taken=timezone.make_aware(timezone.datetime(day.year, day.month, day.day, 12)),
+                expenditure_amount=Decimal(300 * (index + 1)), category=expenditure_category,
+            )
+            # Renting is not listed in Tables A-D/H, so it must not be carried either
+            FacilityRenting.objects.create(
+                year=years[month.year], property_rented=asset, rentor_name="Guest",
+                amount=Decimal("5000"), date_rented=day,
+            )
+        # Donations are dated when they are recorded (this month)
+        DonationItemFund.objects.create(
+            contribution_type=contribution, year=years[today.year], period="This month",
+            mass_name="First Mass", amount=Decimal("700"),
+        )
+
+        cls.admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password")
+
+    def report(self, month):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("finance_general_report"), {"year": month.year, "month": month.month}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.context
+
+    def test_closing_balance_is_next_months_opening_balance(self):
+        reports = [self.report(month) for month in self.months]
 
-# Create your tests here.
+        self.assertEqual(reports[0]["previous_balance"], 0)
+        for current, following in zip(reports, reports[1:]):
+            self.assertEqual(current["overall_total_remained"], following["previous_balance"])
+        # 700 + 1400 carried, then 3000 + 700 in less 900 out
+        self.assertEqual(reports[2]["previous_balance"], Decimal("2100"))
+        self.assertEqual(reports[2]["overall_total_remained"], Decimal("4900"))
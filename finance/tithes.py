@@ -0,0 +1,243 @@
+# finance/tithes.py
+"""
+Bulk tithe entry.
+
+    members = resolve_members(["0754123456", "123", "AB12..."])   # one query
+    result = create_tithes(rows, defaults={"date_given": "2025-03-02"})
+    result["ok"], result["created"], result["results"]           # per-row outcome
+
+A member can be given by member ID, phone number (any common spelling:
+0754..., 754..., +255 754...) or pledge envelope number. All identifiers of a
+batch are resolved by one UNION query in which each branch is an index lookup
+(ChurchMember.member_id / phone_number are unique, Pledge.envelope_number has
+the pledge_envelope_number index). An envelope reused over the years belongs
+to the member of its latest pledge.
+
+create_tithes() validates every row first; only if all rows are valid are they
+written, with one bulk_create inside a transaction (receipt numbers are
+reserved as one block, settings/ids.py; the pledge fulfilment summary,
+finance/pledges.py, the daily rollup and the journal are updated the same way
+as for imported offerings). Otherwise nothing is saved
+and the per-row errors are returned.
+
+import_tithes() streams a CSV/XLSX file (finance/importer.py readers) in chunks
+of IMPORT_CHUNK_SIZE: the members of a chunk are resolved with one
+resolve_members() query and its valid rows saved as above; invalid rows are
+reported with their row number and skipped.
+
+    result = import_tithes(upload)
+    result.created, result.errors
+
+Columns (header row, any order, case-insensitive):
+    member* (member ID, phone or envelope number), amount*, date_given*,
+    payment_method (default Cash), purpose
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import CharField, F, IntegerField, Value
+from django.utils import timezone
+
+from finance.importer import (
+    IMPORT_CHUNK_SIZE, ImportFileError, ImportResult, _text, normalise_phone, parse_amount, parse_any_date, read_rows,
+)
+from finance.journal import post_new_records
+from finance.models import Pledge, Tithe
+from finance.pledges import apply_summary_deltas, summary_deltas
+from finance.rollup import apply_rollup_deltas, freeze_key, rollup_entry
+from members.models import ChurchMember
+from settings.ids import assign_ids, is_typed_id_acceptable
+from settings.models import Year
+
+MAX_BULK_TITHES = 500
+
+PAYMENT_METHODS = {value.lower(): value for value, _ in Tithe.PAYMENT_METHOD_CHOICES}
+
+# Order in which a matching identifier wins
+_LOOKUP_PRIORITY = {"member_id": 0, "envelope": 1, "phone": 2}
+
+IMPORT_REQUIRED_COLUMNS = ("member", "amount", "date_given")
+
+
+def resolve_members(identifiers):
+    """
+    {identifier: {"id", "name", "member_id", "status", "via"} or None} for the
+    given member IDs / phone numbers / envelope numbers, with one query.
+    """
+    identifiers = {_text(identifier) for identifier in identifiers} - {""}
+    if not identifiers:
+        return {}
+    # Phone numbers are matched as typed and in the 255... form; several
+    # spellings of one number ("0688758006", "688758006") share a key
+    phones = defaultdict(set)
+    for identifier in identifiers:
+        phones[identifier].add(identifier)
+        phones[normalise_phone(identifier)].add(identifier)
+    phones.pop("", None)
+
+    columns = ("key", "via", "year_number", "member_pk", "member_name", "member_code", "member_status")
+    member_columns = {
+        "year_number": Value(None, output_field=IntegerField()),
+        "member_pk": F("pk"),
+        "member_name": F("full_name"),
+        "member_code": F("member_id"),
+        "member_status": F("status"),
+    }
+    # Member IDs with a wrong check character are typing mistakes: not looked up
+    member_ids = [identifier for identifier in identifiers if is_typed_id_acceptable("member", identifier)]
+    by_member_id = ChurchMember.objects.filter(member_id__in=member_ids).annotate(
+        key=F("member_id"), via=Value("member_id", output_field=CharField()), **member_columns
+    ).values_list(*columns)
+    by_phone = ChurchMember.objects.filter(phone_number__in=phones).annotate(
+        key=F("phone_number"), via=Value("phone", output_field=CharField()), **member_columns
+    ).values_list(*columns)
+    by_envelope = Pledge.objects.filter(envelope_number__in=identifiers).annotate(
+        key=F("envelope_number"), via=Value("envelope", output_field=CharField()),
+        year_number=F("year__year"), member_pk=F("member_id"), member_name=F("member__full_name"),
+        member_code=F("member__member_id"), member_status=F("member__status"),
+    ).values_list(*columns)
+
+    found = {}
+    for key, via, year_number, pk, name, member_id, status in by_member_id.union(by_phone, by_envelope, all=True):
+        rank = (_LOOKUP_PRIORITY[via], -(year_number or 0))
+        for identifier in phones[key] if via == "phone" else (key,):
+            if identifier not in found or rank < found[identifier][0]:
+                found[identifier] = (rank, {"id": pk, "name": name, "member_id": member_id, "status": status, "via": via})
+
+    return {identifier: found[identifier][1] if identifier in found else None for identifier in identifiers}
+
+
+def _validate(row, defaults, members, years, current_year):
+    """(unsaved Tithe, None) for a valid row, or (None, {field: message})."""
+    errors = {}
+    value = lambda field: row.get(field) if _text(row.get(field)) else defaults.get(field)
+
+    identifier = _text(row.get("member"))
+    member = members.get(identifier)
+    if not identifier:
+        errors["member"] = "Enter a member ID, phone or envelope number."
+    elif member is None:
+        errors["member"] = f"No member found for '{identifier}'."
+
+    amount = parse_amount(row.get("amount"))
+    if amount is None:
+        errors["amount"] = "Enter a positive amount below 100,000,000."
+
+    payment_method = PAYMENT_METHODS.get(_text(value("payment_method") or "Cash").lower())
+    if payment_method is None:
+        errors["payment_method"] = f"One of {', '.join(PAYMENT_METHODS.values())}."
+
+    date_value = value("date_given")
+    date_given = parse_any_date(date_value) if _text(date_value) else timezone.localdate()
+    if date_given is None:
+        errors["date_given"] = "Enter a date like 2025-01-31."
+
+    if errors:
+        return None, errors
+    return Tithe(
+        year=years.get(date_given.year) or current_year,
+        member_id=member["id"],
+        amount=amount,
+        payment_method=payment_method,
+        date_given=date_given,
+        purpose=_text(value("purpose")) or None,
+    ), None
+
+
+def create_tithes(rows, defaults=None):
+    """
+    Validates `rows` (dicts with member, amount and optionally payment_method,
+    date_given, purpose; missing values come from `defaults`, the date defaults
+    to today and the payment method to Cash) and saves them all
+    or none. Returns {"ok", "created", "results": [per-row dict]}.
+    """
+    defaults = defaults or {}
+    if len(rows) > MAX_BULK_TITHES:
+        raise ValueError(f"At most {MAX_BULK_TITHES} tithes can be sent at once.")
+
+    members = resolve_members(_text(row.get("member")) for row in rows)
+    years = {year.year: year for year in Year.objects.all()}
+    current_year = next((year for year in years.values() if year.is_current), None)
+
+    tithes, results = [], []
+    for number, row in enumerate(rows, start=1):
+        tithe, errors = _validate(row, defaults, members, years, current_year)
+        if errors:
+            results.append({"row": number, "ok": False, "errors": errors})
+        else:
+            tithes.append((number, tithe))
+            results.append({"row": number, "ok": True})
+
+    if len(tithes) != len(rows):
+        return {"ok": False, "created": 0, "results": results}
+
+    created = save_tithes([tithe for _, tithe in tithes])
+    for (number, _), tithe in zip(tithes, created):
+        results[number - 1].update({
+            "id": tithe.pk,
+            "receipt_number": tithe.receipt_number,
+            "member": members[_text(rows[number - 1].get("member"))]["name"],
+            "amount": f"{tithe.amount:.2f}",
+        })
+    return {"ok": True, "created": len(created), "results": results}
+
+
+def save_tithes(tithes):
+    """
+    bulk_creates unsaved Tithes with their receipt numbers and brings the pledge
+    summaries, the rollup and the journal up to date, atomically. Returns the saved tithes.
+    """
+    with transaction.atomic():
+        assign_ids("tithe_receipt", tithes)
+        created = Tithe.objects.bulk_create(tithes)
+        apply_summary_deltas(summary_deltas(created))
+
+        deltas = defaultdict(lambda: [Decimal("0"), 0])
+        for tithe in created:
+            key, amount = rollup_entry(tithe, "TITHE")
+            delta = deltas[freeze_key(key)]
+            delta[0] += amount
+            delta[1] += 1
+        apply_rollup_deltas(deltas)
+        post_new_records("TITHE", created)
+    return created
+
+
+def import_tithes(upload, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Imports the tithes of a CSV/XLSX upload (see the columns above). Raises
+    ImportFileError if the file cannot be read at all; row problems are
+    collected in the returned ImportResult.
+    """
+    rows = read_rows(upload)
+    columns = next(rows, [])
+    missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}.")
+
+    years = {year.year: year for year in Year.objects.all()}
+    current_year = next((year for year in years.values() if year.is_current), None)
+
+    result = ImportResult()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        members = resolve_members(_text(row.get("member")) for _, row in chunk)
+
+        tithes = []
+        for row_number, row in chunk:
+            result.rows += 1
+            tithe, errors = _validate(row, {}, members, years, current_year)
+            if not _text(row.get("date_given")):
+                errors = dict(errors or {}, date_given="Required.")
+            if errors:
+                result.add_error(row_number, " ".join(f"{field}: {message}" for field, message in errors.items()))
+            else:
+                tithes.append(tithe)
+        if tithes:
+            result.created += len(save_tithes(tithes))
+    return result
@@ -0,0 +1,148 @@
+# finance/trends.py
+"""
+Multi-year offering trends, computed in memory with NumPy/pandas.
+
+load_offering_frame() reads every offering rollup row (one query over
+FinanceDailyRollup, one row per day/outstation/category/mass) into a
+DataFrame; compute_offering_trends() derives, without further queries:
+
+- yearly totals, year-over-year growth and like-for-like year-to-date growth,
+- weekly totals (weeks ending Sunday) with rolling 4- and 12-week averages,
+- seasonality per mass_name (average month / average of all months, x100),
+- year-to-date change per outstation against the same period last year.
+
+The result is plain JSON-able data; finance.utils.get_offering_trends_data()
+serialises it and the dashboards serve it through the analytics cache.
+"""
+import calendar
+
+import numpy as np
+import pandas as pd
+
+FRAME_COLUMNS = ["date", "outstation_id", "outstation", "mass_name", "total"]
+
+
+def load_offering_frame():
+    """All offering rollup rows as a DataFrame (ONE query)."""
+    from finance.models import FinanceDailyRollup
+
+    rows = (
+        FinanceDailyRollup.objects
+        .filter(kind=FinanceDailyRollup.OFFERING)
+        .order_by()
+        .values_list("date", "outstation_id", "outstation__name", "mass_name", "total")
+    )
+    frame = pd.DataFrame.from_records(list(rows), columns=FRAME_COLUMNS)
+    frame["date"] = pd.to_datetime(frame["date"])
+    frame["total"] = frame["total"].astype(float)
+    return frame
+
+
+def _clean(values):
+    """Rounded floats with NaN/inf -> None, ready for json.dumps."""
+    values = np.round(np.asarray(values, dtype=float), 2)
+    return [None if not np.isfinite(value) else float(value) for value in values]
+
+
+def _percent_change(current, previous):
+    """Vectorised (current - previous) / previous * 100, NaN where previous is 0."""
+    current = np.asarray(current, dtype=float)
+    previous = np.asarray(previous, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, (current - previous) / previous * 100, np.nan)
+
+
+def _year_to_date_mask(index, today):
+    """Days falling on or before today's month/day, in every year."""
+    return (index.month < today.month) | ((index.month == today.month) & (index.day <= today.day))
+
+
+def compute_offering_trends(frame, today, weeks=52):
+    """
+    Trend figures for the offerings in `frame` (see load_offering_frame) as of
+    `today`. `weeks` limits the weekly series to the most recent weeks.
+    """
+    if frame.empty:
+        return None
+
+    today_ts = pd.Timestamp(today)
+    frame = frame[frame["date"] <= today_ts]
+    if frame.empty:
+        return None
+
+    # 📅 Continuous daily series (days without offerings count as 0)
+    daily = frame.groupby("date")["total"].sum()
+    daily = daily.reindex(pd.date_range(daily.index.min(), today_ts, freq="D"), fill_value=0.0)
+
+    # 📈 Yearly totals, year-over-year growth and like-for-like year-to-date growth
+    yearly = daily.groupby(daily.index.year).sum()
+    ytd = daily[_year_to_date_mask(daily.index, today_ts)]
+    ytd = ytd.groupby(ytd.index.year).sum().reindex(yearly.index, fill_value=0.0)
+
+    # 🗓️ Weekly totals (weeks end on Sunday) and rolling averages
+    weekly = daily.resample("W-SUN").sum()
+    weekly = weekly[weekly.index <= today_ts]  # drop the week still in progress
+    rolling_4 = weekly.rolling(4, min_periods=1).mean()
+    rolling_12 = weekly.rolling(12, min_periods=1).mean()
+    recent = slice(-weeks, None)
+
+    # 🌦️ Seasonality per mass_name: mean monthly total per calendar month,
+    # relative to that mass's mean month (100 = an average month)
+    month_index = pd.MultiIndex.from_product(
+        [range(daily.index.min().year, today_ts.year + 1), range(1, 13)], names=["year", "month"]
+    )
+    monthly = (
+        frame.assign(year=frame["date"].dt.year, month=frame["date"].dt.month)
+        .pivot_table(index=["year", "month"], columns="mass_name", values="total", aggfunc="sum", fill_value=0.0)
+        .reindex(month_index, fill_value=0.0)
+    )
+    # Ignore months that have not happened yet
+    elapsed = np.array([(year, month) <= (today_ts.year, today_ts.month) for year, month in month_index])
+    seasonal = monthly[elapsed].groupby(level="month").mean().reindex(range(1, 13), fill_value=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seasonal_index = seasonal.div(seasonal.mean().replace(0.0, np.nan)) * 100
+
+    # 🏛️ Year-to-date change per outstation vs the same period last year
+    this_year, last_year = today_ts.year, today_ts.year - 1
+    outstation_ytd = frame[_year_to_date_mask(frame["date"].dt, today_ts) & frame["date"].dt.year.isin([this_year, last_year])]
+    per_outstation = (
+        outstation_ytd.assign(year=outstation_ytd["date"].dt.year)
+        .pivot_table(index=["outstation_id", "outstation"], columns="year", values="total", aggfunc="sum", fill_value=0.0)
+        .reindex(columns=[this_year, last_year], fill_value=0.0)
+    )
+    outstation_change = _percent_change(per_outstation[this_year], per_outstation[last_year])
+
+    return {
+        "years": [int(year) for year in yearly.index],
+        "yearly_totals": _clean(yearly.values),
+        # Growth lists line up with "years"; the first year has nothing to compare with
+        "yoy_growth": [None] + _clean(_percent_change(yearly.values[1:], yearly.values[:-1])),
+        "ytd_totals": _clean(ytd.values),
+        "ytd_growth": [None] + _clean(_percent_change(ytd.values[1:], ytd.values[:-1])),
+        "weeks": [week.strftime("%Y-%m-%d") for week in weekly.index[recent]],
+        "weekly_totals": _clean(weekly.values[recent]),
+        "rolling_4": _clean(rolling_4.values[recent]),
+        "rolling_12": _clean(rolling_12.values[recent]),
+        "seasonality": {
+            "months": list(calendar.month_abbr)[1:],
+            "mass_names": {
+                str(mass_name): _clean(seasonal_index[mass_name].values)
+                for mass_name in seasonal_index.columns
+            },
+        },
+        "outstations": [
+            {
+                "id": int(outstation_id),
+                "name": name,
+                "current": current,
+                "previous": previous,
+                "change": change,
+            }
+            for (outstation_id, name), current, previous, change in zip(
+                per_outstation.index,
+                _clean(per_outstation[this_year].values),
+                _clean(per_outstation[last_year].values),
+                _clean(outstation_change),
+            )
+        ],
+    }
@@ -10,6 +10,8 @@ urlpatterns = [
     path('finance/', finance_home, name='finance_home'),
     path('offering/category/<int:cat_pk>/create/', OfferingsCreateByCategoryView.as_view(), name='offering_create_by_category'),    
     path('offerings/list/', OfferingsListView.as_view(), name='offerings_list'),
+    path('offerings/import/', views.offerings_import, name='offerings_import'),
+    path('offerings/grid/', views.offerings_grid, name='offerings_grid'),
     path('offering/category/<int:cat_pk>/update/<int:pk>/', OfferingsUpdateByCategoryView.as_view(), name='offerings_update_by_category'),
     path('offerings/delete/<int:pk>/', OfferingsDeleteView.as_view(), name='offerings_delete'),
     path('facility-renting/create/', views.facility_renting_create, name='facility_renting_create'),
@@ -34,9 +36,11 @@ urlpatterns = [
          views.donation_item_fund_delete, 
          name='donation_item_fund_delete'),
     path('donation-item-funds/all/', views.all_donation_item_funds, name='all_donation_item_funds'),
+    path('donation-item-funds/all/export/', views.all_donation_item_funds_export, name='all_donation_item_funds_export'),
     path("pledge/create/", pledge_create_view, name="pledge_create"),
     path("pledge/update/<int:pk>/", pledge_create_view, name="pledge_update"),
     path('pledges/list/', views.pledge_list_view, name='pledge_list'),
+    path('pledges/fulfilment/', views.pledge_fulfilment_view, name='pledge_fulfilment'),
     path("pledge/delete/<int:pk>/", views.pledge_delete_view, name="pledge_delete"),
     path('category/create/', views.category_create, name='category_create'),
     path('all/category/list/', views.category_list, name='category_list'),
@@ -45,6 +49,7 @@ urlpatterns = [
     path('expenditure/<int:category_pk>/create/', views.expenditure_create, name='expenditure_create'),
     path('expenditure/<int:pk>/update/', views.expenditure_update, name='expenditure_update'),
     path('expenditure/all/', views.expenditure_list_all, name='expenditure_list_all'),
+    path('expenditure/all/export/', views.expenditure_list_export, name='expenditure_list_export'),
     path('expenditure/<int:pk>/delete/', views.expenditure_delete, name='expenditure_delete'),
     path('category/<int:category_pk>/expenditures/', views.category_expenditure_list, name='category_expenditure_list'),
     path('report/general/', views.finance_general_report, name='finance_general_report'),
@@ -53,5 +58,6 @@ urlpatterns = [
     path('offering-category/list/', views.offering_category_list, name='offering_category_list'),
     path('offering-category/<int:pk>/delete/', views.offering_category_delete, name='offering_category_delete'),
     path('offering/category/<int:cat_pk>/all/', views.offerings_by_category_list, name='offerings_by_category_list'),
+    path('offering/category/<int:cat_pk>/all/export/', views.offerings_by_category_export, name='offerings_by_category_export'),
 ]
 
@@ -3,7 +3,7 @@ from django.utils.timezone import now
 
 
 import json
-from .models import Offerings
+from datetime import date
 
 
 def get_offerings_data():
@@ -13,20 +13,19 @@ def get_offerings_data():
     """
     current_year = now().year
 
-    # Query the total amount collected per date in the current year
-    offerings_data = Offerings.objects.filter(date_given__year=current_year).values(
-        'date_given'
-    ).annotate(total_amount=models.Sum('amount')).order_by('date_given')
+    # Total amount collected per date in the current year (daily series)
+    offerings_data = Offerings.objects.series(
+        'day', start=date(current_year, 1, 1), end=date(current_year, 12, 31)
+    )
 
     if not offerings_data:
         return json.dumps({"labels": [], "data": [], "highest_date": None, "lowest_date": None, "analysis": "No offerings data available for the current year."})
 
-    # Convert QuerySet to dictionary
-    offerings_list = list(offerings_data)
+    offerings_list = offerings_data
 
     # Extract labels (Dates) and values (Total Offerings)
-    labels = [item['date_given'].strftime('%Y-%m-%d') for item in offerings_list]
-    data = [float(item['total_amount']) for item in offerings_list]
+    labels = [item['period'].strftime('%Y-%m-%d') for item in offerings_list]
+    data = [float(item['total']) for item in offerings_list]
 
     # Identify highest and lowest offerings
     highest_index = data.index(max(data))
@@ -51,7 +50,7 @@ def get_offerings_data():
 import json
 from django.db.models import Sum
 from django.utils.timezone import now
-from finance.models import DonationItemFund
+from finance.models import FinanceDailyRollup
 
 def get_special_contributions_data():
     """
@@ -61,31 +60,31 @@ def get_special_contributions_data():
     # Get the current year
     current_year = now().year
     
-    # Query all DonationItemFund for the current year
-    item_funds = DonationItemFund.objects.filter(year__is_current=True)
-
-    if not item_funds.exists():
-        return json.dumps({
-            "labels": [],
-            "data": [],
-            "highest_contribution": None,
-            "lowest_contribution": None,
-            "analysis": "No Special Contributions data available for the current year."
-        })
+    # Query the DonationItemFund rollup for the current year
+    item_funds = FinanceDailyRollup.objects.filter(kind=FinanceDailyRollup.DONATION, year__is_current=True)
 
     # Group and sum by SpecialContribution name
     grouped_data = (
         item_funds
-        .values('contribution_type__name')
-        .annotate(total_amount=Sum('amount'))
+        .values('contribution__name')
+        .annotate(total_amount=Sum('total'))
         .order_by('-total_amount')
     )
 
     # Convert QuerySet to a list of dicts
     grouped_list = list(grouped_data)
 
+    if not grouped_list:
+        return json.dumps({
+            "labels": [],
+            "data": [],
+            "highest_contribution": None,
+            "lowest_contribution": None,
+            "analysis": "No Special Contributions data available for the current year."
+        })
+
     # Extract labels (contribution names) and values (total amounts)
-    labels = [item['contribution_type__name'] for item in grouped_list]
+    labels = [item['contribution__name'] for item in grouped_list]
     data = [float(item['total_amount']) for item in grouped_list]
 
     # Identify highest and lowest
@@ -117,7 +116,7 @@ def get_special_contributions_data():
 # finance/utils.py
 
 from django.utils.timezone import now
-from finance.models import FacilityRenting
+from finance.models import FinanceDailyRollup
 import json
 from django.db import models
 
@@ -129,7 +128,9 @@ def get_asset_finance_data():
     current_year = now().year
 
     # Fetch total rental income per asset in the current year
-    assets_data = FacilityRenting.objects.filter(year__is_current=True).values('property_rented__name').annotate(total_income=models.Sum('amount'))
+    assets_data = FinanceDailyRollup.objects.filter(
+        kind=FinanceDailyRollup.RENTING, year__is_current=True
+    ).values('property_rented__name').annotate(total_income=models.Sum('total')).order_by('property_rented__name')
 
     # If no data exists, return an empty dataset
     if not assets_data:
@@ -160,3 +161,39 @@ def get_asset_finance_data():
     )
 
     return json.dumps({"labels": labels, "data": data, "highest_asset": highest_asset, "lowest_asset": lowest_asset, "analysis": analysis})
+
+
+# finance/utils.py
+
+import json
+from django.utils.timezone import localdate
+
+def get_offering_trends_data():
+    """
+    Multi-year offering trends (year-over-year growth, rolling weekly averages,
+    seasonality per mass and change per outstation) as JSON.
+    Everything is computed from ONE rollup query; see finance/trends.py.
+    """
+    from finance.trends import load_offering_frame, compute_offering_trends
+
+    today = localdate()
+    trends = compute_offering_trends(load_offering_frame(), today)
+
+    if trends is None:
+        return json.dumps({"years": [], "weeks": [], "outstations": [], "analysis": "No offerings data available yet."})
+
+    # Generate analysis
+    analysis = f"Offerings so far in {today.year}: **TZS {trends['ytd_totals'][-1]:,.2f}**."
+    if trends["ytd_growth"][-1] is not None:
+        analysis += (
+            f" That is **{trends['ytd_growth'][-1]:+.1f}%** compared with the same period of {today.year - 1}"
+            f" (**TZS {trends['ytd_totals'][-2]:,.2f}**)."
+        )
+    if trends["rolling_4"]:
+        analysis += (
+            f" The 4-week average is **TZS {trends['rolling_4'][-1]:,.2f}** per week"
+            f" against a 12-week average of **TZS {trends['rolling_12'][-1]:,.2f}**."
+        )
+    trends["analysis"] = analysis
+
+    return json.dumps(trends)
@@ -4,8 +4,10 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from .utils import (
     get_offerings_data,
     get_special_contributions_data,  # <-- NEW
-    get_asset_finance_data
+    get_asset_finance_data,
+    get_offering_trends_data
 )
+from analysis.cache import cached_analysis
 
 def is_admin_or_superuser(user):
     return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
@@ -20,6 +22,9 @@ def finance_home(request):
     # Offerings Data (Chart.js)
     offerings_data = get_offerings_data()
 
+    # Multi-year offering trends (cached, see finance/trends.py)
+    offering_trends_data = cached_analysis("offering_trends", get_offering_trends_data)
+
     # Tithes Data (Chart.js)
 
     # Special Contributions Data (Chart.js)
@@ -30,6 +35,7 @@ def finance_home(request):
 
     context = {
         'offerings_data': offerings_data,
+        'offering_trends_data': offering_trends_data,
         'special_contributions_data': special_contributions_data,  # Pass to template
         'asset_finance_data': asset_finance_data,
     }
@@ -96,14 +102,10 @@ class OfferingsCreateByCategoryView(
         return context
 
 
-from django.utils.timezone import now
-from django.utils.timesince import timesince
 from django.views.generic import ListView
-from django.db.models import Sum
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from .models import Offerings
-from settings.models import Year
-from members.models import ChurchMember
+from .ledger import offerings_ledger_context
 
 # ✅ Custom Mixin to Restrict Access to Admins/Superusers
 class AdminOrSuperuserRequiredMixin(UserPassesTestMixin):
@@ -116,13 +118,13 @@ class AdminOrSuperuserRequiredMixin(UserPassesTestMixin):
 
 class OfferingsListView(LoginRequiredMixin, AdminOrSuperuserRequiredMixin, ListView):
     """
-    View to list all offerings from all years.
+    View to list offerings (newest first), filtered and paginated in the
+    database by the offerings ledger (finance/ledger.py).
     Only accessible by Admins and Superusers.
     """
     model = Offerings
     template_name = "finance/offerings_list.html"
     context_object_name = "offerings"
-    ordering = ['-date_given']  # Display newest offerings first
 
     def get_context_data(self, **kwargs):
         """
@@ -130,29 +132,8 @@ class OfferingsListView(LoginRequiredMixin, AdminOrSuperuserRequiredMixin, ListV
         """
         context = super().get_context_data(**kwargs)
 
-        # Retrieve all offerings
-        offerings_qs = Offerings.objects.all().order_by('-date_given')
-        context["offerings"] = offerings_qs
-
-        # Retrieve all years
-        context["years"] = Year.objects.all()
-
-        # Retrieve all active church members for collected_by filter
-        context["collected_by_members"] = ChurchMember.objects.filter(status="Active")
-
-        # Retrieve all active church leaders for recorded_by filter
-        context["recorded_by_leaders"] = ChurchMember.objects.filter(leader__isnull=False, status="Active")
-
-        # NEW: Retrieve all OfferingCategory objects (for category filter)
-        context["all_offering_categories"] = OfferingCategory.objects.all()
-
-        # Calculate total amount
-        context["total_offerings"] = offerings_qs.aggregate(Sum('amount'))['amount__sum'] or 0
-
-        # Annotate offerings with time since created and updated
-        for offering in context["offerings"]:
-            offering.time_since_created = timesince(offering.date_created, now())
-            offering.time_since_updated = timesince(offering.date_updated, now())
+        # One page of offerings, the filtered totals and the filter choices
+        context.update(offerings_ledger_context(self.request.GET))
 
         return context
 
@@ -770,70 +751,85 @@ from settings.models import Year
 def is_admin_or_superuser(user):
     return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
 
-@login_required
-@user_passes_test(is_admin_or_superuser, login_url='login')
-def expenditure_list_all(request):
+def _filter_date(value):
+    """date of a YYYY-MM-DD filter value; None if empty, malformed or impossible (2025-02-30)."""
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+def filter_expenditures(params):
     """
-    Displays all expenditures in tables grouped by category, 
-    with search fields (year, month, category, purpose, date range).
-    The default year is the system's current year if no year is provided.
-    Shows totals per category and overall total,
-    re-displaying the same filters on refresh. 
+    Applies the expenditure list filters (year, month, category, purpose, date range)
+    from `params` (request.GET). Without a year the system's current year is used.
+    Returns (filtered QuerySet, {filter name: value as given}).
     """
+    filters = {
+        'year': params.get('year', ''),         # e.g. "2023"
+        'month': params.get('month', ''),
+        'category': params.get('category', ''),
+        'purpose': params.get('purpose', ''),
+        'from_date': params.get('from_date', ''),
+        'to_date': params.get('to_date', ''),
+    }
 
-    # 1) Collect Filter Inputs
-    year_filter    = request.GET.get('year', '')         # e.g. "2023"
-    month_filter   = request.GET.get('month', '')
-    category_filter = request.GET.get('category', '')
-    purpose_filter = request.GET.get('purpose', '')
-    from_date_str  = request.GET.get('from_date', '')
-    to_date_str    = request.GET.get('to_date', '')
-
-    # 2) Base QuerySet
+    # Base QuerySet
     expenditures_qs = Expenditure.objects.all()
 
-    # 2a) If no year given, default to the current system year
-    #     We check if user hasn't chosen year_filter and we do not want to override if user chooses empty.
-    if not year_filter:
-        # get current system year, e.g. 2025
-        current_year = now().year
-        # We set year_filter to that
-        year_filter = str(current_year)
+    # If no year given, default to the current system year
+    if not filters['year']:
+        filters['year'] = str(now().year)
 
-    # 3) Apply Filters
     # a) Year
-    if year_filter:
-        try:
-            expenditures_qs = expenditures_qs.filter(year__year=year_filter)
-        except:
-            pass
+    if filters['year'].isdecimal():
+        expenditures_qs = expenditures_qs.filter(year__year=filters['year'])
 
     # b) Month
-    if month_filter:
-        expenditures_qs = expenditures_qs.filter(month=month_filter)
+    if filters['month']:
+        expenditures_qs = expenditures_qs.filter(month=filters['month'])
 
     # c) Category
-    if category_filter:
-        expenditures_qs = expenditures_qs.filter(category__pk=category_filter)
+    if filters['category'].isdecimal():
+        expenditures_qs = expenditures_qs.filter(category__pk=filters['category'])
 
     # d) Purpose
-    if purpose_filter:
-        expenditures_qs = expenditures_qs.filter(expenditure_purpose__icontains=purpose_filter)
+    if filters['purpose']:
+        expenditures_qs = expenditures_qs.filter(expenditure_purpose__icontains=filters['purpose'])
 
     # e) Date range
-    if from_date_str:
-        parsed_from = parse_date(from_date_str)
+    if filters['from_date']:
+        parsed_from = _filter_date(filters['from_date'])
         if parsed_from:
             from_dt = datetime(parsed_from.year, parsed_from.month, parsed_from.day)
-            from_dt_aware = make_aware(from_dt)
-            expenditures_qs = expenditures_qs.filter(date_taken__gte=from_dt_aware)
+            expenditures_qs = expenditures_qs.filter(date_taken__gte=make_aware(from_dt))
 
-    if to_date_str:
-        parsed_to = parse_date(to_date_str)
+    if filters['to_date']:
+        parsed_to = _filter_date(filters['to_date'])
         if parsed_to:
             to_dt = datetime(parsed_to.year, parsed_to.month, parsed_to.day, 23, 59, 59)
-            to_dt_aware = make_aware(to_dt)
-            expenditures_qs = expenditures_qs.filter(date_taken__lte=to_dt_aware)
+            expenditures_qs = expenditures_qs.filter(date_taken__lte=make_aware(to_dt))
+
+    return expenditures_qs, filters
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def expenditure_list_all(request):
+    """
+    Displays all expenditures in tables grouped by category, 
+    with search fields (year, month, category, purpose, date range).
+    The default year is the system's current year if no year is provided.
+    Shows totals per category and overall total,
+    re-displaying the same filters on refresh. 
+    """
+
+    # 1) Filter inputs + filtered QuerySet (shared with the CSV/XLSX export)
+    expenditures_qs, filters = filter_expenditures(request.GET)
+    year_filter = filters['year']
+    month_filter = filters['month']
+    category_filter = filters['category']
+    purpose_filter = filters['purpose']
+    from_date_str = filters['from_date']
+    to_date_str = filters['to_date']
 
     # 4) categories in the filtered queryset
     cat_ids = expenditures_qs.values_list('category', flat=True).distinct()
@@ -1131,14 +1127,10 @@ def offering_category_list(request):
                   {'categories': categories})
 
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Sum
-from django.utils.timezone import make_aware, datetime
-from django.utils.dateparse import parse_date
 from django.contrib.auth.decorators import login_required, user_passes_test
 
-from settings.models import Year
-from members.models import ChurchMember
-from finance.models import OfferingCategory, Offerings
+from finance.models import OfferingCategory
+from finance.ledger import offerings_ledger_context
 
 def is_admin_or_superuser(user):
     return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
@@ -1147,87 +1139,20 @@ def is_admin_or_superuser(user):
 @user_passes_test(is_admin_or_superuser, login_url='login')
 def offerings_by_category_list(request, cat_pk):
     category = get_object_or_404(OfferingCategory, pk=cat_pk)
-    offerings_qs = category.offerings.all().order_by('-date_given')
-
-    # Retrieve filters from GET
-    year_param          = request.GET.get('year')            # this could be None or ''
-    collected_by_filter = request.GET.get('collected_by', '')
-    recorded_by_filter  = request.GET.get('recorded_by', '')
-    mass_name_filter    = request.GET.get('mass_name', '')
-    from_date_str       = request.GET.get('from_date', '')
-    to_date_str         = request.GET.get('to_date', '')
-
-    # ------------------------------------------------
-    # 1) Determine the default year_filter:
-    #    - If year_param is None (meaning ?year= is not in the URL at all), 
-    #      use the current year's .year.
-    #    - Otherwise, keep whatever the user gave (even if it's empty string).
-    # ------------------------------------------------
-    if year_param is None:
-        # No ?year= in the querystring => default to current year
-        current_year_obj = Year.objects.filter(is_current=True).first()
-        if current_year_obj:
-            year_filter = str(current_year_obj.year)  # e.g. "2025"
-        else:
-            # If there's no "current" year in DB, fallback to All Years
-            year_filter = ''
-    else:
-        # The user explicitly provided something (?year= or ?year=2022, etc.)
-        year_filter = year_param
-
-    # ------------------------------------------------
-    # 2) Apply filters
-    # ------------------------------------------------
-    if year_filter:
-        # If it's not empty, filter by that year
-        offerings_qs = offerings_qs.filter(year__year=year_filter)
-
-    if collected_by_filter:
-        offerings_qs = offerings_qs.filter(collected_by__full_name=collected_by_filter)
-
-    if recorded_by_filter:
-        offerings_qs = offerings_qs.filter(recorded_by__full_name=recorded_by_filter)
-
-    if mass_name_filter:
-        offerings_qs = offerings_qs.filter(mass_name__icontains=mass_name_filter)
-
-    if from_date_str:
-        parsed_from = parse_date(from_date_str)
-        if parsed_from:
-            offerings_qs = offerings_qs.filter(date_given__gte=parsed_from)
-
-    if to_date_str:
-        parsed_to = parse_date(to_date_str)
-        if parsed_to:
-            offerings_qs = offerings_qs.filter(date_given__lte=parsed_to)
-
-    # 3) Compute total
-    total_offerings = offerings_qs.aggregate(Sum('amount'))['amount__sum'] or 0
 
-    # 4) Build context
-    context = {
-        'category': category,
-        'offerings': offerings_qs,
-        'total_offerings': total_offerings,
-
-        # For building filter dropdowns
-        'years': Year.objects.order_by('year'),
-        'collected_by_members': ChurchMember.objects.filter(status="Active"),
-        'recorded_by_members': ChurchMember.objects.filter(status="Active"),
-
-        # Pass filter choices back to template
-        'year_filter': year_filter,  # string
-        'collected_by_filter': collected_by_filter,
-        'recorded_by_filter': recorded_by_filter,
-        'mass_name_filter': mass_name_filter,
-        'from_date': from_date_str,
-        'to_date': to_date_str,
-    }
+    # Filters (?year=, ?collected_by=, ?recorded_by=, ?mass_name=, ?from_date=, ?to_date=),
+    # cursor pagination and the filtered total all run in the database.
+    # Without ?year= the current year is shown.
+    context = offerings_ledger_context(request.GET, queryset=category.offerings.all())
+    context['category'] = category
 
     return render(request, 'finance/offerings_by_category_list.html', context)
 
 # finance/views.py
 
+import calendar
+from datetime import date, timedelta
+
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db.models import Sum
@@ -1238,109 +1163,117 @@ from members.models import ChurchMember
 from finance.models import (
     OfferingCategory, Offerings,
     SpecialContribution, DonationItemFund,
-    Expenditure, Category
+    Expenditure, Category, FinanceDailyRollup
 )
+from finance.journal import cash_balance
+
+# Journal kinds whose records Tables A-D and H list
+REPORT_JOURNAL_KINDS = ("OFFERING", "DONATION", "EXPENDITURE")
 
 def is_admin_or_superuser(user):
     """Check if the user is authenticated and is superuser or admin."""
     return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
 
+def _report_period(params):
+    """(year, month) from ?year=&month=, falling back to the current month for missing/invalid values."""
+    today = now()
+    year, month = params.get('year', ''), params.get('month', '')
+    year = int(year) if year.isdecimal() and 1 <= int(year) <= 9999 else today.year
+    month = int(month) if month.isdecimal() and 1 <= int(month) <= 12 else today.month
+    return year, month
+
+
+def _monthly_rollup_totals(year, month):
+    """
+    Totals of one calendar month grouped by kind and dimension, from a single
+    GROUP BY over FinanceDailyRollup:
+      {OFFERING: {offering_category_id: total},
+       DONATION: {contribution_id: total},
+       EXPENDITURE: {expenditure_category_id: total}}
+    """
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    dimensions = {
+        FinanceDailyRollup.OFFERING: 'offering_category',
+        FinanceDailyRollup.DONATION: 'contribution',
+        FinanceDailyRollup.EXPENDITURE: 'expenditure_category',
+    }
+    rows = (
+        FinanceDailyRollup.objects
+        .filter(kind__in=dimensions, date__range=(first_day, last_day))
+        .values('kind', *dimensions.values())
+        .annotate(amount=Sum('total'))
+        .order_by()
+    )
+    totals = {kind: {} for kind in dimensions}
+    for row in rows:
+        key = row[dimensions[row['kind']]]
+        totals[row['kind']][key] = totals[row['kind']].get(key, 0) + row['amount']
+    return totals
+
+
 @login_required
 @user_passes_test(is_admin_or_superuser, login_url='login')
 def finance_general_report(request):
     """
     Displays the general finance report for the church:
-      - Table A: Offerings (by category, this month)
-      - Table B: Special Diocesan contributions (this month)
-      - Table C: Jimbo contributions (this month)
-      - Table D: Fellowship contributions (this month)
+      - Table A: Offerings (by category, selected month)
+      - Table B: Special Diocesan contributions (selected month)
+      - Table C: Jimbo contributions (selected month)
+      - Table D: Fellowship contributions (selected month)
       - Table E: Sum of A+B+C+D + Christians stats
-      - Table H: Expenditures by Category (this month)
-      - Table I: Summary of Income & Expenditure (including all-time data)
+      - Table H: Expenditures by Category (selected month)
+      - Table I: Summary of Income & Expenditure (balance before the month + this month)
       - Table J: Signatures & Stamps (needs current date/time)
+    The month is ?year=&month= (default: this month). Tables A-D and H are
+    read from FinanceDailyRollup with one grouped query; the previous balance
+    in Table I is what the same accounts carry forward in the journal from
+    the month before, so each month opens with the last one's closing.
     """
 
-    # 1) Current calendar year/month
-    current_year = now().year
-    current_month = now().month
+    # 1) Report period: ?year=&month= (defaults to the current calendar month)
+    current_year, current_month = _report_period(request.GET)
 
     # 2) current_datetime for Table J
     current_datetime = now()
 
+    # Tables A, B, C, D and H all come from ONE grouped rollup query
+    monthly_totals = _monthly_rollup_totals(current_year, current_month)
+
     # ----------------------------------------------------------
-    # TABLE A: Offerings by OfferingCategory (Current Month)
+    # TABLE A: Offerings by OfferingCategory (Selected Month)
     # ----------------------------------------------------------
-    categories_data = []
-    offering_categories = OfferingCategory.objects.all()
-
-    for cat in offering_categories:
-        total_amount = cat.offerings.filter(
-            date_given__year=current_year,
-            date_given__month=current_month
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        categories_data.append({
+    categories_data = [
+        {
             'category': cat,
-            'total_amount': total_amount,
-        })
+            'total_amount': monthly_totals[FinanceDailyRollup.OFFERING].get(cat.pk, 0),
+        }
+        for cat in OfferingCategory.objects.all()
+    ]
     table_a_total = sum(item['total_amount'] for item in categories_data)
 
     # ----------------------------------------------------------
-    # TABLE B: Special Diocesan Contributions (Current Month)
+    # TABLES B, C, D: Special contributions by type (Selected Month)
     # ----------------------------------------------------------
-    diocesan_data = []
-    diocesan_contributions = SpecialContribution.objects.filter(contribution_type="DIOCESAN")
-
-    for sc in diocesan_contributions:
-        total_funds = sc.donation_item_funds.filter(
-            date_created__year=current_year,
-            date_created__month=current_month
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-
-        diocesan_data.append({
+    contributions_by_type = {"DIOCESAN": [], "JIMBO": [], "FELLOWSHIP": []}
+    for sc in SpecialContribution.objects.filter(contribution_type__in=contributions_by_type):
+        contributions_by_type[sc.contribution_type].append({
             'special_contribution': sc,
-            'total_amount': total_funds,
+            'total_amount': monthly_totals[FinanceDailyRollup.DONATION].get(sc.pk, 0),
         })
 
+    # TABLE B: Special Diocesan Contributions
+    diocesan_data = contributions_by_type["DIOCESAN"]
     diocesan_total = sum(item['total_amount'] for item in diocesan_data)
     sum_table_a_b = table_a_total + diocesan_total
 
-    # ----------------------------------------------------------
-    # TABLE C: Jimbo contributions (Current Month)
-    # ----------------------------------------------------------
-    jimbo_data = []
-    jimbo_contributions = SpecialContribution.objects.filter(contribution_type="JIMBO")
-
-    for sc in jimbo_contributions:
-        total_funds = sc.donation_item_funds.filter(
-            date_created__year=current_year,
-            date_created__month=current_month
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-
-        jimbo_data.append({
-            'special_contribution': sc,
-            'total_amount': total_funds,
-        })
-
+    # TABLE C: Jimbo contributions
+    jimbo_data = contributions_by_type["JIMBO"]
     jimbo_total = sum(item['total_amount'] for item in jimbo_data)
     sum_table_a_b_c = table_a_total + diocesan_total + jimbo_total
 
-    # ----------------------------------------------------------
-    # TABLE D: Fellowship contributions (Current Month)
-    # ----------------------------------------------------------
-    fellowship_data = []
-    fellowship_contributions = SpecialContribution.objects.filter(contribution_type="FELLOWSHIP")
-
-    for sc in fellowship_contributions:
-        total_funds = sc.donation_item_funds.filter(
-            date_created__year=current_year,
-            date_created__month=current_month
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-
-        fellowship_data.append({
-            'special_contribution': sc,
-            'total_amount': total_funds,
-        })
-
+    # TABLE D: Fellowship contributions
+    fellowship_data = contributions_by_type["FELLOWSHIP"]
     fellowship_total = sum(item['total_amount'] for item in fellowship_data)
     sum_table_a_b_c_d = table_a_total + diocesan_total + jimbo_total + fellowship_total
 
@@ -1355,35 +1288,30 @@ def finance_general_report(request):
         average_offering_per_member = 0
 
     # ----------------------------------------------------------
-    # TABLE H: Expenditures by Category (Current Month)
+    # TABLE H: Expenditures by Category (Selected Month)
     # ----------------------------------------------------------
-    category_expenditures_data = []
-    all_expenditure_categories = Category.objects.all()
-
-    for cat in all_expenditure_categories:
-        total_spent = cat.expenditures.filter(
-            date_taken__year=current_year,
-            date_taken__month=current_month
-        ).aggregate(Sum('expenditure_amount'))['expenditure_amount__sum'] or 0
-
-        category_expenditures_data.append({
+    category_expenditures_data = [
+        {
             'category': cat,
-            'total_spent': total_spent,
-        })
-
+            'total_spent': monthly_totals[FinanceDailyRollup.EXPENDITURE].get(cat.pk, 0),
+        }
+        for cat in Category.objects.all()
+    ]
     table_h_total = sum(item['total_spent'] for item in category_expenditures_data)
 
     # ----------------------------------------------------------
     # TABLE I: Summary of Income & Expenditure (All-Time)
     # ----------------------------------------------------------
-    # 1) "Balance from the previous period" 
-    #    = (all offerings EVER) + (all donation item funds EVER) - (all expenditures EVER)
-    
-    all_offerings_total = Offerings.objects.aggregate(Sum('amount'))['amount__sum'] or 0
-    all_donation_funds_total = DonationItemFund.objects.aggregate(Sum('amount'))['amount__sum'] or 0
-    all_expenditures_total = Expenditure.objects.aggregate(Sum('expenditure_amount'))['expenditure_amount__sum'] or 0
-
-    previous_balance = all_offerings_total + all_donation_funds_total - all_expenditures_total
+    # 1) "Balance from the previous period"
+    #    = what the offering, contribution and expenditure accounts (the ones
+    #    Tables A-D and H show) carry forward from the month before, read from
+    #    the journal's running account balances (one row per account).
+    #    Renting and tithes are not in the tables, so they are not carried either.
+    first_day = date(current_year, current_month, 1)
+    previous_balance = (
+        cash_balance(first_day - timedelta(days=1), kinds=REPORT_JOURNAL_KINDS)
+        if first_day > date.min else 0
+    )
 
     # 2) "Overall monthly income" => sum_table_a_b_c_d
     # 3) "Total of prev balance & monthly income" => previous_balance + sum_table_a_b_c_d
@@ -1448,3 +1376,199 @@ def finance_general_report(request):
     }
 
     return render(request, 'finance/finance_general_report.html', context)
+
+
+# finance/views.py
+
+from django.shortcuts import render
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+
+from .forms import OfferingsImportForm
+from .importer import ImportFileError, import_offerings
+
+def is_admin_or_superuser(user):
+    return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def offerings_import(request):
+    """
+    📥 Import many offerings at once from a CSV/XLSX file.
+    Bad rows are listed with their row number; the valid rows are saved.
+    """
+    result = None
+    if request.method == 'POST':
+        form = OfferingsImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                result = import_offerings(form.cleaned_data['file'], form.cleaned_data['default_category'])
+            except ImportFileError as error:
+                form.add_error('file', str(error))
+            else:
+                messages.success(request, f"✅ {result.created} offerings imported.")
+                if result.error_count:
+                    messages.warning(request, f"⚠️ {result.error_count} rows were skipped.")
+    else:
+        form = OfferingsImportForm()
+
+    return render(request, 'finance/offerings_import.html', {'form': form, 'result': result})
+
+
+# finance/views.py
+
+from django.shortcuts import get_object_or_404
+from django.contrib.auth.decorators import login_required, user_passes_test
+
+from .exports import EXPORT_CHUNK_SIZE, export_filename, export_response
+from .ledger import OfferingsLedger
+from .models import DonationItemFund, OfferingCategory
+
+def is_admin_or_superuser(user):
+    return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def expenditure_list_export(request):
+    """
+    📤 CSV/XLSX download of the expenditures matching the expenditure_list_all filters.
+    """
+    expenditures_qs, filters = filter_expenditures(request.GET)
+    rows = (
+        expenditures_qs.order_by('category__name', 'date_taken', 'pk')
+        .values_list(
+            'date_taken', 'year__year', 'month', 'category__name',
+            'expenditure_purpose', 'expenditure_amount', 'notes',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    header = ['Date Taken', 'Year', 'Month', 'Category', 'Purpose', 'Amount (TZS)', 'Notes']
+    return export_response(request, export_filename('expenditures', filters['year'], filters['month']), header, rows)
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def offerings_by_category_export(request, cat_pk):
+    """
+    📤 CSV/XLSX download of one category's offerings, with the same filters as
+    offerings_by_category_list (every matching row, not just one page).
+    """
+    category = get_object_or_404(OfferingCategory, pk=cat_pk)
+    ledger = OfferingsLedger(request.GET, queryset=category.offerings.all())
+    rows = (
+        ledger.queryset.order_by('-date_given', '-pk')
+        .values_list(
+            'date_given', 'service_time', 'mass_name', 'outstation__name', 'amount',
+            'collected_by__full_name', 'recorded_by__full_name', 'notes',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    header = ['Date Given', 'Service Time', 'Mass Name', 'Outstation', 'Amount (TZS)',
+              'Collected By', 'Recorded By', 'Notes']
+    return export_response(request, export_filename('offerings', category.name, ledger.filters['year']), header, rows)
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def all_donation_item_funds_export(request):
+    """
+    📤 CSV/XLSX download of donation item funds.
+    Filters: ?year=, ?contribution= (name or id), ?period= (partial match).
+    """
+    funds = DonationItemFund.objects.all()
+    year_filter = request.GET.get('year', '')
+    contribution_filter = request.GET.get('contribution', '').strip()
+    period_filter = request.GET.get('period', '').strip()
+
+    if year_filter.isdecimal():
+        funds = funds.filter(year__year=year_filter)
+    if contribution_filter.isdecimal():
+        funds = funds.filter(contribution_type_id=contribution_filter)
+    elif contribution_filter:
+        funds = funds.filter(contribution_type__name__iexact=contribution_filter)
+    if period_filter:
+        funds = funds.filter(period__icontains=period_filter)
+
+    rows = (
+        funds.order_by('contribution_type__name', '-date_created', '-pk')
+        .values_list(
+            'contribution_type__name', 'contribution_type__contribution_type', 'year__year',
+            'period', 'mass_name', 'amount', 'date_created', 'notes',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    header = ['Contribution', 'Type', 'Year', 'Period', 'Mass Name', 'Amount (TZS)', 'Date Recorded', 'Notes']
+    return export_response(request, export_filename('donation_item_funds', year_filter, contribution_filter), header, rows)
+
+
+# finance/views.py
+
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required, user_passes_test
+
+from settings.models import OutStation
+from .grid import offerings_grid_context
+
+def is_admin_or_superuser(user):
+    return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def offerings_grid(request):
+    """
+    🗓️ Sunday grid: every service × category × outstation of one date on one
+    screen, validated together and saved in one transaction.
+    """
+    context = offerings_grid_context(request, OutStation.objects.all())
+    return render(request, 'finance/offerings_grid.html', context)
+
+
+# finance/views.py
+
+from django.core.paginator import Paginator
+from django.db.models import Count, Sum
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required, user_passes_test
+
+from settings.models import Year
+from .pledges import FULFILMENT_ORDERINGS, fulfilment_queryset
+
+def is_admin_or_superuser(user):
+    return user.is_authenticated and (user.is_superuser or user.user_type == 'ADMIN')
+
+@login_required
+@user_passes_test(is_admin_or_superuser, login_url='login')
+def pledge_fulfilment_view(request):
+    """
+    📊 Pledged, paid and outstanding per member for one year, largest
+    outstanding balance first (or sorted by ?order=pledged|paid|name).
+    Read from PledgeSummary, which is kept up to date as pledges and tithes change.
+    """
+    years = Year.objects.all().order_by('-year')
+    selected = request.GET.get('year', '')
+    year = next((y for y in years if str(y.year) == selected), None)
+    if year is None and not selected:
+        year = next((y for y in years if y.is_current), None)
+
+    search = request.GET.get('q', '').strip()
+    order = request.GET.get('order', 'outstanding')
+    if order not in FULFILMENT_ORDERINGS:
+        order = 'outstanding'
+
+    rows = fulfilment_queryset(year=year, search=search, order=order)
+    totals = rows.aggregate(
+        pledged=Sum('pledged'), paid=Sum('paid'), outstanding=Sum('outstanding'), members=Count('member', distinct=True)
+    )
+    page = Paginator(rows, 50).get_page(request.GET.get('page'))
+
+    query = request.GET.copy()
+    query.pop('page', None)
+
+    return render(request, 'finance/pledge_fulfilment.html', {
+        'page': page,
+        'totals': totals,
+        'years': years,
+        'year': year,
+        'search': search,
+        'order': order,
+        'orderings': FULFILMENT_ORDERINGS.keys(),
+        'query': query.urlencode(),
+    })
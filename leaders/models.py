@@ -1,11 +1,10 @@
 # leaders/models.py
 
-import random
-import string
 from django.db import models
 from django.utils.timezone import now
 
 from members.models import ChurchMember
+from settings.ids import new_id
 from settings.models import OutStation
 
 
@@ -138,14 +137,9 @@ class Leader(models.Model):
     # ────────────────────────────────────────────────────────────
     def generate_unique_leader_id(self) -> str:
         """
-        Produce a 20‑character ID (10 random digits + 10 random letters).
+        Produce a 20‑character ID (digits + lowercase letters, see settings/ids.py).
         """
-        while True:
-            digits = ''.join(random.choices(string.digits, k=10))
-            letters = ''.join(random.choices(string.ascii_lowercase, k=10))
-            candidate = ''.join(random.sample(digits + letters, 20))
-            if not Leader.objects.filter(leader_id=candidate).exists():
-                return candidate
+        return new_id("leader")
 
     # ────────────────────────────────────────────────────────────
     # Save override for ID + validation
@@ -0,0 +1,48 @@
+# members/management/commands/snapshot_membership.py
+"""
+Nightly membership snapshot. Schedule it once a day, e.g. (crontab):
+
+    55 23 * * *  cd /srv/kkkt && python manage.py snapshot_membership
+
+Membership state metrics reflect the moment the command runs; the day's
+events (baptisms, confirmations, marriages, new members) are read from the
+member dates, so --date can also backfill those for past days. An existing
+snapshot of a past day is never replaced unless --force is given.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from members.utils import take_membership_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write today's (or --date's) parish/outstation/cell membership snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Snapshot date (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Replace an existing snapshot of a past --date with figures from the current data.",
+        )
+
+    def handle(self, *args, **options):
+        day = timezone.localdate()
+        if options["date"]:
+            try:
+                day = parse_date(options["date"])
+            except ValueError:
+                day = None
+            if day is None:
+                raise CommandError("--date must be a valid YYYY-MM-DD date.")
+            if day != timezone.localdate():
+                self.stdout.write(self.style.WARNING(
+                    "Membership totals are taken from the current data; only the day's events are historical."
+                ))
+
+        try:
+            written = take_membership_snapshot(day, overwrite=options["force"])
+        except ValueError as e:
+            raise CommandError(f"{e} Use --force to replace it with figures from the current data.")
+        self.stdout.write(self.style.SUCCESS(f"Membership snapshot for {day}: {written} rows."))
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Day this snapshot describes.')),
+                ('scope', models.CharField(choices=[('PARISH', 'Parish'), ('OUTSTATION', 'Outstation'), ('CELL', 'Cell')], max_length=10)),
+                ('label', models.CharField(blank=True, default='', max_length=255)),
+                ('stats', models.JSONField(default=dict, help_text="Cube metrics + the day's new_* events.")),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('cell', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='membership_snapshots', to='settings.cell')),
+                ('outstation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='membership_snapshots', to='settings.outstation')),
+            ],
+            options={
+                'verbose_name': 'Membership Snapshot',
+                'verbose_name_plural': 'Membership Snapshots',
+                'ordering': ['-date', 'scope'],
+                'indexes': [models.Index(fields=['scope', 'date'], name='membership_snapshot_scope'), models.Index(fields=['date'], name='membership_snapshot_date')],
+            },
+        ),
+    ]
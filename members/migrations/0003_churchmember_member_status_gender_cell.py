@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_membershipsnapshot'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='churchmember',
+            index=models.Index(fields=['status', 'gender', 'cell'], name='member_status_gender_cell'),
+        ),
+    ]
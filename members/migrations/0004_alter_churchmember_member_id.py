@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_churchmember_member_status_gender_cell'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='churchmember',
+            name='member_id',
+            field=models.CharField(blank=True, help_text='Unique 5-character ID of letters and numbers; the last character is a check character.', max_length=20, null=True, unique=True),
+        ),
+    ]
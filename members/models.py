@@ -1,9 +1,8 @@
-import random
-import string
 from django.db import models
 from django.core.validators import RegexValidator
 from django.utils.timezone import now
 from django.core.exceptions import ValidationError
+from settings.ids import new_id
 from settings.models import Cell
 
 
@@ -28,7 +27,7 @@ class ChurchMember(models.Model):
         unique=True,
         blank=True,
         null=True,
-        help_text="Unique ID consisting of a highly randomized mix of 10 letters and 10 numbers."
+        help_text="Unique 5-character ID of letters and numbers; the last character is a check character."
     )
 
     # Status Field
@@ -144,20 +143,18 @@ class ChurchMember(models.Model):
     def __str__(self):
         return f"{self.full_name} ({self.phone_number}) - {self.status} - Confirmed: {self.is_confirmed} - Leader: {self.is_this_church_member_a_leader}"
 
+    class Meta:
+        indexes = [
+            # Membership statistics and member lists filter on status, gender and cell
+            models.Index(fields=["status", "gender", "cell"], name="member_status_gender_cell"),
+        ]
+
     def generate_unique_member_id(self):
         """
-        Generates a highly randomized unique 20-character member ID.
+        Generates a unique 5-character member ID (A–Z and 0–9, at least one
+        letter and one digit, last character a check character). See settings/ids.py.
         """
-        while True:
-            characters = list(
-                ''.join(random.choices(string.ascii_uppercase, k=10)) +
-                ''.join(random.choices(string.digits, k=10))
-            )
-            random.shuffle(characters)
-            member_id = ''.join(characters)
-
-            if not ChurchMember.objects.filter(member_id=member_id).exists():
-                return member_id
+        return new_id("member")
 
     def clean(self):
         super().clean()
@@ -185,7 +182,7 @@ class ChurchMember(models.Model):
 
         # Send SMS if status changed to Active
         if original_status != 'Active' and self.status == 'Active':
-            from sms.utils import send_sms  # Import here to avoid circular import
+            from sms.outbox import enqueue_sms  # Import here to avoid circular import
             approval_message = (
                 f"Hongera {self.full_name}! "
                 f"Umeidhinishwa kuwa mshirika hai wa KKKT Mkwawa. "
@@ -194,9 +191,63 @@ class ChurchMember(models.Model):
                 f"https://www.kkktmkwawa.com/accounts/request-account/. "
                 f"Karibu sana katika jumuiya yetu!"
             )
-            response = send_sms(
-                to=self.phone_number,
-                message=approval_message,
-                member=self
-            )
-            print(f"📩 Approval SMS sent to {self.phone_number}: {response}")
+            enqueue_sms(self.phone_number, approval_message, member=self, reference=f"member-active-{self.pk}")
+
+
+from django.db import models
+from django.utils.timezone import now
+from settings.models import OutStation, Cell
+
+class MembershipSnapshot(models.Model):
+    """
+    Daily copy of the membership statistics cube (members/utils.py), written by
+    `python manage.py snapshot_membership` (run nightly from cron).
+
+    One row per (date, scope, group): the parish, every outstation and every
+    cell. `stats` holds the cube metrics as they stood when the snapshot ran,
+    plus the day's events (new_* metrics: baptisms, confirmations, marriages,
+    new members) so past months can be reported without touching ChurchMember.
+    """
+
+    PARISH = "PARISH"
+    OUTSTATION = "OUTSTATION"
+    CELL = "CELL"
+
+    SCOPE_CHOICES = [
+        (PARISH, "Parish"),
+        (OUTSTATION, "Outstation"),
+        (CELL, "Cell"),
+    ]
+
+    date = models.DateField(help_text="Day this snapshot describes.")
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    outstation = models.ForeignKey(
+        OutStation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="membership_snapshots",
+    )
+    cell = models.ForeignKey(
+        Cell,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="membership_snapshots",
+    )
+    # 🏷 Name at snapshot time (kept if the outstation/cell is renamed or deleted)
+    label = models.CharField(max_length=255, blank=True, default="")
+    stats = models.JSONField(default=dict, help_text="Cube metrics + the day's new_* events.")
+    created_at = models.DateTimeField(default=now)
+
+    class Meta:
+        ordering = ["-date", "scope"]
+        indexes = [
+            models.Index(fields=["scope", "date"], name="membership_snapshot_scope"),
+            models.Index(fields=["date"], name="membership_snapshot_date"),
+        ]
+        verbose_name = "Membership Snapshot"
+        verbose_name_plural = "Membership Snapshots"
+
+    def __str__(self):
+        return f"{self.date} {self.scope} {self.label}".strip()
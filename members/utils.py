@@ -1,5 +1,6 @@
 import json
 from django.db.models import Count
+from django.utils import timezone
 from members.models import ChurchMember
 from settings.models import Cell, OutStation  # Updated imports
 
@@ -9,31 +10,30 @@ def get_membership_distribution_analysis():
     Returns JSON data for visualization.
     """
 
+    # Totals and both distributions from the membership stats cube
+    parish = get_membership_stats("parish")
+
     # Get total members
-    total_members = ChurchMember.objects.count()
-    total_active_members = ChurchMember.objects.filter(status="Active").count()
-    total_inactive_members = ChurchMember.objects.filter(status="Inactive").count()
-
-    # Get members count by cell
-    members_by_cell = (
-        ChurchMember.objects.values("cell__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
+    total_members = parish["total"]
+    total_active_members = parish["active"]
+    total_inactive_members = parish["inactive"]
 
-    # Get members count by outstation (changed from zone)
-    members_by_outstation = (
-        ChurchMember.objects.values("cell__outstation__name")  # Updated from cell__zone__name
-        .annotate(count=Count("id"))
-        .order_by("-count")
+    # Get members count by cell / outstation, largest first;
+    # filter out cells and outstations with no members
+    members_by_cell = sorted(
+        (row for row in get_membership_stats("cell").values() if row["label"]),
+        key=lambda row: (-row["total"], row["label"]),
+    )
+    members_by_outstation = sorted(
+        (row for row in get_membership_stats("outstation").values() if row["label"]),
+        key=lambda row: (-row["total"], row["label"]),
     )
 
-    # Filter out cells and outstations with no members
-    cell_labels = [entry["cell__name"] for entry in members_by_cell if entry["cell__name"]]
-    cell_counts = [entry["count"] for entry in members_by_cell if entry["cell__name"]]
+    cell_labels = [row["label"] for row in members_by_cell]
+    cell_counts = [row["total"] for row in members_by_cell]
 
-    outstation_labels = [entry["cell__outstation__name"] for entry in members_by_outstation if entry["cell__outstation__name"]]  # Updated from zone_labels
-    outstation_counts = [entry["count"] for entry in members_by_outstation if entry["cell__outstation__name"]]  # Updated from zone_counts
+    outstation_labels = [row["label"] for row in members_by_outstation]  # Updated from zone_labels
+    outstation_counts = [row["total"] for row in members_by_outstation]  # Updated from zone_counts
 
     # Calculate percentages for cells and outstations
     cell_percentages = [
@@ -62,4 +62,317 @@ def get_membership_distribution_analysis():
         "total_active_members": total_active_members,
         "total_inactive_members": total_inactive_members,
         "analysis": analysis
-    })
\ No newline at end of file
+    })
+
+from django.db.models import Q
+
+# Grouping name -> (group key field, label field) on ChurchMember.
+# "parish" collapses every member into a single row.
+MEMBERSHIP_STATS_GROUPINGS = {
+    "cell": ("cell", "cell__name"),
+    "outstation": ("cell__outstation", "cell__outstation__name"),
+    "parish": (None, None),
+}
+
+_ACTIVE = Q(status="Active")
+_INACTIVE = Q(status="Inactive")
+_MALE = Q(gender="Male")
+_FEMALE = Q(gender="Female")
+_MARRIED = Q(marital_status="Married")
+_UNMARRIED = Q(marital_status__in=["Single", "Divorced", "Widowed"])
+_BAPTISED = Q(is_baptised=True)
+_CONFIRMED = Q(date_confirmed__isnull=False)  # date_confirmed is the source of truth
+_LEADER = Q(leader__isnull=False)
+
+# Every breakdown the reports need, as one conditional count each.
+MEMBERSHIP_STATS_METRICS = {
+    # Status
+    "active": _ACTIVE,
+    "inactive": _INACTIVE,
+    "pending": Q(status="Pending"),
+    # Gender
+    "male": _MALE,
+    "female": _FEMALE,
+    "active_male": _ACTIVE & _MALE,
+    "active_female": _ACTIVE & _FEMALE,
+    "inactive_male": _INACTIVE & _MALE,
+    "inactive_female": _INACTIVE & _FEMALE,
+    # Baptism
+    "baptised": _BAPTISED,
+    "unbaptised": ~_BAPTISED,
+    "active_baptised": _ACTIVE & _BAPTISED,
+    "active_unbaptised": _ACTIVE & ~_BAPTISED,
+    # Confirmation (by date, plus the legacy is_confirmed flag)
+    "confirmed": _CONFIRMED,
+    "unconfirmed": ~_CONFIRMED,
+    "active_confirmed": _ACTIVE & _CONFIRMED,
+    "active_unconfirmed": _ACTIVE & ~_CONFIRMED,
+    "flagged_confirmed": Q(is_confirmed=True),
+    "flagged_unconfirmed": Q(is_confirmed=False),
+    # Marital status
+    "married_male": _MARRIED & _MALE,
+    "married_female": _MARRIED & _FEMALE,
+    "unmarried_male": _UNMARRIED & _MALE,
+    "unmarried_female": _UNMARRIED & _FEMALE,
+    "active_married_male": _ACTIVE & _MARRIED & _MALE,
+    "active_married_female": _ACTIVE & _MARRIED & _FEMALE,
+    "active_unmarried_male": _ACTIVE & _UNMARRIED & _MALE,
+    "active_unmarried_female": _ACTIVE & _UNMARRIED & _FEMALE,
+    "inactive_unmarried_male": _INACTIVE & _UNMARRIED & _MALE,
+    "inactive_unmarried_female": _INACTIVE & _UNMARRIED & _FEMALE,
+    # Leadership
+    "leaders": _LEADER,
+    "active_leaders": _ACTIVE & _LEADER,
+    "inactive_leaders": _INACTIVE & _LEADER,
+}
+
+
+def empty_membership_stats(label=None):
+    """
+    Returns a stats row with every metric set to zero.
+    Used for cells/outstations that have no members yet.
+    """
+    row = {metric: 0 for metric in MEMBERSHIP_STATS_METRICS}
+    row["total"] = 0
+    row["label"] = label
+    return row
+
+
+def get_membership_stats(group_by="parish", queryset=None, metrics=None):
+    """
+    Membership statistics cube.
+
+    Computes every breakdown in MEMBERSHIP_STATS_METRICS (status, gender,
+    baptism, confirmation, marital status, leadership and their combinations)
+    in ONE grouped query using conditional counts.
+
+    - group_by="parish"     -> a single stats dict for all members.
+    - group_by="cell"       -> {cell_id: stats}
+    - group_by="outstation" -> {outstation_id: stats}
+
+    Members without a cell are grouped under the key None.
+    Groups without members are absent; use empty_membership_stats() for them.
+    `metrics` replaces MEMBERSHIP_STATS_METRICS (e.g. to add event counts).
+    """
+    if group_by not in MEMBERSHIP_STATS_GROUPINGS:
+        raise ValueError(f"Unknown membership stats grouping: {group_by}")
+
+    key_field, label_field = MEMBERSHIP_STATS_GROUPINGS[group_by]
+    queryset = ChurchMember.objects.all() if queryset is None else queryset
+
+    aggregates = {"total": Count("id")}
+    aggregates.update({
+        metric: Count("id", filter=condition)
+        for metric, condition in (metrics or MEMBERSHIP_STATS_METRICS).items()
+    })
+
+    if key_field is None:
+        row = queryset.aggregate(**aggregates)
+        row["label"] = None
+        return row
+
+    rows = (
+        queryset.order_by()
+        .values(key_field, label_field)
+        .annotate(**aggregates)
+    )
+
+    cube = {}
+    for row in rows:
+        key = row.pop(key_field)
+        row["label"] = row.pop(label_field)
+        cube[key] = row
+    return cube
+
+
+import calendar
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Subquery
+from members.models import MembershipSnapshot
+
+# Event metric -> (date field, extra filters) on ChurchMember.
+MEMBERSHIP_EVENTS = {
+    "new_members": ("date_created__date", {}),
+    "new_baptised_male": ("date_of_baptism", {"gender": "Male"}),
+    "new_baptised_female": ("date_of_baptism", {"gender": "Female"}),
+    "new_confirmed": ("date_confirmed", {}),
+    "new_married": ("date_of_marriage", {}),
+}
+
+
+def membership_event_metrics(day, end=None, skip=()):
+    """
+    Conditional counts of what happened to members on `day` (or between
+    `day` and `end` inclusive, leaving out the dates in `skip`).
+    Stored in snapshots with a new_ prefix and summed over a month for reports.
+    """
+    metrics = {}
+    for metric, (field, extra) in MEMBERSHIP_EVENTS.items():
+        condition = Q(**{field: day}) if end is None else Q(**{f"{field}__range": (day, end)})
+        if skip:
+            condition &= ~Q(**{f"{field}__in": skip})
+        metrics[metric] = condition & Q(**extra)
+    return metrics
+
+
+def take_membership_snapshot(day=None, overwrite=False):
+    """
+    Writes the parish, outstation and cell snapshot rows for `day` (default: today).
+    Three grouped queries + one insert. Returns the number of rows written.
+
+    Today's snapshot is simply replaced. A past day's snapshot is history (its
+    state metrics cannot be recomputed from current data), so it is only
+    replaced with overwrite=True; otherwise ValueError is raised.
+    """
+    day = day or timezone.localdate()
+    if (
+        not overwrite
+        and day < timezone.localdate()
+        and MembershipSnapshot.objects.filter(date=day).exists()
+    ):
+        raise ValueError(f"A membership snapshot for {day} already exists.")
+    metrics = dict(MEMBERSHIP_STATS_METRICS)
+    metrics.update(membership_event_metrics(day))
+
+    parish = get_membership_stats("parish", metrics=metrics)
+    outstations = get_membership_stats("outstation", metrics=metrics)
+    cells = get_membership_stats("cell", metrics=metrics)
+
+    rows = [MembershipSnapshot(date=day, scope=MembershipSnapshot.PARISH, label="", stats=_snapshot_stats(parish))]
+    rows += [
+        MembershipSnapshot(
+            date=day, scope=MembershipSnapshot.OUTSTATION, outstation_id=key,
+            label=row["label"] or "", stats=_snapshot_stats(row),
+        )
+        for key, row in outstations.items()
+    ]
+    rows += [
+        MembershipSnapshot(
+            date=day, scope=MembershipSnapshot.CELL, cell_id=key,
+            label=row["label"] or "", stats=_snapshot_stats(row),
+        )
+        for key, row in cells.items()
+    ]
+
+    with transaction.atomic():
+        MembershipSnapshot.objects.filter(date=day).delete()
+        MembershipSnapshot.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _snapshot_stats(row):
+    return {key: value for key, value in row.items() if key != "label"}
+
+
+def _snapshot_row(snapshot):
+    row = dict(snapshot.stats)
+    row["label"] = snapshot.label or None
+    return row
+
+
+def get_membership_snapshot(on_date):
+    """
+    The latest snapshot taken on or before `on_date`, in ONE indexed query.
+
+    Returns None when there is none, otherwise:
+        {"date": snapshot date,
+         "parish": stats,                       # like get_membership_stats("parish")
+         "outstation": {outstation_id: stats},  # like get_membership_stats("outstation")
+         "cell": {cell_id: stats}}              # like get_membership_stats("cell")
+    """
+    latest = (
+        MembershipSnapshot.objects
+        .filter(scope=MembershipSnapshot.PARISH, date__lte=on_date)
+        .order_by("-date")
+        .values("date")[:1]
+    )
+    snapshots = list(MembershipSnapshot.objects.filter(date=Subquery(latest)))
+    if not snapshots:
+        return None
+
+    result = {"date": snapshots[0].date, "parish": None, "outstation": {}, "cell": {}}
+    for snapshot in snapshots:
+        if snapshot.scope == MembershipSnapshot.PARISH:
+            result["parish"] = _snapshot_row(snapshot)
+        elif snapshot.scope == MembershipSnapshot.OUTSTATION:
+            result["outstation"][snapshot.outstation_id] = _snapshot_row(snapshot)
+        else:
+            result["cell"][snapshot.cell_id] = _snapshot_row(snapshot)
+    if result["parish"] is None:
+        return None
+    return result
+
+
+def get_membership_events(start, end):
+    """
+    Parish-wide new_* event totals between `start` and `end` (inclusive),
+    summed from the daily parish snapshots. Days without a snapshot (today
+    before the nightly job, or days the job missed) are counted live from
+    the members in one grouped query.
+    """
+    totals = {metric: 0 for metric in MEMBERSHIP_EVENTS}
+    rows = MembershipSnapshot.objects.filter(
+        scope=MembershipSnapshot.PARISH, date__range=(start, end)
+    ).values_list("date", "stats")
+    covered = set()
+    for day, stats in rows:
+        covered.add(day)
+        for metric in totals:
+            totals[metric] += stats.get(metric, 0)
+
+    if len(covered) < (end - start).days + 1:
+        live = get_membership_stats(
+            "parish", metrics=membership_event_metrics(start, end, skip=sorted(covered))
+        )
+        for metric in totals:
+            totals[metric] += live[metric]
+    return totals
+
+
+def get_membership_trend(metrics, start, end):
+    """
+    Month-end parish values of `metrics` between `start` and `end`, from the
+    snapshots (the last snapshot of each month):
+        [{"month": date(YYYY, MM, 1), "date": snapshot date, metric: value, ...}, ...]
+    """
+    rows = (
+        MembershipSnapshot.objects
+        .filter(scope=MembershipSnapshot.PARISH, date__range=(start, end))
+        .order_by("date")
+        .values_list("date", "stats")
+    )
+    month_end = {}
+    for day, stats in rows:
+        month_end[day.replace(day=1)] = (day, stats)
+
+    return [
+        {"month": month, "date": day, **{metric: stats.get(metric, 0) for metric in metrics}}
+        for month, (day, stats) in sorted(month_end.items())
+    ]
+
+
+def get_month_report_figures(year, month):
+    """
+    Membership figures of the monthly PastorReport for `month` of `year`,
+    from the snapshots: the month's baptisms, marriages and new members, and
+    the active members at the end of the month (today for the current month).
+    Days without a snapshot, today included, have their events counted live.
+    """
+    today = timezone.localdate()
+    start = date(year, month, 1)
+    end = min(date(year, month, calendar.monthrange(year, month)[1]), today)
+    events = {metric: 0 for metric in MEMBERSHIP_EVENTS}
+    if start <= end:
+        events = get_membership_events(start, end)
+
+    snapshot = get_membership_snapshot(end) if end < today else None
+    parish = snapshot["parish"] if snapshot else get_membership_stats("parish")
+    return {
+        "baptized_male": events["new_baptised_male"],
+        "baptized_female": events["new_baptised_female"],
+        "marriages_solemnized": events["new_married"],
+        "number_of_joined_christians": events["new_members"],
+        "number_of_christians": parish["active"],
+    }
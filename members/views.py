@@ -1,7 +1,5 @@
 # members/views.py
 import logging
-import random
-import string
 from datetime import date
 
 import pytz
@@ -21,8 +19,13 @@ from .forms import (
 from .models import ChurchMember
 from leaders.forms import LeaderForm
 from leaders.models import Leader
-from sms.utils import send_sms  # NextSMS integration
-from .utils import get_membership_distribution_analysis  # your analysis helper
+from sms.outbox import enqueue_sms  # NextSMS integration (queued, see send_sms_outbox)
+from .utils import (  # your analysis helpers
+    get_membership_distribution_analysis,
+    get_membership_stats,
+    empty_membership_stats,
+)
+from settings.ids import new_id
 from settings.models import Cell, OutStation
 
 log = logging.getLogger(__name__)
@@ -34,35 +37,6 @@ def is_admin_or_superuser(user):
     return user.is_authenticated and (user.is_superuser or getattr(user, "user_type", "") == "ADMIN")
 
 
-# =========================
-# Member-ID generator (exactly 5 chars, A–Z + 0–9, must contain at least one letter & one digit)
-# =========================
-def _generate_member_id(length: int = 5) -> str:
-    """
-    Returns a unique 5-character code containing at least:
-      • 1 uppercase letter, and
-      • 1 digit.
-    Only A–Z and 0–9 used. Ensures uniqueness against ChurchMember.member_id.
-    """
-    if length < 2:
-        length = 2  # need room for 1 letter + 1 digit
-
-    letters = string.ascii_uppercase
-    digits = string.digits
-    pool = letters + digits
-
-    while True:
-        # guarantee mixture
-        core = [random.choice(letters), random.choice(digits)]
-        core += random.choices(pool, k=length - 2)
-        random.shuffle(core)
-        code = "".join(core)[:length]  # never exceed length
-
-        # unique check
-        if not ChurchMember.objects.filter(member_id=code).exists():
-            return code
-
-
 # =========================
 # NextSMS safety wrappers
 # =========================
@@ -73,7 +47,7 @@ def _sms_enabled() -> bool:
 
 def safe_send_sms(*, to: str, message: str, member=None, reference: str = "") -> dict:
     """
-    Calls sms.utils.send_sms but never raises.
+    Queues the SMS (sms.outbox; the send_sms_outbox worker sends it) but never raises.
     Skips if NEXTSMS creds are missing; logs any error and returns a dict.
     """
     if not _sms_enabled():
@@ -82,12 +56,13 @@ def safe_send_sms(*, to: str, message: str, member=None, reference: str = "") ->
         return {"success": False, "skipped": True, "reason": "missing_credentials", "note": note}
 
     try:
-        resp = send_sms(to=to, message=message, member=member, reference=reference)
-        if not resp.get("success"):
-            log.warning("NextSMS send failed: %s", resp)
-        return resp
+        entry = enqueue_sms(to, message, member=member, reference=reference)
+        if entry is None:
+            log.warning("SMS not queued: no phone number for %s", member)
+            return {"success": False, "reason": "missing_phone"}
+        return {"success": True, "queued": True, "outbox_id": entry.pk}
     except Exception as e:
-        log.exception("NextSMS send error")
+        log.exception("SMS enqueue error")
         return {"success": False, "error": str(e)}
 
 
@@ -124,7 +99,7 @@ def create_or_update_church_member(request, member_id=None):
 
                 # Assign member_id on create only
                 if not is_update and not member.member_id:
-                    member.member_id = _generate_member_id(5)
+                    member.member_id = new_id("member")
 
                 member.save()
                 form.save_m2m()
@@ -148,7 +123,7 @@ def create_or_update_church_member(request, member_id=None):
                     elif not resp.get("success"):
                         messages.warning(request, "Member saved, but SMS sending failed.")
                     else:
-                        messages.success(request, "✅ Member saved and SMS notification sent.")
+                        messages.success(request, "✅ Member saved and SMS notification queued.")
 
                     # If marked as leader, continue to leader details
                     if getattr(member, "is_this_church_member_a_leader", False):
@@ -184,7 +159,7 @@ def approve_church_member(request, member_id):
         member.status = "Active"
         # Ensure member_id exists
         if not member.member_id:
-            member.member_id = _generate_member_id(5)
+            member.member_id = new_id("member")
         member.save()
 
         request_account_url = request.build_absolute_uri("/accounts/request-account/")
@@ -203,7 +178,7 @@ def approve_church_member(request, member_id):
         elif not resp.get("success"):
             messages.warning(request, "Approved, but SMS sending failed.")
         else:
-            messages.success(request, f"✅ {member.full_name} approved and notified via SMS!")
+            messages.success(request, f"✅ {member.full_name} approved; SMS notification queued!")
 
         return redirect("church_member_list")
 
@@ -517,67 +492,37 @@ def church_member_detail(request, pk):
 @login_required
 @user_passes_test(is_admin_or_superuser, login_url="/accounts/login/")
 def church_members_report(request):
-    total_members = ChurchMember.objects.count()
-    total_active = ChurchMember.objects.filter(status="Active").count()
-    total_inactive = ChurchMember.objects.filter(status="Inactive").count()
-
-    active_male = ChurchMember.objects.filter(status="Active", gender="Male").count()
-    active_female = ChurchMember.objects.filter(status="Active", gender="Female").count()
-
-    inactive_male = ChurchMember.objects.filter(status="Inactive", gender="Male").count()
-    inactive_female = ChurchMember.objects.filter(status="Inactive", gender="Female").count()
+    # Whole-parish totals and per-cell breakdowns come from two grouped queries
+    parish = get_membership_stats("parish")
+    cell_stats = get_membership_stats("cell")
 
     total_outstations = OutStation.objects.count()
-    total_cells = Cell.objects.count()
 
-    cells = Cell.objects.select_related("outstation").all()
+    cells = list(Cell.objects.select_related("outstation").all())
+    total_cells = len(cells)
     cell_stats_list = []
     for cell in cells:
-        all_members = cell.members.all()
-        total_cell_members = all_members.count()
-
-        active_cell = all_members.filter(status="Active").count()
-        inactive_cell = all_members.filter(status="Inactive").count()
-
-        active_male_cell = all_members.filter(status="Active", gender="Male").count()
-        active_female_cell = all_members.filter(status="Active", gender="Female").count()
-
-        inactive_male_cell = all_members.filter(status="Inactive", gender="Male").count()
-        inactive_female_cell = all_members.filter(status="Inactive", gender="Female").count()
-
-        active_baptized_cell = all_members.filter(status="Active", is_baptised=True).count()
-        active_unbaptized_cell = all_members.filter(status="Active", is_baptised=False).count()
-        active_confirmed_cell = all_members.filter(status="Active", date_confirmed__isnull=False).count()
-        active_unconfirmed_cell = all_members.filter(status="Active", date_confirmed__isnull=True).count()
-
-        married_males_cell = all_members.filter(status="Active", gender="Male", marital_status="Married").count()
-        unmarried_males_cell = all_members.filter(
-            status="Active", gender="Male", marital_status__in=["Single", "Divorced", "Widowed"]
-        ).count()
-        married_females_cell = all_members.filter(status="Active", gender="Female", marital_status="Married").count()
-        unmarried_females_cell = all_members.filter(
-            status="Active", gender="Female", marital_status__in=["Single", "Divorced", "Widowed"]
-        ).count()
+        stats = cell_stats.get(cell.pk) or empty_membership_stats(cell.name)
 
         cell_stats_list.append(
             {
                 "cell": cell,
                 "cell_display": f"{cell.name} ({cell.outstation.name})",
-                "total_members": total_cell_members,
-                "active_members": active_cell,
-                "inactive_members": inactive_cell,
-                "active_male": active_male_cell,
-                "active_female": active_female_cell,
-                "inactive_male": inactive_male_cell,
-                "inactive_female": inactive_female_cell,
-                "active_baptized": active_baptized_cell,
-                "active_unbaptized": active_unbaptized_cell,
-                "active_confirmed": active_confirmed_cell,
-                "active_unconfirmed": active_unconfirmed_cell,
-                "married_males": married_males_cell,
-                "unmarried_males": unmarried_males_cell,
-                "married_females": married_females_cell,
-                "unmarried_females": unmarried_females_cell,
+                "total_members": stats["total"],
+                "active_members": stats["active"],
+                "inactive_members": stats["inactive"],
+                "active_male": stats["active_male"],
+                "active_female": stats["active_female"],
+                "inactive_male": stats["inactive_male"],
+                "inactive_female": stats["inactive_female"],
+                "active_baptized": stats["active_baptised"],
+                "active_unbaptized": stats["active_unbaptised"],
+                "active_confirmed": stats["active_confirmed"],
+                "active_unconfirmed": stats["active_unconfirmed"],
+                "married_males": stats["active_married_male"],
+                "unmarried_males": stats["active_unmarried_male"],
+                "married_females": stats["active_married_female"],
+                "unmarried_females": stats["active_unmarried_female"],
             }
         )
 
@@ -585,30 +530,26 @@ def church_members_report(request):
     smallest_cell = min(cell_stats_list, key=lambda c: c["total_members"]) if cell_stats_list else None
 
     context = {
-        "total_members": total_members,
-        "total_active": total_active,
-        "total_inactive": total_inactive,
-        "active_male": active_male,
-        "active_female": active_female,
-        "inactive_male": inactive_male,
-        "inactive_female": inactive_female,
+        "total_members": parish["total"],
+        "total_active": parish["active"],
+        "total_inactive": parish["inactive"],
+        "active_male": parish["active_male"],
+        "active_female": parish["active_female"],
+        "inactive_male": parish["inactive_male"],
+        "inactive_female": parish["inactive_female"],
         "total_outstations": total_outstations,
         "total_cells": total_cells,
         "cell_stats_list": cell_stats_list,
         "largest_cell": largest_cell,
         "smallest_cell": smallest_cell,
-        "active_baptized": ChurchMember.objects.filter(status="Active", is_baptised=True).count(),
-        "active_unbaptized": ChurchMember.objects.filter(status="Active", is_baptised=False).count(),
-        "active_confirmed": ChurchMember.objects.filter(status="Active", date_confirmed__isnull=False).count(),
-        "active_unconfirmed": ChurchMember.objects.filter(status="Active", date_confirmed__isnull=True).count(),
-        "married_males": ChurchMember.objects.filter(status="Active", gender="Male", marital_status="Married").count(),
-        "unmarried_males": ChurchMember.objects.filter(
-            status="Active", gender="Male", marital_status__in=["Single", "Divorced", "Widowed"]
-        ).count(),
-        "married_females": ChurchMember.objects.filter(status="Active", gender="Female", marital_status="Married").count(),
-        "unmarried_females": ChurchMember.objects.filter(
-            status="Active", gender="Female", marital_status__in=["Single", "Divorced", "Widowed"]
-        ).count(),
+        "active_baptized": parish["active_baptised"],
+        "active_unbaptized": parish["active_unbaptised"],
+        "active_confirmed": parish["active_confirmed"],
+        "active_unconfirmed": parish["active_unconfirmed"],
+        "married_males": parish["active_married_male"],
+        "unmarried_males": parish["active_unmarried_male"],
+        "married_females": parish["active_married_female"],
+        "unmarried_females": parish["active_unmarried_female"],
         "comments_explanations_advice": (
             "These statistics provide insights into membership trends, gender distribution, and sacramental participation "
             "across outstations and cells. Cells with lower membership may indicate areas needing outreach or support. "
@@ -631,7 +572,7 @@ def church_member_signup(request):
 
             # Ensure ID exists even for public signup
             if not member.member_id:
-                member.member_id = _generate_member_id(5)
+                member.member_id = new_id("member")
                 member.save(update_fields=["member_id"])
 
             signup_message = (
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_churchmember_member_status_gender_cell'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['church_member', 'created_at'], name='notification_member_created'),
+        ),
+    ]
@@ -47,3 +47,7 @@ class Notification(models.Model):
         ordering = ['-created_at']  # Show latest notifications first
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
+        indexes = [
+            # A member's notifications, newest first
+            models.Index(fields=["church_member", "created_at"], name="notification_member_created"),
+        ]
@@ -24,7 +24,8 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from .models import Notification
 from members.models import ChurchMember
 from .forms import NotificationForm
-from sms.utils import send_sms  # ✅ Import Beem SMS function
+from analysis.cache import bump_data_version
+from sms.outbox import enqueue_many  # ✅ SMS are queued and sent by the send_sms_outbox worker
 
 # ✅ Helper function to allow only Admins and Superusers
 def is_admin_or_superuser(user):
@@ -59,26 +60,22 @@ def create_notification(request):
 
         if form.is_valid():
             message = form.cleaned_data["message"]
-            recipients = ChurchMember.objects.filter(id__in=selected_ids)
-
-            for recipient in recipients:
-                # ✅ Save the notification in the database
-                notification = Notification.objects.create(
-                    title="Notification",  # Title is required in the model, but will not be included in SMS
-                    message=message,
-                    church_member=recipient
-                )
-
-                # ✅ Construct the SMS message without the title
-                sms_message = f"Ndugu {recipient.full_name}, {message}"
-
-                # ✅ Send SMS to the recipient
-                response = send_sms(to=recipient.phone_number, message=sms_message, member=recipient)
-
-                # ✅ Log response for debugging
-                print(f"📩 SMS sent to {recipient.phone_number} (Request ID: {response.get('request_id', 'N/A')}): {response}")
-
-            messages.success(request, "📩 Notifications and SMS sent successfully!")
+            recipients = list(ChurchMember.objects.filter(id__in=selected_ids))
+
+            # ✅ Save the notifications in the database (title is required in the model, but not included in SMS)
+            Notification.objects.bulk_create([
+                Notification(title="Notification", message=message, church_member=recipient)
+                for recipient in recipients
+            ])
+            bump_data_version("notifications.Notification")
+
+            # ✅ Queue the SMS; the send_sms_outbox worker sends them
+            queued = enqueue_many(
+                (recipient.phone_number, f"Ndugu {recipient.full_name}, {message}", recipient)
+                for recipient in recipients
+            )
+
+            messages.success(request, f"📩 Notifications saved and {queued} SMS queued for sending!")
             return redirect('notification_list')
 
         else:
@@ -1120,6 +1120,22 @@ from django.db.models import Q, Count
 from members.models import ChurchMember
 from settings.models import Cell, OutStation  # Updated imports: Community → Cell, Zone → OutStation
 from leaders.models import Leader
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from members.utils import (
+    get_membership_stats, empty_membership_stats, get_membership_snapshot,
+    get_membership_trend, get_month_report_figures,
+)
+
+# Parish metrics drawn on the pastor report's monthly trend chart
+MEMBERSHIP_TREND_METRICS = ("active", "inactive", "active_baptised", "active_confirmed")
+
+
+def _months_back(day, months):
+    """First day of the month `months` months before `day`'s month."""
+    index = day.year * 12 + day.month - 1 - months
+    return day.replace(year=index // 12, month=index % 12 + 1, day=1)
+
 
 @login_required
 def pastor_report(request):
@@ -1131,6 +1147,10 @@ def pastor_report(request):
       - church_member.status == 'Active'
       - church_member is a leader
       - leader.occupation == 'Senior Pastor'
+
+    ?date=YYYY-MM-DD reports the membership as of that day, read from the
+    nightly MembershipSnapshot (falls back to live figures when there is none).
+    The month's events and the 12-month trend chart also come from the snapshots.
     """
 
     user = request.user
@@ -1154,86 +1174,95 @@ def pastor_report(request):
         raise PermissionDenied("Access denied: Only Senior Pastors can access this report.")
 
     # ✅ If checks pass, proceed with the statistics logic
-    total_active_members = ChurchMember.objects.filter(status='Active').count()
-    total_inactive_members = ChurchMember.objects.filter(status='Inactive').count()
+    # Past dates: one indexed read of the snapshot table
+    try:
+        report_date = parse_date(request.GET.get('date', '') or '')
+    except ValueError:  # well formed but impossible, e.g. 2025-02-30: show today's figures
+        report_date = None
+    snapshot = None
+    if report_date and report_date < timezone.localdate():
+        snapshot = get_membership_snapshot(report_date)
+
+    if snapshot:
+        parish = snapshot["parish"]
+        outstation_cube = snapshot["outstation"]
+        cell_cube = snapshot["cell"]
+    else:
+        # Parish, outstation and cell breakdowns: one grouped query each
+        parish = get_membership_stats("parish")
+        outstation_cube = get_membership_stats("outstation")
+        cell_cube = get_membership_stats("cell")
+
+    total_active_members = parish['active']
+    total_inactive_members = parish['inactive']
 
-    active_baptized = ChurchMember.objects.filter(status='Active', is_baptised=True).count()
-    active_unbaptized = ChurchMember.objects.filter(status='Active', is_baptised=False).count()
+    active_baptized = parish['active_baptised']
+    active_unbaptized = parish['active_unbaptised']
 
     # Use date_confirmed instead of is_confirmed (corrected field)
-    active_confirmed = ChurchMember.objects.filter(status='Active', date_confirmed__isnull=False).count()
-    active_unconfirmed = ChurchMember.objects.filter(status='Active', date_confirmed__isnull=True).count()
+    active_confirmed = parish['active_confirmed']
+    active_unconfirmed = parish['active_unconfirmed']
 
     # Use marital_status instead of is_married (corrected field)
-    active_married_male = ChurchMember.objects.filter(status='Active', marital_status='Married', gender='Male').count()
-    inactive_unmarried_male = ChurchMember.objects.filter(status='Inactive', marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Male').count()
-    active_married_female = ChurchMember.objects.filter(status='Active', marital_status='Married', gender='Female').count()
-    inactive_unmarried_female = ChurchMember.objects.filter(status='Inactive', marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Female').count()
+    active_married_male = parish['active_married_male']
+    inactive_unmarried_male = parish['inactive_unmarried_male']
+    active_married_female = parish['active_married_female']
+    inactive_unmarried_female = parish['inactive_unmarried_female']
 
-    total_outstations = OutStation.objects.count()  # Updated from total_zones
-    total_cells = Cell.objects.count()  # Updated from total_communities
+    outstations = list(OutStation.objects.all())  # Updated from zones
+    cells = list(Cell.objects.select_related('outstation').all())  # Updated from communities, zone → outstation
+
+    total_outstations = len(outstations)  # Updated from total_zones
+    total_cells = len(cells)  # Updated from total_communities
 
-    outstations = OutStation.objects.all()  # Updated from zones
     outstation_stats = []  # Updated from zone_stats
     for o in outstations:
-        members_in_outstation = ChurchMember.objects.filter(cell__outstation=o)  # Updated relationship: community__zone → cell__outstation
-
-        outstation_baptized = members_in_outstation.filter(is_baptised=True).count()
-        outstation_unbaptized = members_in_outstation.filter(is_baptised=False).count()
-        outstation_confirmed = members_in_outstation.filter(date_confirmed__isnull=False).count()  # Updated field
-        outstation_unconfirmed = members_in_outstation.filter(date_confirmed__isnull=True).count()  # Updated field
-        outstation_married_male = members_in_outstation.filter(marital_status='Married', gender='Male').count()  # Updated field
-        outstation_unmarried_male = members_in_outstation.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Male').count()  # Updated field
-        outstation_married_female = members_in_outstation.filter(marital_status='Married', gender='Female').count()  # Updated field
-        outstation_unmarried_female = members_in_outstation.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Female').count()  # Updated field
-        active_leaders_in_outstation = members_in_outstation.filter(status='Active', leader__isnull=False).count()
+        stats = outstation_cube.get(o.pk) or empty_membership_stats(o.name)
 
         outstation_stats.append({
             'outstation': o,  # Updated key from zone to outstation
-            'outstation_baptized': outstation_baptized,  # Updated from zone_baptized
-            'outstation_unbaptized': outstation_unbaptized,  # Updated from zone_unbaptized
-            'outstation_confirmed': outstation_confirmed,  # Updated from zone_confirmed
-            'outstation_unconfirmed': outstation_unconfirmed,  # Updated from zone_unconfirmed
-            'outstation_married_male': outstation_married_male,  # Updated from zone_married_male
-            'outstation_unmarried_male': outstation_unmarried_male,  # Updated from zone_unmarried_male
-            'outstation_married_female': outstation_married_female,  # Updated from zone_married_female
-            'outstation_unmarried_female': outstation_unmarried_female,  # Updated from zone_unmarried_female
-            'active_leaders_in_outstation': active_leaders_in_outstation,  # Updated from active_leaders_in_zone
+            'outstation_baptized': stats['baptised'],
+            'outstation_unbaptized': stats['unbaptised'],
+            'outstation_confirmed': stats['confirmed'],
+            'outstation_unconfirmed': stats['unconfirmed'],
+            'outstation_married_male': stats['married_male'],
+            'outstation_unmarried_male': stats['unmarried_male'],
+            'outstation_married_female': stats['married_female'],
+            'outstation_unmarried_female': stats['unmarried_female'],
+            'active_leaders_in_outstation': stats['active_leaders'],
         })
 
-    cells = Cell.objects.select_related('outstation').all()  # Updated from communities, zone → outstation
     cell_stats = []  # Updated from community_stats
     for c in cells:
-        members_in_cell = ChurchMember.objects.filter(cell=c)  # Updated from community to cell
-
-        cell_baptized = members_in_cell.filter(is_baptised=True).count()  # Updated from comm_baptized
-        cell_unbaptized = members_in_cell.filter(is_baptised=False).count()  # Updated from comm_unbaptized
-        cell_confirmed = members_in_cell.filter(date_confirmed__isnull=False).count()  # Updated from comm_confirmed
-        cell_unconfirmed = members_in_cell.filter(date_confirmed__isnull=True).count()  # Updated from comm_unconfirmed
-        cell_married_male = members_in_cell.filter(marital_status='Married', gender='Male').count()  # Updated from comm_married_male
-        cell_unmarried_male = members_in_cell.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Male').count()  # Updated from comm_unmarried_male
-        cell_married_female = members_in_cell.filter(marital_status='Married', gender='Female').count()  # Updated from comm_married_female
-        cell_unmarried_female = members_in_cell.filter(marital_status__in=['Single', 'Divorced', 'Widowed'], gender='Female').count()  # Updated from comm_unmarried_female
-        active_leaders_in_cell = members_in_cell.filter(status='Active', leader__isnull=False).count()  # Updated from active_leaders_in_comm
+        stats = cell_cube.get(c.pk) or empty_membership_stats(c.name)
 
         display_name = f"{c.name} ({c.outstation.name})"  # Updated from zone to outstation
 
         cell_stats.append({
             'cell': c,  # Updated from community to cell
             'display_name': display_name,
-            'cell_baptized': cell_baptized,  # Updated from comm_baptized
-            'cell_unbaptized': cell_unbaptized,  # Updated from comm_unbaptized
-            'cell_confirmed': cell_confirmed,  # Updated from comm_confirmed
-            'cell_unconfirmed': cell_unconfirmed,  # Updated from comm_unconfirmed
-            'cell_married_male': cell_married_male,  # Updated from comm_married_male
-            'cell_unmarried_male': cell_unmarried_male,  # Updated from comm_unmarried_male
-            'cell_married_female': cell_married_female,  # Updated from comm_married_female
-            'cell_unmarried_female': cell_unmarried_female,  # Updated from comm_unmarried_female
-            'active_leaders_in_cell': active_leaders_in_cell,  # Updated from active_leaders_in_comm
+            'cell_baptized': stats['baptised'],
+            'cell_unbaptized': stats['unbaptised'],
+            'cell_confirmed': stats['confirmed'],
+            'cell_unconfirmed': stats['unconfirmed'],
+            'cell_married_male': stats['married_male'],
+            'cell_unmarried_male': stats['unmarried_male'],
+            'cell_married_female': stats['married_female'],
+            'cell_unmarried_female': stats['unmarried_female'],
+            'active_leaders_in_cell': stats['active_leaders'],
         })
 
-    overall_active_leaders = ChurchMember.objects.filter(status='Active', leader__isnull=False).count()
-    overall_inactive_leaders = ChurchMember.objects.filter(status='Inactive', leader__isnull=False).count()
+    overall_active_leaders = parish['active_leaders']
+    overall_inactive_leaders = parish['inactive_leaders']
+
+    # Events of the report month and month-end totals of the last 12 months (snapshots)
+    trend_end = min(report_date or timezone.localdate(), timezone.localdate())
+    month_figures = get_month_report_figures(trend_end.year, trend_end.month)
+    trend = get_membership_trend(MEMBERSHIP_TREND_METRICS, _months_back(trend_end, 11), trend_end)
+    membership_trend = {
+        'labels': [row['month'].strftime('%b %Y') for row in trend],
+        **{metric: [row[metric] for row in trend] for metric in MEMBERSHIP_TREND_METRICS},
+    }
 
     context = {
         'total_active_members': total_active_members,
@@ -1256,6 +1285,13 @@ def pastor_report(request):
 
         'overall_active_leaders': overall_active_leaders,
         'overall_inactive_leaders': overall_inactive_leaders,
+
+        # Set when the figures come from a past snapshot
+        'snapshot_date': snapshot["date"] if snapshot else None,
+
+        'report_month': trend_end,
+        'month_figures': month_figures,
+        'membership_trend': membership_trend if trend else None,
     }
 
     return render(request, 'pastor/pastor_report.html', context)
@@ -1266,7 +1302,8 @@ from django.core.exceptions import PermissionDenied
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from .models import PastorReport, DatesOfServices, VisitedLocalCongregation
+from .models import PastorReport, DatesOfServices, VisitedLocalCongregation, MONTH_CHOICES
+from settings.models import Year
 from .forms import (
     PastorReportForm,
     DatesOfServicesFormSet,
@@ -1314,6 +1351,29 @@ class PastorReportCreateView(LoginRequiredMixin, View):
         if leader_user.occupation != 'Senior Pastor':
             raise PermissionDenied("Access denied: Only Senior Pastors can access this.")
 
+    def membership_initial(self, request):
+        """
+        Initial month, year and membership figures (baptisms, marriages, new
+        and total Christians, cell groups) of a new report for ?month=&year=
+        (default: the current month), read from the membership snapshots.
+        """
+        today = timezone.localdate()
+        month_names = [name for name, _ in MONTH_CHOICES]
+        month_name = request.GET.get('month') or today.strftime('%B')
+        month = month_names.index(month_name) + 1 if month_name in month_names else today.month
+        year = Year.objects.filter(year=request.GET.get('year')).first() if request.GET.get('year', '').isdecimal() else None
+        year = year or Year.objects.filter(is_current=True).first()
+        if year is None:
+            return {}
+
+        initial = get_month_report_figures(year.year, month)
+        initial.update({
+            'month': month_names[month - 1],
+            'year': year.pk,
+            'number_of_cell_groups': Cell.objects.count(),
+        })
+        return initial
+
     def get_object(self, pk):
         """Fetches an existing PastorReport or returns None if pk is None."""
         if pk is not None:
@@ -1332,8 +1392,8 @@ class PastorReportCreateView(LoginRequiredMixin, View):
             dates_formset = DatesOfServicesFormSet(prefix='dates', instance=instance)
             congregations_formset = VisitedLocalCongregationFormSet(prefix='congregations', instance=instance)
         else:
-            # Creating
-            report_form = PastorReportForm()
+            # Creating: membership figures pre-filled from the snapshots (?month=March&year=2025)
+            report_form = PastorReportForm(initial=self.membership_initial(request))
             dates_formset = DatesOfServicesFormSet(prefix='dates', queryset=DatesOfServices.objects.none())
             congregations_formset = VisitedLocalCongregationFormSet(prefix='congregations', queryset=VisitedLocalCongregation.objects.none())
 
@@ -1,6 +1,7 @@
 import json
 from django.db.models import Count
 from members.models import ChurchMember
+from members.utils import get_membership_stats
 
 def get_sacraments_trend_analysis():
     """
@@ -9,18 +10,21 @@ def get_sacraments_trend_analysis():
     Returns JSON data for Chart.js.
     """
 
+    # All categories come from a single conditional-count query
+    stats = get_membership_stats("parish")
+
     # Get total counts for each category
-    total_baptized = ChurchMember.objects.filter(is_baptised=True).count()
-    total_unbaptized = ChurchMember.objects.filter(is_baptised=False).count()
+    total_baptized = stats["baptised"]
+    total_unbaptized = stats["unbaptised"]
 
-    total_confirmed = ChurchMember.objects.filter(is_confirmed=True).count()
-    total_unconfirmed = ChurchMember.objects.filter(is_confirmed=False).count()
+    total_confirmed = stats["flagged_confirmed"]
+    total_unconfirmed = stats["flagged_unconfirmed"]
 
-    total_married_males = ChurchMember.objects.filter(marital_status="Married", gender="Male").count()
-    total_married_females = ChurchMember.objects.filter(marital_status="Married", gender="Female").count()
+    total_married_males = stats["married_male"]
+    total_married_females = stats["married_female"]
 
-    total_unmarried_males = ChurchMember.objects.exclude(marital_status="Married").filter(gender="Male").count()
-    total_unmarried_females = ChurchMember.objects.exclude(marital_status="Married").filter(gender="Female").count()
+    total_unmarried_males = stats["male"] - total_married_males
+    total_unmarried_females = stats["female"] - total_married_females
 
     # Data Labels and Values
     labels = [
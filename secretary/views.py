@@ -2927,7 +2927,7 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.contrib.auth.decorators import login_required
 from members.models import ChurchMember
-from sms.utils import send_sms  # ✅ Import Beem SMS function
+from sms.outbox import enqueue_many  # ✅ SMS are queued and sent by the send_sms_outbox worker
 from .decorators import parish_council_secretary_required  # ✅ Ensure correct permission
 
 # 🚀 Create/Update Church Members (Restricted to Parish Council Secretary)
@@ -2951,20 +2951,20 @@ def secretary_create_or_update_church_member(request):
                         church_member = form.save()  # ✅ Save the member
                         new_members.append(church_member)  # ✅ Add to list for SMS
 
-                # ✅ Send SMS to each newly created member
-                for member in new_members:
-                    sms_message = f"Habari {member.full_name}, karibu katika application yetu ya parokia ya mkwawa, " \
-                                  f"kama unatumia smartphone unaweza kupata akaunti yako mwenyewe kwa kutumia " \
-                                  f"utambulisho wako ID (Usimpe yeyote!!) {member.member_id}, kwa kutumia link (bonyeza link hii hapa) " \
-                                  f"https://4404-196-249-93-210.ngrok-free.app/accounts/request-account/"
-
-                    # ✅ Now pass `member` as the third argument
-                    response = send_sms(to=member.phone_number, message=sms_message, member=member)
-
-                    # ✅ Log response for debugging
-                    print(f"📩 SMS sent to {member.phone_number} (Request ID: {response.get('request_id', 'N/A')}): {response}")
+                # ✅ Queue an SMS for each newly created member
+                enqueue_many(
+                    (
+                        member.phone_number,
+                        f"Habari {member.full_name}, karibu katika application yetu ya parokia ya mkwawa, "
+                        f"kama unatumia smartphone unaweza kupata akaunti yako mwenyewe kwa kutumia "
+                        f"utambulisho wako ID (Usimpe yeyote!!) {member.member_id}, kwa kutumia link (bonyeza link hii hapa) "
+                        f"https://4404-196-249-93-210.ngrok-free.app/accounts/request-account/",
+                        member,
+                    )
+                    for member in new_members
+                )
 
-                messages.success(request, '✅ Church members saved successfully & SMS notifications sent!')
+                messages.success(request, '✅ Church members saved successfully & SMS notifications queued!')
                 return redirect('secretary_church_member_list')
 
             except ValidationError as e:
@@ -3644,7 +3644,8 @@ from django.contrib.auth.decorators import login_required
 from notifications.models import Notification
 from members.models import ChurchMember
 from notifications.forms import NotificationForm
-from sms.utils import send_sms  # ✅ Import Beem SMS function
+from analysis.cache import bump_data_version
+from sms.outbox import enqueue_many  # ✅ SMS are queued and sent by the send_sms_outbox worker
 from .decorators import parish_council_secretary_required  # ✅ Ensure correct permission
 
 # 🚀 Create Notification View (Restricted)
@@ -3676,26 +3677,22 @@ def secretary_create_notification(request):
 
         if form.is_valid():
             message = form.cleaned_data["message"]
-            recipients = ChurchMember.objects.filter(id__in=selected_ids)
-
-            for recipient in recipients:
-                # ✅ Save the notification in the database
-                notification = Notification.objects.create(
-                    title="Notification",  # Title is required in the model, but will not be included in SMS
-                    message=message,
-                    church_member=recipient
-                )
-
-                # ✅ Construct the SMS message without the title
-                sms_message = f"Ndugu {recipient.full_name}, {message}"
-
-                # ✅ Send SMS to the recipient
-                response = send_sms(to=recipient.phone_number, message=sms_message, member=recipient)
-
-                # ✅ Log response for debugging
-                print(f"📩 SMS sent to {recipient.phone_number} (Request ID: {response.get('request_id', 'N/A')}): {response}")
-
-            messages.success(request, "📩 Notifications and SMS sent successfully!")
+            recipients = list(ChurchMember.objects.filter(id__in=selected_ids))
+
+            # ✅ Save the notifications in the database (title is required in the model, but not included in SMS)
+            Notification.objects.bulk_create([
+                Notification(title="Notification", message=message, church_member=recipient)
+                for recipient in recipients
+            ])
+            bump_data_version("notifications.Notification")
+
+            # ✅ Queue the SMS; the send_sms_outbox worker sends them
+            queued = enqueue_many(
+                (recipient.phone_number, f"Ndugu {recipient.full_name}, {message}", recipient)
+                for recipient in recipients
+            )
+
+            messages.success(request, f"📩 Notifications saved and {queued} SMS queued for sending!")
             return redirect('secretary_notification_list')
 
         else:
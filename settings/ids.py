@@ -0,0 +1,210 @@
+# settings/ids.py
+"""
+Central generator of the parish's public IDs (member IDs, leader IDs, outstation
+and cell numbers, receipt numbers).
+
+    member.member_id = new_id("member")                 # one ID
+    numbers = reserve_ids("tithe_receipt", 250)          # a block for a bulk import
+    assign_ids("tithe_receipt", tithes)                  # fill the field of many unsaved objects
+    is_valid_id("member", "K7Q2M")                       # checksum test for typed IDs
+    is_typed_id_acceptable("member", typed)              # ... unless legacy IDs are allowed
+
+How an ID is made, without trying random values until one is free:
+
+1. A block of sequence numbers is reserved with one UPDATE of the kind's
+   IdSequence row, so two requests never get the same number.
+2. Each number is scrambled by a keyed permutation (a small Feistel network
+   keyed with SECRET_KEY) over the kind's ID space: IDs are unique because the
+   permutation is one-to-one, and consecutive IDs look unrelated, so they
+   cannot be guessed from each other.
+3. The scrambled number is written in the kind's alphabet and a Luhn mod N
+   check character is added, so most typing mistakes are detected.
+
+IDs created before this service (random values), or after a SECRET_KEY change,
+may coincide with new ones; they are filtered out with one `__in` query per
+block (in chunks of LOOKUP_CHUNK), never one query per candidate.
+
+The reservation joins the caller's transaction: if it is rolled back, the
+numbers are given out again, which is safe since none of them was stored.
+"""
+import hashlib
+import string
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+UPPER_DIGITS = string.ascii_uppercase + string.digits
+LOWER_DIGITS = string.ascii_lowercase + string.digits
+
+# kind -> format of its IDs. "length" counts the characters before the check
+# character; numeric kinds are integers of digits + 1 digits not starting with 0.
+ID_FORMATS = {
+    "member": {
+        "model": "members.ChurchMember", "field": "member_id",
+        "alphabet": UPPER_DIGITS, "length": 4, "letter_and_digit": True,
+    },
+    "leader": {"model": "leaders.Leader", "field": "leader_id", "alphabet": LOWER_DIGITS, "length": 19},
+    "outstation": {"model": "settings.OutStation", "field": "outstation_id", "digits": 5},
+    "cell": {"model": "settings.Cell", "field": "cell_id", "digits": 6},
+    "renting_receipt": {
+        "model": "finance.FacilityRenting", "field": "receipt_id",
+        "alphabet": "123456789" + string.ascii_uppercase, "length": 9,
+    },
+    "tithe_receipt": {
+        "model": "finance.Tithe", "field": "receipt_number",
+        "prefix": "ZK", "alphabet": UPPER_DIGITS, "length": 9,
+    },
+}
+
+FEISTEL_ROUNDS = 4
+
+# Kinds whose IDs from before the check character (random values, e.g. member
+# cards already handed out) are still accepted where users type them
+LEGACY_ID_KINDS = frozenset(getattr(settings, "LEGACY_ID_KINDS", ()))
+
+# IDs per `__in` query when looking for ones already in use (SQLite variable limit)
+LOOKUP_CHUNK = 900
+
+
+def _format(kind):
+    try:
+        return ID_FORMATS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown ID kind '{kind}'.") from None
+
+
+def _space(spec):
+    """Number of different IDs of a kind (before the letter/digit rule)."""
+    if "digits" in spec:
+        return 9 * 10 ** (spec["digits"] - 1)
+    return len(spec["alphabet"]) ** spec["length"]
+
+
+def _key(kind):
+    return hashlib.sha256(f"{settings.SECRET_KEY}:ids:{kind}".encode()).digest()
+
+
+def _permute(value, space, key):
+    """Keyed one-to-one mapping of range(space) onto itself (Feistel network + cycle walking)."""
+    bits = max(2, (space - 1).bit_length())
+    bits += bits % 2
+    half = bits // 2
+    mask = (1 << half) - 1
+    while True:
+        left, right = value >> half, value & mask
+        for round_number in range(FEISTEL_ROUNDS):
+            digest = hashlib.blake2b(f"{round_number}:{right}".encode(), key=key, digest_size=16).digest()
+            left, right = right, left ^ (int.from_bytes(digest, "big") & mask)
+        value = (left << half) | right
+        if value < space:
+            return value
+
+
+def check_character(body, alphabet):
+    """Luhn mod N check character of `body` (all characters taken from `alphabet`)."""
+    base = len(alphabet)
+    total, factor = 0, 2
+    for char in reversed(body):
+        addend = factor * alphabet.index(char)
+        total += addend // base + addend % base
+        factor = 3 - factor
+    return alphabet[-total % base]
+
+
+def _encode(number, spec):
+    """The ID (str or int) for a scrambled number of the kind's space."""
+    if "digits" in spec:
+        body = str(10 ** (spec["digits"] - 1) + number)
+        return int(body + check_character(body, string.digits))
+    alphabet = spec["alphabet"]
+    chars = []
+    for _ in range(spec["length"]):
+        number, index = divmod(number, len(alphabet))
+        chars.append(alphabet[index])
+    body = "".join(reversed(chars))
+    return spec.get("prefix", "") + body + check_character(body, alphabet)
+
+
+def _acceptable(value, spec):
+    if spec.get("letter_and_digit"):
+        return any(c.isalpha() for c in value) and any(c.isdigit() for c in value)
+    return True
+
+
+def is_valid_id(kind, value):
+    """True if `value` is well formed for the kind and its check character matches."""
+    spec = _format(kind)
+    text = str(value).strip()
+    if "digits" in spec:
+        return (
+            len(text) == spec["digits"] + 1 and all(c in string.digits for c in text) and text[0] != "0"
+            and check_character(text[:-1], string.digits) == text[-1]
+        )
+    prefix, alphabet = spec.get("prefix", ""), spec["alphabet"]
+    body = text[len(prefix):]
+    return (
+        text.startswith(prefix) and len(body) == spec["length"] + 1
+        and all(c in alphabet for c in body)
+        and check_character(body[:-1], alphabet) == body[-1]
+    )
+
+
+def is_typed_id_acceptable(kind, value):
+    """
+    Whether a typed ID is worth looking up: its check character matches, or
+    the kind is in LEGACY_ID_KINDS. Typing mistakes are rejected without a query.
+    """
+    return kind in LEGACY_ID_KINDS or is_valid_id(kind, value)
+
+
+def _reserve_block(kind, count):
+    """range of `count` sequence numbers nobody else will get."""
+    IdSequence = apps.get_model("settings", "IdSequence")
+    with transaction.atomic():
+        # The UPDATE comes first so the row is locked before it is read
+        rows = IdSequence.objects.filter(name=kind)
+        if not rows.update(next_value=F("next_value") + count):
+            IdSequence.objects.get_or_create(name=kind)
+            rows.update(next_value=F("next_value") + count)
+        end = rows.values_list("next_value", flat=True).get()
+    return range(end - count, end)
+
+
+def reserve_ids(kind, count):
+    """`count` new, unused IDs of the kind, with one reservation per block."""
+    spec = _format(kind)
+    space, key = _space(spec), _key(kind)
+    model = apps.get_model(spec["model"])
+    field = spec["field"]
+
+    ids = []
+    while len(ids) < count:
+        missing = count - len(ids)
+        # About a quarter of the member codes lack a letter or a digit: ask for more
+        block = _reserve_block(kind, missing * 3 // 2 + 1 if spec.get("letter_and_digit") else missing)
+        if block.stop > space:
+            raise RuntimeError(f"All {space} {kind} IDs have been given out.")
+        candidates = [_encode(_permute(number, space, key), spec) for number in block]
+        candidates = [value for value in candidates if _acceptable(str(value), spec)]
+        taken = set()
+        for start in range(0, len(candidates), LOOKUP_CHUNK):
+            chunk = candidates[start:start + LOOKUP_CHUNK]
+            taken.update(model._default_manager.filter(**{f"{field}__in": chunk}).values_list(field, flat=True))
+        ids.extend(value for value in candidates if value not in taken)
+    return ids[:count]
+
+
+def new_id(kind):
+    """One new, unused ID of the kind."""
+    return reserve_ids(kind, 1)[0]
+
+
+def assign_ids(kind, objects):
+    """Gives every object in `objects` without an ID one, reserving them all at once."""
+    field = _format(kind)["field"]
+    missing = [obj for obj in objects if not getattr(obj, field)]
+    for obj, value in zip(missing, reserve_ids(kind, len(missing))):
+        setattr(obj, field, value)
+    return objects
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Kind of ID, e.g. 'member'.", max_length=50, unique=True)),
+                ('next_value', models.PositiveBigIntegerField(default=0, help_text='First sequence number not given out yet.')),
+            ],
+        ),
+    ]
@@ -54,9 +54,9 @@ class Year(models.Model):
     def __str__(self):
         return f"{self.year} ({'Current' if self.is_current else 'Not Current'})"
 
-import random
 from django.db import models
 from django.utils.timezone import now
+from settings.ids import new_id
 
 class OutStation(models.Model):
     """
@@ -79,13 +79,9 @@ class OutStation(models.Model):
 
     def generate_unique_outstation_id(self):
         """
-        Generates a unique 6-digit ID for the outstation.
-        Ensures the ID is not already used.
+        Generates a unique 6-digit ID for the outstation (see settings/ids.py).
         """
-        while True:
-            random_id = random.randint(100000, 999999)  # Generate a 6-digit number
-            if not OutStation.objects.filter(outstation_id=random_id).exists():
-                return random_id
+        return new_id("outstation")
 
     def save(self, *args, **kwargs):
         """
@@ -120,11 +116,7 @@ class Cell(models.Model):
     def save(self, *args, **kwargs):
         """ Automatically generate a unique 7-digit cell_id if not set """
         if not self.cell_id:
-            while True:
-                new_id = random.randint(1000000, 9999999)  # Generate 7-digit ID
-                if not Cell.objects.filter(cell_id=new_id).exists():
-                    self.cell_id = new_id
-                    break
+            self.cell_id = new_id("cell")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -190,3 +182,15 @@ class ChurchLocation(models.Model):
         return f"Church Location: ({self.latitude}, {self.longitude}, {self.altitude}) {'[Active]' if self.is_active else ''}"
 
 
+
+
+class IdSequence(models.Model):
+    """
+    Next unused sequence number of each kind of generated ID
+    (member, leader, outstation, cell, receipts). See settings/ids.py.
+    """
+    name = models.CharField(max_length=50, unique=True, help_text="Kind of ID, e.g. 'member'.")
+    next_value = models.PositiveBigIntegerField(default=0, help_text="First sequence number not given out yet.")
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
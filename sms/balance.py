@@ -0,0 +1,104 @@
+# sms/balance.py
+"""
+NextSMS account balance, served from the cache.
+
+    balance, checked_at = cached_sms_balance()     # never waits for the provider
+    spend_sms_balance(parts)                      # after the outbox sent messages
+
+The balance is stored under one cache key without expiry, together with the
+time it was read from the provider (stale-while-revalidate):
+
+- younger than SMS_BALANCE_TTL seconds: returned as is;
+- older: returned as is, and one background thread asks the provider for the
+  current value (a cache.add() lock makes sure only one process and thread
+  does, at most once per SMS_BALANCE_REFRESH_TIMEOUT seconds);
+- never read yet: (None, None) is returned and the first refresh starts.
+
+Between refreshes the outbox worker subtracts the SMS parts it sent
+(spend_sms_balance), so the figure stays close to the provider's. That is a
+read and a write, not cache.decr(): backends such as FileBasedCache implement
+decr as get + set with the default timeout, which would make the entry expire.
+Two workers spending at the same moment may lose one subtraction; the next
+refresh corrects it.
+"""
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from sms.utils import check_sms_balance
+
+SMS_BALANCE_TTL = getattr(settings, "SMS_BALANCE_TTL", 300)  # seconds
+SMS_BALANCE_REFRESH_TIMEOUT = getattr(settings, "SMS_BALANCE_REFRESH_TIMEOUT", 60)
+
+# {"value": balance, "checked_at": UNIX timestamp of the provider read}
+BALANCE_KEY = "sms:balance"
+REFRESH_LOCK_KEY = "sms:balance:refreshing"
+
+
+def sms_parts(text):
+    """Number of SMS a message is billed as (160 characters, 153 per part when split)."""
+    length = len(text or "")
+    return 1 if length <= 160 else math.ceil(length / 153)
+
+
+def _as_number(value):
+    """The balance as an int when the provider returned a number (or "1,234"), else None."""
+    try:
+        return int(float(str(value).replace(",", "").strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def refresh_sms_balance():
+    """Reads the balance from the provider and stores it; returns the stored value."""
+    value = check_sms_balance()
+    if isinstance(value, dict) and value.get("error"):
+        logging.warning("NextSMS balance refresh failed: %s", value["error"])
+        # Keep the last good figure; an error is shown only when there is none
+        entry = cache.get(BALANCE_KEY)
+        if entry is not None:
+            return entry["value"]
+    number = _as_number(value)
+    value = value if number is None else number
+    cache.set(BALANCE_KEY, {"value": value, "checked_at": time.time()}, None)
+    return value
+
+
+def _refresh_in_background():
+    if not cache.add(REFRESH_LOCK_KEY, 1, SMS_BALANCE_REFRESH_TIMEOUT):
+        return  # someone is refreshing already
+
+    def run():
+        try:
+            refresh_sms_balance()
+        except Exception:
+            logging.exception("NextSMS balance refresh failed")
+        finally:
+            cache.delete(REFRESH_LOCK_KEY)
+
+    threading.Thread(target=run, name="sms-balance-refresh", daemon=True).start()
+
+
+def cached_sms_balance():
+    """
+    (balance, time it was read as a UNIX timestamp) without waiting for the
+    provider; (None, None) before the first read.
+    """
+    entry = cache.get(BALANCE_KEY) or {"value": None, "checked_at": None}
+    if entry["checked_at"] is None or time.time() - entry["checked_at"] > SMS_BALANCE_TTL:
+        _refresh_in_background()
+    return entry["value"], entry["checked_at"]
+
+
+def spend_sms_balance(parts):
+    """Subtracts `parts` sent SMS from the cached balance (if it is a number)."""
+    if parts <= 0:
+        return
+    entry = cache.get(BALANCE_KEY)
+    if entry is None or not isinstance(entry["value"], int):
+        return  # not read yet, or not a number (e.g. "N/A")
+    cache.set(BALANCE_KEY, dict(entry, value=entry["value"] - parts), None)
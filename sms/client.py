@@ -0,0 +1,133 @@
+# sms/client.py
+"""
+Process-wide HTTP client for NextSMS.
+
+    response = nextsms_request("POST", "/api/sms/v1/text/single", json=payload)
+
+One httpx.Client per process, created on first use and shared by every
+thread (gunicorn threads, the outbox worker's pool): connections are kept
+alive, so a message no longer pays for a new TCP + TLS handshake, and the
+Basic auth header is built once. httpx.Client is safe to share between
+threads; after a fork (gunicorn --preload) the child builds its own.
+
+Settings (all optional):
+
+    NEXTSMS_POOL_SIZE        connections kept open to the provider (default 20)
+    NEXTSMS_CONNECT_TIMEOUT  seconds to open a connection / get one from the pool (default 5)
+    NEXTSMS_READ_TIMEOUT     seconds to wait for the provider's answer (default 30)
+
+Every call is timed: add_latency_hook(fn) registers fn(method, path,
+status_code or None, seconds), and latency_stats() returns the running
+count / total / max per path (used by `send_sms_outbox`).
+"""
+import base64
+import logging
+import os
+import threading
+import time
+
+import httpx
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+NEXTSMS_POOL_SIZE = getattr(settings, "NEXTSMS_POOL_SIZE", 20)
+NEXTSMS_CONNECT_TIMEOUT = getattr(settings, "NEXTSMS_CONNECT_TIMEOUT", 5.0)
+NEXTSMS_READ_TIMEOUT = getattr(settings, "NEXTSMS_READ_TIMEOUT", 30.0)
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_hooks = []
+_stats = {}
+
+
+def _build_client():
+    username = getattr(settings, "NEXTSMS_USERNAME", "")
+    password = getattr(settings, "NEXTSMS_PASSWORD", "")
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return httpx.Client(
+        base_url=getattr(settings, "NEXTSMS_BASE_URL", "https://messaging-service.co.tz").rstrip("/"),
+        headers={
+            "Authorization": f"Basic {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+        timeout=httpx.Timeout(
+            NEXTSMS_READ_TIMEOUT, connect=NEXTSMS_CONNECT_TIMEOUT, pool=NEXTSMS_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=NEXTSMS_POOL_SIZE, max_keepalive_connections=NEXTSMS_POOL_SIZE, keepalive_expiry=60
+        ),
+        verify=getattr(settings, "NEXTSMS_VERIFY_SSL", True),
+    )
+
+
+def nextsms_client():
+    """The shared httpx.Client of this process."""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client, _client_pid = _build_client(), pid
+    return _client
+
+
+def close_client():
+    """Closes the shared client (its connections); the next call opens a new one."""
+    global _client
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+
+
+# ------------------------------------------------------------------
+# Latency
+# ------------------------------------------------------------------
+
+def add_latency_hook(hook):
+    """Calls hook(method, path, status_code or None, seconds) after every request."""
+    _hooks.append(hook)
+
+
+def _record(method, path, status_code, seconds):
+    with _lock:
+        entry = _stats.setdefault(path, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        entry["count"] += 1
+        entry["errors"] += status_code is None or status_code >= 400
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+    for hook in list(_hooks):
+        try:
+            hook(method, path, status_code, seconds)
+        except Exception:
+            log.exception("NextSMS latency hook failed")
+
+
+def latency_stats(reset=False):
+    """{path: {"count", "errors", "total", "max", "average"}} of the requests made so far."""
+    with _lock:
+        stats = {
+            path: dict(entry, average=entry["total"] / entry["count"] if entry["count"] else 0.0)
+            for path, entry in _stats.items()
+        }
+        if reset:
+            _stats.clear()
+    return stats
+
+
+def nextsms_request(method, path, **kwargs):
+    """
+    Sends one request with the shared client and records its latency.
+    Raises httpx.HTTPError on network errors and timeouts.
+    """
+    started = time.perf_counter()
+    status_code = None
+    try:
+        response = nextsms_client().request(method, path, **kwargs)
+        status_code = response.status_code
+        return response
+    finally:
+        _record(method, path, status_code, time.perf_counter() - started)
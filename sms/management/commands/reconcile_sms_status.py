@@ -0,0 +1,36 @@
+# sms/management/commands/reconcile_sms_status.py
+from django.core.management.base import BaseCommand
+
+from sms.client import close_client
+from sms.reports import SMS_STATUS_BATCH_SIZE, SMS_STATUS_MAX_AGE_DAYS, reconcile_statuses
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the delivery status of sent SMS: applies the provider's delivery reports, then polls "
+        "one batch of recent messages without a final status. Run from cron every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SMS_STATUS_BATCH_SIZE,
+            help=f"Messages polled per run (default SMS_STATUS_BATCH_SIZE = {SMS_STATUS_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--max-age-days",
+            type=int,
+            default=SMS_STATUS_MAX_AGE_DAYS,
+            help=f"Only poll messages sent in the last N days (default {SMS_STATUS_MAX_AGE_DAYS}).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = reconcile_statuses(options["batch_size"], options["max_age_days"])
+        finally:
+            close_client()
+        self.stdout.write(self.style.SUCCESS(
+            f"SMS status: {counts['reported']} reports received, {counts['polled']} messages polled, "
+            f"{counts['changed']} statuses changed."
+        ))
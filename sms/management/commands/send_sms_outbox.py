@@ -0,0 +1,56 @@
+# sms/management/commands/send_sms_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from sms.client import close_client, latency_stats
+from sms.outbox import SMS_OUTBOX_CONCURRENCY, process_outbox, worker_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the queued SMS (sms.SmsOutbox) with bounded concurrency, retrying failures with "
+        "exponential backoff. Runs until stopped, or use --once from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Send everything that is due, then exit.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Messages claimed per round (default 500).")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=SMS_OUTBOX_CONCURRENCY,
+            help=f"Provider requests sent at the same time (default SMS_OUTBOX_CONCURRENCY = {SMS_OUTBOX_CONCURRENCY}).",
+        )
+        parser.add_argument("--idle-sleep", type=float, default=5.0, help="Seconds to wait when nothing is due.")
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        totals = {"sent": 0, "retried": 0, "failed": 0, "requests": 0}
+        try:
+            while True:
+                counts = process_outbox(options["batch_size"], options["concurrency"], worker)
+                for key, value in counts.items():
+                    totals[key] += value
+                if counts["requests"]:
+                    self.stdout.write(
+                        f"📩 {counts['requests']} requests: sent {counts['sent']}, "
+                        f"retry later {counts['retried']}, failed {counts['failed']}"
+                    )
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["idle_sleep"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_client()
+        for path, stats in latency_stats().items():
+            self.stdout.write(
+                f"⏱️ {path}: {stats['count']} requests, average {stats['average'] * 1000:.0f} ms, "
+                f"max {stats['max'] * 1000:.0f} ms, {stats['errors']} errors"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"SMS outbox: {totals['sent']} sent, {totals['retried']} to retry, {totals['failed']} failed "
+            f"in {totals['requests']} requests."
+        ))
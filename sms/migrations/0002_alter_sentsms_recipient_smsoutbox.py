@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_alter_churchmember_member_id'),
+        ('sms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sentsms',
+            name='recipient',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sent_sms', to='members.churchmember'),
+        ),
+        migrations.CreateModel(
+            name='SmsOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(help_text="Recipient's phone number.", max_length=20)),
+                ('message', models.TextField(help_text='Message content.')),
+                ('reference', models.CharField(blank=True, default='', help_text='Reference sent to the provider.', max_length=100)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='QUEUED', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Number of sending attempts so far.')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time of the next attempt.')),
+                ('claimed_by', models.CharField(blank=True, default='', help_text='Worker sending the message.', max_length=64)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('recipient', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='queued_sms', to='members.churchmember')),
+                ('sent_sms', models.ForeignKey(blank=True, help_text='Record of the final outcome.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_entries', to='sms.sentsms')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='sms_outbox_due')],
+            },
+        ),
+    ]
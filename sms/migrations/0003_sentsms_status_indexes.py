@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-17 02:15
+
+from django.db import migrations, models
+
+
+def normalise_statuses(apps, schema_editor):
+    """Reduces the stored provider status names to the groups of sms.utils.normalise_status."""
+    from sms.utils import normalise_status
+
+    SentSMS = apps.get_model("sms", "SentSMS")
+    for status in list(SentSMS.objects.values_list("status", flat=True).distinct()):
+        group = normalise_status(status, default="PENDING" if not status else "UNKNOWN")
+        if group != status:
+            SentSMS.objects.filter(status=status).update(status=group)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_alter_churchmember_member_id'),
+        ('sms', '0002_alter_sentsms_recipient_smsoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sentsms',
+            name='last_checked_at',
+            field=models.DateTimeField(blank=True, help_text='Last time the delivery status was received or polled.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='sentsms',
+            index=models.Index(fields=['request_id'], name='sentsms_request_id'),
+        ),
+        migrations.AddIndex(
+            model_name='sentsms',
+            index=models.Index(fields=['sent_at', 'id'], name='sentsms_sent_at'),
+        ),
+        migrations.AddIndex(
+            model_name='sentsms',
+            index=models.Index(fields=['status', 'sent_at'], name='sentsms_status_sent_at'),
+        ),
+        migrations.RunPython(normalise_statuses, migrations.RunPython.noop),
+    ]
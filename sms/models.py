@@ -6,12 +6,72 @@ class SentSMS(models.Model):
     """
     Stores details of SMS messages sent via Beem.
     """
-    recipient = models.ForeignKey(ChurchMember, on_delete=models.CASCADE, related_name="sent_sms")
+    recipient = models.ForeignKey(
+        ChurchMember, on_delete=models.CASCADE, related_name="sent_sms", null=True, blank=True
+    )
     phone_number = models.CharField(max_length=15, help_text="Recipient's phone number.")
     message = models.TextField(help_text="Message content.")
     request_id = models.CharField(max_length=50, help_text="Beem API request ID.")
     status = models.CharField(max_length=20, default="PENDING", help_text="SMS delivery status.")
     sent_at = models.DateTimeField(default=now, help_text="Time when the SMS was sent.")
+    last_checked_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last time the delivery status was received or polled."
+    )
+
+    class Meta:
+        indexes = [
+            # Delivery reports find their message by the provider's ID
+            models.Index(fields=["request_id"], name="sentsms_request_id"),
+            # Status pages list the newest first; the reconciler reads recent non-final ones
+            models.Index(fields=["sent_at", "id"], name="sentsms_sent_at"),
+            models.Index(fields=["status", "sent_at"], name="sentsms_status_sent_at"),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient.full_name if self.recipient else self.phone_number} - {self.status}"
+
+
+class SmsOutbox(models.Model):
+    """
+    SMS waiting to be sent. Views only add rows here (sms/outbox.py); the
+    `send_sms_outbox` worker sends them, retries failures with exponential
+    backoff and records the outcome in SentSMS.
+    """
+    QUEUED = "QUEUED"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    recipient = models.ForeignKey(
+        ChurchMember, on_delete=models.CASCADE, related_name="queued_sms", null=True, blank=True
+    )
+    phone_number = models.CharField(max_length=20, help_text="Recipient's phone number.")
+    message = models.TextField(help_text="Message content.")
+    reference = models.CharField(max_length=100, blank=True, default="", help_text="Reference sent to the provider.")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Number of sending attempts so far.")
+    next_attempt_at = models.DateTimeField(default=now, help_text="Earliest time of the next attempt.")
+    claimed_by = models.CharField(max_length=64, blank=True, default="", help_text="Worker sending the message.")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    sent_sms = models.ForeignKey(
+        SentSMS, on_delete=models.SET_NULL, null=True, blank=True, related_name="outbox_entries",
+        help_text="Record of the final outcome.",
+    )
+    date_created = models.DateTimeField(default=now)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # The worker picks due messages: status = QUEUED and next_attempt_at <= now
+            models.Index(fields=["status", "next_attempt_at"], name="sms_outbox_due"),
+        ]
 
     def __str__(self):
-        return f"{self.recipient.full_name} - {self.status}"
+        return f"{self.phone_number} - {self.status} ({self.attempts} attempts)"
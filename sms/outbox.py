@@ -0,0 +1,268 @@
+# sms/outbox.py
+"""
+Queue of outgoing SMS.
+
+    enqueue_sms(member.phone_number, text, member=member)          # one message
+    enqueue_many([(m.phone_number, text, m) for m in members])      # one bulk INSERT
+    process_outbox(batch_size=500)                                   # one round of the worker
+
+Views and models only enqueue, so a broadcast to thousands of members is a
+single INSERT and never holds up the request. The `send_sms_outbox` command
+claims due messages, groups them into provider requests (plan_requests) and
+posts those with a pool of SMS_OUTBOX_CONCURRENCY threads (the threads only
+talk HTTP; every database write happens in the calling thread):
+
+- messages with the same text go out as one multi-destination request;
+- the remaining ones (e.g. "Ndugu <name>, ..." greetings) go out together
+  through the multi-message endpoint;
+- each request carries at most NEXTSMS_BATCH_LIMIT messages, and the
+  provider's per-number message IDs are split back onto the messages;
+- a request refused as invalid (400/422) is split in halves to isolate the
+  bad messages; a 401/403 stops the round and the batch is retried later.
+
+Then the outcome of every message is recorded:
+
+- sent: a SentSMS row with the provider's message ID, outbox row SENT, and
+  the cached balance lowered by the SMS parts sent;
+- retryable failure (network error, 401/403, 429, 5xx): QUEUED again after
+  SMS_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1) seconds (with jitter, at most
+  SMS_OUTBOX_MAX_RETRY_DELAY), until SMS_OUTBOX_MAX_ATTEMPTS attempts;
+- any other failure, or the last attempt: a SentSMS row with status FAILED,
+  outbox row FAILED.
+
+Messages claimed by a worker that died are claimed again after
+SMS_OUTBOX_CLAIM_TIMEOUT seconds (so an SMS may, rarely, be sent twice).
+"""
+import os
+import random
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from sms.balance import sms_parts, spend_sms_balance
+from sms.models import SentSMS, SmsOutbox
+from sms.utils import NEXTSMS_BATCH_LIMIT, post_sms, post_sms_batch, post_sms_multi
+
+SMS_OUTBOX_CONCURRENCY = getattr(settings, "SMS_OUTBOX_CONCURRENCY", 8)
+SMS_OUTBOX_MAX_ATTEMPTS = getattr(settings, "SMS_OUTBOX_MAX_ATTEMPTS", 5)
+SMS_OUTBOX_RETRY_DELAY = getattr(settings, "SMS_OUTBOX_RETRY_DELAY", 30)  # seconds
+SMS_OUTBOX_MAX_RETRY_DELAY = getattr(settings, "SMS_OUTBOX_MAX_RETRY_DELAY", 3600)
+SMS_OUTBOX_CLAIM_TIMEOUT = getattr(settings, "SMS_OUTBOX_CLAIM_TIMEOUT", 600)
+
+FAILED_STATUS = "FAILED"  # SentSMS.status of messages that could not be sent
+
+
+# ------------------------------------------------------------------
+# Enqueueing
+# ------------------------------------------------------------------
+
+def enqueue_sms(to, message, member=None, reference=""):
+    """Queues one SMS; returns the SmsOutbox row (None if there is no phone number)."""
+    to = str(to or "").strip()
+    if not to:
+        return None
+    return SmsOutbox.objects.create(recipient=member, phone_number=to, message=message, reference=reference)
+
+
+def enqueue_many(messages, reference=""):
+    """
+    Queues many SMS with one bulk INSERT. `messages` holds (phone, text, member)
+    tuples; entries without a phone number are left out. Returns the number queued.
+    """
+    entries = [
+        SmsOutbox(recipient=member, phone_number=str(to).strip(), message=text, reference=reference)
+        for to, text, member in messages
+        if str(to or "").strip()
+    ]
+    SmsOutbox.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+# ------------------------------------------------------------------
+# Sending
+# ------------------------------------------------------------------
+
+def worker_name():
+    """Identifies one worker process in SmsOutbox.claimed_by."""
+    return f"{socket.gethostname()[:30]}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _due(moment):
+    stale = moment - timedelta(seconds=SMS_OUTBOX_CLAIM_TIMEOUT)
+    return (
+        Q(status=SmsOutbox.QUEUED, next_attempt_at__lte=moment)
+        | Q(status=SmsOutbox.SENDING, claimed_at__lt=stale)
+    )
+
+
+def claim_due(worker, limit):
+    """
+    Marks up to `limit` due messages as SENDING by `worker` and returns them.
+    The UPDATE repeats the "due" condition, so two workers never claim the same row.
+    """
+    moment = now()
+    ids = list(
+        SmsOutbox.objects.filter(_due(moment)).order_by("next_attempt_at", "id").values_list("pk", flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    SmsOutbox.objects.filter(_due(moment), pk__in=ids).update(
+        status=SmsOutbox.SENDING, claimed_by=worker, claimed_at=moment, attempts=F("attempts") + 1,
+    )
+    return list(SmsOutbox.objects.filter(pk__in=ids, status=SmsOutbox.SENDING, claimed_by=worker, claimed_at=moment))
+
+
+def plan_requests(entries, limit=None):
+    """
+    Splits claimed entries into provider requests (lists of at most `limit`,
+    NEXTSMS_BATCH_LIMIT, entries): full requests of one shared text first, then
+    everything left over (texts of their own, ends of large groups) together.
+    """
+    limit = max(1, limit or NEXTSMS_BATCH_LIMIT)
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[(entry.message, entry.reference)].append(entry)
+
+    planned, rest = [], []
+    for group in groups.values():
+        full = len(group) - len(group) % limit
+        planned.extend(group[start:start + limit] for start in range(0, full, limit))
+        rest.extend(group[full:])
+    planned.extend(rest[start:start + limit] for start in range(0, len(rest), limit))
+    return planned
+
+
+# Whole-request refusals that may be caused by one message (a bad number, a bad text):
+# the batch is split in halves until the culprits are found
+SPLIT_STATUS_CODES = (400, 422)
+# Refusals of the account itself (bad credentials, suspended account): no request of
+# the round can succeed, so the rest of the round is skipped and retried later
+AUTH_STATUS_CODES = (401, 403)
+
+
+def _all_status(results, codes):
+    return all(not r.get("success") and r.get("status_code") in codes for r in results)
+
+
+def _post(entries, auth_failed=None):
+    """
+    Runs in a pool thread: one provider request, HTTP only, no database access.
+    `auth_failed` (a threading.Event shared by the round) is set on 401/403;
+    once set, the remaining requests are not sent.
+    """
+    auth_failed = auth_failed or threading.Event()
+    if auth_failed.is_set():
+        return [{"success": False, "error": "Skipped: NextSMS refused the credentials.", "retryable": True} for _ in entries]
+    try:
+        if len(entries) == 1:
+            first = entries[0]
+            results = [post_sms(first.phone_number, first.message, first.reference)]
+        elif len({(entry.message, entry.reference) for entry in entries}) == 1:
+            results = post_sms_batch([entry.phone_number for entry in entries], entries[0].message, entries[0].reference)
+        else:
+            results = post_sms_multi([(entry.phone_number, entry.message, entry.reference) for entry in entries])
+        if _all_status(results, AUTH_STATUS_CODES):
+            # Back off the whole batch (retried with the usual delays, then FAILED)
+            auth_failed.set()
+            return [dict(result, retryable=True) for result in results]
+        # A batch refused as invalid may be one bad number's fault: retry each half on its own
+        if len(entries) > 1 and _all_status(results, SPLIT_STATUS_CODES):
+            middle = len(entries) // 2
+            results = _post(entries[:middle], auth_failed) + _post(entries[middle:], auth_failed)
+        return results
+    except Exception as e:  # never lose the outcome of a whole batch
+        return [{"success": False, "error": str(e), "retryable": True} for _ in entries]
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt number `attempts` + 1."""
+    delay = min(SMS_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0), SMS_OUTBOX_MAX_RETRY_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _error_text(result):
+    if result.get("skipped"):
+        return "NextSMS credentials missing."
+    if result.get("error"):
+        return str(result["error"])
+    return f"API {result.get('status_code')}: {result.get('api_response')}"[:1000]
+
+
+def record_results(outcomes):
+    """
+    Stores the outcome of [(claimed entry, post_sms result)]: SentSMS rows for
+    final outcomes and the new outbox state, with bulk writes.
+    Returns {"sent", "retried", "failed"} counts.
+    """
+    moment = now()
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    logged = []
+    parts = 0
+    for entry, result in outcomes:
+        entry.claimed_by, entry.claimed_at = "", None
+        if result.get("success"):
+            entry.status, entry.last_error = SmsOutbox.SENT, ""
+            request_id, status = str(result.get("request_id") or ""), result.get("status") or "SENT"
+            counts["sent"] += 1
+            parts += sms_parts(entry.message)
+        elif result.get("retryable") and entry.attempts < SMS_OUTBOX_MAX_ATTEMPTS:
+            entry.status, entry.last_error = SmsOutbox.QUEUED, _error_text(result)
+            entry.next_attempt_at = moment + timedelta(seconds=retry_delay(entry.attempts))
+            counts["retried"] += 1
+            continue
+        else:
+            entry.status, entry.last_error = SmsOutbox.FAILED, _error_text(result)
+            request_id, status = "", FAILED_STATUS
+            counts["failed"] += 1
+        logged.append((entry, SentSMS(
+            recipient_id=entry.recipient_id,
+            phone_number=entry.phone_number[:15],
+            message=entry.message,
+            request_id=request_id[:50],
+            status=str(status)[:20],
+            sent_at=moment,
+        )))
+
+    with transaction.atomic():
+        SentSMS.objects.bulk_create([sent for _, sent in logged], batch_size=1000)
+        for entry, sent in logged:
+            entry.sent_sms = sent
+        SmsOutbox.objects.bulk_update(
+            [entry for entry, _ in outcomes],
+            ["status", "last_error", "next_attempt_at", "claimed_by", "claimed_at", "sent_sms"],
+            batch_size=1000,
+        )
+    # Keeps the cached balance close between provider checks (sms/balance.py)
+    spend_sms_balance(parts)
+    return counts
+
+
+def process_outbox(batch_size=500, concurrency=None, worker=None):
+    """
+    Claims up to `batch_size` due messages, sends them in provider requests
+    (`concurrency` requests at a time) and records the outcome. Returns the
+    counts of record_results() plus the number of requests (all zero when
+    nothing was due).
+    """
+    entries = claim_due(worker or worker_name(), batch_size)
+    if not entries:
+        return {"sent": 0, "retried": 0, "failed": 0, "requests": 0}
+    planned = plan_requests(entries)
+    auth_failed = threading.Event()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency or SMS_OUTBOX_CONCURRENCY)) as pool:
+        results = list(pool.map(lambda request_entries: _post(request_entries, auth_failed), planned))
+    counts = record_results([
+        (entry, result)
+        for request_entries, request_results in zip(planned, results)
+        for entry, result in zip(request_entries, request_results)
+    ])
+    counts["requests"] = len(planned)
+    return counts
@@ -0,0 +1,100 @@
+# sms/reports.py
+"""
+Delivery status of sent SMS, kept up to date without touching the status pages.
+
+    apply_reports([("28089492984101631440", "DELIVERED"), ...])   # webhook / polling results
+    reconcile_statuses()                                          # `manage.py reconcile_sms_status`
+
+Statuses arrive two ways:
+
+1. NextSMS posts delivery reports to the `sms_delivery_report` endpoint
+   (sms/views.py); they are applied by request_id straight away.
+2. The reconciler (run from cron every few minutes) first takes the reports
+   the provider holds for us (one request), then polls the messages that are
+   still not final, oldest check first, SMS_STATUS_BATCH_SIZE at a time.
+   Messages older than SMS_STATUS_MAX_AGE_DAYS are no longer polled and
+   a message is polled again at most every SMS_STATUS_RECHECK_AFTER seconds.
+
+Final statuses (sms.utils.FINAL_STATUSES) are never overwritten.
+"""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from sms.models import SentSMS
+from sms.utils import FINAL_STATUSES, check_sms_status, fetch_delivery_reports
+
+SMS_STATUS_BATCH_SIZE = getattr(settings, "SMS_STATUS_BATCH_SIZE", 200)
+SMS_STATUS_MAX_AGE_DAYS = getattr(settings, "SMS_STATUS_MAX_AGE_DAYS", 3)
+SMS_STATUS_RECHECK_AFTER = getattr(settings, "SMS_STATUS_RECHECK_AFTER", 600)  # seconds
+SMS_STATUS_CONCURRENCY = getattr(settings, "SMS_STATUS_CONCURRENCY", 8)
+
+# request_ids per UPDATE ... WHERE request_id IN (...)
+UPDATE_CHUNK = 900
+
+
+def apply_reports(reports):
+    """
+    Stores [(request_id, status group)]: one UPDATE per status (and chunk of
+    IDs), skipping messages whose status is final already. Returns the number
+    of SentSMS rows changed.
+    """
+    by_status = defaultdict(set)
+    for request_id, status in reports:
+        by_status[status].add(request_id)
+
+    moment = now()
+    changed = 0
+    for status, request_ids in by_status.items():
+        request_ids = sorted(request_ids)
+        for start in range(0, len(request_ids), UPDATE_CHUNK):
+            changed += (
+                SentSMS.objects.filter(request_id__in=request_ids[start:start + UPDATE_CHUNK])
+                .exclude(status__in=FINAL_STATUSES)
+                .update(status=status, last_checked_at=moment)
+            )
+    return changed
+
+
+def pending_messages(batch_size=None, max_age_days=None, recheck_after=None):
+    """Recent SentSMS rows without a final status that are due for a check, oldest check first."""
+    moment = now()
+    recheck = moment - timedelta(seconds=SMS_STATUS_RECHECK_AFTER if recheck_after is None else recheck_after)
+    return (
+        SentSMS.objects.filter(
+            sent_at__gte=moment - timedelta(days=max_age_days or SMS_STATUS_MAX_AGE_DAYS),
+        )
+        .exclude(status__in=FINAL_STATUSES)
+        .exclude(request_id="")
+        .filter(Q(last_checked_at__isnull=True) | Q(last_checked_at__lt=recheck))
+        .order_by(F("last_checked_at").asc(nulls_first=True), "id")[:batch_size or SMS_STATUS_BATCH_SIZE]
+    )
+
+
+def reconcile_statuses(batch_size=None, max_age_days=None, recheck_after=None, concurrency=None):
+    """
+    One reconciler round: the provider's new reports, then a poll of one batch
+    of pending messages. Returns {"reported", "polled", "changed"}.
+    """
+    reports = fetch_delivery_reports()
+    changed = apply_reports(reports)
+
+    pending = list(pending_messages(batch_size, max_age_days, recheck_after).values_list("pk", "request_id", "phone_number"))
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency or SMS_STATUS_CONCURRENCY)) as pool:
+            results = list(pool.map(lambda row: check_sms_status(message_id=row[1], to=row[2]), pending))
+        changed += apply_reports(
+            (request_id, result["status"])
+            for (_, request_id, _), result in zip(pending, results)
+            if result.get("success") and result.get("status") not in (None, "UNKNOWN")
+        )
+        # Rows without news are checked again after SMS_STATUS_RECHECK_AFTER
+        moment = now()
+        ids = [pk for pk, _, _ in pending]
+        for start in range(0, len(ids), UPDATE_CHUNK):
+            SentSMS.objects.filter(pk__in=ids[start:start + UPDATE_CHUNK]).update(last_checked_at=moment)
+    return {"reported": len(reports), "polled": len(pending), "changed": changed}
@@ -7,6 +7,7 @@ from .views import (
     secretary_sms_status_view,
     secretary_delete_sms,
     secretary_delete_all_sms,
+    sms_delivery_report,
 )
 
 
@@ -18,4 +19,7 @@ urlpatterns = [
     path("secretary-sms-status/", secretary_sms_status_view, name="secretary_sms_status"),
     path("secretary-delete-sms/<int:sms_id>/", secretary_delete_sms, name="secretary_delete_sms"),
     path("secretary-delete-all-sms/", secretary_delete_all_sms, name="secretary_delete_all_sms"),
+
+    # NextSMS delivery reports (webhook)
+    path("delivery-report/", sms_delivery_report, name="sms_delivery_report"),
 ]
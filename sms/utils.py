@@ -1,10 +1,11 @@
 # sms/utils.py  — NextSMS (safe: no crashes if creds missing)
-import base64
 import logging
-import requests
+import httpx
 from django.conf import settings
 from django.utils.timezone import now
 
+from sms.client import nextsms_request  # pooled keep-alive client shared by all threads
+
 # Optional DB logging of outbound SMS
 try:
     from sms.models import SentSMS
@@ -18,77 +19,177 @@ NEXTSMS_SENDER_ID   = getattr(settings, "NEXTSMS_SENDER_ID", "KIZITA SOFT")
 NEXTSMS_BASE_URL    = getattr(settings, "NEXTSMS_BASE_URL", "https://messaging-service.co.tz")
 NEXTSMS_VERIFY_SSL  = getattr(settings, "NEXTSMS_VERIFY_SSL", True)
 
-NEXTSMS_SEND_URL = f"{NEXTSMS_BASE_URL.rstrip('/')}/api/sms/v1/text/single"
+# Paths on NEXTSMS_BASE_URL (sms/client.py holds the base URL, auth header and timeouts)
+NEXTSMS_SEND_PATH = "/api/sms/v1/text/single"     # one text, one or many numbers
+NEXTSMS_MULTI_PATH = "/api/sms/v1/text/multi"     # many texts in one request
+NEXTSMS_BALANCE_PATH = "/api/account/balance"
+NEXTSMS_REPORTS_PATH = "/api/sms/v1/reports"       # delivery reports (all new ones, or ?messageId=)
+# Largest number of destinations sent in one request
+NEXTSMS_BATCH_LIMIT = getattr(settings, "NEXTSMS_BATCH_LIMIT", 100)
 
 def _creds_ok() -> bool:
     return bool(NEXTSMS_USERNAME and NEXTSMS_PASSWORD)
 
-def _auth_header():
-    """Build Basic Auth header for NextSMS."""
-    if not _creds_ok():
-        # NOTE: do not call this without checking _creds_ok() first.
-        raise RuntimeError("NEXTSMS credentials missing. Set NEXTSMS_USERNAME and NEXTSMS_PASSWORD.")
-    token = base64.b64encode(f"{NEXTSMS_USERNAME}:{NEXTSMS_PASSWORD}".encode()).decode()
-    return {
-        "Authorization": f"Basic {token}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
+def _phone_key(number) -> str:
+    """Last 9 digits, so 0754..., 754..., 255754... and +255 754... compare equal."""
+    return "".join(ch for ch in str(number) if ch.isdigit())[-9:]
 
-def send_sms(to: str, message: str, member=None, reference: str = ""):
+# Delivery statuses stored in SentSMS.status. The provider reports many detailed
+# names (PENDING_ENROUTE, DELIVERED_TO_HANDSET, ...); they are reduced to these groups.
+STATUS_GROUPS = ("UNDELIVERABLE", "DELIVERED", "EXPIRED", "REJECTED", "FAILED", "PENDING")  # UNDELIVERABLE first
+FINAL_STATUSES = ("DELIVERED", "UNDELIVERABLE", "EXPIRED", "REJECTED", "FAILED")  # will not change any more
+
+def normalise_status(value, default="UNKNOWN") -> str:
+    """Status group of a provider status (string or {"groupName", "name", ...} dict)."""
+    if isinstance(value, dict):
+        value = value.get("groupName") or value.get("name") or ""
+    text = str(value or "").strip().upper()
+    if not text or text.startswith("ERROR"):
+        return default
+    for group in STATUS_GROUPS:
+        if group in text:
+            return group
+    if "SENT" in text or "ENROUTE" in text or text == "ACCEPTED":
+        return "SENT"
+    return text[:20]
+
+def _message_status(msg) -> str:
+    return normalise_status(msg.get("status"), default="SENT")
+
+def parse_delivery_reports(data):
     """
-    Send an SMS via NextSMS.
-    SAFE: If credentials are missing, this returns a 'skipped' result instead of raising.
+    [(message_id, status group)] from a NextSMS delivery report payload, e.g.
+    {"results": [{"messageId": "...", "status": {"groupName": "DELIVERED", ...}}, ...]}
+    or a single {"messageId": "...", "status": "DELIVERED"}.
+    """
+    if isinstance(data, list):
+        reports = data
+    elif isinstance(data, dict):
+        reports = next(
+            (data[key] for key in ("results", "reports", "messages", "data") if isinstance(data.get(key), list)),
+            [data],
+        )
+    else:
+        reports = []
+    parsed = []
+    for report in reports:
+        if not isinstance(report, dict):
+            continue
+        message_id = str(report.get("messageId") or report.get("message_id") or report.get("id") or "").strip()
+        status = normalise_status(
+            report.get("status") or report.get("deliveryStatus") or report.get("messageStatus")
+        )
+        if message_id and status != "UNKNOWN":
+            parsed.append((message_id, status))
+    return parsed
+
+def _post(path, payload, recipients):
+    """
+    POST one NextSMS request and return one result per number in `recipients`
+    (same order), each shaped like post_sms()'s result.
     """
     if not _creds_ok():
         logging.warning("NextSMS credentials missing; skipping SMS send.")
-        return {"success": False, "skipped": True, "reason": "missing_credentials"}
-
-    headers = _auth_header()
-    payload = {
-        "from": NEXTSMS_SENDER_ID,
-        "to": str(to),
-        "text": message,
-        "reference": reference or "church-app",
-    }
+        return [{"success": False, "skipped": True, "reason": "missing_credentials"} for _ in recipients]
 
     try:
-        resp = requests.post(NEXTSMS_SEND_URL, json=payload, headers=headers, timeout=30, verify=NEXTSMS_VERIFY_SSL)
-    except requests.RequestException as e:
+        resp = nextsms_request("POST", path, json=payload)
+    except httpx.HTTPError as e:
         logging.error("NextSMS send_sms network error: %s", e)
-        return {"success": False, "error": str(e)}
+        return [{"success": False, "error": str(e), "retryable": True} for _ in recipients]
 
     try:
         data = resp.json()
     except ValueError:
         data = {"raw": resp.text}
 
-    if resp.ok:
-        # Typical NextSMS shape: {"messages":[{"messageId":"...","status":{"name":"PENDING",...}}]}
-        msg0 = (data.get("messages") or [{}])[0]
-        message_id = msg0.get("messageId") or msg0.get("id") or ""
-        status_obj = msg0.get("status")
-        if isinstance(status_obj, dict):
-            status_name = status_obj.get("name") or status_obj.get("groupName") or "SENT"
+    if not resp.is_success:
+        failure = {
+            "success": False,
+            "status_code": resp.status_code,
+            "api_response": data,
+            "retryable": resp.status_code == 429 or resp.status_code >= 500,
+        }
+        return [dict(failure) for _ in recipients]
+
+    # Typical NextSMS shape: {"messages":[{"to":"255...","messageId":"...","status":{"name":"PENDING",...}}, ...]}
+    # Each number gets the entry with its "to"; entries without one are taken in order.
+    messages = [msg for msg in (data.get("messages") or []) if isinstance(msg, dict)] if isinstance(data, dict) else []
+    by_phone = {}
+    for msg in messages:
+        by_phone.setdefault(_phone_key(msg.get("to", "")), []).append(msg)
+    results = []
+    for index, to in enumerate(recipients):
+        matches = by_phone.get(_phone_key(to))
+        if matches:
+            msg = matches.pop(0)
+        elif len(messages) == len(recipients):
+            msg = messages[index]
         else:
-            status_name = status_obj or "SENT"
+            msg = {}
+        message_id = msg.get("messageId") or msg.get("id") or ""
+        results.append({"success": True, "api_response": data, "request_id": message_id, "status": _message_status(msg)})
+    return results
 
-        if SentSMS:
-            try:
-                SentSMS.objects.create(
-                    recipient=member if member else None,
-                    phone_number=str(to),
-                    message=message,
-                    request_id=str(message_id),
-                    status=status_name,
-                    sent_at=now(),
-                )
-            except Exception as e:
-                logging.warning("Could not persist SentSMS record: %s", e)
+def post_sms(to: str, message: str, reference: str = ""):
+    """
+    Send one SMS via NextSMS without touching the database (safe to call from
+    worker threads). Returns {"success", "request_id", "status", "api_response"}
+    on success; on failure {"success": False, ...} with "retryable": True when
+    trying again later may help (network error, 429, 5xx).
+    """
+    return post_sms_batch([to], message, reference)[0]
 
-        return {"success": True, "api_response": data, "request_id": message_id}
+def post_sms_batch(recipients, message: str, reference: str = ""):
+    """
+    Send the same text to several numbers (at most NEXTSMS_BATCH_LIMIT) with one
+    request. Returns one post_sms()-style result per number, in order.
+    """
+    recipients = [str(to) for to in recipients]
+    payload = {
+        "from": NEXTSMS_SENDER_ID,
+        "to": recipients if len(recipients) > 1 else recipients[0],
+        "text": message,
+        "reference": reference or "church-app",
+    }
+    return _post(NEXTSMS_SEND_PATH, payload, recipients)
+
+def post_sms_multi(messages):
+    """
+    Send different texts (e.g. with a personal greeting) with one request:
+    `messages` holds (to, text, reference) tuples, at most NEXTSMS_BATCH_LIMIT.
+    Returns one post_sms()-style result per message, in order.
+    """
+    payload = {
+        "messages": [
+            {"from": NEXTSMS_SENDER_ID, "to": str(to), "text": text, "reference": reference or "church-app"}
+            for to, text, reference in messages
+        ]
+    }
+    return _post(NEXTSMS_MULTI_PATH, payload, [str(to) for to, _, _ in messages])
+
+def send_sms(to: str, message: str, member=None, reference: str = ""):
+    """
+    Send an SMS via NextSMS right away and log it in SentSMS.
+    SAFE: If credentials are missing, this returns a 'skipped' result instead of raising.
+    Views should queue messages instead (sms.outbox.enqueue_sms).
+    """
+    result = post_sms(to, message, reference)
 
-    return {"success": False, "status_code": resp.status_code, "api_response": data}
+    if result.get("success") and SentSMS:
+        try:
+            SentSMS.objects.create(
+                recipient=member if member else None,
+                phone_number=str(to),
+                message=message,
+                request_id=str(result["request_id"]),
+                status=result["status"],
+                sent_at=now(),
+            )
+        except Exception as e:
+            logging.warning("Could not persist SentSMS record: %s", e)
+
+    return result
 
 def check_sms_balance():
     """
@@ -96,19 +197,42 @@ def check_sms_balance():
     """
     if not _creds_ok():
         return "N/A"
-    headers = _auth_header()
-    url = f"{NEXTSMS_BASE_URL.rstrip('/')}/api/account/balance"
     try:
-        resp = requests.get(url, headers=headers, timeout=30, verify=NEXTSMS_VERIFY_SSL)
-        if resp.ok:
+        resp = nextsms_request("GET", NEXTSMS_BALANCE_PATH)
+        if resp.is_success:
             j = resp.json()
             return j.get("balance") or j.get("credit") or j
         return {"error": f"API {resp.status_code}", "body": resp.text}
-    except requests.RequestException as e:
+    except (httpx.HTTPError, ValueError) as e:
         return {"error": str(e)}
 
 def check_sms_status(*, message_id: str = "", to: str = ""):
     """
-    Placeholder for NextSMS status polling (varies by account). Kept non-fatal.
+    Delivery status of one sent message (NextSMS delivery reports API).
+    Returns {"success": True, "status": status group or "UNKNOWN"}; never raises.
     """
-    return {"success": True, "status": "UNKNOWN"}
+    if not (_creds_ok() and message_id):
+        return {"success": True, "status": "UNKNOWN"}
+    try:
+        resp = nextsms_request("GET", NEXTSMS_REPORTS_PATH, params={"messageId": message_id})
+        data = resp.json()
+    except (httpx.HTTPError, ValueError) as e:
+        return {"success": False, "error": str(e), "status": "UNKNOWN"}
+    if not resp.is_success:
+        return {"success": False, "status_code": resp.status_code, "status": "UNKNOWN"}
+    statuses = dict(parse_delivery_reports(data))
+    return {"success": True, "status": statuses.get(str(message_id), "UNKNOWN"), "api_response": data}
+
+def fetch_delivery_reports():
+    """
+    [(message_id, status group)] of the delivery reports the provider has not
+    handed out yet (one request). Empty list on any error.
+    """
+    if not _creds_ok():
+        return []
+    try:
+        resp = nextsms_request("GET", NEXTSMS_REPORTS_PATH)
+        return parse_delivery_reports(resp.json()) if resp.is_success else []
+    except (httpx.HTTPError, ValueError) as e:
+        logging.warning("NextSMS delivery reports error: %s", e)
+        return []
@@ -1,10 +1,24 @@
 # sms/views.py
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages as dj_messages
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
-from sms.models import SentSMS
-from sms.utils import check_sms_balance, check_sms_status  # ✅ NextSMS-safe imports
+from sms.balance import cached_sms_balance
+from sms.models import SentSMS, SmsOutbox
+from sms.reports import apply_reports
+from sms.utils import parse_delivery_reports  # ✅ NextSMS-safe imports
 
 
 # ✅ Allow only Admins & Superusers (for admin pages)
@@ -27,84 +41,91 @@ def _normalize_balance(value):
     return "N/A"
 
 
-def _extract_status(resp) -> str:
-    """
-    Extract a human-friendly delivery status from check_sms_status() response.
+STATUS_PAGE_SIZE = 50
+
+
+def _day_start(value):
+    """Aware datetime of the start of a YYYY-MM-DD day, or None (also for impossible dates)."""
+    try:
+        day = parse_date(value or "")
+    except ValueError:  # e.g. 2025-02-30
+        return None
+    return make_aware(datetime.combine(day, time.min)) if day else None
 
-    Expected shapes:
-      - {"success": True, "status": "DELIVERED"}
-      - {"success": False, "status_code": 400, "error": "..."}
-      - {"success": True, "api_response": {"messages":[{"status":{"name":"DELIVERED"}}]}}
-    Fallback: "UNKNOWN"
+
+def _status_page_context(request):
     """
-    # Simple/primary path from our utils
-    if isinstance(resp, dict):
-        status = resp.get("status")
-        if isinstance(status, str) and status:
-            return status
-
-        # Try to mine deeper if a raw API response is included
-        data = resp.get("api_response")
-        if isinstance(data, dict):
-            msgs = None
-            for key in ("messages", "results", "reports", "data", "items"):
-                val = data.get(key)
-                if isinstance(val, list) and val:
-                    msgs = val
-                    break
-                if isinstance(val, dict):
-                    msgs = [val]
-                    break
-            if msgs:
-                m0 = msgs[0]
-                if isinstance(m0, dict):
-                    st = m0.get("status")
-                    if isinstance(st, dict):
-                        return st.get("name") or st.get("groupName") or "UNKNOWN"
-                    if st:
-                        return str(st)
-                    # Other possible vendor fields
-                    for f in ("name", "messageStatus", "deliveryStatus"):
-                        if m0.get(f):
-                            return str(m0[f])
-
-        # If util flagged error explicitly
-        if resp.get("success") is False:
-            code = resp.get("status_code")
-            return f"ERROR:{code}" if code else "ERROR"
-
-    return "UNKNOWN"
-
-
-def _collect_rows_and_update_status():
+    One page of SentSMS, newest first, filtered by ?q= (name or phone),
+    ?status=, ?from= and ?to= (dates), plus the number of messages per status
+    (one GROUP BY) and the number still waiting in the outbox.
+    Statuses are kept current by the delivery-report webhook and the
+    reconciler (sms/reports.py) and the balance comes from the cache
+    (sms/balance.py), so nothing here waits for the provider.
     """
-    Read all SentSMS, fetch status via NextSMS (best-effort), persist normalized status.
-    Returns a list of dicts for templates.
+    status_counts = dict(SentSMS.objects.order_by().values_list("status").annotate(total=Count("id")))
+    total = sum(status_counts.values())
+
+    search = request.GET.get("q", "").strip()
+    status = request.GET.get("status", "").strip()
+    date_from = request.GET.get("from", "").strip()
+    date_to = request.GET.get("to", "").strip()
+
+    rows = SentSMS.objects.select_related("recipient").order_by("-sent_at", "-id")
+    if search:
+        rows = rows.filter(Q(recipient__full_name__icontains=search) | Q(phone_number__icontains=search))
+    if status:
+        rows = rows.filter(status=status)
+    start = _day_start(date_from)
+    if start:
+        rows = rows.filter(sent_at__gte=start)
+    end = _day_start(date_to)
+    if end:
+        rows = rows.filter(sent_at__lt=end + timedelta(days=1))
+
+    paginator = Paginator(rows, STATUS_PAGE_SIZE)
+    if not (search or start or end):
+        # The GROUP BY already counted the rows: no second COUNT(*)
+        paginator.count = status_counts.get(status, 0) if status else total
+    page = paginator.get_page(request.GET.get("page"))
+
+    query = request.GET.copy()
+    query.pop("page", None)
+    balance, balance_checked_at = cached_sms_balance()   # from the cache, refreshed in the background
+    return {
+        "balance": "Checking…" if balance_checked_at is None else _normalize_balance(balance),
+        "balance_checked_at": datetime.fromtimestamp(balance_checked_at, dt_timezone.utc) if balance_checked_at else None,
+        "total_sent_sms": total,
+        "filtered_count": paginator.count,
+        "status_counts": sorted(status_counts.items()),
+        "waiting_sms": SmsOutbox.objects.filter(status__in=[SmsOutbox.QUEUED, SmsOutbox.SENDING]).count(),
+        "page": page,
+        "messages_info": page.object_list,
+        "filters": {"q": search, "status": status, "from": date_from, "to": date_to},
+        "query": query.urlencode(),
+    }
+
+
+# =========================
+# Delivery reports (called by NextSMS)
+# =========================
+@csrf_exempt
+@require_POST
+def sms_delivery_report(request):
     """
-    rows = []
-    for sms in SentSMS.objects.all().order_by("-sent_at"):
-        phone = sms.phone_number or ""
-        req_id = sms.request_id or ""
-
-        if req_id:
-            status_resp = check_sms_status(message_id=req_id, to=phone)
-            status_str = _extract_status(status_resp)
-        else:
-            status_str = "UNKNOWN"
-
-        if status_str and status_str != sms.status:
-            sms.status = status_str
-            sms.save(update_fields=["status"])
-
-        rows.append({
-            "id": sms.id,
-            "sent_at": sms.sent_at.strftime("%Y-%m-%d %H:%M:%S") if sms.sent_at else "",
-            "name": getattr(sms.recipient, "full_name", None) or getattr(sms.recipient, "name", None) or "-",
-            "phone": sms.phone_number,
-            "message": sms.message,
-            "status": status_str,
-        })
-    return rows
+    Receives NextSMS delivery reports and updates SentSMS by request_id.
+    The callback URL must carry the shared secret: /sms/delivery-report/?token=<NEXTSMS_WEBHOOK_TOKEN>
+    (or send it in an X-Webhook-Token header).
+    """
+    expected = getattr(settings, "NEXTSMS_WEBHOOK_TOKEN", "")
+    given = request.GET.get("token") or request.headers.get("X-Webhook-Token", "")
+    if not expected or not constant_time_compare(given, expected):
+        return JsonResponse({"error": "forbidden"}, status=403)
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "invalid JSON"}, status=400)
+    reports = parse_delivery_reports(data)
+    return JsonResponse({"received": len(reports), "updated": apply_reports(reports)})
 
 
 # =========================
@@ -113,14 +134,7 @@ def _collect_rows_and_update_status():
 @login_required
 @user_passes_test(is_admin_or_superuser, login_url="login")
 def sms_status_view(request):
-    balance = _normalize_balance(check_sms_balance())   # "N/A" or number/string/error text
-    rows = _collect_rows_and_update_status()
-    context = {
-        "balance": balance,
-        "total_sent_sms": len(rows),
-        "messages_info": rows,
-    }
-    return render(request, "sms/sms_status.html", context)
+    return render(request, "sms/sms_status.html", _status_page_context(request))
 
 
 @login_required
@@ -149,14 +163,7 @@ def delete_all_sms(request):
 # =========================
 @login_required
 def secretary_sms_status_view(request):
-    balance = _normalize_balance(check_sms_balance())
-    rows = _collect_rows_and_update_status()
-    context = {
-        "balance": balance,
-        "total_sent_sms": len(rows),
-        "messages_info": rows,
-    }
-    return render(request, "secretary/sms/sms_status.html", context)
+    return render(request, "secretary/sms/sms_status.html", _status_page_context(request))
 
 
 @login_required